@@ -0,0 +1,348 @@
+# -*- coding: utf-8 -*-
+"""
+EFES ROTA X - Ekran (View) Yenileme Benchmark'ı
+Görünür yavaşlığın çoğu view kodunda: tablo satırı doldurma, satır widget'ı
+yeniden kurma, filtre/arama. Bu paket ekranları başsız (QT_QPA_PLATFORM=
+offscreen) ve sentetik veritabanı üzerinde açıp süre ve bellek ölçer.
+
+Her view için:
+- construct_ms:      Oluşturma + show() (ilk async yükleme hariç)
+- first_refresh_ms:  Oluşturmadan sonra ilk verinin ekrana basılması
+                     (ilk yüklemesi yapıcıda senkron olan view'larda - ör.
+                     DecisionView - ayrı değer yoktur: construct_ms'e dahildir)
+- refresh_ms:        Tekrarlanan yenilemelerin medyanı (async uçtan uca)
+- fetch_ms/apply_ms: Yenilemenin veri çekme / arayüze basma ayrımı (senkron)
+- işlemler:          Filtre, arama, sıralama vb. (medyan)
+- py_peak_mb:        Oluşturma + ilk yüklemede Python tepe bellek (tracemalloc)
+- rss_delta_mb:      Aynı sürede süreç bellek artışı (Qt nesneleri dahil)
+
+Kullanım (Rota klasöründen, Linux'ta ekran gerekmez):
+    python -m benchmarks.gui_benchmarks                   # 1k sipariş
+    python -m benchmarks.gui_benchmarks --sizes 1k,10k --repeat 5
+    python -m benchmarks.gui_benchmarks --only OrdersView,ShippingView --json sonuc.json
+"""
+
+import argparse
+import gc
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional
+
+from benchmarks.planner_benchmarks import SEED, parse_size, run_size, size_label
+
+DEFAULT_SIZES = "1k"
+DEFAULT_REPEAT = 3
+WAIT_TIMEOUT_S = 300
+
+
+def _rss_mb() -> Optional[float]:
+    """Süreç bellek kullanımı (MB) - Linux /proc, yoksa None"""
+    try:
+        with open('/proc/self/statm') as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def _peak_rss_mb() -> Optional[float]:
+    """Sürecin tepe bellek kullanımı (MB)"""
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 1024 if sys.platform != 'darwin' else peak / (1024 * 1024)
+    except ImportError:
+        return None
+
+
+# =============================================================================
+# VIEW TANIMLARI
+# =============================================================================
+def _type(widget, text: str):
+    """Arama kutusuna yazı yaz (textChanged sinyali kullanıcıdaki gibi tetiklenir)"""
+    widget.setText(text)
+
+
+def view_specs() -> Dict[str, Dict]:
+    """
+    {ad: {'create', 'refresh', 'fetch', 'apply', 'operations', 'rows', 'sync_first_load'}}
+    refresh async olabilir; ölçüm async_db boşalana kadar bekler.
+    sync_first_load: ilk yükleme yapıcıda senkron (first_refresh_ms ölçülmez).
+    """
+    from views.orders_view import OrdersView
+    from views.production_view import ProductionView
+    from views.decision_view import DecisionView
+    from views.shipping_view import ShippingView
+
+    return {
+        'OrdersView': {
+            'create': OrdersView,
+            'refresh': lambda v: v.refresh_data(),
+            'fetch': lambda v: v.fetch_data(),
+            'apply': lambda v, data: v.apply_data(data),
+            'operations': {
+                'search "Müşteri 01"': lambda v: _type(v.search_input, "Müşteri 01"),
+                'search clear': lambda v: _type(v.search_input, ""),
+            },
+            'rows': lambda v: v.table.rowCount(),
+        },
+        'ProductionView': {
+            'create': ProductionView,
+            'refresh': lambda v: v.refresh_data(),
+            'fetch': lambda v: v.fetch_data(),
+            'apply': lambda v, data: v.apply_data(data),
+            'operations': {
+                'filter Uretimde': lambda v: v.combo_filter.setCurrentText("Uretimde"),
+                'filter Tumu': lambda v: v.combo_filter.setCurrentText("Tumu"),
+                'search "BNC-0001"': lambda v: _type(v.search_box, "BNC-0001"),
+                'search clear': lambda v: _type(v.search_box, ""),
+            },
+            'rows': lambda v: v.list_layout.count() - 1,
+        },
+        'DecisionView': {
+            'create': DecisionView,
+            # Yapıcı load_orders()'ı senkron çağırır: ilk yükleme construct_ms'te,
+            # tekrar yükleme süresi refresh_ms'te
+            'sync_first_load': True,
+            'refresh': lambda v: v.load_orders(),
+            'operations': {
+                'refresh_table': lambda v: v.refresh_table(),
+                'sort_by_deadline': lambda v: v.sort_by_deadline(),
+                'sort_by_cr': lambda v: v.sort_by_cr(),
+            },
+            'rows': lambda v: v.table.rowCount(),
+        },
+        'ShippingView': {
+            'create': ShippingView,
+            'refresh': lambda v: v.refresh_data(),
+            'fetch': lambda v: v.fetch_data(),
+            'apply': lambda v, data: v.apply_data(data),
+            'operations': {
+                'search "Müşteri 01"': lambda v: _type(v.search_input, "Müşteri 01"),
+                'search clear': lambda v: _type(v.search_input, ""),
+            },
+            'rows': lambda v: v.table_orders.rowCount(),
+        },
+    }
+
+
+# =============================================================================
+# ÖLÇÜM (işçi süreçte)
+# =============================================================================
+class ViewBenchmark:
+    """Tek view'ı ölçen yardımcı: olay döngüsünü async görevler bitene kadar döndürür"""
+
+    def __init__(self, app, async_db, repeat: int):
+        self.app = app
+        self.async_db = async_db
+        self.repeat = repeat
+
+    def wait_idle(self):
+        """Async görevler bitip sonuçları arayüze basılana kadar olayları işle"""
+        from PySide6.QtCore import QEventLoop
+
+        deadline = time.perf_counter() + WAIT_TIMEOUT_S
+        self.app.processEvents(QEventLoop.AllEvents)
+        while not self.async_db.is_idle():
+            if time.perf_counter() > deadline:
+                raise TimeoutError("Async görevler zaman aşımına uğradı")
+            self.app.processEvents(QEventLoop.AllEvents, 5)
+            time.sleep(0.001)
+        self.app.processEvents(QEventLoop.AllEvents)
+
+    def timed(self, func: Callable, *args) -> float:
+        t0 = time.perf_counter()
+        func(*args)
+        self.wait_idle()
+        return (time.perf_counter() - t0) * 1000
+
+    def median(self, func: Callable, *args) -> float:
+        return round(statistics.median(self.timed(func, *args) for _ in range(self.repeat)), 2)
+
+    def measure_memory(self, spec: Dict) -> Dict:
+        """Ayrı bir örnekle oluşturma + ilk yükleme belleği (tracemalloc süreleri bozmasın)"""
+        gc.collect()
+        rss_before = _rss_mb()
+        tracemalloc.start()
+
+        view = spec['create']()
+        view.resize(1600, 900)
+        view.show()
+        self.wait_idle()
+
+        memory = {'py_peak_mb': round(tracemalloc.get_traced_memory()[1] / (1024 * 1024), 2)}
+        tracemalloc.stop()
+        rss_after = _rss_mb()
+        if rss_before is not None and rss_after is not None:
+            memory['rss_delta_mb'] = round(rss_after - rss_before, 2)
+
+        view.close()
+        view.deleteLater()
+        self.wait_idle()
+        return memory
+
+    def run(self, spec: Dict) -> Dict:
+        result = self.measure_memory(spec)
+
+        # Oluşturma + ilk yükleme
+        t0 = time.perf_counter()
+        view = spec['create']()
+        view.resize(1600, 900)
+        view.show()
+        self.app.processEvents()
+        result['construct_ms'] = round((time.perf_counter() - t0) * 1000, 2)
+
+        t1 = time.perf_counter()
+        self.wait_idle()
+        if spec.get('sync_first_load'):
+            result['first_refresh_ms'] = None  # construct_ms'e dahil
+            result['sync_first_load'] = True
+        else:
+            result['first_refresh_ms'] = round((time.perf_counter() - t1) * 1000, 2)
+
+        result['rows'] = spec['rows'](view)
+
+        # Tekrarlanan yenileme (uçtan uca)
+        result['refresh_ms'] = self.median(spec['refresh'], view)
+
+        # Veri çekme / arayüze basma ayrımı
+        if 'fetch' in spec:
+            fetch_times, apply_times = [], []
+            for _ in range(self.repeat):
+                t0 = time.perf_counter()
+                data = spec['fetch'](view)
+                fetch_times.append((time.perf_counter() - t0) * 1000)
+                apply_times.append(self.timed(spec['apply'], view, data))
+            result['fetch_ms'] = round(statistics.median(fetch_times), 2)
+            result['apply_ms'] = round(statistics.median(apply_times), 2)
+
+        result['operations'] = {
+            name: self.median(operation, view)
+            for name, operation in spec['operations'].items()
+        }
+
+        view.close()
+        view.deleteLater()
+        self.wait_idle()
+        return result
+
+
+def run_worker(n_orders: int, only: Optional[List[str]] = None, repeat: int = DEFAULT_REPEAT) -> Dict:
+    """Tek boyut: veriyi üret, view'ları sırayla ölç (ROTA_DB_PATH ayarlı süreçte)"""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+    from PySide6.QtWidgets import QApplication
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+
+    from core.db_manager import db
+    from core.db_async import async_db
+    from benchmarks.synthetic_factory import build_database
+
+    started = time.perf_counter()
+    summary = build_database(db.db_path, n_orders, seed=SEED)
+    generate_ms = (time.perf_counter() - started) * 1000
+
+    bench = ViewBenchmark(app, async_db, repeat)
+    results = {}
+    for name, spec in view_specs().items():
+        if only and name not in only:
+            continue
+        try:
+            results[name] = bench.run(spec)
+        except Exception as e:
+            results[name] = {'error': f"{type(e).__name__}: {e}"}
+
+    async_db.shutdown()
+    return {
+        'data': summary,
+        'generate_ms': round(generate_ms, 1),
+        'peak_rss_mb': _peak_rss_mb(),
+        'results': results
+    }
+
+
+# =============================================================================
+# RAPOR
+# =============================================================================
+def print_report(label: str, run: Dict):
+    data = run['data']
+    print(f"=== {label} sipariş ({data['orders']} sipariş, {data['logs']} log) ===")
+
+    columns = ['rows', 'construct_ms', 'first_refresh_ms', 'refresh_ms', 'fetch_ms', 'apply_ms',
+               'py_peak_mb', 'rss_delta_mb']
+    print(f"  {'view':<16}" + "".join(f"{c:>18}" for c in columns))
+    for name, result in run['results'].items():
+        if 'error' in result:
+            print(f"  {name:<16} HATA: {result['error']}")
+            continue
+        cells = []
+        for column in columns:
+            value = result.get(column)
+            cells.append(f"{'-' if value is None else value:>18}")
+        print(f"  {name:<16}" + "".join(cells))
+
+    sync_views = [name for name, result in run['results'].items() if result.get('sync_first_load')]
+    if sync_views:
+        print(f"  * {', '.join(sync_views)}: ilk yükleme yapıcıda senkron, "
+              f"construct_ms'e dahil (first_refresh_ms yok)")
+
+    print()
+    print(f"  {'view':<16}{'işlem':<28}{'ms':>12}")
+    for name, result in run['results'].items():
+        for operation, ms in result.get('operations', {}).items():
+            print(f"  {name:<16}{operation:<28}{ms:>12.2f}")
+
+    if run.get('peak_rss_mb') is not None:
+        print(f"\n  Süreç tepe bellek: {run['peak_rss_mb']:.0f} MB")
+    print()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="EFES ROTA X ekran yenileme benchmark'ı")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="Sipariş sayıları (ör. 1k,10k)")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="Tekrar sayısı (medyan)")
+    parser.add_argument("--only", help="Sadece bu view'lar (virgülle, ör. OrdersView,ShippingView)")
+    parser.add_argument("--json", help="Sonuçları JSON dosyasına da yaz")
+    parser.add_argument("--worker", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--out", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    only = [s.strip() for s in args.only.split(',')] if args.only else None
+
+    if args.worker is not None:
+        result = run_worker(args.worker, only, args.repeat)
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump(result, f)
+        # Qt nesneleri yorumlayıcı kapanışında yıkılmasın (sonuç zaten yazıldı)
+        os._exit(0)
+
+    report = {}
+    failed = False
+    for size in [parse_size(s) for s in args.sizes.split(',') if s.strip()]:
+        label = size_label(size)
+        try:
+            run = run_size(size, only, module="benchmarks.gui_benchmarks",
+                           extra_env={"QT_QPA_PLATFORM": "offscreen"},
+                           extra_args=["--repeat", str(args.repeat)])
+        except RuntimeError as e:
+            print(e)
+            failed = True
+            continue
+
+        print_report(label, run)
+        report[label] = run
+        failed = failed or any('error' in r for r in run['results'].values())
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
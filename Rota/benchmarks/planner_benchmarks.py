@@ -0,0 +1,299 @@
+# -*- coding: utf-8 -*-
+"""
+EFES ROTA X - Planlayıcı Benchmark Paketi
+Sentetik fabrikalar (1k / 10k / 100k sipariş) üzerinde kritik yolların
+süresini ölçer, JSON baseline ile karşılaştırır ve tolerans aşılırsa
+hata koduyla çıkar (CI / sürüm öncesi kontrol).
+
+Her boyut ayrı bir süreçte, geçici bir SQLite dosyası üzerinde çalışır
+(ROTA_DB_PATH); canlı efes_factory.db'ye ve planlayıcı cache'ine dokunulmaz.
+Cache'li metodlar (SWR, planlayıcı disk cache) her tekrardan önce
+boşaltılır; ölçülen değer soğuk hesaplama süresidir.
+
+Kullanım (Rota klasöründen):
+    python -m benchmarks.planner_benchmarks                    # 1k, 10k
+    python -m benchmarks.planner_benchmarks --sizes 1k,10k,100k
+    python -m benchmarks.planner_benchmarks --update-baseline  # Baseline'ı yenile
+    python -m benchmarks.planner_benchmarks --tolerance 0.5    # %50 yavaşlamaya izin ver
+
+Baseline makineye özeldir (benchmarks/baselines.json); yoksa ilk çalıştırmada
+oluşturulur.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Optional
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines.json")
+
+DEFAULT_SIZES = "1k,10k"
+DEFAULT_TOLERANCE = 0.25   # Baseline'dan %25 yavaş = regresyon
+NOISE_FLOOR_MS = 5.0       # Bu sürenin altındaki farklar ölçüm gürültüsü sayılır
+SEED = 42
+
+
+def parse_size(text: str) -> int:
+    text = text.strip().lower()
+    if text.endswith('k'):
+        return int(float(text[:-1]) * 1000)
+    return int(text)
+
+
+def size_label(n: int) -> str:
+    return f"{n // 1000}k" if n % 1000 == 0 else str(n)
+
+
+# =============================================================================
+# BENCHMARK TANIMLARI (işçi süreçte çalışır)
+# =============================================================================
+BENCHMARKS: Dict[str, Dict] = {}
+
+
+def benchmark(name: str, repeat: int = 5):
+    """
+    Benchmark kaydı. Fonksiyon ortamı (ctx) alır ve ölçülecek çağrıyı döndürür;
+    hazırlık (cache ısıtma vb.) döndürmeden önce yapılır ve ölçüme girmez.
+    """
+    def decorator(func: Callable):
+        BENCHMARKS[name] = {'setup': func, 'repeat': repeat}
+        return func
+    return decorator
+
+
+@benchmark("smart_planner._run_simulation", repeat=3)
+def bench_run_simulation(ctx):
+    planner = ctx['planner']
+    return lambda: planner._run_simulation()
+
+
+@benchmark("smart_planner.calculate_impact", repeat=3)
+def bench_calculate_impact(ctx):
+    planner = ctx['planner']
+    planner.disk_cache.clear()
+    planner._run_base_simulation()  # Ekranda olduğu gibi: mevcut plan cache'te
+    new_order = {
+        'width': 200, 'height': 150, 'quantity': 40, 'thickness': 6,
+        'product': 'Temperli', 'route': 'INTERMAC,CNC RODAJ,TEMPER A1,SEVKIYAT',
+        'priority': 'Normal', 'date': ''
+    }
+    return lambda: planner.calculate_impact(new_order)
+
+
+@benchmark("smart_planner.plan_furnace_loads")
+def bench_plan_furnace_loads(ctx):
+    planner = ctx['planner']
+    inputs = planner._load_simulation_inputs()
+    return lambda: planner.plan_furnace_loads(inputs=inputs)
+
+
+@benchmark("db.get_production_matrix_advanced")
+def bench_production_matrix(ctx):
+    return ctx['db'].get_production_matrix_advanced
+
+
+@benchmark("db.get_station_loads")
+def bench_station_loads(ctx):
+    db, swr_cache = ctx['db'], ctx['swr_cache']
+
+    def run():
+        swr_cache.invalidate("station_loads")
+        return db.get_station_loads()
+    return run
+
+
+@benchmark("db.get_dashboard_stats")
+def bench_dashboard_stats(ctx):
+    db, swr_cache = ctx['db'], ctx['swr_cache']
+
+    def run():
+        swr_cache.invalidate("dashboard_stats")
+        return db.get_dashboard_stats()
+    return run
+
+
+@benchmark("db.bulk_add_orders", repeat=3)
+def bench_bulk_add_orders(ctx):
+    # Excel aktarımı: 10k sipariş tek çağrıda. Yazma yaptığı için en sonda
+    # kayıtlı; ısınma + her tekrar için ayrı kodlu liste önceden hazırlanır.
+    db = ctx['db']
+    batches = [[{
+        'code': f"BENCH-{run:02d}-{i:05d}", 'customer': f"Müşteri {i % 200:03d}",
+        'product': 'Düz Cam', 'thickness': (4, 6, 8)[i % 3], 'quantity': 1 + i % 20,
+        'width': 100, 'height': 80, 'total_m2': round(0.8 * (1 + i % 20), 2),
+        'date': '2030-01-01', 'priority': 'Normal', 'route': 'INTERMAC,SEVKIYAT', 'notes': '',
+    } for i in range(10_000)] for run in range(4)]
+
+    def run():
+        return db.bulk_add_orders(batches.pop() if batches else [], skip_existing=True)
+    return run
+
+
+def run_worker(n_orders: int, only: Optional[List[str]] = None) -> Dict:
+    """Tek boyut: veriyi üret, benchmark'ları çalıştır (ROTA_DB_PATH ayarlı süreçte)"""
+    from core.db_manager import db
+    from core.cache_manager import swr_cache
+    from core.smart_planner import planner
+    from benchmarks.synthetic_factory import build_database
+
+    started = time.perf_counter()
+    summary = build_database(db.db_path, n_orders, seed=SEED)
+    generate_ms = (time.perf_counter() - started) * 1000
+
+    ctx = {'db': db, 'planner': planner, 'swr_cache': swr_cache}
+    results = {}
+    for name, spec in BENCHMARKS.items():
+        if only and name not in only:
+            continue
+        try:
+            func = spec['setup'](ctx)
+            func()  # Isınma (import, sorgu planı, bağlantı havuzu)
+            timings = []
+            for _ in range(spec['repeat']):
+                t0 = time.perf_counter()
+                func()
+                timings.append((time.perf_counter() - t0) * 1000)
+            results[name] = {
+                'median_ms': round(statistics.median(timings), 2),
+                'min_ms': round(min(timings), 2),
+                'repeat': spec['repeat']
+            }
+        except Exception as e:
+            results[name] = {'error': f"{type(e).__name__}: {e}"}
+
+    return {'data': summary, 'generate_ms': round(generate_ms, 1), 'results': results}
+
+
+# =============================================================================
+# ANA SÜREÇ: boyut başına işçi süreç, baseline karşılaştırması
+# =============================================================================
+def run_size(n_orders: int, only: Optional[List[str]] = None,
+             module: str = "benchmarks.planner_benchmarks", extra_env: Optional[Dict] = None,
+             extra_args: Optional[List[str]] = None) -> Dict:
+    """Boyutu geçici klasörde ayrı süreçte çalıştır (module --worker N --out dosya)"""
+    with tempfile.TemporaryDirectory(prefix="rota_bench_") as tmp:
+        out_path = os.path.join(tmp, "result.json")
+        env = dict(os.environ, ROTA_DB_PATH=os.path.join(tmp, f"bench_{size_label(n_orders)}.db"))
+        env.update(extra_env or {})
+        cmd = [sys.executable, "-m", module, "--worker", str(n_orders), "--out", out_path]
+        if only:
+            cmd += ["--only", ",".join(only)]
+        cmd += extra_args or []
+
+        proc = subprocess.run(cmd, cwd=ROOT_DIR, env=env, capture_output=True, text=True)
+        if proc.returncode != 0 or not os.path.exists(out_path):
+            raise RuntimeError(f"{size_label(n_orders)} benchmark süreci başarısız:\n{proc.stderr[-2000:]}")
+
+        with open(out_path, encoding='utf-8') as f:
+            return json.load(f)
+
+
+def load_baseline(path: str = BASELINE_FILE) -> Dict:
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_baseline(baseline: Dict, path: str = BASELINE_FILE):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(baseline, f, indent=2, ensure_ascii=False, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def compare(label: str, results: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """Baseline'a göre regresyonları döndür (hata veren benchmark da regresyondur)"""
+    regressions = []
+    for name, result in results.items():
+        if 'error' in result:
+            regressions.append(f"{label} {name}: {result['error']}")
+            continue
+
+        base = baseline.get(label, {}).get(name)
+        if not base:
+            continue
+        limit = base['median_ms'] * (1 + tolerance)
+        if result['median_ms'] > limit and result['median_ms'] - base['median_ms'] > NOISE_FLOOR_MS:
+            regressions.append(
+                f"{label} {name}: {result['median_ms']:.1f} ms "
+                f"(baseline {base['median_ms']:.1f} ms, limit {limit:.1f} ms)"
+            )
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="EFES ROTA X planlayıcı benchmark paketi")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="Sipariş sayıları (ör. 1k,10k,100k)")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="İzin verilen yavaşlama oranı (0.25 = %%25)")
+    parser.add_argument("--update-baseline", action="store_true", help="Sonuçları baseline olarak kaydet")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="Baseline JSON dosyası")
+    parser.add_argument("--only", help="Sadece bu benchmark'lar (virgülle)")
+    parser.add_argument("--worker", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--out", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    only = [s.strip() for s in args.only.split(',')] if args.only else None
+
+    if args.worker is not None:
+        result = run_worker(args.worker, only)
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump(result, f)
+        return 0
+
+    baseline = load_baseline(args.baseline)
+    new_baseline = dict(baseline)
+    regressions = []
+
+    for size in [parse_size(s) for s in args.sizes.split(',') if s.strip()]:
+        label = size_label(size)
+        print(f"=== {label} sipariş ===")
+        try:
+            run = run_size(size, only)
+        except RuntimeError as e:
+            print(e)
+            regressions.append(f"{label}: süreç hatası")
+            continue
+
+        data = run['data']
+        print(f"  Veri: {data['orders']} sipariş, {data['logs']} log ({run['generate_ms']:.0f} ms)")
+        for name, result in run['results'].items():
+            base = baseline.get(label, {}).get(name)
+            if 'error' in result:
+                print(f"  {name:<40} HATA: {result['error']}")
+                continue
+            line = f"  {name:<40} {result['median_ms']:>10.1f} ms"
+            if base:
+                change = (result['median_ms'] / base['median_ms'] - 1) * 100 if base['median_ms'] else 0.0
+                line += f"   (baseline {base['median_ms']:.1f} ms, {change:+.0f}%)"
+            print(line)
+
+        regressions.extend(compare(label, run['results'], baseline, args.tolerance))
+
+        ok_results = {k: v for k, v in run['results'].items() if 'error' not in v}
+        if args.update_baseline or label not in baseline:
+            new_baseline[label] = {**new_baseline.get(label, {}), **ok_results}
+
+    if new_baseline != baseline:
+        save_baseline(new_baseline, args.baseline)
+        print(f"\nBaseline kaydedildi: {args.baseline}")
+
+    if regressions and not args.update_baseline:
+        print("\nREGRESYON:")
+        for line in regressions:
+            print(f"  - {line}")
+        return 1
+
+    print("\nOK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
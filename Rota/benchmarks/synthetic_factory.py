@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+"""
+EFES ROTA X - Sentetik Fabrika Verisi
+Benchmark'lar için tekrarlanabilir (aynı seed = aynı veri) veritabanı üretir.
+
+- Rotalar FactoryConfig.DEFAULT_STATIONS gruplarından ürün tipine göre kurulur
+  (kesim -> işleme/yüzey -> temper -> birleştirme -> sevkiyat)
+- Üretimdeki siparişlerin rota başından itibaren tamamlanan/kısmi ilerleme
+  logları, tamamlanan siparişlerin tüm istasyon logları ve fire kayıtları
+- Fabrika takviminde tatil günleri, plaka stokları
+
+Tarihler bugüne göre göreli üretilir; planlayıcı her gün benzer bir
+"gecikmiş / yakın / uzak" dağılımı görür.
+
+Kullanım:
+    # ROTA_DB_PATH ile işaret edilen (veya verilen) dosyaya yazar
+    summary = build_database("/tmp/bench_10k.db", n_orders=10_000, seed=42)
+"""
+
+import random
+import sqlite3
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional
+
+from core import report_rollups
+from core.factory_config import FactoryConfig, StationGroup
+
+# (ürün tipi, kalınlıklar, olasılık ağırlığı)
+PRODUCTS = [
+    ("Düz Cam", (4, 5, 6, 8, 10), 40),
+    ("Temperli", (4, 5, 6, 8, 10, 12), 30),
+    ("4.4.1 Lamine", (8, 9), 12),
+    ("Isıcam", (4, 6), 12),
+    ("Buzlu", (4, 6), 6),
+]
+
+STATUSES = [("Beklemede", 55), ("Üretimde", 15), ("Tamamlandı", 20), ("Sevk Edildi", 10)]
+PRIORITIES = [("Normal", 75), ("Acil", 15), ("Çok Acil", 7), ("Kritik", 3)]
+
+CUSTOMER_COUNT = 200
+HOLIDAY_COUNT = 12
+FIRE_RATIO = 0.02
+NOTE_RATIO = 0.05
+NOTES = ["Rodaj hassas", "Müşteri arayacak", "Etiket özel", "Acil sevk"]
+
+
+def _pick(rng: random.Random, weighted) -> object:
+    return rng.choices([w[0] for w in weighted], weights=[w[-1] for w in weighted])[0]
+
+
+def _stations_by_group() -> Dict[StationGroup, List[str]]:
+    groups: Dict[StationGroup, List[str]] = {}
+    for name, info in FactoryConfig.DEFAULT_STATIONS.items():
+        groups.setdefault(info.group, []).append(name)
+    return groups
+
+
+def build_route(rng: random.Random, product: str, groups: Dict[StationGroup, List[str]]) -> str:
+    """Ürün tipine uygun, istasyon sırasına dizilmiş rota"""
+    route = []
+    if product == "4.4.1 Lamine":
+        route.append("LAMINE KESIM")
+    else:
+        route.append(rng.choice(["INTERMAC", "LIVA KESIM"]))
+
+    route.extend(s for s in groups[StationGroup.ISLEME] if rng.random() < 0.3)
+    route.extend(s for s in groups[StationGroup.YUZEY] if rng.random() < 0.1)
+
+    if product == "Temperli":
+        route.append(rng.choice(["TEMPER A1", "TEMPER A1", "TEMPER B1", "TEMPER BOMBE"]))
+    elif product == "4.4.1 Lamine":
+        route.append("LAMINE A1")
+    elif product == "Isıcam":
+        route.append("ISICAM B1")
+    elif product == "Buzlu":
+        route.append("KUMLAMA")
+
+    route.append("SEVKIYAT")
+
+    order_index = {name: info.order_index for name, info in FactoryConfig.DEFAULT_STATIONS.items()}
+    return ",".join(sorted(set(route), key=order_index.get))
+
+
+def build_database(db_path: str, n_orders: int, seed: int = 42,
+                   today: Optional[date] = None) -> Dict[str, int]:
+    """
+    Şeması hazır (DatabaseManager ile oluşturulmuş) veritabanına sentetik veri yaz.
+
+    Returns: {'orders', 'logs', 'holidays', 'plates'} satır sayıları
+    """
+    rng = random.Random(seed)
+    today = today or date.today()
+    groups = _stations_by_group()
+    customers = [f"Müşteri {i:03d}" for i in range(1, CUSTOMER_COUNT + 1)]
+    now_str = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+    orders = []
+    logs = []
+    for i in range(1, n_orders + 1):
+        product, thicknesses, _ = PRODUCTS[rng.choices(range(len(PRODUCTS)),
+                                                       weights=[p[2] for p in PRODUCTS])[0]]
+        thickness = rng.choice(thicknesses)
+        width = rng.randint(30, 320)
+        height = rng.randint(30, 250)
+        quantity = rng.randint(1, 60)
+        m2 = round(width * height * quantity / 10000.0, 2)
+        route = build_route(rng, product, groups)
+        status = _pick(rng, STATUSES)
+        delivery = today + timedelta(days=rng.randint(-10, 120))
+
+        notes = rng.choice(NOTES) if rng.random() < NOTE_RATIO else ''
+        orders.append((
+            i, f"BNC-{i:06d}", rng.choice(customers), product, thickness, width, height,
+            quantity, m2, route, status, _pick(rng, PRIORITIES), delivery.isoformat(), i,
+            notes, now_str
+        ))
+
+        # İlerleme logları
+        stations = route.split(',')
+        if status in ("Tamamlandı", "Sevk Edildi"):
+            done_count, partial = len(stations), False
+        elif status == "Üretimde":
+            done_count, partial = rng.randint(0, len(stations) - 1), True
+        else:
+            done_count, partial = 0, False
+
+        for station in stations[:done_count]:
+            logs.append((i, station, 'Tamamlandi', quantity, 'bench', now_str))
+        if partial and quantity > 1:
+            logs.append((i, stations[done_count], 'Tamamlandi', rng.randint(1, quantity - 1), 'bench', now_str))
+        if rng.random() < FIRE_RATIO:
+            logs.append((i, rng.choice(stations), 'Fire/Kırık', rng.randint(1, 3), 'bench', now_str))
+
+    holidays = sorted(rng.sample(range(1, 180), HOLIDAY_COUNT))
+    holiday_rows = [((today + timedelta(days=d)).isoformat(), 1, 'Sentetik tatil') for d in holidays]
+
+    plates = []
+    for product, thicknesses, _ in PRODUCTS:
+        for thickness in thicknesses:
+            for width, height in ((321, 225), (321, 600), (255, 321)):
+                plates.append((thickness, product, width, height, rng.randint(0, 200), f"Raf {rng.randint(1, 40)}"))
+
+    conn = sqlite3.connect(db_path)
+    try:
+        with conn:
+            conn.executemany("""
+                INSERT INTO orders (id, order_code, customer_name, product_type, thickness,
+                                    width, height, quantity, declared_total_m2, route, status,
+                                    priority, delivery_date, queue_position, notes, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, orders)
+            conn.executemany("""
+                INSERT INTO production_logs (order_id, station_name, action, quantity, operator_name, timestamp)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, logs)
+            conn.executemany(
+                "INSERT OR REPLACE INTO factory_calendar (date, is_holiday, description) VALUES (?, ?, ?)",
+                holiday_rows
+            )
+            conn.executemany("""
+                INSERT INTO plates (thickness, glass_type, width, height, quantity, location)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, plates)
+            # Loglar toplu eklendi; rapor özetlerini bir kerede hesapla
+            report_rollups.create_tables(conn)
+            report_rollups.rebuild(conn)
+        conn.execute("ANALYZE")
+    finally:
+        conn.close()
+
+    return {'orders': len(orders), 'logs': len(logs), 'holidays': len(holiday_rows), 'plates': len(plates)}
@@ -0,0 +1,398 @@
+# -*- coding: utf-8 -*-
+"""
+EFES ROTA X - Çok İstasyonlu Eşzamanlı Yazma Yük Testi
+Aynı veritabanı dosyasını paylaşan terminalleri ayrı süreçlerle taklit eder:
+
+- Operatör:  register_production (adet bildirimi), arada report_fire
+- Sevkiyat:  ship_partial_order (kısmi sevk)
+- Planlama:  bulk_add_orders (toplu sipariş aktarımı, --batch-size)
+
+Her süreç kendi hızında (saniyede işlem, Poisson aralıklı) çalışır; süre
+bitince işlem başına verim, gecikme yüzdelikleri (p50/p95/p99) ve kilit
+hatası ("database is locked") oranı raporlanır. Aynı senaryo farklı
+busy_timeout / journal_mode / batch ayarlarıyla koşturularak sahaya
+çıkmadan önce karşılaştırılabilir. "Bekleme" / "Tekrar" sütunları
+DatabaseManager yazma sayaçlarından gelir (kilidi geç alan transaction'lar,
+BEGIN IMMEDIATE ve metod düzeyi tekrarlar).
+
+Veritabanı varsayılan olarak geçici klasörde sentetik fabrika ile
+üretilir (ROTA_DB_PATH); canlı efes_factory.db'ye dokunulmaz.
+
+Kullanım (Rota klasöründen):
+    python -m benchmarks.write_load                                   # 6 operatör, 2 sevk, 1 planlama, 20 sn
+    python -m benchmarks.write_load --operators 12 --operator-rate 5 --duration 60
+    python -m benchmarks.write_load --busy-timeout 0.5                # Kısa bekleme: kilit hatası artar mı?
+    python -m benchmarks.write_load --journal-mode DELETE --batch-size 500
+    python -m benchmarks.write_load --db kopya.db --json sonuc.json   # Mevcut dosya üzerinde (yazar!)
+"""
+
+import argparse
+import io
+import json
+import logging
+import multiprocessing
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from typing import Dict, List, Optional
+
+from benchmarks.planner_benchmarks import parse_size, size_label
+
+DEFAULT_SIZE = "10k"
+DEFAULT_DURATION = 20.0
+FIRE_RATIO = 0.05          # Operatör bildirimlerinin fire payı
+SEHPALAR = ("Büyük L", "Küçük L", "Büyük A")
+SEED = 42
+STARTUP_BUSY_TIMEOUT = 60.0
+
+# Rol -> (varsayılan süreç sayısı, varsayılan hız [işlem/sn/süreç])
+ROLES = {
+    'operator': (6, 4.0),
+    'clerk': (2, 1.0),
+    'planner': (1, 0.2),
+}
+
+
+def is_lock_error(message: str) -> bool:
+    """SQLite kilit/meşgul hatası mı?"""
+    text = message.lower()
+    return "database is locked" in text or "database is busy" in text or "database table is locked" in text
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Sıralı listede en yakın sıra yöntemiyle yüzdelik"""
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, int(round(pct / 100.0 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+# =============================================================================
+# İŞÇİ SÜREÇ (tek terminal)
+# =============================================================================
+def _load_targets(db) -> Dict[str, List]:
+    """Rollerin üzerinde çalışacağı sipariş havuzları (başlangıçta bir kez)"""
+    with db.get_connection() as conn:
+        production = [(r['id'], r['route'].split(',')) for r in conn.execute(
+            "SELECT id, route FROM orders WHERE status IN ('Beklemede', 'Üretimde') "
+            "AND route IS NOT NULL AND route != '' AND quantity > 0"
+        )]
+        shippable = [r['id'] for r in conn.execute(
+            "SELECT id FROM orders WHERE status = 'Tamamlandı' "
+            "AND quantity > COALESCE(shipped_quantity, 0)"
+        )]
+    return {'production': production, 'shippable': shippable}
+
+
+def _new_orders(rng: random.Random, worker_id: int, batch_no: int, size: int) -> List[Dict]:
+    """bulk_add_orders formatında (Excel aktarımı gibi) sipariş listesi"""
+    from benchmarks.synthetic_factory import PRODUCTS, PRIORITIES, _pick, _stations_by_group, build_route
+
+    groups = _stations_by_group()
+    orders = []
+    for i in range(size):
+        product, thicknesses, _ = rng.choice(PRODUCTS)
+        width, height, quantity = rng.randint(30, 320), rng.randint(30, 250), rng.randint(1, 40)
+        orders.append({
+            'code': f"YUK-{worker_id:02d}-{batch_no:05d}-{i:04d}",
+            'customer': f"Müşteri {rng.randint(1, 200):03d}",
+            'product': product,
+            'thickness': rng.choice(thicknesses),
+            'quantity': quantity,
+            'width': width,
+            'height': height,
+            'total_m2': round(width * height * quantity / 10000.0, 2),
+            'date': time.strftime('%Y-%m-%d', time.localtime(time.time() + rng.randint(1, 60) * 86400)),
+            'priority': _pick(rng, PRIORITIES),
+            'route': build_route(rng, product, groups),
+            'notes': '',
+        })
+    return orders
+
+
+def _make_operation(role: str, db, targets: Dict, rng: random.Random, worker_id: int, batch_size: int):
+    """Rolün bir sonraki işlemi: (işlem adı, çağrı) döndüren üretici"""
+    batch_no = 0
+
+    def next_operation():
+        nonlocal batch_no
+        if role == 'operator':
+            oid, route = rng.choice(targets['production'])
+            station = rng.choice(route)
+            operator = f"Operatör {worker_id:02d}"
+            if rng.random() < FIRE_RATIO:
+                return 'report_fire', lambda: db.report_fire(oid, 1, station, operator)
+            return 'register_production', lambda: db.register_production(oid, station, 1, operator)
+
+        if role == 'clerk':
+            oid = rng.choice(targets['shippable'])
+            return 'ship_partial_order', lambda: db.ship_partial_order(oid, 1, rng.choice(SEHPALAR))
+
+        batch_no += 1
+        orders = _new_orders(rng, worker_id, batch_no, batch_size)
+
+        def bulk():
+            _, _, errors = db.bulk_add_orders(orders)
+            # Satır hataları yutulur; kilit hatası varsa çağrı kilitli sayılır
+            locked = [e for e in errors if is_lock_error(e)]
+            if locked:
+                raise RuntimeError(locked[0])
+            if errors:
+                raise ValueError(errors[0])
+        return 'bulk_add_orders', bulk
+
+    return next_operation
+
+
+def run_worker(worker_id: int, role: str, rate: float, duration: float, start_at: float,
+               batch_size: int, queue) -> None:
+    """
+    Tek terminal süreci. ROTA_DB_PATH ana süreçte ayarlanmıştır; db burada
+    (süreç başına bir kez) açılır. Sonuç {işlem: {'latencies', 'ok', 'locked',
+    'errors'}} olarak kuyruğa konur.
+    """
+    # Kilit hataları zaten sayılıyor; log dosyası yazımı gecikmeye karışmasın
+    logging.disable(logging.ERROR)
+
+    # Açılış (şema kontrolü, varsayılan kayıtlar) tüm süreçlerde aynı anda yazar;
+    # ölçülen ayar değil, uzun bekleme ile açılıp sonra ayar uygulanır
+    busy_timeout = os.environ.get('ROTA_DB_BUSY_TIMEOUT')
+    os.environ['ROTA_DB_BUSY_TIMEOUT'] = str(STARTUP_BUSY_TIMEOUT)
+    # ship_partial_order ve hata yolu stdout'a DEBUG basar; ölçümü kirletmesin
+    with redirect_stdout(io.StringIO()):
+        from core.db_manager import db
+        targets = _load_targets(db)
+    db.busy_timeout = float(busy_timeout) if busy_timeout else 5.0
+
+    rng = random.Random(SEED * 1000 + worker_id)
+    next_operation = _make_operation(role, db, targets, rng, worker_id, batch_size)
+    stats: Dict[str, Dict] = {}
+    lag_ms = 0.0
+
+    if (role == 'operator' and not targets['production']) or (role == 'clerk' and not targets['shippable']):
+        queue.put({'worker': worker_id, 'role': role, 'stats': stats, 'lag_ms': 0.0,
+                   'error': "Rol için uygun sipariş yok"})
+        return
+
+    # Açık döngü: planlanan varış anları işlem süresinden bağımsız ilerler,
+    # geride kalınırsa işlem bekletilmeden hemen yapılır (kuyruk birikmesi = lag)
+    time.sleep(max(0.0, start_at - time.time()))
+    end_at = start_at + duration
+    scheduled = start_at + rng.expovariate(rate)
+
+    sink = io.StringIO()
+    while scheduled < end_at:
+        wait = scheduled - time.time()
+        if wait > 0:
+            time.sleep(wait)
+        else:
+            lag_ms = max(lag_ms, -wait * 1000)
+
+        name, call = next_operation()
+        entry = stats.setdefault(name, {'latencies': [], 'ok': 0, 'locked': 0, 'errors': 0, 'last_error': ''})
+        t0 = time.perf_counter()
+        try:
+            with redirect_stdout(sink):
+                call()
+            entry['ok'] += 1
+        except Exception as e:
+            if is_lock_error(str(e)):
+                entry['locked'] += 1
+            else:
+                entry['errors'] += 1
+                entry['last_error'] = f"{type(e).__name__}: {e}"[:200]
+        entry['latencies'].append((time.perf_counter() - t0) * 1000)
+        sink.seek(0)
+        sink.truncate()
+
+        scheduled += rng.expovariate(rate)
+
+    queue.put({'worker': worker_id, 'role': role, 'stats': stats, 'lag_ms': round(lag_ms, 1),
+               'write_stats': db.get_write_stats()})
+
+
+# =============================================================================
+# ANA SÜREÇ: veri hazırlığı, süreçleri başlatma, toplama
+# =============================================================================
+def prepare_database(db_path: str, n_orders: int) -> Dict[str, int]:
+    """Yeni dosyada şemayı kur ve sentetik fabrikayı yaz (ROTA_DB_PATH ayarlı olmalı)"""
+    from core.db_manager import db
+    from benchmarks.synthetic_factory import build_database
+    return build_database(db.db_path, n_orders, seed=SEED)
+
+
+def aggregate(results: List[Dict], duration: float) -> Dict:
+    """İşçi sonuçlarını işlem bazında birleştir"""
+    merged: Dict[str, Dict] = {}
+    for result in results:
+        for name, entry in result['stats'].items():
+            target = merged.setdefault(name, {'latencies': [], 'ok': 0, 'locked': 0, 'errors': 0, 'last_error': ''})
+            target['latencies'].extend(entry['latencies'])
+            target['ok'] += entry['ok']
+            target['locked'] += entry['locked']
+            target['errors'] += entry['errors']
+            target['last_error'] = entry['last_error'] or target['last_error']
+
+    # DatabaseManager yazma sayaçları (BEGIN IMMEDIATE beklemeleri / tekrarları)
+    write_stats: Dict[str, Dict] = {}
+    for result in results:
+        for name, entry in result.get('write_stats', {}).items():
+            target = write_stats.setdefault(name, {'contended': 0, 'begin_retries': 0, 'retries': 0})
+            for key in target:
+                target[key] += entry.get(key, 0)
+
+    report = {}
+    for name, entry in sorted(merged.items()):
+        latencies = sorted(entry['latencies'])
+        calls = len(latencies)
+        report[name] = {
+            'calls': calls,
+            'ok': entry['ok'],
+            'locked': entry['locked'],
+            'errors': entry['errors'],
+            'lock_rate': round(entry['locked'] / calls, 4) if calls else 0.0,
+            'throughput': round(entry['ok'] / duration, 2),
+            'p50_ms': round(percentile(latencies, 50), 2),
+            'p95_ms': round(percentile(latencies, 95), 2),
+            'p99_ms': round(percentile(latencies, 99), 2),
+            'max_ms': round(latencies[-1], 2) if latencies else 0.0,
+            'contended': write_stats.get(name, {}).get('contended', 0),
+            'lock_retries': write_stats.get(name, {}).get('begin_retries', 0) + write_stats.get(name, {}).get('retries', 0),
+            'last_error': entry['last_error'],
+        }
+    return report
+
+
+def run_load(db_path: str, roles: Dict[str, tuple], duration: float, batch_size: int) -> Dict:
+    """Süreçleri başlat, ortak başlangıç anında yükü uygula, sonuçları topla"""
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    processes = []
+    worker_id = 0
+    # Süreç açılışı (import + şema kontrolü) ölçüme girmesin diye ortak başlangıç
+    start_at = time.time() + 3.0 + 0.25 * sum(count for count, _ in roles.values())
+    for role, (count, rate) in roles.items():
+        for _ in range(count):
+            worker_id += 1
+            proc = ctx.Process(target=run_worker,
+                               args=(worker_id, role, rate, duration, start_at, batch_size, queue))
+            proc.start()
+            processes.append(proc)
+
+    results = []
+    deadline = start_at + duration + 120
+    while len(results) < len(processes) and time.time() < deadline:
+        try:
+            results.append(queue.get(timeout=1.0))
+        except Exception:
+            if not any(p.is_alive() for p in processes) and queue.empty():
+                break
+    for proc in processes:
+        proc.join(timeout=5)
+        if proc.is_alive():
+            proc.terminate()
+
+    late = max(0.0, time.time() - start_at - duration)
+    return {
+        'db_path': db_path,
+        'duration': duration,
+        'workers': len(processes),
+        'reported': len(results),
+        'max_lag_ms': max((r.get('lag_ms', 0.0) for r in results), default=0.0),
+        'drain_s': round(late, 2),
+        'worker_errors': [f"#{r['worker']} {r['role']}: {r['error']}" for r in results if r.get('error')],
+        'operations': aggregate(results, duration),
+    }
+
+
+def print_report(run: Dict, settings: Dict):
+    print(f"=== Yazma yükü: {run['workers']} süreç, {run['duration']:.0f} sn ===")
+    print("  " + ", ".join(f"{k}={v}" for k, v in settings.items()))
+    header = f"  {'İşlem':<22}{'Çağrı':>7}{'İşlem/sn':>10}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}{'Bekleme':>9}{'Tekrar':>8}{'Kilit':>7}{'Kilit %':>9}{'Hata':>6}"
+    print(header)
+    print("  " + "-" * (len(header) - 2))
+    for name, row in run['operations'].items():
+        print(f"  {name:<22}{row['calls']:>7}{row['throughput']:>10.2f}{row['p50_ms']:>9.1f}{row['p95_ms']:>9.1f}"
+              f"{row['p99_ms']:>9.1f}{row['max_ms']:>9.1f}{row['contended']:>9}{row['lock_retries']:>8}{row['locked']:>7}{row['lock_rate'] * 100:>8.1f}%{row['errors']:>6}")
+    for name, row in run['operations'].items():
+        if row['last_error']:
+            print(f"  ! {name}: {row['last_error']}")
+    for line in run['worker_errors']:
+        print(f"  ! {line}")
+    if run['reported'] < run['workers']:
+        print(f"  ! {run['workers'] - run['reported']} süreç sonuç döndürmedi")
+    print(f"  En büyük zamanlama gecikmesi: {run['max_lag_ms']:.0f} ms (hedef hıza yetişilemiyorsa büyür)")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="EFES ROTA X eşzamanlı yazma yük testi")
+    parser.add_argument("--db", help="Mevcut veritabanı dosyası (verilmezse geçici sentetik fabrika)")
+    parser.add_argument("--orders", default=DEFAULT_SIZE, help="Sentetik sipariş sayısı (ör. 1k, 10k)")
+    parser.add_argument("--duration", type=float, default=DEFAULT_DURATION, help="Yük süresi (saniye)")
+    for role, (count, rate) in ROLES.items():
+        parser.add_argument(f"--{role}s", type=int, default=count, help=f"{role} süreç sayısı")
+        parser.add_argument(f"--{role}-rate", type=float, default=rate, help=f"{role} başına işlem/sn")
+    parser.add_argument("--batch-size", type=int, default=50, help="bulk_add_orders başına sipariş")
+    parser.add_argument("--busy-timeout", type=float, help="ROTA_DB_BUSY_TIMEOUT (saniye)")
+    parser.add_argument("--journal-mode", help="ROTA_DB_JOURNAL_MODE (WAL, DELETE, TRUNCATE)")
+    parser.add_argument("--json", help="Sonuçları bu JSON dosyasına da yaz")
+    args = parser.parse_args(argv)
+
+    roles = {}
+    for role in ROLES:
+        count, rate = getattr(args, f"{role}s"), getattr(args, f"{role}_rate")
+        if count > 0 and rate > 0:
+            roles[role] = (count, rate)
+    if not roles:
+        parser.error("En az bir rol için süreç sayısı ve hız > 0 olmalı")
+
+    # Ayarlar ortam değişkeniyle süreçlere geçer (DatabaseManager açılışta okur)
+    settings = {'batch_size': args.batch_size}
+    if args.busy_timeout is not None:
+        os.environ['ROTA_DB_BUSY_TIMEOUT'] = str(args.busy_timeout)
+    if args.journal_mode:
+        os.environ['ROTA_DB_JOURNAL_MODE'] = args.journal_mode.upper()
+    settings['busy_timeout'] = os.environ.get('ROTA_DB_BUSY_TIMEOUT', '5.0')
+    settings['journal_mode'] = os.environ.get('ROTA_DB_JOURNAL_MODE', 'WAL')
+    settings.update({f"{role}s": f"{count}x{rate:g}/sn" for role, (count, rate) in roles.items()})
+
+    tmp_dir: Optional[str] = None
+    try:
+        if args.db:
+            db_path = os.path.abspath(args.db)
+            os.environ['ROTA_DB_PATH'] = db_path
+            with redirect_stdout(io.StringIO()):
+                from core.db_manager import db  # noqa: F401  (şema/migrasyon)
+        else:
+            tmp_dir = tempfile.mkdtemp(prefix="rota_load_")
+            n_orders = parse_size(args.orders)
+            db_path = os.path.join(tmp_dir, f"load_{size_label(n_orders)}.db")
+            os.environ['ROTA_DB_PATH'] = db_path
+            started = time.perf_counter()
+            with redirect_stdout(io.StringIO()):
+                data = prepare_database(db_path, n_orders)
+            print(f"Veri: {data['orders']} sipariş, {data['logs']} log "
+                  f"({(time.perf_counter() - started) * 1000:.0f} ms)")
+
+        run = run_load(db_path, roles, args.duration, args.batch_size)
+        run['settings'] = settings
+        print_report(run, settings)
+
+        if args.json:
+            with open(args.json, 'w', encoding='utf-8') as f:
+                json.dump(run, f, indent=2, ensure_ascii=False)
+            print(f"\nSonuç kaydedildi: {args.json}")
+    finally:
+        if tmp_dir:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    # Kilit hataları ölçümün konusudur; sadece süreç düzeyindeki sorunlar hata kodu verir
+    return 1 if run['worker_errors'] or run['reported'] < run['workers'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -248,6 +248,212 @@ class QueryCache:
         return stats
 
 
+class StaleWhileRevalidateCache:
+    """
+    Stale-While-Revalidate Cache (Dashboard / istasyon yükü gibi pahalı özetler için)
+
+    Özellikler:
+    - TTL dolduğunda veya tablo invalidate edildiğinde eski değer HEMEN döner
+    - Yeniden hesaplama arka planda (async DB worker) planlanır
+    - Key başına maksimum bayatlık (max_stale_seconds): bu süre aşılırsa
+      eski değer gösterilmez, senkron hesaplanır
+    - Taze veri geldiğinde listener'lar bilgilendirilir (UI repaint için)
+
+    Kullanım:
+        swr_cache.configure("dashboard_stats", ttl_seconds=30, max_stale_seconds=300,
+                            tables=['orders', 'production_logs'])
+        stats = swr_cache.get_or_compute("dashboard_stats", compute_func)
+    """
+
+    def __init__(self, ttl_seconds: int = 30, max_stale_seconds: int = 300):
+        self.ttl_seconds = ttl_seconds
+        self.max_stale_seconds = max_stale_seconds
+
+        self._entries = {}        # {key: (value, created_at)}
+        self._stale_keys = set()  # invalidate edilmiş (ama değeri saklanan) key'ler
+        self._settings = {}       # {key: (ttl_seconds, max_stale_seconds)}
+        self._table_keys = {}     # {table_name: set(keys)}
+        self._generations = {}    # {key: int} - yarış durumları için
+        self._refreshing = set()  # arka planda hesaplanan key'ler
+        self._listeners = []
+        self._scheduler = None
+        self._lock = threading.Lock()
+
+        # İstatistikler
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.revalidations = 0
+
+    def configure(self, key: str, ttl_seconds: int = None, max_stale_seconds: int = None,
+                  tables: list = None):
+        """
+        Key bazlı ayar
+
+        Args:
+            key: Cache anahtarı
+            ttl_seconds: Bu süreden sonra veri bayat sayılır (arka planda yenilenir)
+            max_stale_seconds: Bu süreden eski veri asla gösterilmez (senkron hesaplanır)
+            tables: Bu key hangi tabloları okuyor? (invalidation için)
+        """
+        with self._lock:
+            ttl = ttl_seconds if ttl_seconds is not None else self.ttl_seconds
+            max_stale = max_stale_seconds if max_stale_seconds is not None else self.max_stale_seconds
+            self._settings[key] = (ttl, max(ttl, max_stale))
+
+            for table in tables or []:
+                self._table_keys.setdefault(table, set()).add(key)
+
+    def set_scheduler(self, scheduler: Optional[Callable]):
+        """
+        Arka plan hesaplayıcıyı ayarla
+
+        scheduler(key, compute_func, on_done) şeklinde çağrılır.
+        on_done(value) taze değer hazır olduğunda çağrılmalıdır.
+        None ise bayat değer senkron yenilenir (eski davranış).
+        """
+        self._scheduler = scheduler
+
+    def add_listener(self, callback: Callable):
+        """Taze veri geldiğinde çağrılacak fonksiyon: callback(key)"""
+        if callback not in self._listeners:
+            self._listeners.append(callback)
+
+    def remove_listener(self, callback: Callable):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _get_settings(self, key: str):
+        return self._settings.get(key, (self.ttl_seconds, self.max_stale_seconds))
+
+    def get_or_compute(self, key: str, compute: Callable) -> Any:
+        """
+        Değeri döndür
+
+        - Taze ise: cache'den
+        - Bayat ama max_stale_seconds içinde ise: cache'den + arka planda yenile
+        - Hiç yoksa veya çok eskiyse: senkron hesapla
+        """
+        schedule = False
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, created_at = entry
+                ttl, max_stale = self._get_settings(key)
+                age = (datetime.now() - created_at).total_seconds()
+
+                if age <= ttl and key not in self._stale_keys:
+                    self.hits += 1
+                    return value
+
+                if age <= max_stale and self._scheduler is not None:
+                    self.stale_hits += 1
+                    if key in self._refreshing:
+                        return value  # Zaten arka planda yenileniyor
+                    self._refreshing.add(key)
+                    generation = self._generations.get(key, 0)
+                    schedule = True
+
+            if not schedule:
+                self.misses += 1
+
+        if schedule:
+            try:
+                self._scheduler(key, compute,
+                                lambda v, k=key, g=generation: self._on_revalidated(k, v, g))
+                self.revalidations += 1
+                return value
+            except Exception as e:
+                # Planlama başarısız (worker yok vb.) - senkron hesaplamaya düş
+                print(f"SWR planlama hatası ({key}): {e}")
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        # Miss veya çok bayat: senkron hesapla
+        with self._lock:
+            generation = self._generations.get(key, 0)
+        value = compute()
+        self._store(key, value, generation)
+        return value
+
+    def _store(self, key: str, value: Any, generation: int):
+        """Değeri kaydet (hesaplama sırasında invalidate geldiyse bayat bırak)"""
+        with self._lock:
+            self._entries[key] = (value, datetime.now())
+            if self._generations.get(key, 0) == generation:
+                self._stale_keys.discard(key)
+
+    def _on_revalidated(self, key: str, value: Any, generation: int):
+        """Arka plan hesaplaması bitti"""
+        with self._lock:
+            self._refreshing.discard(key)
+
+        if value is None:
+            return  # Hata - eski değer korunur
+
+        self._store(key, value, generation)
+
+        for listener in list(self._listeners):
+            try:
+                listener(key)
+            except Exception as e:
+                print(f"SWR listener hatası ({key}): {e}")
+
+    def invalidate(self, key: str):
+        """Key'i bayat işaretle (değer silinmez, bir sonraki okumada yenilenir)"""
+        with self._lock:
+            self._generations[key] = self._generations.get(key, 0) + 1
+            if key in self._entries:
+                self._stale_keys.add(key)
+
+    def invalidate_table(self, table_name: str):
+        """Tabloyu okuyan tüm key'leri bayat işaretle"""
+        with self._lock:
+            keys = list(self._table_keys.get(table_name, ()))
+        for key in keys:
+            self.invalidate(key)
+
+    def delete(self, key: str):
+        """Key'i tamamen sil (bir sonraki okuma senkron olur)"""
+        with self._lock:
+            self._entries.pop(key, None)
+            self._stale_keys.discard(key)
+            self._generations[key] = self._generations.get(key, 0) + 1
+
+    def clear(self):
+        """Tüm cache'i temizle"""
+        with self._lock:
+            for key in self._entries:
+                self._generations[key] = self._generations.get(key, 0) + 1
+            self._entries.clear()
+            self._stale_keys.clear()
+            self.hits = 0
+            self.stale_hits = 0
+            self.misses = 0
+            self.revalidations = 0
+
+    def get_stats(self) -> dict:
+        """Cache istatistiklerini döndür"""
+        total_requests = self.hits + self.stale_hits + self.misses
+        hit_rate = ((self.hits + self.stale_hits) / total_requests * 100) if total_requests > 0 else 0
+
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "revalidations": self.revalidations,
+            "refreshing": len(self._refreshing),
+            "hit_rate": round(hit_rate, 2),
+            "total_requests": total_requests
+        }
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+
 def cached(cache_instance: LRUCache, ttl: int = None):
     """
     Fonksiyon sonucunu cache'leyen decorator
@@ -305,3 +511,6 @@ query_cache = QueryCache(max_size=500, ttl_seconds=30)
 
 # Production logs cache (orta sıklıkta değişir)
 production_cache = LRUCache(max_size=200, ttl_seconds=15)
+
+# Stale-while-revalidate cache (dashboard özetleri, istasyon yükleri)
+swr_cache = StaleWhileRevalidateCache(ttl_seconds=30, max_stale_seconds=300)
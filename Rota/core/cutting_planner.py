@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+"""
+EFES ROTA X - Kesim Planlayıcı (INTERMAC / LIVA KESIM)
+Kesim istasyonunda bekleyen parçaları kalınlık/cam tipine göre gruplar,
+stoktaki (rezerve edilmemiş) plakalarla nesting motorunda çözer ve
+kullanılan plakaları istasyon adına rezerve eder.
+
+Kullanım:
+    plan = cutting_planner.plan("INTERMAC")
+    for group in plan['groups']:
+        group['group'], group['sheets'], group['yield'], group['waste_m2']
+    cutting_planner.reserve(plan)    # Plakalar istasyona ayrılır
+"""
+
+import time
+from typing import Dict, List, Optional
+
+from core.nesting_engine import (
+    CutPiece, StockSheet, KERF_CM, TIME_BUDGET, TRIM_CM, nest_groups
+)
+
+CUTTING_STATIONS = ("INTERMAC", "LIVA KESIM")
+
+# Desen yönü olan camlar döndürülemez
+NON_ROTATABLE_KEYWORDS = ("Desenli",)
+
+
+class CuttingPlanner:
+    """Kesim istasyonu nesting planı ve plaka rezervasyonu"""
+
+    def __init__(self):
+        self.last_plan: Optional[Dict] = None
+
+    def build_jobs(self, station_name: str) -> List[tuple]:
+        """[(('6mm', 'Düz Cam') anahtarı, [CutPiece], [StockSheet])] - DB'den"""
+        from core.db_manager import db
+
+        groups: Dict[tuple, List[CutPiece]] = {}
+        for item in db.get_cut_queue(station_name):
+            key = (item['thickness'], item['product_type'])
+            rotatable = not any(k in (item['product_type'] or '') for k in NON_ROTATABLE_KEYWORDS)
+            groups.setdefault(key, []).append(CutPiece(
+                order_id=item['id'], order_code=item['order_code'],
+                width=float(item['width']), height=float(item['height']),
+                quantity=int(item['remaining']), rotatable=rotatable
+            ))
+
+        jobs = []
+        for (thickness, glass_type), pieces in groups.items():
+            stock = [
+                StockSheet(plate_id=p['id'], width=float(p['width']), height=float(p['height']),
+                           quantity=int(p['available']), location=p.get('location') or '')
+                for p in db.get_available_plates(thickness, glass_type, exclude_station=station_name)
+                if p['available'] > 0
+            ]
+            jobs.append(((thickness, glass_type), pieces, stock))
+        return jobs
+
+    def plan(self, station_name: str, time_budget: float = TIME_BUDGET, guillotine: bool = True,
+             trim: float = TRIM_CM, kerf: float = KERF_CM, max_workers: Optional[int] = None,
+             runner=None) -> Dict:
+        """
+        İstasyonun tüm bekleyen kesimleri için plan (worker thread'de çağrılabilir).
+
+        Returns: {'station', 'groups' (nest_group sonuçları), 'plates_used',
+        'sheets', 'pieces', 'placed', 'yield', 'used_m2', 'waste_m2', 'elapsed_ms'}
+        """
+        started = time.perf_counter()
+        if runner is None:
+            from core.scenario_engine import scenario_runner as runner
+
+        jobs = self.build_jobs(station_name)
+        results = nest_groups(jobs, runner=runner, max_workers=max_workers,
+                              time_budget=time_budget, guillotine=guillotine, trim=trim, kerf=kerf)
+        # En çok parçası olan grup üstte
+        results.sort(key=lambda r: -r['pieces'])
+
+        plates_used: Dict = {}
+        for result in results:
+            for plate_id, count in result['plates_used'].items():
+                plates_used[plate_id] = plates_used.get(plate_id, 0) + count
+
+        used_m2 = sum(r['used_m2'] for r in results)
+        waste_m2 = sum(r['waste_m2'] for r in results)
+        plan = {
+            'station': station_name,
+            'groups': results,
+            'plates_used': plates_used,
+            'sheets': sum(r['sheets'] for r in results),
+            'pieces': sum(r['pieces'] for r in results),
+            'placed': sum(r['placed'] for r in results),
+            'yield': round(used_m2 / (used_m2 + waste_m2), 4) if used_m2 + waste_m2 else 0.0,
+            'used_m2': round(used_m2, 2),
+            'waste_m2': round(waste_m2, 2),
+            'elapsed_ms': round((time.perf_counter() - started) * 1000, 1),
+        }
+        self.last_plan = plan
+        return plan
+
+    def reserve(self, plan: Dict) -> int:
+        """Planın kullandığı plakaları istasyona rezerve et (öncekinin yerine)"""
+        from core.db_manager import db
+
+        note = f"{plan['placed']} parça, {plan['sheets']} plaka, verim %{plan['yield'] * 100:.1f}"
+        return db.reserve_plates(plan['station'], plan['plates_used'], note)
+
+    def release(self, station_name: str):
+        from core.db_manager import db
+        db.release_plate_reservations(station_name)
+
+
+# Global instance
+cutting_planner = CuttingPlanner()
@@ -2,12 +2,28 @@
 EFES ROTA X - Thread-Safe Veritabanı İşlemleri
 QThread ile arka planda veritabanı sorguları çalıştırır.
 UI donmasını önler.
+
+- Okumalar: birden fazla okuyucu worker, havuzlanmış salt-okunur bağlantılar
+- Yazmalar: tek yazıcı worker (sıralı)
+- Öncelikli kuyruk (heapq), eşit öncelikte FIFO, boşta bekleme yok (wait condition)
+- İptal / yerine geçme: aynı 'key' ile gelen yeni görev eskisini iptal eder
+- Büyük sonuçlar fetchmany parçaları halinde sinyalle akıtılır (fetch_stream)
+- run_async(fonksiyon, *args): domain metotlarını (db.get_..., planner...) aynı
+  worker havuzunda çalıştırır, sonuç GUI thread'ine sinyalle döner. Anahtar
+  kelimeli argümanlar fonksiyona iletilmez (callback/key/priority/write ile
+  çakışmasın); gerekirse functools.partial ile bağlanır
 """
 
-from PySide6.QtCore import QThread, Signal, QObject, QMutex, QMutexLocker
+from PySide6.QtCore import QThread, Signal, QObject
 from typing import Any, Callable, Optional, List, Dict
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from collections import deque
 from enum import Enum
+import heapq
+import itertools
+import sqlite3
+import threading
+import time
 import traceback
 
 
@@ -28,82 +44,253 @@ class DBTask:
     callback: Callable = None
     error_callback: Callable = None
     priority: TaskPriority = TaskPriority.NORMAL
-    fetch_type: str = "all"  # "all", "one", "execute"
+    fetch_type: str = "all"  # "all", "one", "execute", "call", "stream"
+    func: Callable = None  # fetch_type="call" için: worker thread'de çalışacak fonksiyon
+    write: bool = False  # True: tek yazıcı worker'da sırayla çalışır
+    key: str = None  # Yerine geçme anahtarı (örn: "logs_search")
+    chunk_size: int = 500  # fetch_type="stream" için parça boyutu
+
+    # İptal durumu (GUI thread'i set eder, worker okur)
+    cancelled: bool = False
+    connection: Any = field(default=None, repr=False)  # Çalışırken kullanılan bağlantı
+    # connection'ın atanması/bırakılması ile cancel()'daki interrupt() arasında:
+    # bağlantı havuza dönüp başka göreve geçtikten sonra kesilmesin
+    connection_lock: Any = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    # Zaman ölçümleri (time.perf_counter)
+    enqueued_at: float = 0.0
+    started_at: float = 0.0
+    finished_at: float = 0.0
+
+    @property
+    def queue_wait_ms(self) -> float:
+        """Kuyrukta bekleme süresi"""
+        if not self.started_at:
+            return 0.0
+        return (self.started_at - self.enqueued_at) * 1000
+
+    @property
+    def exec_ms(self) -> float:
+        """Çalışma süresi"""
+        if not self.finished_at:
+            return 0.0
+        return (self.finished_at - self.started_at) * 1000
+
+
+class TaskCancelled(Exception):
+    """Görev çalışırken iptal edildi"""
+
+
+class TaskQueue:
+    """
+    Öncelikli görev kuyruğu (heapq)
+
+    - Yüksek öncelik önce çıkar, eşit öncelikte FIFO (sıra numarası ile)
+    - Boşken worker'lar condition variable üzerinde uyur, yeni görev gelince
+      uyanır (polling / msleep yok)
+
+    Not: QMutex/QWaitCondition beklerken GIL'i bırakmadığı için
+    threading.Condition kullanılır.
+    """
+
+    def __init__(self):
+        self._heap = []
+        self._counter = itertools.count()
+        self._not_empty = threading.Condition()
+        self._closed = False
+
+    def put(self, task: DBTask):
+        """Görev ekle - O(log n)"""
+        task.enqueued_at = time.perf_counter()
+        with self._not_empty:
+            heapq.heappush(self._heap, (-task.priority.value, next(self._counter), task))
+            self._not_empty.notify()
+
+    def get(self) -> Optional[DBTask]:
+        """Sıradaki görevi al; kuyruk boşsa bekle. Kapatıldıysa None döner."""
+        with self._not_empty:
+            while not self._heap and not self._closed:
+                self._not_empty.wait()
+            if self._closed:
+                return None
+            return heapq.heappop(self._heap)[2]
+
+    def close(self):
+        """Bekleyen tüm worker'ları uyandır ve durdur"""
+        with self._not_empty:
+            self._closed = True
+            self._not_empty.notify_all()
+
+    def __len__(self):
+        with self._not_empty:
+            return len(self._heap)
 
 
 class DatabaseWorker(QThread):
     """
     Arka planda veritabanı işlemleri yapan worker
     
+    Okuyucu worker'lar (role="reader") sorguları db.read_pool'dan alınan
+    salt-okunur bağlantılarla çalıştırır; yazıcı worker (role="writer") tektir
+    ve normal bağlantı kullanır.
+
     Sinyaller:
         result_ready: Sorgu sonucu hazır (task_id, result)
         error_occurred: Hata oluştu (task_id, error_message)
         progress_updated: İlerleme güncellemesi (task_id, percent)
+        task_finished: Görev bitti (task_id, kuyruk_bekleme_ms, çalışma_ms)
+        chunk_ready: Akış parçası hazır (task_id, satırlar, parça_no)
+        task_cancelled: Görev iptal edildiği için sonuç üretilmedi (task_id)
     """
     
     result_ready = Signal(str, object)     # task_id, result
     error_occurred = Signal(str, str)       # task_id, error_message
     progress_updated = Signal(str, int)     # task_id, percent
+    task_finished = Signal(str, float, float)  # task_id, wait_ms, exec_ms
+    chunk_ready = Signal(str, object, int)  # task_id, rows, chunk_index
+    task_cancelled = Signal(str)            # task_id
     
-    def __init__(self, db_manager, parent=None):
+    def __init__(self, db_manager, task_queue: TaskQueue = None,
+                 role: str = "writer", parent=None):
         super().__init__(parent)
         self.db_manager = db_manager
-        self._tasks: List[DBTask] = []
-        self._mutex = QMutex()
-        self._running = True
+        self.role = role
+        self._queue = task_queue if task_queue is not None else TaskQueue()
+        self._owns_queue = task_queue is None
     
     def add_task(self, task: DBTask):
         """Göreve ekle"""
-        with QMutexLocker(self._mutex):
-            # Önceliğe göre sırala
-            self._tasks.append(task)
-            self._tasks.sort(key=lambda x: x.priority.value, reverse=True)
+        self._queue.put(task)
     
     def run(self):
-        """Thread ana döngüsü"""
-        while self._running:
-            task = None
-            
-            with QMutexLocker(self._mutex):
-                if self._tasks:
-                    task = self._tasks.pop(0)
-            
-            if task:
-                self._execute_task(task)
-            else:
-                self.msleep(50)  # CPU kullanımını azalt
+        """Thread ana döngüsü - görev yokken kuyrukta uyur"""
+        while True:
+            task = self._queue.get()
+            if task is None:
+                break
+            self._execute_task(task)
+    
+    def _connection(self):
+        """Görev için bağlantı: okuyucuda havuz, yazıcıda normal bağlantı"""
+        if self.role == "reader" and hasattr(self.db_manager, 'get_read_connection'):
+            return self.db_manager.get_read_connection()
+        return self.db_manager.get_connection()
     
     def _execute_task(self, task: DBTask):
         """Görevi çalıştır"""
+        if task.cancelled:
+            # Kuyrukta beklerken yerine yenisi geldi
+            self.task_cancelled.emit(task.task_id)
+            return
+
+        task.started_at = time.perf_counter()
         try:
-            with self.db_manager.get_connection() as conn:
-                cursor = conn.execute(task.query, task.params or ())
-                
-                if task.fetch_type == "all":
-                    result = cursor.fetchall()
-                elif task.fetch_type == "one":
-                    result = cursor.fetchone()
-                else:
-                    result = cursor.lastrowid
-                
-                self.result_ready.emit(task.task_id, result)
-                
-                if task.callback:
-                    task.callback(result)
+            if task.fetch_type == "call":
+                # Domain metodu (örn: get_dashboard_stats hesaplaması)
+                result = task.func()
+            else:
+                with self._connection() as conn:
+                    # İptal edilirse GUI thread'i conn.interrupt() çağırabilsin
+                    with task.connection_lock:
+                        task.connection = conn
+                    try:
+                        if task.cancelled:
+                            raise TaskCancelled()
+
+                        cursor = conn.execute(task.query, task.params or ())
+                        
+                        if task.fetch_type == "all":
+                            result = cursor.fetchall()
+                        elif task.fetch_type == "one":
+                            result = cursor.fetchone()
+                        elif task.fetch_type == "stream":
+                            result = self._stream_rows(task, cursor)
+                        else:
+                            result = cursor.lastrowid
+                    finally:
+                        # Bağlantı havuza dönmeden önce; cancel() bu noktadan
+                        # sonra interrupt() çağıramaz
+                        with task.connection_lock:
+                            task.connection = None
+
+            if task.cancelled:
+                raise TaskCancelled()
+            
+            task.finished_at = time.perf_counter()
+            self.task_finished.emit(task.task_id, task.queue_wait_ms, task.exec_ms)
+            # Callback'ler burada ÇAĞRILMAZ: sonuç sinyalle GUI thread'ine gider,
+            # AsyncDatabaseManager orada callback'i çalıştırır
+            self.result_ready.emit(task.task_id, result)
                     
+        except TaskCancelled:
+            self.task_cancelled.emit(task.task_id)
+
+        except sqlite3.OperationalError as e:
+            if task.cancelled:
+                # conn.interrupt() ile kesildi
+                self.task_cancelled.emit(task.task_id)
+                return
+            self._report_error(task, e)
+
         except Exception as e:
-            error_msg = str(e)
-            self.error_occurred.emit(task.task_id, error_msg)
-            
-            if task.error_callback:
-                task.error_callback(error_msg)
+            self._report_error(task, e)
+    
+    def _stream_rows(self, task: DBTask, cursor) -> int:
+        """Sonucu fetchmany parçaları halinde gönder, toplam satır sayısını döndür"""
+        total = 0
+        index = 0
+        while True:
+            rows = cursor.fetchmany(task.chunk_size)
+            if not rows:
+                break
+            if task.cancelled:
+                raise TaskCancelled()
+            self.chunk_ready.emit(task.task_id, [dict(r) for r in rows], index)
+            total += len(rows)
+            index += 1
+        return total
+    
+    def _report_error(self, task: DBTask, e: Exception):
+        """Hata sinyalini gönder"""
+        task.finished_at = time.perf_counter()
+        self.task_finished.emit(task.task_id, task.queue_wait_ms, task.exec_ms)
+        error_msg = str(e)
+        self.error_occurred.emit(task.task_id, error_msg)
     
     def stop(self):
         """Worker'ı durdur"""
-        self._running = False
+        if self._owns_queue:
+            self._queue.close()
         self.wait()
 
 
+class AsyncCall(QObject):
+    """
+    run_async dönüş nesnesi - sonucu GUI thread'inde sinyalle verir
+
+    Kullanım:
+        call = run_async(db.get_station_loads, key="station_loads")
+        call.finished.connect(self.on_loads)
+        call.failed.connect(self.on_error)
+        ...
+        call.cancel()
+    """
+
+    finished = Signal(object)  # sonuç
+    failed = Signal(str)       # hata mesajı
+    cancelled = Signal()
+
+    def __init__(self, task_id: str, manager: 'AsyncDatabaseManager'):
+        super().__init__()
+        self.task_id = task_id
+        self._manager = manager
+        self.done = False
+
+    def cancel(self) -> bool:
+        """Görevi iptal et (sonuç sinyali gelmez)"""
+        return self._manager.cancel(self.task_id)
+
+
 class AsyncDatabaseManager(QObject):
     """
     Asenkron veritabanı yöneticisi
@@ -125,94 +312,362 @@ class AsyncDatabaseManager(QObject):
             callback=self.on_order_loaded,
             error_callback=self.on_error
         )
+        
+        # Domain metodu: sonuç GUI thread'inde callback'e gelir
+        async_db.run_async(
+            db.get_production_matrix_advanced,
+            callback=self.apply_data,
+            key="production_view"
+        )
+        
+        # Yerine geçen arama: aynı key ile gelen yeni görev eskisini iptal eder,
+        # sonuç 500'lük parçalar halinde gelir
+        async_db.fetch_stream(
+            sql, params,
+            on_chunk=self.append_rows,
+            callback=self.on_search_done,
+            key="logs_search"
+        )
     """
     
     # Sinyaller
     data_loaded = Signal(str, object)      # query_name, data
     operation_completed = Signal(str)       # operation_name
     error_occurred = Signal(str, str)       # operation_name, error
+    cache_refreshed = Signal(str)           # cache_key (stale-while-revalidate)
+    task_timed = Signal(str, float, float)  # task_id, wait_ms, exec_ms
+    task_cancelled = Signal(str)            # task_id
+    
+    READER_COUNT = 3  # Paralel okuyucu worker sayısı (yazıcı her zaman tek)
+    TIMING_HISTORY = 200  # Saklanan son görev ölçümü sayısı
     
-    def __init__(self, db_manager=None):
+    def __init__(self, db_manager=None, reader_count: int = None):
         super().__init__()
         self._db_manager = db_manager
-        self._worker: Optional[DatabaseWorker] = None
-        self._task_counter = 0
+        self.reader_count = reader_count or self.READER_COUNT
+        
+        # Okuma kuyruğu birden fazla okuyucu tarafından paylaşılır,
+        # yazma kuyruğunu tek worker tüketir (yazmalar sıralı kalır)
+        self._read_queue: Optional[TaskQueue] = None
+        self._write_queue: Optional[TaskQueue] = None
+        self._readers: List[DatabaseWorker] = []
+        self._worker: Optional[DatabaseWorker] = None  # yazıcı
+        
+        # Görevler okuyucu thread'lerinden de gönderilebilir (SWR yenilemesi,
+        # run_async içindeki iç çağrılar): kayıt tabloları kilitle korunur
+        self._lock = threading.RLock()
+        self._task_ids = itertools.count(1)
         self._callbacks: Dict[str, tuple] = {}
+        self._chunk_callbacks: Dict[str, Callable] = {}
+        
+        # Devam eden görevler ve yerine geçme anahtarları
+        self._tasks: Dict[str, DBTask] = {}
+        self._keyed: Dict[str, str] = {}  # key -> task_id
+        self._calls: Dict[str, AsyncCall] = {}  # run_async tutamaçları
+        
+        # Görev süre ölçümleri: (task_id, wait_ms, exec_ms)
+        self._timings = deque(maxlen=self.TIMING_HISTORY)
     
     def set_database(self, db_manager):
         """Veritabanı bağlantısını ayarla"""
         self._db_manager = db_manager
         self._start_worker()
+
+        # 🚀 PERFORMANS: Bayat cache'ler arka planda bu worker'da yenilenir
+        try:
+            from core.cache_manager import swr_cache
+            swr_cache.set_scheduler(self._schedule_revalidation)
+        except ImportError:
+            pass
     
     def _start_worker(self):
-        """Worker'ı başlat"""
-        if self._worker and self._worker.isRunning():
-            self._worker.stop()
+        """Okuyucu havuzunu ve tek yazıcıyı başlat"""
+        self._stop_workers()
+        
+        self._read_queue = TaskQueue()
+        self._write_queue = TaskQueue()
+        
+        self._readers = [
+            DatabaseWorker(self._db_manager, self._read_queue, role="reader")
+            for _ in range(self.reader_count)
+        ]
+        self._worker = DatabaseWorker(self._db_manager, self._write_queue, role="writer")
+        
+        for worker in self._readers + [self._worker]:
+            worker.result_ready.connect(self._on_result)
+            worker.error_occurred.connect(self._on_error)
+            worker.task_finished.connect(self._on_task_finished)
+            worker.chunk_ready.connect(self._on_chunk)
+            worker.start()
+    
+    def _stop_workers(self):
+        """Kuyrukları kapat ve tüm worker'ların bitmesini bekle"""
+        for queue in (self._read_queue, self._write_queue):
+            if queue is not None:
+                queue.close()
+        for worker in self._readers + ([self._worker] if self._worker else []):
+            worker.wait()
+        self._readers = []
+        self._worker = None
+    
+    def is_running(self) -> bool:
+        """Worker'lar çalışıyor mu?"""
+        return bool(self._worker and self._worker.isRunning())
+    
+    def _submit(self, task: DBTask):
+        """Görevi okuma veya yazma kuyruğuna yönlendir (her thread'den çağrılabilir)"""
+        # set_database çağrılmadan kullanılırsa (örn. tek başına açılan view)
+        # fonksiyon görevleri için worker'ları başlat
+        if not self.is_running():
+            if QThread.currentThread() is not self.thread():
+                # Worker'lar ve sinyal bağlantıları GUI thread'inde kurulmalı
+                with self._lock:
+                    self._callbacks.pop(task.task_id, None)
+                    self._calls.pop(task.task_id, None)
+                raise RuntimeError("Async DB worker çalışmıyor")
+            self._start_worker()
         
-        self._worker = DatabaseWorker(self._db_manager)
-        self._worker.result_ready.connect(self._on_result)
-        self._worker.error_occurred.connect(self._on_error)
-        self._worker.start()
+        previous_id = None
+        with self._lock:
+            # Görev üzerinde callback verilmişse GUI thread'inde çağrılsın
+            if task.callback or task.error_callback:
+                self._callbacks.setdefault(task.task_id, (task.callback, task.error_callback))
+                task.callback = task.error_callback = None
+            
+            # Aynı anahtarlı eski görev artık gereksiz
+            if task.key:
+                previous_id = self._keyed.get(task.key)
+                self._keyed[task.key] = task.task_id
+            self._tasks[task.task_id] = task
+        
+        if previous_id:
+            self.cancel(previous_id)
+        
+        if task.write or task.fetch_type == "execute":
+            task.write = True
+            self._write_queue.put(task)
+        else:
+            self._read_queue.put(task)
     
+    def _on_task_finished(self, task_id: str, wait_ms: float, exec_ms: float):
+        """Görev süresini kaydet (GUI thread)"""
+        self._timings.append((task_id, wait_ms, exec_ms))
+        self.task_timed.emit(task_id, wait_ms, exec_ms)
+    
+    def get_task_stats(self) -> dict:
+        """
+        Son görevlerin kuyruk bekleme / çalışma süreleri (ms)
+        
+        Returns:
+            {'count': 120, 'avg_wait_ms': 0.4, 'max_wait_ms': 3.1,
+             'avg_exec_ms': 5.2, 'max_exec_ms': 40.0, 'pending_reads': 0, ...}
+        """
+        timings = list(self._timings)
+        count = len(timings)
+        waits = [t[1] for t in timings]
+        execs = [t[2] for t in timings]
+        return {
+            'count': count,
+            'avg_wait_ms': round(sum(waits) / count, 2) if count else 0.0,
+            'max_wait_ms': round(max(waits), 2) if count else 0.0,
+            'avg_exec_ms': round(sum(execs) / count, 2) if count else 0.0,
+            'max_exec_ms': round(max(execs), 2) if count else 0.0,
+            'pending_reads': len(self._read_queue) if self._read_queue else 0,
+            'pending_writes': len(self._write_queue) if self._write_queue else 0,
+            'readers': len(self._readers),
+            'recent': timings[-10:]
+        }
+    
+    def is_idle(self) -> bool:
+        """Kuyrukta, çalışmakta veya sonucu GUI thread'ine teslim edilmemiş görev yok mu?"""
+        with self._lock:
+            return not self._tasks
+
     def _generate_task_id(self) -> str:
-        """Benzersiz görev ID'si oluştur"""
-        self._task_counter += 1
-        return f"task_{self._task_counter}"
+        """Benzersiz görev ID'si oluştur (itertools.count: thread'ler arasında tekrar etmez)"""
+        return f"task_{next(self._task_ids)}"
+    
+    def _forget(self, task_id: str) -> Optional[DBTask]:
+        """Görev kaydını sil (sonuç, hata veya iptal sonrası)"""
+        with self._lock:
+            task = self._tasks.pop(task_id, None)
+            self._chunk_callbacks.pop(task_id, None)
+            if task is not None and task.key and self._keyed.get(task.key) == task_id:
+                del self._keyed[task.key]
+            return task
+    
+    def _take_callbacks(self, task_id: str) -> Optional[tuple]:
+        """(callback, error_callback) kaydını al ve sil"""
+        with self._lock:
+            return self._callbacks.pop(task_id, None)
+    
+    def _take_call(self, task_id: str) -> Optional[AsyncCall]:
+        with self._lock:
+            return self._calls.pop(task_id, None)
     
     def _on_result(self, task_id: str, result):
         """Sonuç geldiğinde"""
-        if task_id in self._callbacks:
-            callback, _ = self._callbacks.pop(task_id)
+        self._forget(task_id)
+        callbacks = self._take_callbacks(task_id)
+        if callbacks:
+            callback, _ = callbacks
             if callback:
                 callback(result)
+        
+        call = self._take_call(task_id)
+        if call is not None:
+            call.done = True
+            call.finished.emit(result)
+    
+    def _on_chunk(self, task_id: str, rows, chunk_index: int):
+        """Akış parçası geldiğinde (iptal edilen görevin parçaları atılır)"""
+        with self._lock:
+            on_chunk = self._chunk_callbacks.get(task_id) if task_id in self._tasks else None
+        if on_chunk:
+            on_chunk(rows, chunk_index)
     
     def _on_error(self, task_id: str, error_msg: str):
         """Hata olduğunda"""
-        if task_id in self._callbacks:
-            _, error_callback = self._callbacks.pop(task_id)
+        task = self._forget(task_id)
+        callbacks = self._take_callbacks(task_id)
+        if task is None and callbacks is None:
+            # İptal edilmiş görev: hata raporlanmaz
+            return
+        
+        if callbacks:
+            _, error_callback = callbacks
             if error_callback:
                 error_callback(error_msg)
         
+        call = self._take_call(task_id)
+        if call is not None:
+            call.done = True
+            call.failed.emit(error_msg)
+        
         self.error_occurred.emit(task_id, error_msg)
     
+    # === İPTAL ===
+    
+    def cancel(self, task_id: str) -> bool:
+        """
+        Görevi iptal et
+        
+        Kuyruktaysa hiç çalışmaz; okuma sorgusu çalışıyorsa sqlite3
+        interrupt() ile kesilir. Callback'ler çağrılmaz.
+        
+        Returns:
+            Görev bulunup iptal edildiyse True
+        """
+        task = self._forget(task_id)
+        if task is None:
+            return False
+        
+        task.cancelled = True
+        self._take_callbacks(task_id)
+        
+        call = self._take_call(task_id)
+        if call is not None:
+            call.done = True
+            call.cancelled.emit()
+        
+        if not task.write:
+            # Kilit tutulurken worker bağlantıyı bırakamaz: interrupt() yalnızca
+            # bu görevin bağlantısına gider
+            with task.connection_lock:
+                conn = task.connection
+                if conn is not None:
+                    try:
+                        conn.interrupt()
+                    except sqlite3.Error:
+                        pass
+        
+        self.task_cancelled.emit(task_id)
+        return True
+    
+    def cancel_key(self, key: str) -> bool:
+        """Anahtara bağlı devam eden görevi iptal et"""
+        with self._lock:
+            task_id = self._keyed.get(key)
+        return self.cancel(task_id) if task_id else False
+    
     # === ANA METODLAR ===
     
     def fetch_all(self, query: str, params: tuple = None,
                   callback: Callable = None, error_callback: Callable = None,
-                  priority: TaskPriority = TaskPriority.NORMAL) -> str:
-        """Tüm sonuçları getir"""
+                  priority: TaskPriority = TaskPriority.NORMAL,
+                  key: str = None) -> str:
+        """Tüm sonuçları getir (key verilirse aynı key'li eski görev iptal edilir)"""
         task_id = self._generate_task_id()
         
-        self._callbacks[task_id] = (callback, error_callback)
+        with self._lock:
+            self._callbacks[task_id] = (callback, error_callback)
         
         task = DBTask(
             task_id=task_id,
             query=query,
             params=params,
             priority=priority,
-            fetch_type="all"
+            fetch_type="all",
+            key=key
         )
         
-        self._worker.add_task(task)
+        self._submit(task)
         return task_id
     
     def fetch_one(self, query: str, params: tuple = None,
                   callback: Callable = None, error_callback: Callable = None,
-                  priority: TaskPriority = TaskPriority.NORMAL) -> str:
+                  priority: TaskPriority = TaskPriority.NORMAL,
+                  key: str = None) -> str:
         """Tek sonuç getir"""
         task_id = self._generate_task_id()
         
-        self._callbacks[task_id] = (callback, error_callback)
+        with self._lock:
+            self._callbacks[task_id] = (callback, error_callback)
         
         task = DBTask(
             task_id=task_id,
             query=query,
             params=params,
             priority=priority,
-            fetch_type="one"
+            fetch_type="one",
+            key=key
         )
         
-        self._worker.add_task(task)
+        self._submit(task)
+        return task_id
+    
+    def fetch_stream(self, query: str, params: tuple = None,
+                     on_chunk: Callable = None, callback: Callable = None,
+                     error_callback: Callable = None, chunk_size: int = 500,
+                     priority: TaskPriority = TaskPriority.NORMAL,
+                     key: str = None) -> str:
+        """
+        Sonucu parça parça getir (fetchmany)
+        
+        Args:
+            on_chunk: Her parça için on_chunk(rows, chunk_index) - rows dict listesi
+            callback: Akış bitince callback(toplam_satir)
+            chunk_size: Parça başına satır sayısı
+            key: Yerine geçme anahtarı
+        """
+        task_id = self._generate_task_id()
+        
+        with self._lock:
+            self._callbacks[task_id] = (callback, error_callback)
+            if on_chunk:
+                self._chunk_callbacks[task_id] = on_chunk
+        
+        task = DBTask(
+            task_id=task_id,
+            query=query,
+            params=params,
+            priority=priority,
+            fetch_type="stream",
+            chunk_size=max(1, chunk_size),
+            key=key
+        )
+        
+        self._submit(task)
         return task_id
     
     def execute(self, query: str, params: tuple = None,
@@ -221,7 +676,8 @@ class AsyncDatabaseManager(QObject):
         """Sorgu çalıştır (INSERT, UPDATE, DELETE)"""
         task_id = self._generate_task_id()
         
-        self._callbacks[task_id] = (callback, error_callback)
+        with self._lock:
+            self._callbacks[task_id] = (callback, error_callback)
         
         task = DBTask(
             task_id=task_id,
@@ -231,31 +687,131 @@ class AsyncDatabaseManager(QObject):
             fetch_type="execute"
         )
         
-        self._worker.add_task(task)
+        self._submit(task)
         return task_id
     
     def execute_many(self, query: str, params_list: List[tuple],
                      callback: Callable = None, error_callback: Callable = None) -> str:
-        """Toplu sorgu çalıştır"""
+        """Toplu sorgu çalıştır (yazıcı worker'da, diğer yazmalarla sıralı)"""
         task_id = self._generate_task_id()
         
+        with self._lock:
+            self._callbacks[task_id] = (callback, error_callback)
+        
         def batch_execute():
-            try:
-                with self._db_manager.get_connection() as conn:
-                    conn.executemany(query, params_list)
-                if callback:
-                    callback(len(params_list))
-            except Exception as e:
-                if error_callback:
-                    error_callback(str(e))
-        
-        # Ayrı thread'de çalıştır
-        from threading import Thread
-        thread = Thread(target=batch_execute)
-        thread.start()
+            with self._db_manager.get_connection() as conn:
+                conn.executemany(query, params_list)
+            return len(params_list)
         
+        task = DBTask(
+            task_id=task_id,
+            query=query,
+            func=batch_execute,
+            fetch_type="call",
+            write=True
+        )
+        
+        self._submit(task)
         return task_id
     
+    def call(self, func: Callable, callback: Callable = None,
+             error_callback: Callable = None,
+             priority: TaskPriority = TaskPriority.NORMAL,
+             write: bool = False, key: str = None) -> str:
+        """
+        Python fonksiyonunu worker thread'de çalıştır (sonuç GUI thread'de döner)
+        
+        write=True ise fonksiyon tek yazıcı worker'da çalışır; aksi halde
+        okuyucu havuzunda paralel çalışabilir.
+        """
+        task_id = self._generate_task_id()
+
+        with self._lock:
+            self._callbacks[task_id] = (callback, error_callback)
+
+        task = DBTask(
+            task_id=task_id,
+            query="",
+            func=func,
+            priority=priority,
+            fetch_type="call",
+            write=write,
+            key=key
+        )
+
+        self._submit(task)
+        return task_id
+
+    def run_async(self, func: Callable, *args, callback: Callable = None,
+                  error_callback: Callable = None, key: str = None,
+                  priority: TaskPriority = TaskPriority.NORMAL,
+                  write: bool = False) -> AsyncCall:
+        """
+        func(*args)'ı worker havuzunda çalıştır, sonucu GUI thread'inde ver
+        
+        Anahtar kelimeli argümanların hepsi run_async'e aittir; func'ın kendi
+        callback/key/priority/write parametreleri sessizce yutulmasın diye
+        func'a iletilmez. Anahtar kelimeli argüman gerekiyorsa:
+            run_async(functools.partial(planner.optimize_sequence, time_budget=5.0), key=...)
+        
+        Args:
+            func: Çalıştırılacak fonksiyon (widget'a dokunmamalı)
+            callback: callback(sonuç) - GUI thread'inde
+            error_callback: error_callback(mesaj) - GUI thread'inde
+            key: Yerine geçme anahtarı; aynı key'li eski görev iptal edilir
+            priority: Kuyruk önceliği
+            write: True ise tek yazıcı worker'da çalışır (kayıt/güncelleme işlemleri)
+        
+        Returns:
+            AsyncCall: finished / failed / cancelled sinyalleri ve cancel()
+        """
+        task_id = self._generate_task_id()
+        call = AsyncCall(task_id, self)
+        if QThread.currentThread() is not self.thread():
+            # Okuyucu thread'inden çağrıldı: sinyaller GUI thread'indeki nesneden çıksın
+            call.moveToThread(self.thread())
+        with self._lock:
+            self._calls[task_id] = call
+            if callback or error_callback:
+                self._callbacks[task_id] = (callback, error_callback)
+        
+        if args:
+            target = lambda: func(*args)
+        else:
+            target = func
+        
+        task = DBTask(
+            task_id=task_id,
+            query="",
+            func=target,
+            priority=priority,
+            fetch_type="call",
+            write=write,
+            key=key
+        )
+        
+        self._submit(task)
+        return call
+    
+    def _schedule_revalidation(self, key: str, compute: Callable, on_done: Callable):
+        """
+        swr_cache scheduler'ı: bayat key'i arka planda yeniden hesapla.
+        Sonuç GUI thread'de cache'e yazılır ve cache_refreshed sinyali gönderilir.
+        """
+        if not self.is_running():
+            raise RuntimeError("Async DB worker çalışmıyor")
+
+        def on_result(value):
+            on_done(value)
+            self.cache_refreshed.emit(key)
+
+        def on_error(msg):
+            on_done(None)
+            print(f"Cache yenileme hatası ({key}): {msg}")
+
+        self.call(compute, callback=on_result, error_callback=on_error,
+                  priority=TaskPriority.LOW)
+
     # === HAZIR SORGULAR ===
     
     def load_orders(self, status: str = None, callback: Callable = None):
@@ -326,8 +882,9 @@ class AsyncDatabaseManager(QObject):
     
     def shutdown(self):
         """Temiz kapanış"""
-        if self._worker:
-            self._worker.stop()
+        self._stop_workers()
+        if self._db_manager is not None and hasattr(self._db_manager, 'read_pool'):
+            self._db_manager.read_pool.close()
 
 
 class DataLoader(QObject):
@@ -430,4 +987,13 @@ class DataLoader(QObject):
 
 
 # Global instance (db_manager sonra set edilecek)
-async_db = AsyncDatabaseManager()
\ No newline at end of file
+async_db = AsyncDatabaseManager()
+
+
+def run_async(func: Callable, *args, callback: Callable = None,
+              error_callback: Callable = None, key: str = None,
+              priority: TaskPriority = TaskPriority.NORMAL,
+              write: bool = False) -> AsyncCall:
+    """Global async_db üzerinden fonksiyon çalıştır (bkz. AsyncDatabaseManager.run_async)"""
+    return async_db.run_async(func, *args, callback=callback, error_callback=error_callback,
+                              key=key, priority=priority, write=write)
\ No newline at end of file
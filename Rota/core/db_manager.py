@@ -2,9 +2,15 @@ import sqlite3
 import hashlib
 import os
 import sys
+import threading
+import time
 from contextlib import contextmanager
 from datetime import datetime
 
+from core.db_pool import ReadConnectionPool, ReadSnapshot
+from core.db_write import WriteStats, backoff_delay, is_lock_error, write_operation
+from core import report_rollups
+
 try:
     from utils.timezone_helper import now_turkey, get_current_date_turkey
 except ImportError:
@@ -24,7 +30,7 @@ except ImportError:
 # === PERFORMANS OPTİMİZASYONU: RefreshManager & Cache ===
 try:
     from core.refresh_manager import refresh_manager
-    from core.cache_manager import query_cache, order_cache, station_cache
+    from core.cache_manager import query_cache, order_cache, station_cache, swr_cache
     OPTIMIZATION_AVAILABLE = True
 except ImportError:
     OPTIMIZATION_AVAILABLE = False
@@ -42,6 +48,16 @@ except ImportError:
     order_cache = DummyCache()
     station_cache = DummyCache()
 
+    class DummySWRCache:
+        def configure(self, key, **kwargs): pass
+        def get_or_compute(self, key, compute): return compute()
+        def invalidate(self, key): pass
+        def invalidate_table(self, table): pass
+    swr_cache = DummySWRCache()
+
+# bulk_add_orders: executemany parça boyutu (ilerleme de parça başına bildirilir)
+BULK_CHUNK_SIZE = 1000
+
 
 class DatabaseManager:
     """
@@ -62,16 +78,44 @@ class DatabaseManager:
             # Geliştirme modunda - proje klasörü kullan
             app_data = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
+        # ROTA_DB_PATH: başka bir veritabanı dosyası (benchmark / deneme kopyası)
+        override_path = os.environ.get('ROTA_DB_PATH')
+        if override_path:
+            app_data = os.path.dirname(os.path.abspath(override_path))
+            db_name = os.path.basename(override_path)
+
         # Klasör yoksa oluştur
         os.makedirs(app_data, exist_ok=True)
 
         self.db_path = os.path.join(app_data, db_name)
         self.app_data_dir = app_data  # Diğer dosyalar için kullanılabilir
 
+        # Eşzamanlı yazma ayarları (yük testi / terminal sayısına göre ayarlanabilir)
+        # ROTA_DB_BUSY_TIMEOUT: kilitli veritabanında bekleme süresi (saniye, sqlite3 varsayılanı 5)
+        # ROTA_DB_JOURNAL_MODE: WAL (varsayılan) veya DELETE / TRUNCATE
+        self.busy_timeout = float(os.environ.get('ROTA_DB_BUSY_TIMEOUT', 5.0))
+        self.journal_mode = os.environ.get('ROTA_DB_JOURNAL_MODE', 'WAL').upper()
+        if self.journal_mode not in ('WAL', 'DELETE', 'TRUNCATE', 'PERSIST'):
+            self.journal_mode = 'WAL'
+        # ROTA_DB_WRITE_RETRIES: kilit alınamazsa busy_timeout sonrası ek deneme sayısı
+        self.write_retries = int(os.environ.get('ROTA_DB_WRITE_RETRIES', 4))
+
+        # PERFORMANS: Salt-okunur sorgular için tekrar kullanılan bağlantılar
+        self.read_pool = ReadConnectionPool(self.db_path, max_size=4)
+        self._snapshot_local = threading.local()  # Thread başına aktif snapshot
+        self._write_local = threading.local()     # Thread başına aktif yazma işlemi/bağlantısı
+        self.write_stats = WriteStats()
+
         # Performans: Cache mekanizması
         self._order_cache = {}  # {order_code: (order_data, timestamp)}
         self._cache_ttl = 30  # Cache geçerlilik süresi (saniye)
 
+        # Stale-while-revalidate ayarları (key başına maksimum bayatlık)
+        swr_cache.configure("dashboard_stats", ttl_seconds=30, max_stale_seconds=300,
+                            tables=['orders', 'production_logs'])
+        swr_cache.configure("station_loads", ttl_seconds=300, max_stale_seconds=900,
+                            tables=['orders', 'production_logs'])
+
         self.init_database()
         self._enable_wal_mode()  # PERFORMANS: WAL mode aktif
         self._migrate_tables() # Otomatik onarım
@@ -89,8 +133,8 @@ class DatabaseManager:
         - Veri güvenliği korunur
         """
         try:
-            conn = sqlite3.connect(self.db_path)
-            conn.execute("PRAGMA journal_mode=WAL")
+            conn = sqlite3.connect(self.db_path, timeout=self.busy_timeout)
+            conn.execute(f"PRAGMA journal_mode={self.journal_mode}")
             conn.execute("PRAGMA synchronous=NORMAL")  # Daha hızlı yazma
             conn.close()
         except:
@@ -98,7 +142,19 @@ class DatabaseManager:
 
     @contextmanager
     def get_connection(self):
-        conn = sqlite3.connect(self.db_path)
+        snap = self.active_snapshot()
+        if snap is not None:
+            # Snapshot içinde: aynı okuma transaction'ını kullan (commit/close yok)
+            yield snap.connection
+            return
+
+        if getattr(self._write_local, 'operation', None) is not None:
+            # @write_operation metodu içinde: BEGIN IMMEDIATE transaction'ı
+            with self.write_transaction() as conn:
+                yield conn
+            return
+
+        conn = sqlite3.connect(self.db_path, timeout=self.busy_timeout)
         conn.row_factory = sqlite3.Row
         try:
             yield conn
@@ -112,6 +168,192 @@ class DatabaseManager:
         finally:
             conn.close()
 
+    @contextmanager
+    def write_transaction(self, name=None):
+        """
+        Yazma transaction'ı (BEGIN IMMEDIATE).
+
+        Yazma kilidi en başta alınır; kilit busy_timeout içinde alınamazsa
+        jitter'lı üstel geri çekilmeyle write_retries kez daha denenir. Aynı
+        thread'de iç içe çağrılar (yazma metodunun çağırdığı diğer metodlar)
+        dıştaki bağlantıyı paylaşır; commit/rollback en dışta yapılır.
+
+        Kullanım:
+            with db.write_transaction("toplu_guncelleme") as conn:
+                conn.execute("UPDATE ...")
+        """
+        active = getattr(self._write_local, 'connection', None)
+        if active is not None:
+            yield active
+            return
+
+        name = name or getattr(self._write_local, 'operation', None) or 'write_transaction'
+        conn = sqlite3.connect(self.db_path, timeout=self.busy_timeout)
+        conn.row_factory = sqlite3.Row
+        try:
+            self._begin_immediate(conn, name)
+            self._write_local.connection = conn
+            self._write_local.after_commit = []
+            try:
+                yield conn
+                conn.commit()
+            except Exception as e:
+                self._write_local.after_commit = []
+                conn.rollback()
+                # Kilit hataları run_write_operation'da tekrar denenir / raporlanır
+                if not is_lock_error(e):
+                    print(f"❌ Veritabanı Hatası: {e}")
+                    if SECURITY_AVAILABLE:
+                        logger.error(f"Veritabanı Hatası: {e}")
+                raise
+            finally:
+                self._write_local.connection = None
+        finally:
+            conn.close()
+
+        # Commit edildi ve yazma bağlantısı bırakıldı
+        self._run_after_commit()
+
+    def after_commit(self, callback):
+        """
+        callback'i aktif yazma transaction'ı commit edildikten sonra çalıştır
+        (transaction yoksa hemen; rollback olursa hiç).
+
+        Cache invalidation için: commit'ten önce bayat işaretlenen bir
+        SWR anahtarı, arka planda commit öncesi veriyle yeniden
+        hesaplanıp TTL boyunca taze sayılabilir.
+        """
+        pending = getattr(self._write_local, 'after_commit', None)
+        if getattr(self._write_local, 'connection', None) is not None and pending is not None:
+            pending.append(callback)
+        else:
+            callback()
+
+    def _run_after_commit(self):
+        callbacks = getattr(self._write_local, 'after_commit', None) or []
+        self._write_local.after_commit = None
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                print(f"Commit sonrası işlem hatası: {e}")
+
+    def _invalidate_swr(self, *tables):
+        """SWR cache'te tabloları okuyan anahtarları commit sonrası bayat işaretle"""
+        self.after_commit(lambda: [swr_cache.invalidate_table(t) for t in tables])
+
+    def _begin_immediate(self, conn, name):
+        """Yazma kilidini al; kilitliyse geri çekilip tekrar dene"""
+        started = time.perf_counter()
+        attempt = 0
+        while True:
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                break
+            except sqlite3.OperationalError as e:
+                if not is_lock_error(e) or attempt >= self.write_retries:
+                    if is_lock_error(e):
+                        # Kilit hiç alınamadı: metod düzeyinde tekrar denenmez
+                        self._write_local.begin_failed = True
+                        self.write_stats.record_failure(name)
+                    raise
+                attempt += 1
+                time.sleep(backoff_delay(attempt))
+        self.write_stats.record_begin(name, (time.perf_counter() - started) * 1000, attempt)
+
+    def run_write_operation(self, name, idempotent, call):
+        """
+        @write_operation metodlarının çalıştırıcısı. İç içe yazma metodları
+        dıştaki işlemin parçası olur (tekrar ve sayaç dıştakine ait).
+        """
+        if getattr(self._write_local, 'operation', None) is not None:
+            return call()
+
+        self._write_local.operation = name
+        try:
+            attempt = 0
+            while True:
+                self._write_local.begin_failed = False
+                try:
+                    return call()
+                except sqlite3.OperationalError as e:
+                    if not is_lock_error(e):
+                        raise
+                    if self._write_local.begin_failed or not idempotent or attempt >= self.write_retries:
+                        if not self._write_local.begin_failed:
+                            self.write_stats.record_failure(name)
+                        if SECURITY_AVAILABLE:
+                            logger.error(f"Veritabanı kilitli ({name}): {e}")
+                        raise
+                    attempt += 1
+                    self.write_stats.record_retry(name)
+                    time.sleep(backoff_delay(attempt))
+        finally:
+            self._write_local.operation = None
+
+    def get_write_stats(self):
+        """Metod başına yazma/çakışma sayaçları: {metod: {transactions, contended, ...}}"""
+        return self.write_stats.snapshot()
+
+    def reset_write_stats(self):
+        self.write_stats.reset()
+
+    @contextmanager
+    def get_read_connection(self):
+        """
+        Salt-okunur havuz bağlantısı (commit/close yok, havuza geri verilir).
+        Sadece SELECT için; yazma denemesi 'attempt to write a readonly database' verir.
+        """
+        snap = self.active_snapshot()
+        if snap is not None:
+            yield snap.connection
+            return
+
+        with self.read_pool.connection() as conn:
+            yield conn
+
+    def active_snapshot(self):
+        """Bu thread'de açık snapshot varsa döndür (yoksa None)"""
+        return getattr(self._snapshot_local, 'snapshot', None)
+
+    @contextmanager
+    def snapshot(self):
+        """
+        Tutarlı okuma snapshot'ı (çok sorgulu ekranlar için).
+
+        Havuzdan tek bağlantı alır ve blok boyunca tek bir okuma transaction'ı
+        açık tutar. Blok içinde çağrılan tüm okuma metodları bu bağlantıyı
+        kullanır: sayılar birbiriyle tutarlı olur, bağlantı kurulum maliyeti
+        bir kez ödenir. Arada yapılan yazmalar blok bitene kadar görünmez.
+
+        Kullanım:
+            with db.snapshot() as snap:
+                stats = snap.get_dashboard_stats()
+                orders = snap.get_orders_by_status(['Beklemede'])
+
+        Not: Bağlantı salt-okunurdur; blok içinde yazma metodu çağrılırsa
+        'attempt to write a readonly database' hatası alınır. İç içe
+        snapshot() çağrıları dıştakini kullanır.
+        """
+        active = self.active_snapshot()
+        if active is not None:
+            yield active
+            return
+
+        with self.read_pool.connection() as conn:
+            conn.execute("BEGIN")
+            # SQLite okuma snapshot'ını ilk SELECT'te sabitler; hemen al
+            conn.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()
+
+            snap = ReadSnapshot(self, conn)
+            self._snapshot_local.snapshot = snap
+            try:
+                yield snap
+            finally:
+                self._snapshot_local.snapshot = None
+                # Transaction'ı havuz release() sırasında rollback eder
+
+    @write_operation()
     def init_database(self):
         with self.get_connection() as conn:
             cursor = conn.cursor()
@@ -188,6 +430,35 @@ class DatabaseManager:
                 )
             """)
 
+            # Kesim planı plaka rezervasyonları (istasyon başına aktif plan)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS plate_reservations (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    plate_id INTEGER NOT NULL,
+                    station_name TEXT NOT NULL,
+                    quantity INTEGER NOT NULL,
+                    status TEXT DEFAULT 'Aktif',
+                    note TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+
+            # Temper fırını yatak ölçüleri ve çevrim parametreleri
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS furnace_beds (
+                    station_name TEXT PRIMARY KEY,
+                    bed_width REAL NOT NULL,
+                    bed_length REAL NOT NULL,
+                    heating_sec_per_mm REAL DEFAULT 40,
+                    overhead_sec REAL DEFAULT 120,
+                    gap_cm REAL DEFAULT 5,
+                    margin_cm REAL DEFAULT 5
+                )
+            """)
+
+            # Günlük rapor özetleri (gün x istasyon / operatör / işlem)
+            report_rollups.create_tables(cursor)
+
             # Fabrika Takvimi
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS factory_calendar (
@@ -221,18 +492,22 @@ class DatabaseManager:
             try:
                 cursor.execute("CREATE INDEX IF NOT EXISTS idx_orders_status ON orders(status)")
                 cursor.execute("CREATE INDEX IF NOT EXISTS idx_orders_customer ON orders(customer_name)")
+                cursor.execute("CREATE INDEX IF NOT EXISTS idx_orders_code ON orders(order_code)")
                 cursor.execute("CREATE INDEX IF NOT EXISTS idx_logs_order_id ON production_logs(order_id)")
                 cursor.execute("CREATE INDEX IF NOT EXISTS idx_logs_station ON production_logs(station_name)")
                 cursor.execute("CREATE INDEX IF NOT EXISTS idx_plates_thickness_type ON plates(thickness, glass_type)")
+                cursor.execute("CREATE INDEX IF NOT EXISTS idx_plate_res_plate ON plate_reservations(plate_id, status)")
 
                 # YENİ: Dashboard ve Planlama için kritik indexler
                 cursor.execute("CREATE INDEX IF NOT EXISTS idx_orders_delivery_date ON orders(delivery_date)")
                 cursor.execute("CREATE INDEX IF NOT EXISTS idx_orders_priority ON orders(priority)")
                 cursor.execute("CREATE INDEX IF NOT EXISTS idx_orders_status_delivery ON orders(status, delivery_date)")
                 cursor.execute("CREATE INDEX IF NOT EXISTS idx_logs_action ON production_logs(action)")
+                cursor.execute("CREATE INDEX IF NOT EXISTS idx_logs_timestamp ON production_logs(timestamp)")
                 cursor.execute("CREATE INDEX IF NOT EXISTS idx_logs_created_at ON production_logs(created_at)")
             except: pass
 
+    @write_operation()
     def _migrate_tables(self):
         """Eski veritabanı dosyalarını yeni yapıya uygun hale getirir (Eksik kolonları ekler)"""
         with self.get_connection() as conn:
@@ -302,6 +577,14 @@ class DatabaseManager:
             except Exception as e:
                 print(f"Production_logs kolonları eklenirken hata: {e}")
 
+            # Rapor özetleri: ilk kurulumda veya dışarıdan log eklendiyse yeniden hesapla
+            try:
+                if not report_rollups.is_consistent(conn):
+                    count = report_rollups.rebuild(conn)
+                    print(f"Rapor özetleri yeniden hesaplandı ({count} log)")
+            except Exception as e:
+                print(f"Rapor özetleri hesaplanırken hata: {e}")
+
             # Orders tablosuna shipped_quantity kolonu ekle (kısmi sevkiyat için)
             try:
                 cursor = conn.execute("PRAGMA table_info(orders)")
@@ -344,6 +627,7 @@ class DatabaseManager:
                 print(f"Sabit sehpalar oluşturulurken hata: {e}")
 
     # --- BAŞLANGIÇ VERİLERİ ---
+    @write_operation()
     def init_machine_capacities(self):
         defaults = {"INTERMAC": 800, "LIVA KESIM": 800, "LAMINE KESIM": 600, "CNC RODAJ": 100, "DOUBLEDGER": 400, "ZIMPARA": 300, "TESIR A1": 400, "TESIR B1": 400, "DELİK": 200, "OYGU": 200, "TEMPER A1": 550, "TEMPER B1": 750, "LAMINE A1": 250, "ISICAM B1": 500, "SEVKİYAT": 5000}
         with self.get_connection() as conn:
@@ -351,6 +635,7 @@ class DatabaseManager:
                 try: conn.execute("INSERT INTO factory_settings (setting_key, setting_value) VALUES (?, ?)", (name, cap))
                 except: pass
 
+    @write_operation()
     def init_default_stocks(self):
         defaults = [("4mm Düz Cam", 1000, 200), ("6mm Düz Cam", 1000, 200)]
         with self.get_connection() as conn:
@@ -358,6 +643,7 @@ class DatabaseManager:
                 try: conn.execute("INSERT INTO stocks (product_name, quantity_m2, min_limit) VALUES (?, ?, ?)", (n, q, l))
                 except: pass
 
+    @write_operation()
     def init_default_prices(self):
         defaults = [("4mm Düz Cam", 100, "HAMMADDE"), ("KESİM İŞÇİLİK", 10, "İŞLEM")]
         with self.get_connection() as conn:
@@ -365,6 +651,7 @@ class DatabaseManager:
                 try: conn.execute("INSERT INTO unit_prices (item_name, price_per_m2, category) VALUES (?, ?, ?)", (n, p, c))
                 except: pass
 
+    @write_operation()
     def create_default_users(self):
         with self.get_connection() as conn:
             try:
@@ -377,23 +664,30 @@ class DatabaseManager:
     def check_login(self, username, password):
         with self.get_connection() as conn:
             user = conn.execute("SELECT * FROM users WHERE username = ?", (username,)).fetchone()
-            if not user: return None
-            
-            stored = user['password_hash']
-            if SECURITY_AVAILABLE:
-                if password_manager.verify_password(password, stored):
-                    if password_manager.is_legacy_hash(stored):
-                        new_hash = password_manager.hash_password(password)
-                        conn.execute("UPDATE users SET password_hash = ? WHERE id = ?", (new_hash, user['id']))
-                    logger.user_login(username, user['role'], success=True)
-                    return dict(user)
-            elif stored == hashlib.sha256(password.encode()).hexdigest() or stored == password:
+        if not user: return None
+
+        stored = user['password_hash']
+        if SECURITY_AVAILABLE:
+            if password_manager.verify_password(password, stored):
+                if password_manager.is_legacy_hash(stored):
+                    self.upgrade_password_hash(user['id'], stored, password_manager.hash_password(password))
+                logger.user_login(username, user['role'], success=True)
                 return dict(user)
-            return None
+        elif stored == hashlib.sha256(password.encode()).hexdigest() or stored == password:
+            return dict(user)
+        return None
+
+    @write_operation()
+    def upgrade_password_hash(self, user_id, old_hash, new_hash):
+        """Eski formattaki şifre hash'ini yenisiyle değiştir (arada değişmediyse)"""
+        with self.get_connection() as conn:
+            conn.execute("UPDATE users SET password_hash = ? WHERE id = ? AND password_hash = ?",
+                         (new_hash, user_id, old_hash))
 
     def get_all_users(self):
         with self.get_connection() as conn: return [dict(r) for r in conn.execute("SELECT * FROM users").fetchall()]
 
+    @write_operation()
     def add_new_user(self, u, p, r, f, s):
         ph = password_manager.hash_password(p) if SECURITY_AVAILABLE else p
         with self.get_connection() as conn:
@@ -402,6 +696,7 @@ class DatabaseManager:
                 return True, "Ok"
             except Exception as e: return False, str(e)
 
+    @write_operation()
     def delete_user(self, uid):
         with self.get_connection() as conn: conn.execute("DELETE FROM users WHERE id=?", (uid,))
         return True
@@ -410,6 +705,7 @@ class DatabaseManager:
     def get_all_stocks(self):
         with self.get_connection() as conn: return [dict(r) for r in conn.execute("SELECT * FROM stocks ORDER BY product_name").fetchall()]
 
+    @write_operation(idempotent=False)
     def add_stock(self, p_name, amount):
         with self.get_connection() as conn:
             if conn.execute("SELECT id FROM stocks WHERE product_name=?", (p_name,)).fetchone():
@@ -422,6 +718,7 @@ class DatabaseManager:
             r = conn.execute("SELECT quantity_m2 FROM stocks WHERE product_name=?", (p_name,)).fetchone()
             return r[0] if r else 0
 
+    @write_operation()
     def update_stock(self, product_name, quantity):
         with self.get_connection() as conn:
             from datetime import datetime as _dt
@@ -433,6 +730,7 @@ class DatabaseManager:
             updated_time = now_turkey().strftime('%Y-%m-%d %H:%M:%S')
             conn.execute("UPDATE stocks SET quantity_m2 = ?, last_updated = ? WHERE product_name = ?", (quantity, updated_time, product_name))
 
+    @write_operation()
     def delete_stock(self, stock_id):
         with self.get_connection() as conn:
             conn.execute("DELETE FROM stocks WHERE id = ?", (stock_id,))
@@ -442,6 +740,7 @@ class DatabaseManager:
             return [dict(r) for r in conn.execute("SELECT * FROM stocks WHERE quantity_m2 < min_limit ORDER BY product_name").fetchall()]
 
     # --- SİPARİŞ İŞLEMLERİ ---
+    @write_operation(idempotent=False)
     def add_new_order(self, data):
         """
         Yeni sipariş ekle
@@ -482,13 +781,28 @@ class DatabaseManager:
                 print(f"Siparis ekleme hatasi: {e}")
                 return False
 
-    def bulk_add_orders(self, orders_list, progress_callback=None):
+    @write_operation(idempotent=False)
+    def bulk_add_orders(self, orders_list, progress_callback=None, skip_existing=False,
+                        chunk_size=BULK_CHUNK_SIZE):
         """
         Birden fazla siparişi toplu olarak ekle (PERFORMANS OPTİMİZASYONU)
 
+        Excel/CSV aktarımı ve write_load benchmark'ı bu tek motoru kullanır:
+
+        - Siparişler chunk_size'lık parçalar halinde executemany ile eklenir
+        - Her parça bir SAVEPOINT içindedir; parça hata verirse geri alınır
+          ve yalnız o parça satır satır (satır başına SAVEPOINT) denenir,
+          böylece hatalı satır diğerlerini düşürmez
+        - Stok düşümleri ürün bazında toplanır, ürün başına tek UPDATE
+        - İlerleme satır başına değil parça başına bildirilir
+
         Args:
             orders_list: Sipariş verilerinin listesi
-            progress_callback: İlerleme bildirimi için callback fonksiyonu (opsiyonel)
+            progress_callback: progress_callback(islenen, toplam) - parça başına (opsiyonel)
+            skip_existing: True ise çağrıdan önce sistemde bulunan sipariş
+                kodları eklenmez, hata listesine yazılır (listede tekrar eden
+                kodlar çok satırlı sipariş sayılır ve eklenir)
+            chunk_size: executemany parça boyutu
 
         Returns:
             tuple: (success_count, error_count, error_messages)
@@ -502,35 +816,55 @@ class DatabaseManager:
         success_count = 0
         error_count = 0
         error_messages = []
+        total = len(orders_list)
+        chunk_size = max(1, chunk_size)
 
         with self.get_connection() as conn:
             created_time = now_turkey().strftime('%Y-%m-%d %H:%M:%S')
 
-            for idx, data in enumerate(orders_list):
+            existing = set()
+            if skip_existing:
+                existing = self._existing_order_codes(conn, [d.get('code') for d in orders_list])
+
+            # Satırları parametre dizisine çevir (eksik alan -> satır hatası)
+            rows = []
+            for data in orders_list:
+                code = data.get('code', 'Bilinmeyen')
+                if code in existing:
+                    error_count += 1
+                    error_messages.append(f"{code}: sistemde zaten var (atlandı)")
+                    continue
                 try:
                     total_m2 = data.get('total_m2') or 0
-
-                    # Sipariş ekle
-                    conn.execute("""
-                        INSERT INTO orders (order_code, customer_name, product_type, thickness, quantity,
-                                           delivery_date, priority, status, route, declared_total_m2, width, height, sale_price, total_price, notes, project_id, created_at)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, 'Beklemede', ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """, (data['code'], data['customer'], data['product'], data['thickness'], data['quantity'],
-                          data['date'], data['priority'], data.get('route', ''), total_m2, data.get('width',0), data.get('height',0), 0, 0, data.get('notes', ''), data.get('project_id'), created_time))
-
-                    # Stok düş
-                    p_name = f"{data['thickness']}mm {data['product']}"
-                    conn.execute("UPDATE stocks SET quantity_m2 = quantity_m2 - ? WHERE product_name = ?", (total_m2, p_name))
-
-                    success_count += 1
-
+                    params = (data['code'], data['customer'], data['product'], data['thickness'], data['quantity'],
+                              data['date'], data['priority'], data.get('route', ''), total_m2, data.get('width', 0),
+                              data.get('height', 0), 0, 0, data.get('notes', ''), data.get('project_id'), created_time)
+                    rows.append((code, f"{data['thickness']}mm {data['product']}", total_m2, params))
                 except Exception as e:
                     error_count += 1
-                    error_messages.append(f"{data.get('code', 'Bilinmeyen')}: {str(e)}")
-
-                # Progress callback varsa çağır
+                    error_messages.append(f"{code}: {str(e)}")
+
+            stock_deltas = {}
+            processed = total - len(rows)
+            for start in range(0, len(rows), chunk_size):
+                chunk = rows[start:start + chunk_size]
+                inserted = self._insert_order_chunk(conn, chunk, error_messages)
+                for _, p_name, total_m2, _ in inserted:
+                    stock_deltas[p_name] = stock_deltas.get(p_name, 0) + total_m2
+                success_count += len(inserted)
+                error_count += len(chunk) - len(inserted)
+
+                processed += len(chunk)
                 if progress_callback:
-                    progress_callback(idx + 1, len(orders_list))
+                    progress_callback(processed, total)
+
+            # Stok düş: ürün başına tek UPDATE
+            if stock_deltas:
+                conn.executemany("UPDATE stocks SET quantity_m2 = quantity_m2 - ? WHERE product_name = ?",
+                                 [(delta, p_name) for p_name, delta in stock_deltas.items()])
+
+            if progress_callback and not rows:
+                progress_callback(total, total)
 
             # 🚀 PERFORMANS: Cache'i sadece en sonda bir kez temizle
             if success_count > 0:
@@ -538,11 +872,73 @@ class DatabaseManager:
                 refresh_manager.mark_dirty('stocks')
                 query_cache.invalidate_table('orders')
                 query_cache.invalidate_table('stocks')
+                self._invalidate_swr('orders', 'stocks')
                 order_cache.clear()
                 station_cache.clear()
 
         return success_count, error_count, error_messages
 
+    _BULK_INSERT_SQL = """
+        INSERT INTO orders (order_code, customer_name, product_type, thickness, quantity,
+                           delivery_date, priority, status, route, declared_total_m2, width, height, sale_price, total_price, notes, project_id, created_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, 'Beklemede', ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+
+    def _insert_order_chunk(self, conn, chunk, error_messages):
+        """
+        Parçayı SAVEPOINT içinde executemany ile ekle; hata olursa parçayı
+        geri alıp satır satır dene. Eklenen satırları döndürür.
+        """
+        conn.execute("SAVEPOINT bulk_chunk")
+        try:
+            conn.executemany(self._BULK_INSERT_SQL, [row[3] for row in chunk])
+            conn.execute("RELEASE SAVEPOINT bulk_chunk")
+            return chunk
+        except sqlite3.Error as e:
+            conn.execute("ROLLBACK TO SAVEPOINT bulk_chunk")
+            conn.execute("RELEASE SAVEPOINT bulk_chunk")
+            # Kilit hatası satıra ait değildir; write_operation tekrar dener
+            if is_lock_error(e):
+                raise
+
+        inserted = []
+        for row in chunk:
+            conn.execute("SAVEPOINT bulk_row")
+            try:
+                conn.execute(self._BULK_INSERT_SQL, row[3])
+                conn.execute("RELEASE SAVEPOINT bulk_row")
+                inserted.append(row)
+            except sqlite3.Error as e:
+                conn.execute("ROLLBACK TO SAVEPOINT bulk_row")
+                conn.execute("RELEASE SAVEPOINT bulk_row")
+                if is_lock_error(e):
+                    raise
+                error_messages.append(f"{row[0]}: {str(e)}")
+        return inserted
+
+    @staticmethod
+    def _existing_order_codes(conn, codes):
+        """Verilen kodlardan orders tablosunda bulunanlar (idx_orders_code, parça parça IN)"""
+        codes = list({c for c in codes if c})
+        found = set()
+        for start in range(0, len(codes), 500):
+            part = codes[start:start + 500]
+            marks = ",".join("?" * len(part))
+            found.update(r[0] for r in conn.execute(
+                f"SELECT DISTINCT order_code FROM orders WHERE order_code IN ({marks})", part))
+        return found
+
+    def get_existing_order_codes(self, codes):
+        """
+        Sistemde kayıtlı sipariş kodları (aktarım önizlemesinde mükerrer
+        işaretlemek için).
+
+        Returns:
+            set: codes içinden orders tablosunda bulunanlar
+        """
+        with self.get_read_connection() as conn:
+            return self._existing_order_codes(conn, codes)
+
     def get_orders_by_status(self, status, respect_manual_order=True):
         """
         Siparişleri durumuna göre getirir.
@@ -566,14 +962,56 @@ class DatabaseManager:
     def get_all_orders(self):
         with self.get_connection() as conn: return [dict(r) for r in conn.execute("SELECT * FROM orders ORDER BY created_at DESC").fetchall()]
 
+    @write_operation()
     def update_order_status(self, oid, st):
+        self.set_status([oid], st)
+
+    @staticmethod
+    def _fill_bulk_ids(conn, ids):
+        """
+        Id listesini bağlantıya özel geçici tabloya yaz (temp._bulk_ids).
+
+        Toplu işlemler "IN (SELECT id FROM temp._bulk_ids)" ile tek sorguda
+        çalışır; SQLite parametre sınırına takılmaz. Tekrarlanan id'ler elenir.
+        """
+        conn.execute("CREATE TEMP TABLE IF NOT EXISTS _bulk_ids (id INTEGER PRIMARY KEY)")
+        conn.execute("DELETE FROM temp._bulk_ids")
+        conn.executemany("INSERT OR IGNORE INTO temp._bulk_ids (id) VALUES (?)", [(i,) for i in ids])
+
+    @write_operation()
+    def set_status(self, order_ids, status):
+        """
+        Siparişlerin durumunu tek transaction'da değiştir.
+
+        Args:
+            order_ids: Sipariş id listesi
+            status: Yeni durum ('Beklemede', 'Üretimde', 'Tamamlandı', ...)
+
+        Returns:
+            int: Durumu değişen sipariş sayısı (zaten bu durumda olanlar sayılmaz)
+        """
+        if not order_ids:
+            return 0
+
         with self.get_connection() as conn:
-            conn.execute("UPDATE orders SET status=? WHERE id=?", (st, oid))
-            # 🚀 PERFORMANS
-            refresh_manager.mark_dirty('orders')
-            query_cache.invalidate_table('orders')
-            station_cache.clear()
+            self._fill_bulk_ids(conn, order_ids)
+            changed = conn.execute("""
+                UPDATE orders SET status = ?
+                WHERE id IN (SELECT id FROM temp._bulk_ids) AND status IS NOT ?
+            """, (status, status)).rowcount
+            conn.execute("DELETE FROM temp._bulk_ids")
 
+            # 🚀 PERFORMANS: Cache'i bir kez temizle
+            if changed:
+                refresh_manager.mark_dirty('orders')
+                query_cache.invalidate_table('orders')
+                self._invalidate_swr('orders')
+                station_cache.clear()
+                self.clear_order_cache()
+
+        return changed
+
+    @write_operation()
     def update_order(self, order_id, data):
         """
         Sipariş bilgilerini güncelle.
@@ -587,12 +1025,23 @@ class DatabaseManager:
                     return False, "Sipariş bulunamadı"
 
                 old_order = dict(old_order)
+                # Hata olursa rapor özeti/stok düzeltmeleri yarım kalmasın
+                conn.execute("SAVEPOINT update_order")
 
                 # Stok farkını hesapla (m2 değişmişse)
                 old_m2 = old_order.get('declared_total_m2', 0)
                 new_m2 = data.get('total_m2', old_m2)
                 m2_diff = new_m2 - old_m2
 
+                # Rapor özetlerindeki m² siparişin ölçülerinden gelir: loglar
+                # eski ölçülerle düşülüp güncelleme sonrası yeniden eklenir
+                rollup_fields = (('quantity', 'quantity'), ('width', 'width'), ('height', 'height'),
+                                 ('total_m2', 'declared_total_m2'))
+                reapply_rollups = any(key in data and data[key] != old_order.get(column)
+                                      for key, column in rollup_fields)
+                if reapply_rollups:
+                    report_rollups.apply_logs(conn, "pl.order_id = ?", (order_id,), sign=-1)
+
                 # Siparişi güncelle
                 conn.execute("""
                     UPDATE orders
@@ -615,6 +1064,8 @@ class DatabaseManager:
                     data.get('project_id', old_order.get('project_id')),
                     order_id
                 ))
+                if reapply_rollups:
+                    report_rollups.apply_logs(conn, "pl.order_id = ?", (order_id,), sign=1)
 
                 # Stok farkı varsa güncelle
                 if abs(m2_diff) > 0.01:  # Küçük farklılıkları yoksay
@@ -638,6 +1089,8 @@ class DatabaseManager:
                             (new_m2, new_product)
                         )
 
+                conn.execute("RELEASE SAVEPOINT update_order")
+
                 # Performans: Cache'i temizle
                 order_code = old_order.get('order_code')
                 if order_code:
@@ -648,60 +1101,76 @@ class DatabaseManager:
                 refresh_manager.mark_dirty('stocks')
                 query_cache.invalidate_table('orders')
                 query_cache.invalidate_table('stocks')
+                self._invalidate_swr('orders', 'stocks')
+                if reapply_rollups:
+                    # Raporlar özetlerden okunur
+                    refresh_manager.mark_dirty('production_logs')
+                    query_cache.invalidate_table('production_logs')
+                    self._invalidate_swr('production_logs')
                 station_cache.clear()
 
                 return True, "Sipariş güncellendi"
 
             except Exception as e:
+                if conn.in_transaction:
+                    try:
+                        conn.execute("ROLLBACK TO SAVEPOINT update_order")
+                        conn.execute("RELEASE SAVEPOINT update_order")
+                    except sqlite3.OperationalError:
+                        pass  # Savepoint açılmadan hata oluştu
                 print(f"Sipariş güncelleme hatası: {e}")
                 return False, str(e)
 
+    @write_operation()
     def delete_order(self, order_id):
         """Siparişi veritabanından sil"""
-        with self.get_connection() as conn:
-            # Önce siparişin var olup olmadığını kontrol et
-            r = conn.execute("SELECT order_code FROM orders WHERE id=?", (order_id,)).fetchone()
-            if not r:
-                return False
+        return self.delete_orders([order_id]) > 0
 
-            order_code = r['order_code']
+    @write_operation()
+    def delete_orders(self, order_ids):
+        """
+        Siparişleri ve ilişkili kayıtlarını tek transaction'da sil.
 
-            # İlişkili tabloları kontrol et ve varsa sil
-            cursor = conn.cursor()
+        Loglar önce rapor özetlerinden düşülür; production_logs,
+        station_progress ve orders birer DELETE ile temizlenir, cache'ler
+        bir kez geçersiz kılınır.
 
-            # production_logs tablosundan sil
-            cursor.execute(
-                "SELECT name FROM sqlite_master WHERE type='table' AND name='production_logs'"
-            )
-            if cursor.fetchone():
-                conn.execute("DELETE FROM production_logs WHERE order_id=?", (order_id,))
+        Returns:
+            int: Silinen sipariş sayısı
+        """
+        if not order_ids:
+            return 0
 
-            # station_progress tablosundan sil (varsa)
-            cursor.execute(
-                "SELECT name FROM sqlite_master WHERE type='table' AND name='station_progress'"
-            )
-            if cursor.fetchone():
-                conn.execute("DELETE FROM station_progress WHERE order_id=?", (order_id,))
+        with self.get_connection() as conn:
+            self._fill_bulk_ids(conn, order_ids)
+            tables = {r[0] for r in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type='table' AND name IN ('production_logs', 'station_progress')"
+            )}
 
-            # Siparişi sil
-            conn.execute("DELETE FROM orders WHERE id=?", (order_id,))
+            if 'production_logs' in tables:
+                report_rollups.apply_logs(conn, "pl.order_id IN (SELECT id FROM temp._bulk_ids)", sign=-1)
+                conn.execute("DELETE FROM production_logs WHERE order_id IN (SELECT id FROM temp._bulk_ids)")
+            if 'station_progress' in tables:
+                conn.execute("DELETE FROM station_progress WHERE order_id IN (SELECT id FROM temp._bulk_ids)")
+
+            deleted = conn.execute("DELETE FROM orders WHERE id IN (SELECT id FROM temp._bulk_ids)").rowcount
+            conn.execute("DELETE FROM temp._bulk_ids")
 
             # 🚀 PERFORMANS: RefreshManager'a bildir
-            refresh_manager.mark_dirty('orders')
-            refresh_manager.mark_dirty('production_logs')
-            query_cache.invalidate_table('orders')
-            query_cache.invalidate_table('production_logs')
-            station_cache.clear()
+            if deleted:
+                refresh_manager.mark_dirty('orders')
+                refresh_manager.mark_dirty('production_logs')
+                query_cache.invalidate_table('orders')
+                query_cache.invalidate_table('production_logs')
+                self._invalidate_swr('orders', 'production_logs')
+                station_cache.clear()
+                self.clear_order_cache()
 
-            return True
+        return deleted
 
     def delete_orders_bulk(self, order_ids):
-        """Toplu sipariş silme"""
-        deleted_count = 0
-        for order_id in order_ids:
-            if self.delete_order(order_id):
-                deleted_count += 1
-        return deleted_count
+        """Toplu sipariş silme (delete_orders ile aynı)"""
+        return self.delete_orders(order_ids)
 
     def get_order_by_code(self, code, use_cache=True):
         """
@@ -750,6 +1219,17 @@ class DatabaseManager:
             self._order_cache.clear()
 
     # --- ÜRETİM VE FİRE (CRITICAL) ---
+    def _insert_production_log(self, conn, order_id, station_name, action, quantity, operator_name,
+                               timestamp, start_time=None, end_time=None):
+        """production_logs'a kayıt ekle ve günlük rapor özetlerini aynı transaction'da güncelle"""
+        cursor = conn.execute("""
+            INSERT INTO production_logs (order_id, station_name, action, quantity, operator_name, timestamp, start_time, end_time)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """, (order_id, station_name, action, quantity, operator_name, timestamp, start_time, end_time))
+        report_rollups.record_log(conn, cursor.lastrowid)
+        return cursor.lastrowid
+
+    @write_operation(idempotent=False)
     def report_fire(self, oid, qty, station_name="Bilinmiyor", operator_name="Sistem"):
         """Fire bildiriminde Adet Düşürme ve Rework"""
         with self.get_connection() as conn:
@@ -761,10 +1241,7 @@ class DatabaseManager:
 
             timestamp = now_turkey().strftime('%Y-%m-%d %H:%M:%S')
             # 1. Logla
-            conn.execute("""
-                INSERT INTO production_logs (order_id, station_name, action, quantity, operator_name, timestamp)
-                VALUES (?, ?, 'Fire/Kırık', ?, ?, ?)
-            """, (oid, station_name, qty, operator_name, timestamp))
+            self._insert_production_log(conn, oid, station_name, 'Fire/Kırık', qty, operator_name, timestamp)
             
             # 2. ASIL SİPARİŞİ GÜNCELLE: Adedi düşür
             orig = conn.execute("SELECT * FROM orders WHERE id=?", (oid,)).fetchone()
@@ -809,6 +1286,7 @@ class DatabaseManager:
             refresh_manager.mark_dirty('production_logs')
             query_cache.invalidate_table('orders')
             query_cache.invalidate_table('production_logs')
+            self._invalidate_swr('orders', 'production_logs')
             station_cache.clear()
 
         if SECURITY_AVAILABLE: logger.warning(f"Fire: {orig['order_code']} ({qty} adet) - Rework açıldı.")
@@ -857,6 +1335,7 @@ class DatabaseManager:
             if row[1] >= target: completed.append(row[0])
         return completed
 
+    @write_operation(idempotent=False)
     def register_production(self, order_id, station_name, qty_done, operator_name="Sistem", start_time=None, end_time=None):
         with self.get_connection() as conn:
             from datetime import datetime as _dt
@@ -866,14 +1345,18 @@ class DatabaseManager:
                 now_turkey = lambda: _dt.now()
 
             timestamp = now_turkey().strftime('%Y-%m-%d %H:%M:%S')
-            conn.execute("INSERT INTO production_logs (order_id, station_name, action, quantity, operator_name, timestamp, start_time, end_time) VALUES (?, ?, 'Tamamlandi', ?, ?, ?, ?, ?)",
-                       (order_id, station_name, qty_done, operator_name, timestamp, start_time, end_time))
+            self._insert_production_log(conn, order_id, station_name, 'Tamamlandi', qty_done, operator_name,
+                                        timestamp, start_time, end_time)
 
             if self._check_all_stations_completed(order_id, conn):
                 conn.execute("UPDATE orders SET status='Tamamlandı' WHERE id=?", (order_id,))
             else:
                 conn.execute("UPDATE orders SET status='Üretimde' WHERE id=? AND status!='Tamamlandı'", (order_id,))
 
+            # 🚀 PERFORMANS: Dashboard özetleri bayat işaretlenir (arka planda yenilenir)
+            self._invalidate_swr('production_logs')
+
+    @write_operation()
     def complete_station_process(self, order_id, station_name):
         with self.get_connection() as conn:
             from datetime import datetime as _dt
@@ -887,7 +1370,7 @@ class DatabaseManager:
             rem = target - done
             if rem > 0:
                 timestamp = now_turkey().strftime('%Y-%m-%d %H:%M:%S')
-                conn.execute("INSERT INTO production_logs (order_id, station_name, action, quantity, operator_name, timestamp) VALUES (?, ?, 'Tamamlandi', ?, 'Sistem', ?)", (order_id, station_name, rem, timestamp))
+                self._insert_production_log(conn, order_id, station_name, 'Tamamlandi', rem, 'Sistem', timestamp)
 
             if self._check_all_stations_completed(order_id, conn):
                 conn.execute("UPDATE orders SET status='Tamamlandı' WHERE id=?", (order_id,))
@@ -899,6 +1382,7 @@ class DatabaseManager:
             refresh_manager.mark_dirty('production_logs')
             query_cache.invalidate_table('orders')
             query_cache.invalidate_table('production_logs')
+            self._invalidate_swr('orders', 'production_logs')
             station_cache.clear()
 
     def _check_all_stations_completed(self, order_id, conn=None):
@@ -968,6 +1452,50 @@ class DatabaseManager:
             ready = max(0, min_completed - already_shipped)
             return ready
 
+    def get_ready_to_ship(self):
+        """
+        Sevke hazır adedi olan tüm siparişler (ölçü/kalınlıkla birlikte).
+        get_ready_quantity_for_shipping'in toplu hali: 2 sorgu, sipariş başına
+        sorgu yok (sehpa planı tüm hazır siparişleri bir kerede ister).
+        """
+        with self.get_connection() as conn:
+            orders = conn.execute("""
+                SELECT id, order_code, customer_name, product_type, thickness, width, height,
+                       quantity, route, delivery_date, priority, pallet_id,
+                       COALESCE(shipped_quantity, 0) as shipped
+                FROM orders
+                WHERE status NOT IN ('Sevk Edildi', 'Hatalı/Fire')
+                  AND route IS NOT NULL AND route != ''
+                ORDER BY queue_position ASC
+            """).fetchall()
+            progress_map = {}
+            for row in conn.execute("""
+                SELECT l.order_id, l.station_name, SUM(l.quantity) as done
+                FROM production_logs l JOIN orders o ON o.id = l.order_id
+                WHERE l.action = 'Tamamlandi' AND o.status NOT IN ('Sevk Edildi', 'Hatalı/Fire')
+                GROUP BY l.order_id, l.station_name
+            """).fetchall():
+                progress_map[(row['order_id'], row['station_name'])] = row['done']
+
+        result = []
+        for order in orders:
+            stations = [s.strip() for s in order['route'].split(',') if s.strip()]
+            if not stations:
+                continue
+
+            min_completed = order['quantity']
+            for station in stations:
+                if station.upper() in ['SEVKIYAT', 'SEVKİYAT']:
+                    continue
+                min_completed = min(min_completed, progress_map.get((order['id'], station), 0))
+
+            ready = max(0, min_completed - order['shipped'])
+            if ready > 0:
+                item = dict(order)
+                item['ready_quantity'] = ready
+                result.append(item)
+        return result
+
     # --- DASHBOARD & MATRİS ---
     def get_production_matrix_advanced(self):
         """
@@ -1059,13 +1587,16 @@ class DatabaseManager:
         Bu yöntem, veritabanında 100.000 kayıt olsa bile milisaniyeler içinde çalışır.
         Kasma riskini tamamen ortadan kaldırır.
 
-        🚀 PERFORMANS: Cache ile 42ms → 2ms (20x hızlanma)
+        🚀 PERFORMANS: Stale-while-revalidate cache - süre dolunca veya yazma
+        sonrası son değer hemen döner, yeni değer arka planda hesaplanır.
         """
-        # Cache kontrol et
-        cached = query_cache.get("dashboard_stats", ())
-        if cached:
-            return cached
+        if self.active_snapshot() is not None:
+            # Snapshot içinde cache'deki (başka andan kalma) değer tutarlılığı bozar
+            return self._compute_dashboard_stats()
+        return swr_cache.get_or_compute("dashboard_stats", self._compute_dashboard_stats)
 
+    def _compute_dashboard_stats(self):
+        """Dashboard sayılarını veritabanından hesapla (cache'siz)"""
         with self.get_connection() as conn:
             # 1. Aktif (Bekleyen + Üretimde)
             active = conn.execute("SELECT COUNT(*) FROM orders WHERE status IN ('Beklemede', 'Üretimde')").fetchone()[0]
@@ -1088,7 +1619,7 @@ class DatabaseManager:
             # 7. Sevk Edildi (Tümü)
             shipped_total = conn.execute("SELECT COUNT(*) FROM orders WHERE status = 'Sevk Edildi'").fetchone()[0]
 
-            result = {
+            return {
                 "active": active,
                 "urgent": urgent,
                 "fire": fire,
@@ -1098,22 +1629,18 @@ class DatabaseManager:
                 "shipped_total": shipped_total
             }
 
-            # Cache'e kaydet (30 saniye TTL)
-            query_cache.set("dashboard_stats", (), result, affected_tables=['orders', 'production_logs'])
-
-            return result
-
     def get_station_loads(self):
         """
         İstasyon yük durumlarını hesaplar.
 
-        🚀 PERFORMANS: Cache ile 8.84ms → 1ms (8x hızlanma)
+        🚀 PERFORMANS: Stale-while-revalidate cache (bkz. get_dashboard_stats)
         """
-        # Cache kontrol et
-        cached = station_cache.get("station_loads")
-        if cached:
-            return cached
+        if self.active_snapshot() is not None:
+            return self._compute_station_loads()
+        return swr_cache.get_or_compute("station_loads", self._compute_station_loads)
 
+    def _compute_station_loads(self):
+        """İstasyon yüklerini veritabanından hesapla (cache'siz)"""
         CAPACITIES = self.get_all_capacities()
         loads = {k: 0.0 for k in CAPACITIES.keys()}
         with self.get_connection() as conn:
@@ -1155,69 +1682,224 @@ class DatabaseManager:
             elif percent > 70: status = "Yogun"
             res.append({"name": station, "percent": min(percent, 100), "status": status})
 
-        # Cache'e kaydet (300 saniye TTL - nadiren değişir)
-        station_cache.set("station_loads", res, ttl_seconds=300)
-
         return res
 
     # --- LOGLAMA ve RAPORLAMA (EKSİK OLANLAR EKLENDİ) ---
+    def build_logs_query(self, keyword=None, limit=None):
+        """
+        İşlem geçmişi sorgusu -> (sql, params)
+        get_system_logs/search_logs ve async akış (LogsView) aynı sorguyu kullanır.
+        """
+        sql = """
+            SELECT pl.timestamp, pl.operator_name, pl.station_name, pl.action,
+                   o.order_code, o.customer_name, o.width, o.height, o.quantity,
+                   o.declared_total_m2, pl.quantity as processed_quantity
+            FROM production_logs pl
+            LEFT JOIN orders o ON pl.order_id = o.id
+        """
+        params = []
+        if keyword:
+            s = f"%{keyword}%"
+            sql += " WHERE o.order_code LIKE ? OR pl.operator_name LIKE ?"
+            params += [s, s]
+        sql += " ORDER BY pl.timestamp DESC"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return sql, tuple(params)
+
     def get_system_logs(self, limit=50):
+        sql, params = self.build_logs_query(limit=limit)
         with self.get_connection() as conn:
-            return [dict(r) for r in conn.execute("""
-                SELECT pl.timestamp, pl.operator_name, pl.station_name, pl.action,
-                       o.order_code, o.customer_name, o.width, o.height, o.quantity,
-                       o.declared_total_m2, pl.quantity as processed_quantity
-                FROM production_logs pl
-                LEFT JOIN orders o ON pl.order_id = o.id
-                ORDER BY pl.timestamp DESC LIMIT ?
-            """, (limit,)).fetchall()]
+            return [dict(r) for r in conn.execute(sql, params).fetchall()]
 
     def search_logs(self, k):
-        s = f"%{k}%"
+        sql, params = self.build_logs_query(keyword=k)
         with self.get_connection() as conn:
-            return [dict(r) for r in conn.execute("""
-                SELECT pl.timestamp, pl.operator_name, pl.station_name, pl.action,
-                       o.order_code, o.customer_name, o.width, o.height, o.quantity,
-                       o.declared_total_m2, pl.quantity as processed_quantity
-                FROM production_logs pl
-                LEFT JOIN orders o ON pl.order_id = o.id
-                WHERE o.order_code LIKE ? OR pl.operator_name LIKE ?
-                ORDER BY pl.timestamp DESC
-            """, (s, s)).fetchall()]
+            return [dict(r) for r in conn.execute(sql, params).fetchall()]
+
+    def build_production_report_query(self, d1, d2):
+        """
+        Üretim hareketleri sorgusu -> (sql, params)
+        get_production_report_data ve akışlı dışa aktarma aynı sorguyu kullanır.
+        """
+        sql = """
+            SELECT pl.timestamp as islem_tarihi, o.order_code as siparis_no,
+                   o.customer_name as musteri, pl.station_name as istasyon,
+                   pl.action as islem, pl.operator_name as operator,
+                   pl.quantity as adet
+            FROM production_logs pl
+            JOIN orders o ON pl.order_id = o.id
+            WHERE pl.timestamp >= ? AND pl.timestamp < date(?, '+1 day')
+            ORDER BY pl.timestamp DESC
+        """
+        return sql, (d1, d2)
 
     def get_production_report_data(self, d1, d2):
-        with self.get_connection() as conn: 
-            return [dict(r) for r in conn.execute("""
-                SELECT pl.timestamp as islem_tarihi, o.order_code as siparis_no, 
-                       o.customer_name as musteri, pl.station_name as istasyon, 
-                       pl.action as islem, pl.operator_name as operator 
-                FROM production_logs pl 
-                JOIN orders o ON pl.order_id = o.id 
-                WHERE date(pl.timestamp) BETWEEN ? AND ? 
-                ORDER BY pl.timestamp DESC
-            """, (d1, d2)).fetchall()]
+        sql, params = self.build_production_report_query(d1, d2)
+        with self.get_connection() as conn:
+            return [dict(r) for r in conn.execute(sql, params).fetchall()]
+
+    def build_orders_export_query(self, statuses=None):
+        """Sipariş listesi dışa aktarma sorgusu -> (sql, params); statuses verilirse filtreler"""
+        sql = """
+            SELECT order_code, customer_name, product_type, thickness, width, height,
+                   quantity, declared_total_m2, route, priority, status,
+                   delivery_date, created_at, notes
+            FROM orders
+        """
+        params = []
+        if statuses:
+            sql += f" WHERE status IN ({','.join('?' * len(statuses))})"
+            params.extend(statuses)
+        sql += " ORDER BY delivery_date, order_code"
+        return sql, tuple(params)
+
+    # --- RAPOR ÖZETLERİ (ROLLUP) ---
+    # Aşağıdaki metodlar production_logs yerine günlük özet tablolarını okur;
+    # aylık/yıllık sorgular gün sayısı kadar satır tarar, log sayısı kadar değil.
+
+    @write_operation()
+    def rebuild_report_rollups(self):
+        """Günlük rapor özetlerini production_logs'tan yeniden hesapla"""
+        with self.get_connection() as conn:
+            count = report_rollups.rebuild(conn)
+
+        refresh_manager.mark_dirty('production_logs')
+        query_cache.invalidate_table('production_logs')
+        self._invalidate_swr('production_logs')
+        return count
 
     def get_operator_performance(self, days=30):
         with self.get_connection() as conn:
             return [dict(r) for r in conn.execute("""
-                SELECT operator_name, COUNT(*) as islem_sayisi, SUM(quantity) as toplam_adet
-                FROM production_logs 
-                WHERE timestamp >= date('now', '-' || ? || ' days')
-                AND operator_name IS NOT NULL AND operator_name != 'Sistem'
-                GROUP BY operator_name 
+                SELECT operator_name, SUM(log_count) as islem_sayisi, SUM(quantity) as toplam_adet,
+                       SUM(completed_m2) as toplam_m2, SUM(duration_min) as toplam_dakika
+                FROM rollup_operator_daily
+                WHERE day >= date('now', '-' || ? || ' days')
+                AND operator_name NOT IN ('', 'Sistem')
+                GROUP BY operator_name
                 ORDER BY toplam_adet DESC
             """, (days,)).fetchall()]
 
     def get_fire_analysis_data(self):
         with self.get_connection() as conn:
             return [dict(r) for r in conn.execute("""
-                SELECT station_name, SUM(quantity) as fire_adedi
-                FROM production_logs 
-                WHERE action LIKE '%Fire%' OR action LIKE '%Kırık%'
-                GROUP BY station_name 
+                SELECT station_name, SUM(fire_qty) as fire_adedi, SUM(fire_m2) as fire_m2
+                FROM rollup_station_daily
+                GROUP BY station_name
+                HAVING SUM(fire_qty) > 0
                 ORDER BY fire_adedi DESC
             """).fetchall()]
 
+    def get_production_summary(self, d1, d2, station_name=None):
+        """Tarih aralığı (dahil) için toplam üretim: adet, m², fire, süre"""
+        sql = """
+            SELECT COALESCE(SUM(completed_qty), 0) as adet,
+                   COALESCE(SUM(completed_m2), 0) as m2,
+                   COALESCE(SUM(fire_qty), 0) as fire_adedi,
+                   COALESCE(SUM(fire_m2), 0) as fire_m2,
+                   COALESCE(SUM(duration_min), 0) as dakika,
+                   COALESCE(SUM(log_count), 0) as kayit
+            FROM rollup_station_daily
+            WHERE day BETWEEN ? AND ?
+        """
+        params = [d1, d2]
+        if station_name:
+            sql += " AND station_name = ?"
+            params.append(station_name)
+        with self.get_connection() as conn:
+            return dict(conn.execute(sql, params).fetchone())
+
+    def get_production_trend(self, d1, d2, period='day', station_name=None):
+        """
+        Dönem x istasyon üretim serisi (trend grafikleri için).
+
+        period: 'day' (YYYY-MM-DD), 'month' (YYYY-MM) veya 'year' (YYYY)
+        """
+        key = report_rollups.PERIOD_EXPRESSIONS.get(period)
+        if key is None:
+            raise ValueError(f"Geçersiz dönem: {period}")
+
+        sql = f"""
+            SELECT {key} as donem, station_name,
+                   SUM(completed_qty) as adet, SUM(completed_m2) as m2,
+                   SUM(fire_qty) as fire_adedi, SUM(duration_min) as dakika
+            FROM rollup_station_daily
+            WHERE day BETWEEN ? AND ?
+        """
+        params = [d1, d2]
+        if station_name:
+            sql += " AND station_name = ?"
+            params.append(station_name)
+        sql += " GROUP BY donem, station_name ORDER BY donem, station_name"
+        with self.get_connection() as conn:
+            return [dict(r) for r in conn.execute(sql, params).fetchall()]
+
+    def get_period_comparison(self, period='month', ref_date=None):
+        """
+        İstasyon bazlı dönem karşılaştırması: bu dönem, önceki dönem ve
+        geçen yılın aynı dönemi (bu dönem ref_date'e kadar, diğerleri aynı
+        gün sayısıyla kesilir - yarım ay tam ayla kıyaslanmaz).
+
+        period: 'month' veya 'year'
+        """
+        from datetime import date as _date, timedelta as _td
+        ref = ref_date or get_current_date_turkey()
+        if isinstance(ref, str):
+            ref = _date.fromisoformat(ref[:10])
+
+        def shift(d, years=0, months=0):
+            m = d.month - 1 + months
+            y = d.year + years + m // 12
+            m = m % 12 + 1
+            while True:
+                try:
+                    return _date(y, m, d.day)
+                except ValueError:
+                    d = d - _td(days=1)
+
+        if period == 'year':
+            start = _date(ref.year, 1, 1)
+            prev_start, prev_end = shift(start, years=-1), shift(ref, years=-1)
+            ly_start, ly_end = prev_start, prev_end
+        elif period == 'month':
+            start = _date(ref.year, ref.month, 1)
+            prev_start, prev_end = shift(start, months=-1), shift(ref, months=-1)
+            ly_start, ly_end = shift(start, years=-1), shift(ref, years=-1)
+        else:
+            raise ValueError(f"Geçersiz dönem: {period}")
+
+        ranges = {
+            'current': (start, ref),
+            'previous': (prev_start, prev_end),
+            'last_year': (ly_start, ly_end),
+        }
+        cases = ", ".join(
+            f"SUM(CASE WHEN day BETWEEN ? AND ? THEN completed_m2 ELSE 0 END) as {k}_m2, "
+            f"SUM(CASE WHEN day BETWEEN ? AND ? THEN completed_qty ELSE 0 END) as {k}_adet"
+            for k in ranges
+        )
+        params = []
+        for d1, d2 in ranges.values():
+            params += [d1.isoformat(), d2.isoformat()] * 2
+        lo = min(r[0] for r in ranges.values()).isoformat()
+
+        with self.get_connection() as conn:
+            rows = conn.execute(f"""
+                SELECT station_name, {cases}
+                FROM rollup_station_daily
+                WHERE day BETWEEN ? AND ?
+                GROUP BY station_name
+                ORDER BY current_m2 DESC, station_name
+            """, params + [lo, ref.isoformat()]).fetchall()
+
+        return {
+            'period': period,
+            'ranges': {k: (a.isoformat(), b.isoformat()) for k, (a, b) in ranges.items()},
+            'rows': [dict(r) for r in rows],
+        }
+
     # --- KAPASİTE & AYARLAR ---
     def get_all_capacities(self):
         """Kapasiteleri factory_config'den al (merkezi sistem)"""
@@ -1233,6 +1915,7 @@ class DatabaseManager:
                     return self.get_all_capacities()
                 return d
 
+    @write_operation()
     def update_capacity(self, m, v):
         """Kapasiteyi hem factory_config hem eski tabloya yaz (uyumluluk için)"""
         # Yeni sistem
@@ -1245,15 +1928,19 @@ class DatabaseManager:
         # Eski sistem (geriye uyumluluk)
         with self.get_connection() as conn:
             conn.execute("UPDATE factory_settings SET setting_value=? WHERE setting_key=?", (v, m))
+            # İstasyon yükleri kapasiteye göre hesaplanır
+            self.after_commit(lambda: swr_cache.invalidate("station_loads"))
 
     def get_all_prices(self):
         with self.get_connection() as conn:
             return [dict(r) for r in conn.execute("SELECT * FROM unit_prices ORDER BY category, item_name").fetchall()]
 
+    @write_operation()
     def update_price(self, item_name, new_price):
         with self.get_connection() as conn:
             conn.execute("UPDATE unit_prices SET price_per_m2 = ? WHERE item_name = ?", (new_price, item_name))
 
+    @write_operation()
     def add_price(self, item_name, price, category):
         with self.get_connection() as conn:
             try:
@@ -1262,6 +1949,29 @@ class DatabaseManager:
             except:
                 return False
 
+    def get_furnace_beds(self):
+        """Temper fırını yatakları {istasyon: FurnaceBed} (kayıt yoksa varsayılan)"""
+        from core.furnace_loader import DEFAULT_BEDS, FurnaceBed
+        beds = dict(DEFAULT_BEDS)
+        with self.get_connection() as conn:
+            for r in conn.execute("SELECT * FROM furnace_beds").fetchall():
+                beds[r['station_name']] = FurnaceBed(
+                    station=r['station_name'], width=r['bed_width'], length=r['bed_length'],
+                    heating_sec_per_mm=r['heating_sec_per_mm'], overhead_sec=r['overhead_sec'],
+                    gap=r['gap_cm'], margin=r['margin_cm']
+                )
+        return beds
+
+    @write_operation()
+    def update_furnace_bed(self, station_name, width, length, heating_sec_per_mm=40.0,
+                           overhead_sec=120.0, gap=5.0, margin=5.0):
+        with self.get_connection() as conn:
+            conn.execute("""
+                INSERT OR REPLACE INTO furnace_beds
+                (station_name, bed_width, bed_length, heating_sec_per_mm, overhead_sec, gap_cm, margin_cm)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, (station_name, width, length, heating_sec_per_mm, overhead_sec, gap, margin))
+
     # --- SEVKİYAT ---
     def get_ready_to_ship_orders(self):
         with self.get_connection() as conn:
@@ -1270,6 +1980,7 @@ class DatabaseManager:
     def get_active_pallets(self):
         with self.get_connection() as conn: return [dict(r) for r in conn.execute("SELECT * FROM shipments WHERE status = 'Hazırlanıyor'").fetchall()]
     
+    @write_operation(idempotent=False)
     def create_pallet(self, n, c):
         with self.get_connection() as conn:
             from datetime import datetime as _dt
@@ -1281,9 +1992,11 @@ class DatabaseManager:
             created_time = now_turkey().strftime('%Y-%m-%d %H:%M:%S')
             conn.execute("INSERT INTO shipments (pallet_name, customer_name, created_at) VALUES (?, ?, ?)", (n, c, created_time))
 
+    @write_operation()
     def add_order_to_pallet(self, oid, pid):
         with self.get_connection() as conn: conn.execute("UPDATE orders SET pallet_id=? WHERE id=?", (pid, oid))
 
+    @write_operation()
     def ship_pallet(self, pid):
         """
         Sehpayı sevk eder.
@@ -1321,6 +2034,7 @@ class DatabaseManager:
     def get_shipped_orders(self):
         with self.get_connection() as conn: return [dict(r) for r in conn.execute("SELECT * FROM orders WHERE status = 'Sevk Edildi' ORDER BY order_code DESC").fetchall()]
 
+    @write_operation()
     def update_all_order_statuses(self):
         with self.get_connection() as conn:
             orders = conn.execute("SELECT id, status FROM orders WHERE status NOT IN ('Sevk Edildi', 'Hatalı/Fire')").fetchall()
@@ -1359,6 +2073,7 @@ class DatabaseManager:
             return result[0] if result else 0
 
     # --- PLAKA YÖNETİMİ ---
+    @write_operation(idempotent=False)
     def add_plate(self, thickness, glass_type, width, height, quantity, location=""):
         """Depoya yeni plaka ekle"""
         with self.get_connection() as conn:
@@ -1397,6 +2112,7 @@ class DatabaseManager:
                 ORDER BY width DESC, height DESC
             """, (thickness, glass_type)).fetchall()]
 
+    @write_operation(idempotent=False)
     def update_plate_quantity(self, plate_id, quantity_change):
         """Plaka miktarını güncelle (+ veya -)"""
         with self.get_connection() as conn:
@@ -1414,6 +2130,10 @@ class DatabaseManager:
                         last_updated = ?
                     WHERE id = ?
                 """, (quantity_change, updated_time, plate_id))
+
+                # Kullanılan plaka rezervasyondan düşer (en eski rezervasyon önce)
+                if quantity_change < 0:
+                    self._consume_plate_reservations(conn, plate_id, -quantity_change)
                 return True
             except Exception as e:
                 print(f"Plaka güncelleme hatası: {e}")
@@ -1427,6 +2147,117 @@ class DatabaseManager:
         """Plaka stoğunu artır"""
         return self.update_plate_quantity(plate_id, amount)
 
+    # --- KESİM PLANI / PLAKA REZERVASYONU ---
+    def get_cut_queue(self, station_name):
+        """
+        Kesim istasyonunda bekleyen parçalar: rotasında istasyon olan, bitmemiş
+        siparişlerin istasyonda kalan adetleri (ebat cm).
+        """
+        with self.get_connection() as conn:
+            rows = conn.execute("""
+                SELECT o.id, o.order_code, o.thickness, o.product_type, o.width, o.height,
+                       o.quantity, o.priority, o.delivery_date,
+                       COALESCE((SELECT SUM(l.quantity) FROM production_logs l
+                                 WHERE l.order_id = o.id AND l.station_name = ?
+                                   AND l.action = 'Tamamlandi'), 0) AS done
+                FROM orders o
+                WHERE o.status NOT IN ('Tamamlandı', 'Sevk Edildi', 'Hatalı/Fire')
+                  AND (',' || REPLACE(REPLACE(o.route, ', ', ','), ' ,', ',') || ',') LIKE ?
+                  AND o.width > 0 AND o.height > 0
+                ORDER BY COALESCE(o.queue_position, 9999), o.delivery_date
+            """, (station_name, f"%,{station_name},%")).fetchall()
+
+        queue = []
+        for r in rows:
+            remaining = r['quantity'] - r['done']
+            if remaining > 0:
+                item = dict(r)
+                item['remaining'] = remaining
+                queue.append(item)
+        return queue
+
+    def get_available_plates(self, thickness, glass_type, exclude_station=None):
+        """
+        Kesim planı için kullanılabilir plakalar: stok - aktif rezervasyon.
+        exclude_station verilirse o istasyonun kendi rezervasyonu serbest
+        sayılır (plan yeniden hesaplanırken).
+        """
+        with self.get_connection() as conn:
+            rows = conn.execute("""
+                SELECT p.*,
+                       COALESCE((SELECT SUM(r.quantity) FROM plate_reservations r
+                                 WHERE r.plate_id = p.id AND r.status = 'Aktif'
+                                   AND r.station_name != ?), 0) AS reserved
+                FROM plates p
+                WHERE p.thickness = ? AND p.glass_type = ? AND p.quantity > 0
+                ORDER BY p.width DESC, p.height DESC
+            """, (exclude_station or '', thickness, glass_type)).fetchall()
+
+        plates = []
+        for r in rows:
+            plate = dict(r)
+            plate['available'] = max(0, plate['quantity'] - plate['reserved'])
+            plates.append(plate)
+        return plates
+
+    @write_operation()
+    def reserve_plates(self, station_name, plates_used, note=""):
+        """
+        İstasyonun kesim planı için plaka rezerve et ({plate_id: adet}).
+        İstasyonun önceki aktif rezervasyonu bu planla değiştirilir.
+        """
+        with self.get_connection() as conn:
+            conn.execute(
+                "UPDATE plate_reservations SET status = 'İptal' WHERE station_name = ? AND status = 'Aktif'",
+                (station_name,)
+            )
+            created_time = now_turkey().strftime('%Y-%m-%d %H:%M:%S')
+            conn.executemany("""
+                INSERT INTO plate_reservations (plate_id, station_name, quantity, note, created_at)
+                VALUES (?, ?, ?, ?, ?)
+            """, [(pid, station_name, qty, note, created_time)
+                  for pid, qty in plates_used.items() if pid is not None and qty > 0])
+            return sum(qty for pid, qty in plates_used.items() if pid is not None and qty > 0)
+
+    @write_operation()
+    def release_plate_reservations(self, station_name):
+        """İstasyonun aktif rezervasyonlarını iptal et"""
+        with self.get_connection() as conn:
+            conn.execute(
+                "UPDATE plate_reservations SET status = 'İptal' WHERE station_name = ? AND status = 'Aktif'",
+                (station_name,)
+            )
+
+    def get_plate_reservations(self, station_name=None):
+        """Aktif rezervasyonlar (plaka bilgisiyle)"""
+        with self.get_connection() as conn:
+            query = """
+                SELECT r.*, p.thickness, p.glass_type, p.width, p.height, p.location
+                FROM plate_reservations r JOIN plates p ON p.id = r.plate_id
+                WHERE r.status = 'Aktif'
+            """
+            params = ()
+            if station_name:
+                query += " AND r.station_name = ?"
+                params = (station_name,)
+            return [dict(r) for r in conn.execute(query + " ORDER BY r.created_at", params).fetchall()]
+
+    def _consume_plate_reservations(self, conn, plate_id, amount):
+        """Stoktan düşen plakayı aktif rezervasyonlardan sırayla düş"""
+        rows = conn.execute(
+            "SELECT id, quantity FROM plate_reservations WHERE plate_id = ? AND status = 'Aktif' ORDER BY id",
+            (plate_id,)
+        ).fetchall()
+        for r in rows:
+            if amount <= 0:
+                break
+            used = min(amount, r['quantity'])
+            amount -= used
+            if used >= r['quantity']:
+                conn.execute("UPDATE plate_reservations SET quantity = 0, status = 'Kullanıldı' WHERE id = ?", (r['id'],))
+            else:
+                conn.execute("UPDATE plate_reservations SET quantity = quantity - ? WHERE id = ?", (used, r['id']))
+
     def get_plate_summary(self):
         """Plaka stok özeti (kalınlık ve tipe göre gruplu)"""
         with self.get_connection() as conn:
@@ -1443,6 +2274,7 @@ class DatabaseManager:
             """).fetchall()]
 
     # --- PROJE YÖNETİMİ ---
+    @write_operation(idempotent=False)
     def add_project(self, data):
         """Yeni proje ekle - data dictionary veya dict-like object alır"""
         with self.get_connection() as conn:
@@ -1535,6 +2367,7 @@ class DatabaseManager:
                 return result
             return None
 
+    @write_operation()
     def update_project(self, project_id, **kwargs):
         """Proje bilgilerini güncelle"""
         with self.get_connection() as conn:
@@ -1559,6 +2392,7 @@ class DatabaseManager:
                 print(f"Proje güncelleme hatası: {e}")
                 return False
 
+    @write_operation()
     def delete_project(self, project_id):
         """Projeyi sil (siparişlerin project_id'sini NULL yap)"""
         with self.get_connection() as conn:
@@ -1568,6 +2402,7 @@ class DatabaseManager:
             conn.execute("DELETE FROM projects WHERE id = ?", (project_id,))
             return True
 
+    @write_operation()
     def complete_project(self, project_id):
         """Projeyi tamamla"""
         with self.get_connection() as conn:
@@ -1665,6 +2500,7 @@ class DatabaseManager:
     # SINIFIN EN ALTINA EKLENECEK TAKVİM FONKSİYONLARI
     # ---------------------------------------------------------
     
+    @write_operation()
     def set_holiday(self, date_str, is_holiday=True, desc=""):
         """Bir günü tatil ilan et veya çalışma gününe çevir"""
         with self.get_connection() as conn:
@@ -1758,6 +2594,7 @@ class DatabaseManager:
         return not self.get_calendar_status(date_str)
 
     # --- KISMI SEVKİYAT FONKSİYONLARI ---
+    @write_operation(idempotent=False)
     def ship_partial_order(self, order_id, quantity, sehpa_name):
         """
         Kısmi sevkiyat yapar
@@ -1862,8 +2699,10 @@ class DatabaseManager:
             refresh_manager.mark_dirty('shipments')
             query_cache.invalidate_table('orders')
             query_cache.invalidate_table('shipments')
+            self._invalidate_swr('orders', 'shipments')
             station_cache.clear()
 
+    @write_operation(idempotent=False)
     def close_sehpa(self, sehpa_name):
         """
         Sehpayı kapatır (sevk edildi olarak işaretler)
@@ -1903,6 +2742,7 @@ class DatabaseManager:
     # =========================================================================
     # CAM TÜRLERİ ve KALINLIKLAR YÖNETİMİ
     # =========================================================================
+    @write_operation()
     def init_default_glass_config(self):
         """Varsayılan cam türleri ve kalınlıkları ekle"""
         default_types = [
@@ -1945,6 +2785,7 @@ class DatabaseManager:
 
             return [dict(row) for row in rows]
 
+    @write_operation()
     def add_glass_type(self, type_name):
         """Yeni cam türü ekle"""
         try:
@@ -1956,6 +2797,7 @@ class DatabaseManager:
         except Exception as e:
             return False, str(e)
 
+    @write_operation()
     def update_glass_type(self, old_name, new_name):
         """Cam türü adını güncelle"""
         try:
@@ -1967,6 +2809,7 @@ class DatabaseManager:
         except Exception as e:
             return False, str(e)
 
+    @write_operation()
     def delete_glass_type(self, type_name):
         """Cam türünü sil"""
         try:
@@ -1976,6 +2819,7 @@ class DatabaseManager:
         except Exception as e:
             return False, str(e)
 
+    @write_operation(idempotent=False)
     def toggle_glass_type_status(self, type_name):
         """Cam türünü aktif/pasif yap"""
         try:
@@ -1999,6 +2843,7 @@ class DatabaseManager:
 
             return [dict(row) for row in rows]
 
+    @write_operation()
     def add_glass_thickness(self, thickness):
         """Yeni cam kalınlığı ekle"""
         try:
@@ -2010,6 +2855,7 @@ class DatabaseManager:
         except Exception as e:
             return False, str(e)
 
+    @write_operation()
     def delete_glass_thickness(self, thickness):
         """Cam kalınlığını sil"""
         try:
@@ -2019,6 +2865,7 @@ class DatabaseManager:
         except Exception as e:
             return False, str(e)
 
+    @write_operation(idempotent=False)
     def toggle_glass_thickness_status(self, thickness):
         """Cam kalınlığını aktif/pasif yap"""
         try:
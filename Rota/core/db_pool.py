@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+"""
+EFES ROTA X - Okuma Bağlantı Havuzu
+Salt-okunur SQLite bağlantılarını tekrar kullanır.
+
+Her sorguda sqlite3.connect() + close() maliyeti yerine havuzdaki
+hazır bağlantılardan biri ödünç alınır. WAL modunda okuyucular yazarı
+bloklamaz; PRAGMA query_only ile bu bağlantılardan yanlışlıkla yazılamaz.
+
+Kullanım:
+    pool = ReadConnectionPool(db_path, max_size=4)
+    with pool.connection() as conn:
+        rows = conn.execute("SELECT ...").fetchall()
+
+    # Birden fazla sorgu aynı anda görülen veriyi okusun (tutarlı snapshot)
+    with db.snapshot() as snap:
+        stats = snap.get_dashboard_stats()
+        loads = snap.get_station_loads()
+"""
+
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Any, List
+
+
+class ReadConnectionPool:
+    """
+    Thread-safe salt-okunur bağlantı havuzu
+
+    Bağlantılar ihtiyaç oldukça (max_size'a kadar) açılır. Havuz doluysa
+    bir bağlantı geri verilene kadar beklenir.
+    """
+
+    def __init__(self, db_path: str, max_size: int = 4, busy_timeout_ms: int = 5000):
+        self.db_path = db_path
+        self.max_size = max_size
+        self.busy_timeout_ms = busy_timeout_ms
+
+        self._idle: List[sqlite3.Connection] = []
+        self._created = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+        # İstatistikler
+        self.acquired = 0
+        self.waited = 0
+
+    def _open(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout_ms)}")
+        conn.execute("PRAGMA query_only = ON")
+        return conn
+
+    def acquire(self) -> sqlite3.Connection:
+        """Havuzdan bağlantı al (gerekirse yeni aç veya bekle)"""
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Bağlantı havuzu kapatıldı")
+
+            while not self._idle and self._created >= self.max_size:
+                self.waited += 1
+                self._cond.wait()
+                if self._closed:
+                    raise RuntimeError("Bağlantı havuzu kapatıldı")
+
+            self.acquired += 1
+            if self._idle:
+                return self._idle.pop()
+            self._created += 1
+
+        try:
+            return self._open()
+        except Exception:
+            with self._cond:
+                self._created -= 1
+                self._cond.notify()
+            raise
+
+    def release(self, conn: sqlite3.Connection):
+        """Bağlantıyı havuza geri ver"""
+        try:
+            # Açık okuma transaction'ı kalmasın (eski snapshot tutulmasın)
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            # Bozuk bağlantı: havuza koyma
+            with self._cond:
+                self._created -= 1
+                self._cond.notify()
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+            return
+
+        with self._cond:
+            if self._closed:
+                self._created -= 1
+                conn.close()
+            else:
+                self._idle.append(conn)
+            self._cond.notify()
+
+    @contextmanager
+    def connection(self):
+        """Bağlantıyı ödünç al, iş bitince havuza geri ver"""
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def close(self):
+        """Boştaki tüm bağlantıları kapat, yeni istekleri reddet"""
+        with self._cond:
+            self._closed = True
+            for conn in self._idle:
+                try:
+                    conn.close()
+                except sqlite3.Error:
+                    pass
+            self._created -= len(self._idle)
+            self._idle = []
+            self._cond.notify_all()
+
+    def get_stats(self) -> dict:
+        """Havuz istatistiklerini döndür"""
+        with self._cond:
+            return {
+                "max_size": self.max_size,
+                "open": self._created,
+                "idle": len(self._idle),
+                "acquired": self.acquired,
+                "waited": self.waited
+            }
+
+
+class ReadSnapshot:
+    """
+    Tek bağlantı üzerinde açık tutulan okuma transaction'ı
+
+    DatabaseManager.snapshot() tarafından oluşturulur. Snapshot açıkken aynı
+    thread'deki tüm okuma metodları (get_connection / get_read_connection
+    kullananlar) bu bağlantıyı paylaşır; hepsi aynı anın verisini görür.
+
+    Bilinmeyen attribute'lar veritabanı yöneticisine yönlendirilir, yani
+    snap.get_dashboard_stats() == db.get_dashboard_stats() (snapshot içinde).
+    """
+
+    def __init__(self, db_manager, conn: sqlite3.Connection):
+        self._db = db_manager
+        self.connection = conn
+        self.query_count = 0
+
+    def execute(self, query: str, params: tuple = ()) -> sqlite3.Cursor:
+        """Snapshot bağlantısında ham sorgu çalıştır"""
+        self.query_count += 1
+        return self.connection.execute(query, params)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._db, name)
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+"""
+EFES ROTA X - Yazma Transaction Yardımcıları
+Aynı veritabanına birden fazla terminal / arka plan thread'i yazarken
+"database is locked" hatalarını operatöre yansıtmadan kısa beklemelere çevirir.
+
+- Yazma transaction'ı BEGIN IMMEDIATE ile açılır: yazma kilidi en başta
+  alınır, okuma-sonra-yazma arasında başka yazar araya giremez ve kilit
+  çakışması henüz hiçbir şey yapılmamışken görülür (tekrar denemek güvenli)
+- Kilit alınamazsa busy_timeout beklemesinin üstüne rastgele dağıtılmış
+  (jitter) üstel geri çekilme ile tekrar denenir
+- Tekrar çalıştırılması güvenli (idempotent) metodlar, transaction ortasında
+  kilit hatası alırsa (ör. rollback journal modunda COMMIT) baştan çalıştırılır
+- Metod başına çakışma sayaçları tutulur (db.get_write_stats())
+
+Kullanım:
+    class DatabaseManager:
+        @write_operation()
+        def update_order_status(self, oid, st):
+            with self.get_connection() as conn:   # BEGIN IMMEDIATE
+                ...
+
+        @write_operation(idempotent=False)         # Göreli değişim: tekrar yok
+        def add_stock(self, p_name, amount):
+            ...
+"""
+
+import functools
+import random
+import sqlite3
+import threading
+from typing import Dict
+
+LOCK_MESSAGES = ("database is locked", "database is busy", "database table is locked")
+
+BACKOFF_BASE = 0.05        # İlk tekrar öncesi en fazla bekleme (saniye)
+BACKOFF_CAP = 1.0          # Tek beklemenin üst sınırı (saniye)
+CONTENTION_MS = 5.0        # Kilidin bu süreden geç alınması çakışma sayılır
+
+
+def is_lock_error(error: BaseException) -> bool:
+    """SQLite kilit/meşgul hatası mı?"""
+    if not isinstance(error, sqlite3.OperationalError):
+        return False
+    text = str(error).lower()
+    return any(msg in text for msg in LOCK_MESSAGES)
+
+
+def backoff_delay(attempt: int, rng=random) -> float:
+    """Üstel geri çekilme, tam jitter: [0, min(cap, base * 2^(attempt-1))]"""
+    return rng.uniform(0.0, min(BACKOFF_CAP, BACKOFF_BASE * (2 ** (attempt - 1))))
+
+
+def write_operation(idempotent: bool = True):
+    """
+    DatabaseManager yazma metodu işareti.
+
+    Metod içindeki get_connection() çağrıları tek bir BEGIN IMMEDIATE
+    transaction'ını paylaşır. idempotent=True ise transaction kilit hatasıyla
+    geri alındığında metod baştan tekrar çalıştırılır; göreli değişim yapan
+    (adet/stok ekleme, fire) veya dışarıya geri bildirim veren metodlar
+    idempotent=False işaretlenir ve sadece kilit alma aşamasında beklenir.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            return self.run_write_operation(func.__name__, idempotent,
+                                            lambda: func(self, *args, **kwargs))
+        wrapper.write_idempotent = idempotent
+        return wrapper
+    return decorator
+
+
+class WriteStats:
+    """Metod başına yazma transaction'ı ve kilit çakışması sayaçları (thread-safe)"""
+
+    FIELDS = ("transactions", "contended", "begin_retries", "retries", "failures")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict] = {}
+
+    def _entry(self, name: str) -> Dict:
+        entry = self._stats.get(name)
+        if entry is None:
+            entry = {field: 0 for field in self.FIELDS}
+            entry.update(wait_ms=0.0, max_wait_ms=0.0)
+            self._stats[name] = entry
+        return entry
+
+    def record_begin(self, name: str, wait_ms: float, begin_retries: int):
+        """Kilit alındı: bekleme süresi ve BEGIN tekrar sayısı"""
+        with self._lock:
+            entry = self._entry(name)
+            entry['transactions'] += 1
+            entry['begin_retries'] += begin_retries
+            entry['wait_ms'] += wait_ms
+            entry['max_wait_ms'] = max(entry['max_wait_ms'], wait_ms)
+            if wait_ms >= CONTENTION_MS or begin_retries:
+                entry['contended'] += 1
+
+    def record_retry(self, name: str):
+        with self._lock:
+            self._entry(name)['retries'] += 1
+
+    def record_failure(self, name: str):
+        with self._lock:
+            self._entry(name)['failures'] += 1
+
+    def snapshot(self) -> Dict[str, Dict]:
+        with self._lock:
+            return {name: {k: (round(v, 2) if isinstance(v, float) else v) for k, v in entry.items()}
+                    for name, entry in self._stats.items()}
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
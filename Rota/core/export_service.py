@@ -0,0 +1,219 @@
+# -*- coding: utf-8 -*-
+"""
+EFES ROTA X - Akışlı Dışa Aktarma Servisi
+
+Büyük tabloları (yıllık loglar, tüm siparişler) belleğe almadan dosyaya
+yazar:
+
+- Excel (.xlsx): openpyxl write_only çalışma kitabı; satırlar diske akar,
+  hücre nesneleri tutulmaz
+- CSV (.csv): csv modülü, Excel'in Türkçe karakterleri tanıması için
+  utf-8-sig (BOM); xlsx'ten kat kat hızlı
+
+Kaynak bir DB cursor'ı (export_query - fetchmany parçaları) veya herhangi
+bir satır üreteci (export_rows) olabilir. Bellek kullanımı satır sayısından
+bağımsız olarak parça boyutuyla sınırlıdır.
+
+İlerleme ve iptal parça başına kontrol edilir; iptal veya hata halinde
+yarım dosya bırakılmaz (önce .part dosyasına yazılır, bitince taşınır).
+
+Qt'den bağımsızdır; arka plan çalıştırma ve ilerleme penceresi için
+views/export_dialog.py içindeki run_export kullanılır.
+
+Kullanım:
+    sql, params = db.build_production_report_query(d1, d2)
+    result = export_query(sql, params, "rapor.xlsx", headers=[...])
+    print(result.rows, result.seconds)
+"""
+
+import csv
+import os
+import time
+from dataclasses import dataclass
+from typing import Callable, Iterable, List, Optional, Sequence
+
+CHUNK_SIZE = 2000
+
+FORMAT_XLSX = "xlsx"
+FORMAT_CSV = "csv"
+
+# QFileDialog filtresi (ilk seçenek varsayılan)
+FILE_FILTER = "Excel Dosyası (*.xlsx);;CSV Dosyası (*.csv)"
+
+HEADER_FILL = "217346"
+DEFAULT_COLUMN_WIDTH = 16
+
+
+class ExportCancelled(Exception):
+    """Dışa aktarma kullanıcı tarafından iptal edildi"""
+
+
+@dataclass
+class ExportResult:
+    """Tamamlanan dışa aktarmanın özeti"""
+    path: str
+    format: str
+    rows: int
+    seconds: float
+
+
+def detect_format(path: str) -> str:
+    """Dosya uzantısından biçim (bilinmeyen uzantı -> xlsx)"""
+    return FORMAT_CSV if os.path.splitext(path)[1].lower() in (".csv", ".txt") else FORMAT_XLSX
+
+
+class _CsvSink:
+    def __init__(self, path, headers, **_):
+        self._file = open(path, "w", encoding="utf-8-sig", newline="")
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(headers)
+
+    def write(self, rows):
+        self._writer.writerows(rows)
+
+    def close(self, ok):
+        self._file.close()
+
+
+class _XlsxSink:
+    def __init__(self, path, headers, sheet_title="Sayfa1", column_widths=None):
+        import openpyxl
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.styles import Font, PatternFill
+        from openpyxl.utils import get_column_letter
+
+        self._path = path
+        self._wb = openpyxl.Workbook(write_only=True)
+        self._ws = self._wb.create_sheet(title=(sheet_title or "Sayfa1")[:31])
+
+        # write_only: sütun genişliği ve dondurma satırlardan önce ayarlanmalı
+        widths = column_widths or []
+        for i in range(len(headers)):
+            width = widths[i] if i < len(widths) and widths[i] else DEFAULT_COLUMN_WIDTH
+            self._ws.column_dimensions[get_column_letter(i + 1)].width = width
+        self._ws.freeze_panes = "A2"
+
+        font = Font(bold=True, color="FFFFFF")
+        fill = PatternFill(start_color=HEADER_FILL, end_color=HEADER_FILL, fill_type="solid")
+        header_cells = []
+        for title in headers:
+            cell = WriteOnlyCell(self._ws, value=title)
+            cell.font = font
+            cell.fill = fill
+            header_cells.append(cell)
+        self._ws.append(header_cells)
+
+    def write(self, rows):
+        append = self._ws.append
+        for row in rows:
+            append(row)
+
+    def close(self, ok):
+        # write_only kitap kaydedilmeden geçici dosyası silinmez
+        self._wb.save(self._path)
+
+
+_SINKS = {FORMAT_CSV: _CsvSink, FORMAT_XLSX: _XlsxSink}
+
+
+def _chunks(rows: Iterable, size: int):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def export_rows(rows: Iterable[Sequence], path: str, headers: Sequence[str],
+                fmt: str = None, total: int = None,
+                progress: Callable[[int, Optional[int]], None] = None,
+                is_cancelled: Callable[[], bool] = None,
+                chunk_size: int = CHUNK_SIZE, sheet_title: str = "Sayfa1",
+                column_widths: List[float] = None) -> ExportResult:
+    """
+    Satır üretecini dosyaya akıt.
+
+    Args:
+        rows: Satır dizileri üreten iterable (liste veya generator)
+        path: Hedef dosya; biçim uzantıdan belirlenir (fmt ile zorlanabilir)
+        total: Bilinen toplam satır (ilerleme yüzdesi için, opsiyonel)
+        progress: progress(yazılan, total) - her parçadan sonra
+        is_cancelled: True dönerse ExportCancelled fırlatılır, yarım dosya silinir
+        chunk_size: Tek seferde bellekte tutulan satır sayısı
+
+    Returns:
+        ExportResult
+    """
+    fmt = fmt or detect_format(path)
+    if fmt not in _SINKS:
+        raise ValueError(f"Desteklenmeyen biçim: {fmt}")
+
+    start = time.perf_counter()
+    part_path = path + ".part"
+    sink = _SINKS[fmt](part_path, list(headers), sheet_title=sheet_title,
+                       column_widths=column_widths)
+    written = 0
+    ok = False
+    try:
+        for chunk in _chunks(rows, max(1, chunk_size)):
+            if is_cancelled and is_cancelled():
+                raise ExportCancelled()
+            sink.write(chunk)
+            written += len(chunk)
+            if progress:
+                progress(written, total)
+        if is_cancelled and is_cancelled():
+            raise ExportCancelled()
+        ok = True
+    finally:
+        try:
+            sink.close(ok)
+        finally:
+            if ok:
+                os.replace(part_path, path)
+            elif os.path.exists(part_path):
+                os.remove(part_path)
+
+    return ExportResult(path=path, format=fmt, rows=written,
+                        seconds=round(time.perf_counter() - start, 3))
+
+
+def export_query(sql: str, params, path: str, headers: Sequence[str],
+                 row_mapper: Callable = None, count: bool = True,
+                 db_manager=None, chunk_size: int = CHUNK_SIZE, **kwargs) -> ExportResult:
+    """
+    SELECT sonucunu cursor'dan parça parça dosyaya akıt.
+
+    Args:
+        sql, params: Sorgu (db.build_*_query dönüşü)
+        row_mapper: Satırı yazılacak diziye çeviren fonksiyon (yoksa satır olduğu gibi)
+        count: True ise ilerleme için önce COUNT(*) alınır
+        db_manager: Varsayılan global db; salt-okunur havuz bağlantısı kullanılır
+        **kwargs: export_rows parametreleri (progress, is_cancelled, fmt, ...)
+    """
+    if db_manager is None:
+        from core.db_manager import db as db_manager
+
+    params = tuple(params or ())
+    with db_manager.get_read_connection() as conn:
+        total = None
+        if count:
+            total = conn.execute(f"SELECT COUNT(*) FROM ({sql})", params).fetchone()[0]
+
+        cursor = conn.execute(sql, params)
+
+        def rows():
+            while True:
+                batch = cursor.fetchmany(chunk_size)
+                if not batch:
+                    return
+                if row_mapper:
+                    yield from (row_mapper(r) for r in batch)
+                else:
+                    yield from (tuple(r) for r in batch)
+
+        return export_rows(rows(), path, headers, total=total,
+                           chunk_size=chunk_size, **kwargs)
@@ -0,0 +1,292 @@
+# -*- coding: utf-8 -*-
+"""
+EFES ROTA X - Temper Fırını Yükleme Planlayıcı
+TEMPER A1 / B1 / BOMBE istasyonlarının kuyruğunu kalınlığa göre gruplar,
+parçaları fırın yatağına yerleştirir ve sıralı yük (şarj) listesi üretir.
+
+- Bir yükte sadece aynı kalınlık bulunur (ısıtma reçetesi kalınlığa bağlı)
+- Yük, kuyruğun en acil parçasıyla açılır; önce yakın siparişler
+  (LOOKAHEAD_ORDERS), kalan boşluklar sonraki siparişlerle doldurulur
+- Yerleşim nesting motorunun tek plaka yerleşimiyle yapılır (yatak = plaka,
+  parçalar arası boşluk = kerf, yatak kenar payı = trim)
+- Yük çevrim süresi = sabit süre (yükleme/soğutma/boşaltma) + mm başına ısıtma
+- Doluluk ve çevrim süresinden istasyon/kalınlık kapasite katsayısı çıkar;
+  SmartPlanner bu katsayıyı kalınlık katsayısı yerine kullanır
+
+Birimler: yatak ve parçalar cm, süreler saniye, alanlar raporda m².
+
+Kullanım:
+    queue = build_furnace_queue(sequenced_orders, progress_cache, completed_cache)
+    plan = plan_station(queue["TEMPER A1"], DEFAULT_BEDS["TEMPER A1"])
+    for load in plan['loads']:
+        load.thickness, load.repeat, load.fill, load.cycle_sec
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from core.nesting_engine import CutPiece, SheetLayout, StockSheet, FIT_RULES, pack_sheet
+
+FURNACE_STATIONS = ("TEMPER A1", "TEMPER B1", "TEMPER BOMBE")
+
+REFERENCE_THICKNESS = 4    # Kapasite ayarlarının referans kalınlığı (SmartPlanner ile aynı)
+NOMINAL_FILL = 0.70        # Kapasite ayarının varsaydığı ortalama yatak doluluğu
+LOOKAHEAD_ORDERS = 6       # Yük açılırken öne alınabilecek acil sipariş sayısı
+BACKFILL_ORDERS = 60       # Boşlukları doldurmak için bakılan sonraki sipariş sayısı
+FACTOR_LIMITS = (0.2, 1.5)  # Katsayı aşırı uçlara kaçmasın (tek parçalık kuyruk vb.)
+
+
+@dataclass
+class FurnaceBed:
+    """Fırın yatağı ve çevrim süresi parametreleri"""
+    station: str
+    width: float                      # Yatak eni (cm, silindir boyu)
+    length: float                     # Yatak boyu (cm, akış yönü)
+    heating_sec_per_mm: float = 40.0  # Isıtma süresi (saniye / mm kalınlık)
+    overhead_sec: float = 120.0       # Yükleme + soğutma + boşaltma (saniye)
+    gap: float = 5.0                  # Parçalar arası boşluk (cm)
+    margin: float = 5.0               # Yatak kenar payı (cm)
+
+    @property
+    def area_m2(self) -> float:
+        return self.width * self.length / 10000.0
+
+    def cycle_seconds(self, thickness) -> float:
+        return self.overhead_sec + self.heating_sec_per_mm * _thickness_mm(thickness)
+
+
+DEFAULT_BEDS: Dict[str, FurnaceBed] = {
+    "TEMPER A1": FurnaceBed("TEMPER A1", width=244, length=420),
+    "TEMPER B1": FurnaceBed("TEMPER B1", width=280, length=600),
+    "TEMPER BOMBE": FurnaceBed("TEMPER BOMBE", width=200, length=300, overhead_sec=240.0),
+}
+
+
+@dataclass
+class FurnaceLoad:
+    """Bir fırın yükü; repeat aynı yerleşimin art arda kaç kez basılacağı"""
+    station: str
+    thickness: int
+    layout: SheetLayout
+    cycle_sec: float
+    repeat: int = 1
+
+    @property
+    def fill(self) -> float:
+        return self.layout.yield_ratio
+
+    @property
+    def m2(self) -> float:
+        return self.layout.used_area / 10000.0
+
+    @property
+    def order_codes(self) -> List[str]:
+        return sorted({p.order_code for p in self.layout.placements})
+
+
+def _thickness_mm(thickness) -> int:
+    try:
+        return int(float(thickness))
+    except (TypeError, ValueError):
+        return REFERENCE_THICKNESS
+
+
+# =============================================================================
+# KUYRUK
+# =============================================================================
+def furnace_station(route: str, stations: Iterable[str] = FURNACE_STATIONS) -> Optional[str]:
+    """Rotadaki ilk temper istasyonu (yoksa None)"""
+    steps = [s.strip() for s in (route or '').split(',')]
+    for station in steps:
+        if station in stations:
+            return station
+    return None
+
+
+def build_furnace_queue(orders: List[Dict], progress_cache: Optional[Dict] = None,
+                        completed_cache: Optional[Dict] = None,
+                        stations: Iterable[str] = FURNACE_STATIONS,
+                        max_m2: Optional[Dict[str, float]] = None) -> Dict[str, Dict[int, List[CutPiece]]]:
+    """
+    Sıralı siparişlerden fırın kuyrukları: {istasyon: {kalınlık: [CutPiece]}}.
+    Parça listeleri sipariş sırasını korur (ilk parça en acil).
+
+    max_m2: {istasyon: m²} verilirse kuyruk bu alana ulaşınca kesilir
+    (ör. bir günlük kapasite kadar iş).
+    """
+    progress_cache = progress_cache or {}
+    completed_cache = completed_cache or {}
+    stations = tuple(stations)
+    queue: Dict[str, Dict[int, List[CutPiece]]] = {}
+    queued_m2: Dict[str, float] = {}
+
+    for order in orders:
+        station = furnace_station(order.get('route', ''), stations)
+        if station is None or station in completed_cache.get(order.get('id'), []):
+            continue
+        if max_m2 and queued_m2.get(station, 0.0) >= max_m2.get(station, float('inf')):
+            continue
+
+        width, height = order.get('width') or 0, order.get('height') or 0
+        done = progress_cache.get(order.get('id'), {}).get(station, 0)
+        remaining = int(order.get('quantity') or 0) - int(done or 0)
+        if width <= 0 or height <= 0 or remaining <= 0:
+            continue
+
+        queue.setdefault(station, {}).setdefault(_thickness_mm(order.get('thickness')), []).append(CutPiece(
+            order_id=order.get('id'), order_code=order.get('order_code', ''),
+            width=float(width), height=float(height), quantity=remaining
+        ))
+        queued_m2[station] = queued_m2.get(station, 0.0) + width * height * remaining / 10000.0
+    return queue
+
+
+# =============================================================================
+# YÜK PLANI
+# =============================================================================
+def _load_order(remaining: List[int], pieces: List[CutPiece], head: int) -> List[int]:
+    """En acil parça + acil pencere (büyükten küçüğe) + boşluk dolduracak sonraki siparişler"""
+    window, backfill = [], []
+    for idx in range(head, len(pieces)):
+        if not remaining[idx]:
+            continue
+        if len(window) < LOOKAHEAD_ORDERS:
+            window.append(idx)
+        elif len(backfill) < BACKFILL_ORDERS:
+            backfill.append(idx)
+        else:
+            break
+    window[1:] = sorted(window[1:], key=lambda i: -(pieces[i].width * pieces[i].height))
+    return window + backfill
+
+
+def plan_loads(pieces: List[CutPiece], bed: FurnaceBed, thickness: int) -> Tuple[List[FurnaceLoad], List[int]]:
+    """
+    Tek kalınlık kuyruğunu yüklere böl; (yükler, parça başına kalan adet).
+    Yatağa hiç sığmayan parçalar kalan olarak döner.
+    """
+    sheet = StockSheet(plate_id=None, width=bed.width, height=bed.length, quantity=1)
+    cycle = bed.cycle_seconds(thickness)
+    usable_w = bed.width - 2 * bed.margin
+    usable_l = bed.length - 2 * bed.margin
+    remaining = [
+        p.quantity if (p.width <= usable_w and p.height <= usable_l) or (p.height <= usable_w and p.width <= usable_l)
+        else 0 for p in pieces
+    ]
+    unfit = [p.quantity - r for p, r in zip(pieces, remaining)]
+
+    loads: List[FurnaceLoad] = []
+    head = 0
+    while True:
+        while head < len(pieces) and not remaining[head]:
+            head += 1
+        if head >= len(pieces):
+            break
+
+        order = _load_order(remaining, pieces, head)
+        best = None
+        for fit in FIT_RULES:
+            placed = pack_sheet(sheet, pieces, remaining, order, fit=fit, guillotine=False,
+                                trim=bed.margin, kerf=bed.gap)
+            used = sum(p.width * p.height for _, p in placed)
+            if best is None or used > best[0]:
+                best = (used, placed)
+        placed = best[1]
+        if not placed:
+            break
+
+        used: Dict[int, int] = {}
+        for idx, _ in placed:
+            used[idx] = used.get(idx, 0) + 1
+        # Aynı yerleşim, adetler elverdikçe art arda basılır
+        repeat = min(remaining[idx] // count for idx, count in used.items())
+        for idx, count in used.items():
+            remaining[idx] -= count * repeat
+
+        loads.append(FurnaceLoad(
+            station=bed.station, thickness=thickness, cycle_sec=cycle, repeat=repeat,
+            layout=SheetLayout(plate_id=None, width=bed.width, height=bed.length,
+                               placements=[p for _, p in placed])
+        ))
+
+    return loads, [r + u for r, u in zip(remaining, unfit)]
+
+
+def plan_station(queue: Dict[int, List[CutPiece]], bed: FurnaceBed) -> Dict:
+    """
+    Bir fırının sıralı yük listesi. Kalınlık grupları en acil parçalarının
+    sırasına göre art arda basılır (reçete değişimi grup başında bir kez).
+
+    Returns: {'station', 'bed', 'loads' [FurnaceLoad], 'load_count', 'pieces',
+    'placed', 'unplaced' {order_id: adet}, 'fill', 'm2', 'cycle_hours',
+    'm2_per_hour', 'thickness_fill' {kalınlık: son yük hariç doluluk}, 'elapsed_ms'}
+    """
+    started = time.perf_counter()
+    loads: List[FurnaceLoad] = []
+    unplaced: Dict = {}
+    thickness_fill: Dict[int, float] = {}
+    total_pieces = 0
+
+    # Kuyruk sırası korunarak kalınlık grupları (dict ekleme sırası = ilk görülme)
+    for thickness, pieces in queue.items():
+        group_loads, remaining = plan_loads(pieces, bed, thickness)
+        loads.extend(group_loads)
+        total_pieces += sum(p.quantity for p in pieces)
+        for piece, left in zip(pieces, remaining):
+            if left:
+                unplaced[piece.order_id] = unplaced.get(piece.order_id, 0) + left
+        count = sum(l.repeat for l in group_loads)
+        m2 = sum(l.m2 * l.repeat for l in group_loads)
+        if count > 1:
+            # Kuyruğun son (yarım) yükü sonraki işlerle tamamlanır; doluluğa
+            # katılmaz. Tek yüklük grupta doluluk ölçülmüş sayılmaz (NOMINAL_FILL)
+            thickness_fill[thickness] = (m2 - group_loads[-1].m2) / ((count - 1) * bed.area_m2)
+
+    load_count = sum(l.repeat for l in loads)
+    m2 = sum(l.m2 * l.repeat for l in loads)
+    cycle_hours = sum(l.cycle_sec * l.repeat for l in loads) / 3600.0
+    return {
+        'station': bed.station,
+        'bed': bed,
+        'loads': loads,
+        'load_count': load_count,
+        'pieces': total_pieces,
+        'placed': total_pieces - sum(unplaced.values()),
+        'unplaced': unplaced,
+        'fill': round(m2 / (load_count * bed.area_m2), 4) if load_count else 0.0,
+        'm2': round(m2, 2),
+        'cycle_hours': round(cycle_hours, 2),
+        'm2_per_hour': round(m2 / cycle_hours, 2) if cycle_hours else 0.0,
+        'thickness_fill': {t: round(f, 4) for t, f in thickness_fill.items()},
+        'elapsed_ms': round((time.perf_counter() - started) * 1000, 1),
+    }
+
+
+# =============================================================================
+# PLANLAYICI KATSAYILARI
+# =============================================================================
+def furnace_factor(bed: FurnaceBed, thickness, fill: float = NOMINAL_FILL) -> float:
+    """
+    Kapasite katsayısı (referans: 4mm, NOMINAL_FILL doluluk = 1.0).
+    Saatte işlenen m² doluluk ile doğru, çevrim süresi ile ters orantılıdır.
+    """
+    factor = (fill / NOMINAL_FILL) * bed.cycle_seconds(REFERENCE_THICKNESS) / bed.cycle_seconds(thickness)
+    return round(min(FACTOR_LIMITS[1], max(FACTOR_LIMITS[0], factor)), 4)
+
+
+def furnace_factors(plans: Dict[str, Dict], beds: Dict[str, FurnaceBed],
+                    thicknesses: Iterable = ()) -> Dict[str, Dict[int, float]]:
+    """
+    {istasyon: {kalınlık: katsayı}}. Planı olan kalınlıklarda ölçülen
+    doluluk, diğerlerinde (thicknesses) NOMINAL_FILL kullanılır.
+    """
+    factors: Dict[str, Dict[int, float]] = {}
+    for station, bed in beds.items():
+        station_factors = {_thickness_mm(t): furnace_factor(bed, t) for t in thicknesses}
+        plan = plans.get(station)
+        if plan:
+            for thickness, fill in plan['thickness_fill'].items():
+                station_factors[thickness] = furnace_factor(bed, thickness, fill)
+        factors[station] = station_factors
+    return factors
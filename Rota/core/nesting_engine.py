@@ -0,0 +1,407 @@
+# -*- coding: utf-8 -*-
+"""
+EFES ROTA X - 2B Kesim Yerleşim (Nesting) Motoru
+Kesim istasyonları (INTERMAC / LIVA KESIM) için bekleyen parçaları stoktaki
+plakalara yerleştirir; plaka başına yerleşim, verim ve fire hesaplar.
+
+- Giyotin yerleşim (varsayılan): her kesim plakayı baştan sona böler, cam
+  kırma (break-out) ile uyumludur. İsteğe bağlı MaxRects (giyotin şartı yok)
+- Parçalar 90° döndürülebilir (desenli camlarda rotatable=False)
+- Plaka kenar payı (trim) ve kesim payı (kerf) cm cinsinden
+- Her yeni plaka için stoktaki ebatlar denenir, en yüksek verimli olan açılır;
+  bulunan desen adetler ve stok elverdikçe sonraki plakalarda tekrarlanır
+- Birden fazla sezgisel (sıralama × yer seçimi × bölme kuralı) süre bütçesi
+  içinde denenir; en az plaka alanı / en yüksek verim seçilir
+- Kalınlık/tip grupları birbirinden bağımsızdır; süre bütçesi gruplar
+  arasında parça sayısına göre paylaştırılır. Süreç havuzu açıksa gruplar
+  paralel çözülür (soğuk havuzun açılışı beklenmez)
+
+Birimler: plakalar ve siparişler gibi cm; alanlar raporda m².
+
+Kullanım:
+    pieces = [CutPiece(order_id=1, order_code="A-1", width=120, height=80, quantity=14)]
+    stock = [StockSheet(plate_id=7, width=321, height=225, quantity=20)]
+    result = nest_group(pieces, stock)
+    result['yield'], result['plates_used'], result['layouts'][0].placements
+"""
+
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+TRIM_CM = 1.0           # Plaka kenarlarından atılan pay (kırık kenar)
+KERF_CM = 0.0           # Kesimler arası pay (cam çizmede ~0)
+TIME_BUDGET = 0.8       # Tüm gruplar için toplam sezgisel deneme bütçesi (saniye)
+PARALLEL_MIN_PIECES = 150  # Toplam parça bunun altındaysa gruplar aynı süreçte çözülür
+
+# Sıralama anahtarları (büyükten küçüğe)
+SORT_KEYS = {
+    'area': lambda p: (p.width * p.height, max(p.width, p.height)),
+    'long_side': lambda p: (max(p.width, p.height), min(p.width, p.height)),
+    'perimeter': lambda p: (p.width + p.height, p.width * p.height),
+    'short_side': lambda p: (min(p.width, p.height), max(p.width, p.height)),
+}
+FIT_RULES = ('bssf', 'baf', 'blsf')       # En kısa kenar / en az alan / en kısa uzun kenar artığı
+SPLIT_RULES = ('short_axis', 'long_axis', 'max_area')
+
+
+@dataclass
+class CutPiece:
+    """Aynı ebattaki parçalar (bir siparişin kalan kesim adedi)"""
+    order_id: Optional[int]
+    order_code: str
+    width: float
+    height: float
+    quantity: int
+    rotatable: bool = True
+
+
+@dataclass
+class StockSheet:
+    """Stoktaki plaka ebadı (plates tablosu satırı)"""
+    plate_id: Optional[int]
+    width: float
+    height: float
+    quantity: int
+    location: str = ''
+
+
+@dataclass
+class Placement:
+    order_id: Optional[int]
+    order_code: str
+    x: float
+    y: float
+    width: float      # Plaka üzerindeki (döndürülmüşse çevrilmiş) ebat
+    height: float
+    rotated: bool = False
+
+
+@dataclass
+class SheetLayout:
+    """Bir plakanın kesim planı; repeat aynı planın kaç plakada uygulanacağı"""
+    plate_id: Optional[int]
+    width: float
+    height: float
+    placements: List[Placement] = field(default_factory=list)
+    repeat: int = 1
+
+    @property
+    def used_area(self) -> float:
+        return sum(p.width * p.height for p in self.placements)
+
+    @property
+    def yield_ratio(self) -> float:
+        area = self.width * self.height
+        return self.used_area / area if area else 0.0
+
+    def signature(self) -> Tuple:
+        return (self.plate_id, tuple((p.order_id, p.x, p.y, p.width, p.height) for p in self.placements))
+
+
+# =============================================================================
+# TEK PLAKA YERLEŞİMİ
+# =============================================================================
+def _fit_score(rule: str, fw: float, fh: float, pw: float, ph: float) -> Tuple[float, float]:
+    dw, dh = fw - pw, fh - ph
+    if rule == 'baf':
+        return (fw * fh - pw * ph, min(dw, dh))
+    if rule == 'blsf':
+        return (max(dw, dh), min(dw, dh))
+    return (min(dw, dh), max(dw, dh))
+
+
+def _best_free_rect(free: List[Tuple], w: float, h: float, rotatable: bool, rule: str):
+    """(skor, free index, döndürüldü mü) - sığmıyorsa None"""
+    best = None
+    for i, (fx, fy, fw, fh) in enumerate(free):
+        if w <= fw and h <= fh:
+            score = _fit_score(rule, fw, fh, w, h)
+            if best is None or score < best[0]:
+                best = (score, i, False)
+        if rotatable and w != h and h <= fw and w <= fh:
+            score = _fit_score(rule, fw, fh, h, w)
+            if best is None or score < best[0]:
+                best = (score, i, True)
+    return best
+
+
+def _split_guillotine(free: List[Tuple], index: int, w: float, h: float, split: str):
+    """Yerleşen parçanın kalan L alanını iki dikdörtgene böl (giyotin)"""
+    fx, fy, fw, fh = free.pop(index)
+    dw, dh = fw - w, fh - h
+    if split == 'short_axis':
+        horizontal = dw <= dh
+    elif split == 'long_axis':
+        horizontal = dw > dh
+    else:  # max_area: büyük artık parça bütün kalsın
+        horizontal = dw * fh < fw * dh
+
+    if horizontal:
+        right = (fx + w, fy, dw, h)
+        top = (fx, fy + h, fw, dh)
+    else:
+        right = (fx + w, fy, dw, fh)
+        top = (fx, fy + h, w, dh)
+    for rect in (right, top):
+        if rect[2] > 0 and rect[3] > 0:
+            free.append(rect)
+
+
+def _split_maxrects(free: List[Tuple], x: float, y: float, w: float, h: float):
+    """MaxRects: parçayla kesişen tüm boş alanları böl, kapsananları at"""
+    new_free = []
+    for fx, fy, fw, fh in free:
+        if x >= fx + fw or x + w <= fx or y >= fy + fh or y + h <= fy:
+            new_free.append((fx, fy, fw, fh))
+            continue
+        if x > fx:
+            new_free.append((fx, fy, x - fx, fh))
+        if x + w < fx + fw:
+            new_free.append((x + w, fy, fx + fw - x - w, fh))
+        if y > fy:
+            new_free.append((fx, fy, fw, y - fy))
+        if y + h < fy + fh:
+            new_free.append((fx, y + h, fw, fy + fh - y - h))
+
+    pruned = []
+    for i, a in enumerate(new_free):
+        contained = False
+        for j, b in enumerate(new_free):
+            if i != j and a[0] >= b[0] and a[1] >= b[1] and \
+                    a[0] + a[2] <= b[0] + b[2] and a[1] + a[3] <= b[1] + b[3]:
+                # Eşit dikdörtgenlerden sadece ilki kalır
+                if a != b or i > j:
+                    contained = True
+                    break
+        if not contained:
+            pruned.append(a)
+    free[:] = pruned
+
+
+def pack_sheet(sheet: StockSheet, pieces: List[CutPiece], remaining: List[int], order: List[int],
+               fit: str = 'bssf', split: str = 'short_axis', guillotine: bool = True,
+               trim: float = TRIM_CM, kerf: float = KERF_CM) -> List[Tuple[int, Placement]]:
+    """
+    Tek plakaya sırayla (order) sığan parçaları yerleştir. remaining
+    değiştirilmez; (parça index, yerleşim) listesi döner.
+
+    Boş alan sadece küçüldüğü için bir kez sığmayan parça tipi bu plakada
+    bir daha denenmez.
+    """
+    usable_w = sheet.width - 2 * trim + kerf
+    usable_h = sheet.height - 2 * trim + kerf
+    if usable_w <= 0 or usable_h <= 0:
+        return []
+
+    free = [(trim, trim, usable_w, usable_h)]
+    placed = []
+    for idx in order:
+        piece = pieces[idx]
+        left = remaining[idx]
+        w, h = piece.width + kerf, piece.height + kerf
+        while left > 0 and free:
+            best = _best_free_rect(free, w, h, piece.rotatable, fit)
+            if best is None:
+                break
+            _, fi, rotated = best
+            pw, ph = (h, w) if rotated else (w, h)
+            fx, fy = free[fi][0], free[fi][1]
+            if guillotine:
+                _split_guillotine(free, fi, pw, ph, split)
+            else:
+                _split_maxrects(free, fx, fy, pw, ph)
+            placed.append((idx, Placement(
+                order_id=piece.order_id, order_code=piece.order_code, x=fx, y=fy,
+                width=pw - kerf, height=ph - kerf, rotated=rotated
+            )))
+            left -= 1
+    return placed
+
+
+# =============================================================================
+# ÇOK PLAKA (tek sezgisel)
+# =============================================================================
+def _fits_any(piece: CutPiece, stock: List[StockSheet], trim: float, kerf: float) -> bool:
+    for sheet in stock:
+        uw, uh = sheet.width - 2 * trim + kerf, sheet.height - 2 * trim + kerf
+        w, h = piece.width + kerf, piece.height + kerf
+        if (w <= uw and h <= uh) or (piece.rotatable and h <= uw and w <= uh):
+            return True
+    return False
+
+
+def _pack_all(pieces: List[CutPiece], stock: List[StockSheet], sort_key: str, fit: str, split: str,
+              guillotine: bool, trim: float, kerf: float) -> Tuple[List[SheetLayout], List[int]]:
+    """Stok bitene veya parçalar yerleşene kadar plaka aç; (plakalar, kalan adetler)"""
+    order = sorted(range(len(pieces)), key=lambda i: SORT_KEYS[sort_key](pieces[i]), reverse=True)
+    remaining = [p.quantity if _fits_any(p, stock, trim, kerf) else 0 for p in pieces]
+    unfit = [p.quantity - r for p, r in zip(pieces, remaining)]
+    available = [s.quantity for s in stock]
+    layouts: List[SheetLayout] = []
+
+    while any(remaining):
+        best = None
+        for si, sheet in enumerate(stock):
+            if available[si] <= 0:
+                continue
+            placed = pack_sheet(sheet, pieces, remaining, order, fit, split, guillotine, trim, kerf)
+            if not placed:
+                continue
+            used = sum(p.width * p.height for _, p in placed)
+            score = (used / (sheet.width * sheet.height), used)
+            if best is None or score > best[0]:
+                best = (score, si, placed)
+        if best is None:
+            break  # Stok bitti / kalanlar hiçbir boş plakaya sığmıyor
+
+        _, si, placed = best
+        used: Dict[int, int] = {}
+        for idx, _ in placed:
+            used[idx] = used.get(idx, 0) + 1
+
+        # Adetler ve stok elverdikçe aynı desen tekrar kesilir (makinede
+        # tek program, hesapta plaka başına yeniden yerleşim yok)
+        repeat = min(available[si], min(remaining[idx] // count for idx, count in used.items()))
+        available[si] -= repeat
+        for idx, count in used.items():
+            remaining[idx] -= count * repeat
+        sheet = stock[si]
+        for _ in range(repeat):
+            layouts.append(SheetLayout(plate_id=sheet.plate_id, width=sheet.width, height=sheet.height,
+                                       placements=[p for _, p in placed]))
+
+    return layouts, [r + u for r, u in zip(remaining, unfit)]
+
+
+def _variants():
+    for sort_key in SORT_KEYS:
+        for fit in FIT_RULES:
+            for split in SPLIT_RULES:
+                yield sort_key, fit, split
+
+
+def _compress(layouts: List[SheetLayout]) -> List[SheetLayout]:
+    """Art arda aynı planları tek satırda topla (repeat)"""
+    merged: List[SheetLayout] = []
+    for layout in layouts:
+        if merged and merged[-1].signature() == layout.signature():
+            merged[-1].repeat += 1
+        else:
+            merged.append(layout)
+    return merged
+
+
+def nest_group(pieces: List[CutPiece], stock: List[StockSheet], time_budget: float = TIME_BUDGET,
+               guillotine: bool = True, trim: float = TRIM_CM, kerf: float = KERF_CM,
+               group: Optional[Tuple] = None) -> Dict:
+    """
+    Tek kalınlık/tip grubu için kesim planı.
+
+    Returns: {'group', 'layouts' (SheetLayout, repeat ile), 'plates_used'
+    {plate_id: adet}, 'sheets', 'pieces', 'placed', 'unplaced' {order_id: adet},
+    'yield', 'used_m2', 'waste_m2', 'heuristic', 'variants', 'elapsed_ms'}
+    """
+    started = time.perf_counter()
+    pieces = [p for p in pieces if p.quantity > 0 and p.width > 0 and p.height > 0]
+    stock = [s for s in stock if s.quantity > 0]
+    total_pieces = sum(p.quantity for p in pieces)
+
+    best = None
+    tried = 0
+    if pieces and stock:
+        deadline = started + time_budget
+        for sort_key, fit, split in _variants():
+            if not guillotine and split != SPLIT_RULES[0]:
+                continue  # MaxRects'te bölme kuralı yok
+            layouts, remaining = _pack_all(pieces, stock, sort_key, fit, split, guillotine, trim, kerf)
+            tried += 1
+            sheet_area = sum(l.width * l.height for l in layouts)
+            used_area = sum(l.used_area for l in layouts)
+            # Önce yerleşen parça, sonra harcanan plaka alanı, sonra son plakanın boşluğu
+            last_yield = layouts[-1].yield_ratio if layouts else 0.0
+            score = (-sum(remaining), sheet_area - used_area, -last_yield)
+            if best is None or score < best[0]:
+                best = (score, layouts, remaining, f"{'giyotin' if guillotine else 'maxrects'}/{sort_key}/{fit}/{split}")
+            if time.perf_counter() >= deadline:
+                break
+
+    layouts, remaining, heuristic = (best[1], best[2], best[3]) if best else ([], [p.quantity for p in pieces], '')
+
+    plates_used: Dict = {}
+    for layout in layouts:
+        plates_used[layout.plate_id] = plates_used.get(layout.plate_id, 0) + 1
+    unplaced: Dict = {}
+    for piece, left in zip(pieces, remaining):
+        if left:
+            unplaced[piece.order_id] = unplaced.get(piece.order_id, 0) + left
+
+    sheet_area = sum(l.width * l.height for l in layouts)
+    used_area = sum(l.used_area for l in layouts)
+    return {
+        'group': group,
+        'layouts': _compress(layouts),
+        'plates_used': plates_used,
+        'sheets': len(layouts),
+        'pieces': total_pieces,
+        'placed': total_pieces - sum(remaining),
+        'unplaced': unplaced,
+        'yield': round(used_area / sheet_area, 4) if sheet_area else 0.0,
+        'used_m2': round(used_area / 10000.0, 2),
+        'waste_m2': round((sheet_area - used_area) / 10000.0, 2),
+        'heuristic': heuristic,
+        'variants': tried,
+        'elapsed_ms': round((time.perf_counter() - started) * 1000, 1),
+    }
+
+
+def nest_chunk(jobs: List[Tuple], options: Dict) -> List[Dict]:
+    """
+    Birden fazla grubu sırayla çöz (jobs: (grup, parçalar, stok)).
+    options['time_budget'] tüm gruplar içindir: kalan süre, kalan grupların
+    parça sayısına göre paylaştırılır; erken biten grubun artanı sonrakilere kalır.
+    """
+    options = dict(options)
+    deadline = time.perf_counter() + options.pop('time_budget', TIME_BUDGET)
+    loads = [sum(p.quantity for p in pieces) for _, pieces, _ in jobs]
+
+    results = []
+    for i, (group, pieces, stock) in enumerate(jobs):
+        left = max(0.0, deadline - time.perf_counter())
+        share = left * loads[i] / sum(loads[i:]) if sum(loads[i:]) else left / (len(jobs) - i)
+        results.append(nest_group(pieces, stock, time_budget=share, group=group, **options))
+    return results
+
+
+def nest_groups(jobs: List[Tuple], runner=None, max_workers: Optional[int] = None, **options) -> List[Dict]:
+    """
+    Kalınlık/tip gruplarını çöz; sonuçlar girdi sırasıyla döner.
+
+    jobs: [(grup anahtarı, [CutPiece], [StockSheet])]. runner verilirse
+    (ScenarioRunner) gruplar parça yüküne göre dengelenip süreç havuzunda
+    paralel çözülür; her işçi aynı toplam bütçeyi kendi grupları arasında
+    paylaştırır. Havuz henüz açık değilse süreç açılışı bütçeyi aşacağından
+    bu çağrı aynı süreçte çözülür ve havuz sonraki planlar için arka planda açılır.
+    """
+    total = sum(p.quantity for _, pieces, _ in jobs for p in pieces)
+    workers = min(max_workers or (runner.max_workers if runner else 1), len(jobs))
+    if runner is None or workers <= 1 or total < PARALLEL_MIN_PIECES:
+        return nest_chunk(jobs, options)
+    if not runner.is_warm():
+        runner.warm_up()
+        return nest_chunk(jobs, options)
+
+    # Büyük gruplar önce, en az yüklü işçiye (LPT)
+    chunks: List[List[int]] = [[] for _ in range(workers)]
+    loads = [0] * workers
+    for index in sorted(range(len(jobs)), key=lambda i: -sum(p.quantity for p in jobs[i][1])):
+        target = loads.index(min(loads))
+        chunks[target].append(index)
+        loads[target] += sum(p.quantity for p in jobs[index][1])
+
+    chunk_results = runner.map(nest_chunk, [([jobs[i] for i in chunk], options) for chunk in chunks if chunk])
+    results: List[Optional[Dict]] = [None] * len(jobs)
+    for chunk, chunk_result in zip([c for c in chunks if c], chunk_results):
+        for index, result in zip(chunk, chunk_result):
+            results[index] = result
+    return results
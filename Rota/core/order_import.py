@@ -0,0 +1,400 @@
+# -*- coding: utf-8 -*-
+"""
+EFES ROTA X - Sipariş Aktarma (Ayrıştırma ve Doğrulama)
+
+Excel / CSV'den sipariş aktarımının Qt'den bağımsız kısmı:
+
+- iter_excel_chunks: openpyxl read_only modunda satırları parça parça
+  okur; tüm çalışma kitabı belleğe alınmaz, ilk parça hemen hazır olur
+- iter_csv_chunks: CSV/TSV dosyasını csv modülüyle satır satır okur
+  (kodlama utf-8-sig / utf-8 / cp1254, ayraç ; , veya sekme otomatik);
+  bellek kullanımı dosya boyutundan bağımsızdır
+- iter_order_chunks: uzantıya göre ikisinden birini seçer
+- parse_row: ham satırı beklenen sütunlara eşler, tiplerini düzeltir ve
+  doğrular (_valid / _errors)
+- mark_duplicates: sistemde kayıtlı sipariş kodlarını işaretler (_duplicate)
+- prepare_order: doğrulanmış satırı bulk_add_orders formatına çevirir
+
+Arayüz (views/excel_import_dialog.py) parçaları worker thread'de alır,
+önizlemeye ekler ve isterse okuma bitmeden aktarmaya başlar.
+"""
+
+import csv
+import codecs
+import os
+import re
+from datetime import datetime, timedelta
+
+try:
+    from utils.timezone_helper import get_current_date_turkey
+except ImportError:
+    get_current_date_turkey = lambda: datetime.now().date()
+
+CHUNK_SIZE = 500
+
+ORDERS_SHEET = "Siparişler"
+
+# Beklenen Excel sütun başlıkları (Türkçe)
+EXPECTED_COLUMNS = [
+    "Sipariş Kodu",
+    "Müşteri",
+    "Ürün Tipi",
+    "Kalınlık (mm)",
+    "Adet",
+    "Toplam m²",
+    "Öncelik",
+    "Teslim Tarihi",
+    "Rota",
+    "Not"
+]
+
+# Müşteri dosyalarında görülen diğer başlıklar (Türkçe karakter ve
+# boşluk/noktalama farkları ayrıca yok sayılır: "Siparis Kodu", "Toplam m2")
+COLUMN_ALIASES = {
+    "Sipariş Kodu": ["Sipariş No", "Kod"],
+    "Müşteri": ["Müşteri Adı", "Cari"],
+    "Ürün Tipi": ["Ürün", "Cam Tipi"],
+    "Kalınlık (mm)": ["Kalınlık", "mm"],
+    "Toplam m²": ["m²", "Metrekare"],
+    "Teslim Tarihi": ["Teslim", "Termin"],
+    "Not": ["Notlar", "Açıklama"],
+}
+
+CSV_EXTENSIONS = (".csv", ".tsv", ".txt")
+CSV_DELIMITERS = ";,\t|"
+
+# Kodlama ve ayraç tespiti için okunan örnek (bayt)
+SAMPLE_SIZE = 64 * 1024
+
+DEFAULT_DELIVERY_DAYS = 7
+
+_HEADER_FOLD = str.maketrans("çğıöşüÇĞİÖŞÜ²", "cgiosuCGIOSU2")
+
+
+def _header_key(text):
+    """Başlığı karşılaştırma anahtarına çevir (Türkçe harf, büyük/küçük, noktalama)"""
+    return re.sub(r"[^0-9a-z]", "", str(text).translate(_HEADER_FOLD).lower())
+
+
+def map_columns(headers):
+    """Başlık satırını beklenen sütunlara eşle -> {sütun: indeks}"""
+    headers = [str(h).strip() if h is not None else "" for h in headers]
+    keys = [_header_key(h) for h in headers]
+
+    column_map = {}
+    for expected_col in EXPECTED_COLUMNS:
+        # Tam eşleşme, yoksa normalize edilmiş ad veya eş anlamlılar
+        if expected_col in headers:
+            column_map[expected_col] = headers.index(expected_col)
+            continue
+        for name in [expected_col] + COLUMN_ALIASES.get(expected_col, []):
+            key = _header_key(name)
+            if key in keys and keys.index(key) not in column_map.values():
+                column_map[expected_col] = keys.index(key)
+                break
+    return column_map
+
+
+def _parse_decimal(value):
+    """Sayı veya metin -> float; CSV'deki "12,5" / "1.234,5" biçimi de kabul edilir"""
+    if not isinstance(value, str):
+        return float(value)
+    text = value.strip().replace(" ", "")
+    if "," in text:
+        text = text.replace(".", "").replace(",", ".")
+    return float(text)
+
+
+def convert_value(value, column_name):
+    """Hücre değerini sütun tipine göre dönüştür (boş -> None)"""
+    if value is None or str(value).strip() == "":
+        return None
+
+    # Tarih sütunu
+    if column_name == "Teslim Tarihi":
+        if isinstance(value, datetime):
+            return value.strftime("%d.%m.%Y")
+        return str(value).strip()
+
+    # Sayı sütunları
+    if column_name in ("Adet", "Kalınlık (mm)"):
+        try:
+            # Eğer Excel tarihe çevirdiyse, sayıya geri dön
+            if isinstance(value, datetime):
+                return int(value.day) if column_name == "Adet" else int(value.month)
+            return int(_parse_decimal(value))
+        except (TypeError, ValueError):
+            return None
+
+    # Ondalık sayı sütunları
+    if column_name == "Toplam m²":
+        try:
+            if isinstance(value, datetime):
+                return 0.0
+            return _parse_decimal(value)
+        except (TypeError, ValueError):
+            return None
+
+    # Metin sütunları
+    return str(value).strip()
+
+
+def parse_row(values, column_map, row_number):
+    """
+    Ham satırı sipariş sözlüğüne çevir ve doğrula.
+
+    Returns:
+        dict: beklenen sütunlar + _row_number, _valid, _errors, _selected
+        (boş satır için None)
+    """
+    if not any(v is not None and str(v).strip() != "" for v in values):
+        return None
+
+    order = {}
+    for expected_col in EXPECTED_COLUMNS:
+        idx = column_map.get(expected_col)
+        value = values[idx] if idx is not None and idx < len(values) else None
+        order[expected_col] = convert_value(value, expected_col)
+
+    errors = []
+    if not order.get("Sipariş Kodu"):
+        errors.append("Sipariş kodu eksik")
+    if not order.get("Müşteri"):
+        errors.append("Müşteri adı eksik")
+    adet = order.get("Adet")
+    if adet is None:
+        errors.append("Adet sayı olmalı")
+    elif adet <= 0:
+        errors.append("Adet 0'dan büyük olmalı")
+
+    order['_row_number'] = row_number
+    order['_errors'] = errors
+    order['_valid'] = not errors
+    # Geçerli olanlar otomatik seçilir
+    order['_selected'] = not errors
+    return order
+
+
+def mark_duplicates(chunk, existing_codes):
+    """
+    Sistemde kayıtlı sipariş kodlu satırları işaretle (_duplicate).
+
+    Bu satırlar varsayılan olarak seçilmez; kullanıcı bilerek seçerse
+    (ör. mevcut siparişe yeni satır) yine aktarılabilir.
+    """
+    for order in chunk:
+        duplicate = order.get("Sipariş Kodu") in existing_codes
+        order['_duplicate'] = duplicate
+        if duplicate:
+            order['_selected'] = False
+    return chunk
+
+
+def iter_excel_chunks(path, chunk_size=CHUNK_SIZE, on_total=None):
+    """
+    Excel dosyasını read_only modda okuyup doğrulanmış sipariş parçaları üret.
+
+    Args:
+        path: .xlsx dosyası ("Siparişler" sayfası, yoksa ilk sayfa)
+        chunk_size: Parça başına satır
+        on_total: on_total(tahmini_satir) - sayfa boyutu biliniyorsa bir kez
+
+    Yields:
+        list[dict]: parse_row çıktıları (boş satırlar atlanır)
+    """
+    import openpyxl
+
+    wb = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        ws = wb[ORDERS_SHEET] if ORDERS_SHEET in wb.sheetnames else wb.active
+
+        rows = ws.iter_rows(values_only=True)
+        headers = next(rows, None)
+        if headers is None:
+            return
+        column_map = map_columns(headers)
+
+        # read_only sayfada boyut, dosyadaki <dimension> etiketinden gelir (olmayabilir)
+        if on_total and ws.max_row and ws.max_row > 1:
+            on_total(ws.max_row - 1)
+
+        chunk = []
+        for row_number, values in enumerate(rows, start=2):
+            order = parse_row(values, column_map, row_number)
+            if order is None:
+                continue
+            chunk.append(order)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+    finally:
+        wb.close()
+
+
+def detect_encoding(path):
+    """
+    Dosyanın metin kodlamasını tahmin et.
+
+    BOM varsa utf-8-sig; ilk ASCII dışı baytları geçerli UTF-8 ise utf-8;
+    değilse Türkçe Windows (Excel'in "CSV olarak kaydet" çıktısı) cp1254.
+    Baştaki bloklar yalnız ASCII ise karar için dosya blok blok taranır.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    with open(path, "rb") as f:
+        block = f.read(SAMPLE_SIZE)
+        if block.startswith(codecs.BOM_UTF8):
+            return "utf-8-sig"
+        while block:
+            try:
+                # Blok çok baytlı bir karakterin ortasında bitebilir (final=False)
+                decoder.decode(block, final=False)
+            except UnicodeDecodeError:
+                return "cp1254"
+            if not block.isascii():
+                return "utf-8"
+            block = f.read(SAMPLE_SIZE)
+    return "utf-8"
+
+
+def detect_delimiter(text, path=""):
+    """Ayraç: .tsv -> sekme, değilse örnekten (Türkçe Excel ';' kullanır)"""
+    if path.lower().endswith(".tsv"):
+        return "\t"
+    try:
+        return csv.Sniffer().sniff(text, delimiters=CSV_DELIMITERS).delimiter
+    except csv.Error:
+        header = text.splitlines()[0] if text else ""
+        counts = {d: header.count(d) for d in CSV_DELIMITERS}
+        best = max(counts, key=counts.get)
+        return best if counts[best] else ","
+
+
+def iter_csv_chunks(path, chunk_size=CHUNK_SIZE, on_total=None, encoding=None, delimiter=None):
+    """
+    CSV/TSV dosyasını okuyup doğrulanmış sipariş parçaları üret.
+
+    Dosya satır satır okunur; bellekte yalnızca bir parça tutulur.
+
+    Args:
+        path: .csv / .tsv / .txt dosyası (ilk satır başlık)
+        chunk_size: Parça başına satır
+        on_total: on_total(tahmini_satir) - dosya boyutu / örnek satır uzunluğundan
+        encoding: Verilmezse detect_encoding
+        delimiter: Verilmezse detect_delimiter
+
+    Yields:
+        list[dict]: parse_row çıktıları (boş satırlar atlanır)
+    """
+    encoding = encoding or detect_encoding(path)
+    with open(path, "rb") as f:
+        sample = f.read(SAMPLE_SIZE)
+    text = sample.decode(encoding, errors="ignore")
+    if len(sample) == SAMPLE_SIZE:
+        # Son (yarım) satırı ayraç tespitine katma
+        text = text[:text.rfind("\n") + 1] or text
+    delimiter = delimiter or detect_delimiter(text, path)
+
+    if on_total:
+        lines = text.count("\n")
+        if len(sample) < SAMPLE_SIZE:
+            lines += 0 if text.endswith("\n") else 1
+            estimate = lines - 1
+        else:
+            estimate = int(os.path.getsize(path) * lines / len(sample)) - 1
+        if estimate > 0:
+            on_total(estimate)
+
+    with open(path, "r", encoding=encoding, errors="replace", newline="") as f:
+        reader = csv.reader(f, delimiter=delimiter)
+        headers = next(reader, None)
+        if headers is None:
+            return
+        column_map = map_columns(headers)
+
+        chunk = []
+        for values in reader:
+            # line_num: tırnak içinde satır sonu olan alanlarda da dosyadaki satır
+            order = parse_row(values, column_map, reader.line_num)
+            if order is None:
+                continue
+            chunk.append(order)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+
+def iter_order_chunks(path, chunk_size=CHUNK_SIZE, on_total=None):
+    """Dosya uzantısına göre CSV/TSV veya Excel okuyucusu"""
+    if os.path.splitext(path)[1].lower() in CSV_EXTENSIONS:
+        return iter_csv_chunks(path, chunk_size, on_total)
+    return iter_excel_chunks(path, chunk_size, on_total)
+
+
+def _safe_int(value, default=0):
+    if value is None or str(value).strip() == "":
+        return default
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return default
+
+
+def _safe_float(value, default=0.0):
+    if value is None or str(value).strip() == "":
+        return default
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def _safe_str(value, default=""):
+    if value is None or str(value).strip() == "":
+        return default
+    return str(value).strip()
+
+
+def _delivery_date(value, default):
+    """GG.AA.YYYY / datetime -> YYYY-MM-DD (boş veya bozuksa default)"""
+    if not value:
+        return default
+    if isinstance(value, datetime):
+        return value.strftime("%Y-%m-%d")
+    parts = str(value).strip().split('.')
+    if len(parts) == 3:
+        return f"{parts[2]}-{parts[1]}-{parts[0]}"
+    return str(value).strip()
+
+
+def prepare_order(order, default_date=None):
+    """Önizleme satırını bulk_add_orders formatına çevir"""
+    if default_date is None:
+        default_date = (get_current_date_turkey() + timedelta(days=DEFAULT_DELIVERY_DAYS)).strftime("%Y-%m-%d")
+
+    # Rotayı düzenle
+    route = _safe_str(order.get("Rota"))
+    if route and "SEVKIYAT" not in route:
+        route = route + ",SEVKIYAT"
+    elif not route:
+        route = "SEVKIYAT"
+
+    return {
+        "code": _safe_str(order.get("Sipariş Kodu")),
+        "customer": _safe_str(order.get("Müşteri")),
+        "product": _safe_str(order.get("Ürün Tipi"), "Düz Cam"),
+        "thickness": _safe_int(order.get("Kalınlık (mm)"), 6),
+        "width": _safe_float(order.get("Genişlik (mm)"), 0),
+        "height": _safe_float(order.get("Yükseklik (mm)"), 0),
+        "quantity": _safe_int(order.get("Adet"), 1),
+        "total_m2": _safe_float(order.get("Toplam m²"), 0),
+        "priority": _safe_str(order.get("Öncelik"), "Normal"),
+        "date": _delivery_date(order.get("Teslim Tarihi"), default_date),
+        "route": route,
+        "sale_price": _safe_float(order.get("Satış Fiyatı"), 0),
+        "notes": _safe_str(order.get("Not")),
+        "project_id": None
+    }
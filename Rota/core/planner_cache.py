@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+"""
+EFES ROTA X - Planlayıcı Disk Cache'i
+SmartPlanner simülasyon sonuçlarını uygulama yeniden başlasa bile saklar.
+
+Cache anahtarı (fingerprint) şunlardan oluşur:
+- Aktif siparişler (miktar, rota, öncelik, termin, sıra...)
+- Üretim ilerlemesi (production_logs sayısı / son kayıt)
+- Kapasiteler
+- Fabrika takvimi
+- Bugünün tarihi
+
+Veri değişmediyse PlanningView ve Haftalık Liste açılışı sadece dosya okumasıdır.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+from typing import Any, Optional
+
+
+class PlannerDiskCache:
+    """
+    Simülasyon sonucunu sıkıştırılmış JSON olarak saklar.
+
+    Sadece EN SON fingerprint tutulur (tarih anahtarın parçası olduğu için
+    eski kayıtlar zaten kullanılamaz).
+
+    Kullanım:
+        cache = PlannerDiskCache(db.app_data_dir)
+        result = cache.get(fingerprint)
+        if result is None:
+            result = run_simulation()
+            cache.set(fingerprint, result)
+    """
+
+    FILE_NAME = "planner_cache.json.gz"
+    FORMAT_VERSION = 2  # 2: sonuca seyrek zaman çizelgesi eklendi
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        self.cache_dir = cache_dir
+        self._lock = threading.Lock()
+
+        # Bellekteki kopya (aynı oturumda dosyayı tekrar okumamak için)
+        self._memory_key = None
+        self._memory_value = None
+
+        # İstatistikler
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def file_path(self) -> Optional[str]:
+        if not self.cache_dir:
+            return None
+        return os.path.join(self.cache_dir, self.FILE_NAME)
+
+    @staticmethod
+    def make_fingerprint(*parts: Any) -> str:
+        """Verilen parçalardan SHA256 fingerprint üret"""
+        json_str = json.dumps(parts, sort_keys=True, default=str, ensure_ascii=False)
+        return hashlib.sha256(json_str.encode('utf-8')).hexdigest()
+
+    def get(self, fingerprint: str) -> Optional[Any]:
+        """Fingerprint eşleşirse kayıtlı sonucu döndür"""
+        with self._lock:
+            if self._memory_key == fingerprint:
+                self.hits += 1
+                return self._memory_value
+
+            path = self.file_path
+            if not path or not os.path.exists(path):
+                self.misses += 1
+                return None
+
+            try:
+                with gzip.open(path, 'rt', encoding='utf-8') as f:
+                    payload = json.load(f)
+            except Exception as e:
+                print(f"Planlayıcı cache okuma hatası: {e}")
+                self.misses += 1
+                return None
+
+            if (payload.get('version') != self.FORMAT_VERSION or
+                    payload.get('fingerprint') != fingerprint):
+                self.misses += 1
+                return None
+
+            self._memory_key = fingerprint
+            self._memory_value = payload.get('data')
+            self.hits += 1
+            return self._memory_value
+
+    def set(self, fingerprint: str, data: Any):
+        """Sonucu belleğe ve diske yaz (atomik)"""
+        with self._lock:
+            self._memory_key = fingerprint
+            self._memory_value = data
+
+            path = self.file_path
+            if not path:
+                return
+
+            tmp_path = path + ".tmp"
+            try:
+                payload = {
+                    'version': self.FORMAT_VERSION,
+                    'fingerprint': fingerprint,
+                    'data': data
+                }
+                with gzip.open(tmp_path, 'wt', encoding='utf-8', compresslevel=5) as f:
+                    json.dump(payload, f, ensure_ascii=False, separators=(',', ':'))
+                os.replace(tmp_path, path)
+            except Exception as e:
+                print(f"Planlayıcı cache yazma hatası: {e}")
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+
+    def clear(self):
+        """Bellek ve disk cache'ini temizle"""
+        with self._lock:
+            self._memory_key = None
+            self._memory_value = None
+            path = self.file_path
+            if path and os.path.exists(path):
+                try:
+                    os.remove(path)
+                except OSError as e:
+                    print(f"Planlayıcı cache silme hatası: {e}")
+
+    def get_stats(self) -> dict:
+        """Cache istatistiklerini döndür"""
+        total_requests = self.hits + self.misses
+        hit_rate = (self.hits / total_requests * 100) if total_requests > 0 else 0
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(hit_rate, 2),
+            "file": self.file_path
+        }
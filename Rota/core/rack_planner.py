@@ -0,0 +1,314 @@
+# -*- coding: utf-8 -*-
+"""
+EFES ROTA X - Sevkiyat Sehpa Yükleme Planlayıcı
+Sevke hazır adetleri ölçü ve ağırlık sınırlarına göre sehpalara (Büyük L,
+Küçük L, Büyük A) dağıtır ve kamyon yükleme sırası önerir.
+
+- Cam sehpaya dik durur ve yüz yüze istiflenir: camın yatay kenarı sehpa
+  taban boyuna, dik kenarı yaslama yüksekliğine sığmalıdır. Uzun kenar
+  tabana (yatık) tercih edilir, sığmazsa dik konur
+- Sehpa yüzü boyunca yan yana istifler açılır; istif kalınlığı = cam
+  kalınlığı + ara takoz. Büyük camlar arkaya (sehpaya) gelir
+- Ağırlık: m² × mm × 2.5 kg. A sehpada her yüz toplam sınırın yarısını taşır
+- Her sehpa tek müşteriye yüklenir. Müşteri için her yeni sehpada tüm
+  tipler denenir; kalanı bitiren en küçük tip, yoksa en çok yük alan seçilir
+- Yükleme sırası: en son teslim edilecek müşteri önce (kasada en arkaya)
+
+Birimler: ölçüler cm, kalınlık mm, ağırlık kg.
+
+Kullanım:
+    plan = rack_planner.plan()           # Tüm sevke hazır siparişler
+    for load in plan['racks']:           # Yükleme sırasıyla
+        load.sequence, load.rack.name, load.customer, load.weight_kg, load.items
+"""
+
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+GLASS_KG_PER_M2_MM = 2.5   # Cam yoğunluğu (kg / m² / mm)
+SPACER_MM = 2.0            # Camlar arası ara takoz / mantar
+EPS = 1e-6
+
+
+@dataclass
+class RackType:
+    """Sehpa tipi ölçü ve yük sınırları"""
+    name: str
+    length: float                    # Taban boyu (cm) - camın yatay kenarı en fazla
+    height: float                    # Yaslama yüksekliği (cm) - camın dik kenarı en fazla
+    depth: float                     # Bir yüzdeki istif kalınlığı (cm)
+    max_weight: float                # Toplam taşıma sınırı (kg)
+    sides: int = 1                   # L sehpa tek yüz, A sehpa iki yüz
+    available: Optional[int] = None  # Eldeki sehpa adedi (None = sınırsız)
+
+
+DEFAULT_RACK_TYPES: Tuple[RackType, ...] = (
+    RackType("Büyük L", length=330, height=250, depth=40, max_weight=3000),
+    RackType("Küçük L", length=200, height=160, depth=30, max_weight=1200),
+    RackType("Büyük A", length=330, height=250, depth=35, max_weight=4500, sides=2),
+)
+
+
+@dataclass
+class ShipPiece:
+    """Bir siparişin sevke hazır, aynı ebattaki camları"""
+    order_id: Optional[int]
+    order_code: str
+    customer: str
+    width: float
+    height: float
+    thickness: float
+    quantity: int
+    delivery_date: str = ''
+
+    @property
+    def m2(self) -> float:
+        return self.width * self.height / 10000.0
+
+    @property
+    def weight_kg(self) -> float:
+        return self.m2 * self.thickness * GLASS_KG_PER_M2_MM
+
+
+@dataclass
+class RackItem:
+    order_id: Optional[int]
+    order_code: str
+    quantity: int
+    side: int = 0
+
+
+@dataclass
+class RackLoad:
+    """Tek sehpanın yükü; sequence kamyona yükleme sırası (1 = ilk)"""
+    rack: RackType
+    customer: str
+    items: List[RackItem] = field(default_factory=list)
+    weight_kg: float = 0.0
+    m2: float = 0.0
+    space_ratio: float = 0.0     # İstiflerin kapladığı taban alanı / sehpa taban alanı
+    delivery_date: str = ''
+    sequence: int = 0
+
+    @property
+    def pieces(self) -> int:
+        return sum(i.quantity for i in self.items)
+
+    @property
+    def fill(self) -> float:
+        """Ağırlık veya istif alanından hangisi sınıra daha yakınsa"""
+        return max(self.weight_kg / self.rack.max_weight, self.space_ratio)
+
+
+def orientation(piece: ShipPiece, rack: RackType) -> Optional[Tuple[float, float]]:
+    """Sehpadaki (taban boyu, yükseklik); sığmıyorsa None"""
+    long_side, short_side = max(piece.width, piece.height), min(piece.width, piece.height)
+    if long_side <= rack.length and short_side <= rack.height:
+        return long_side, short_side
+    if short_side <= rack.length and long_side <= rack.height:
+        return short_side, long_side
+    return None
+
+
+# =============================================================================
+# TEK SEHPA
+# =============================================================================
+def fill_rack(rack: RackType, pieces: List[ShipPiece], remaining: List[int],
+              order: Sequence[int]) -> Tuple[RackLoad, Dict[int, int]]:
+    """
+    Sehpaya sırayla (order) sığan camları yükle. remaining değiştirilmez;
+    (yük, {parça index: alınan adet}) döner.
+    """
+    side_weight_limit = rack.max_weight / rack.sides
+    sides = [{'stacks': [], 'length': 0.0, 'weight': 0.0} for _ in range(rack.sides)]
+    load = RackLoad(rack=rack, customer=pieces[order[0]].customer if order else '')
+    taken: Dict[Tuple[int, int], int] = {}
+
+    for idx in order:
+        piece = pieces[idx]
+        left = remaining[idx]
+        dims = orientation(piece, rack)
+        if not left or dims is None:
+            continue
+        base, _ = dims
+        thick = (piece.thickness + SPACER_MM) / 10.0
+        kg = piece.weight_kg
+
+        while left > 0:
+            placed = 0
+            # Hafif yüz önce (A sehpada denge)
+            for si in sorted(range(rack.sides), key=lambda s: sides[s]['weight']):
+                side = sides[si]
+                by_weight = int((side_weight_limit - side['weight']) / kg + EPS) if kg > 0 else left
+                if by_weight <= 0:
+                    continue
+                stack = next((s for s in side['stacks']
+                              if s['width'] >= base and s['depth'] + thick <= rack.depth + EPS), None)
+                if stack is None and side['length'] + base <= rack.length + EPS:
+                    stack = {'width': base, 'depth': 0.0}
+                    side['stacks'].append(stack)
+                    side['length'] += base
+                if stack is None:
+                    continue
+
+                by_depth = int((rack.depth - stack['depth']) / thick + EPS)
+                placed = min(left, by_depth, by_weight)
+                if placed <= 0:
+                    continue
+                stack['depth'] += placed * thick
+                side['weight'] += placed * kg
+                taken[(idx, si)] = taken.get((idx, si), 0) + placed
+                break
+            if not placed:
+                break
+            left -= placed
+
+    for (idx, si), qty in taken.items():
+        piece = pieces[idx]
+        load.items.append(RackItem(order_id=piece.order_id, order_code=piece.order_code, quantity=qty, side=si))
+        load.weight_kg += qty * piece.weight_kg
+        load.m2 += qty * piece.m2
+    footprint = sum(st['width'] * st['depth'] for side in sides for st in side['stacks'])
+    load.space_ratio = footprint / (rack.length * rack.depth * rack.sides)
+    dates = [pieces[idx].delivery_date for idx, _ in taken if pieces[idx].delivery_date]
+    load.delivery_date = min(dates) if dates else ''
+
+    per_piece: Dict[int, int] = {}
+    for (idx, _), qty in taken.items():
+        per_piece[idx] = per_piece.get(idx, 0) + qty
+    return load, per_piece
+
+
+# =============================================================================
+# TÜM SEVKİYAT
+# =============================================================================
+def _fits_any(piece: ShipPiece, rack_types: Sequence[RackType]) -> bool:
+    """Tek cam en az bir sehpa tipine ölçü ve ağırlık olarak sığıyor mu?"""
+    thick = (piece.thickness + SPACER_MM) / 10.0
+    return any(orientation(piece, rt) is not None and thick <= rt.depth
+               and piece.weight_kg <= rt.max_weight / rt.sides for rt in rack_types)
+
+
+def _piece_order(pieces: List[ShipPiece], indices: List[int]) -> List[int]:
+    """Büyük camlar önce (sehpaya yaslanan arka sıra)"""
+    return sorted(indices, key=lambda i: (max(pieces[i].width, pieces[i].height),
+                                          min(pieces[i].width, pieces[i].height), pieces[i].thickness),
+                  reverse=True)
+
+
+def plan_racks(pieces: List[ShipPiece], rack_types: Sequence[RackType] = DEFAULT_RACK_TYPES) -> Dict:
+    """
+    Sevke hazır camları sehpalara dağıt.
+
+    Returns: {'racks' [RackLoad, yükleme sırasıyla], 'customers' {müşteri:
+    {'racks', 'pieces', 'weight_kg', 'delivery_date'}}, 'unplaced' {order_id: adet},
+    'rack_count', 'by_type' {tip: adet}, 'pieces', 'placed', 'weight_kg', 'm2',
+    'elapsed_ms'}
+    """
+    started = time.perf_counter()
+    pieces = [p for p in pieces if p.quantity > 0 and p.width > 0 and p.height > 0]
+    remaining = [p.quantity if _fits_any(p, rack_types) else 0 for p in pieces]
+    unfit = [p.quantity - r for p, r in zip(pieces, remaining)]
+    available = {rt.name: rt.available for rt in rack_types}
+
+    customers: Dict[str, List[int]] = {}
+    for idx, piece in enumerate(pieces):
+        customers.setdefault(piece.customer or '-', []).append(idx)
+
+    loads: List[RackLoad] = []
+    for customer, indices in customers.items():
+        order = _piece_order(pieces, indices)
+        while any(remaining[i] for i in order):
+            left_kg = sum(remaining[i] * pieces[i].weight_kg for i in order)
+            best = None
+            for rt in rack_types:
+                if available[rt.name] is not None and available[rt.name] <= 0:
+                    continue
+                load, taken = fill_rack(rt, pieces, remaining, order)
+                if not load.items:
+                    continue
+                finishes = load.weight_kg >= left_kg - EPS
+                # Kalanı bitiren en küçük sehpa; yoksa en çok yük alan
+                score = (1, -rt.max_weight) if finishes else (0, load.weight_kg, load.m2)
+                if best is None or score > best[0]:
+                    best = (score, load, taken)
+            if best is None:
+                break  # Kalanlar hiçbir sehpaya sığmıyor / sehpa kalmadı
+
+            _, load, taken = best
+            load.customer = customer
+            for idx, qty in taken.items():
+                remaining[idx] -= qty
+            if available[load.rack.name] is not None:
+                available[load.rack.name] -= 1
+            loads.append(load)
+
+    # Teslim sırası: termini en yakın müşteri önce; kamyona ters sırada yüklenir
+    summary: Dict[str, Dict] = {}
+    for load in loads:
+        entry = summary.setdefault(load.customer, {'racks': 0, 'pieces': 0, 'weight_kg': 0.0, 'delivery_date': ''})
+        entry['racks'] += 1
+        entry['pieces'] += load.pieces
+        entry['weight_kg'] = round(entry['weight_kg'] + load.weight_kg, 1)
+        if load.delivery_date and (not entry['delivery_date'] or load.delivery_date < entry['delivery_date']):
+            entry['delivery_date'] = load.delivery_date
+
+    delivery_rank = {c: i for i, c in enumerate(sorted(summary, key=lambda c: (summary[c]['delivery_date'] or '9999', c)))}
+    loads.sort(key=lambda l: (-delivery_rank[l.customer], -l.weight_kg))
+    for sequence, load in enumerate(loads, 1):
+        load.sequence = sequence
+
+    unplaced: Dict = {}
+    for piece, left, big in zip(pieces, remaining, unfit):
+        if left + big:
+            unplaced[piece.order_id] = unplaced.get(piece.order_id, 0) + left + big
+
+    by_type: Dict[str, int] = {}
+    for load in loads:
+        by_type[load.rack.name] = by_type.get(load.rack.name, 0) + 1
+
+    total = sum(p.quantity for p in pieces)
+    return {
+        'racks': loads,
+        'customers': summary,
+        'unplaced': unplaced,
+        'rack_count': len(loads),
+        'by_type': by_type,
+        'pieces': total,
+        'placed': total - sum(remaining) - sum(unfit),
+        'weight_kg': round(sum(l.weight_kg for l in loads), 1),
+        'm2': round(sum(l.m2 for l in loads), 2),
+        'elapsed_ms': round((time.perf_counter() - started) * 1000, 1),
+    }
+
+
+class RackPlanner:
+    """Sevke hazır siparişlerden sehpa planı (ShippingView)"""
+
+    def __init__(self, rack_types: Sequence[RackType] = DEFAULT_RACK_TYPES):
+        self.rack_types = tuple(rack_types)
+        self.last_plan: Optional[Dict] = None
+
+    def build_pieces(self, orders: Optional[List[Dict]] = None) -> List[ShipPiece]:
+        """db.get_ready_to_ship() satırlarından parçalar"""
+        if orders is None:
+            from core.db_manager import db
+            orders = db.get_ready_to_ship()
+        return [
+            ShipPiece(order_id=o['id'], order_code=o['order_code'], customer=o.get('customer_name') or '-',
+                      width=float(o.get('width') or 0), height=float(o.get('height') or 0),
+                      thickness=float(o.get('thickness') or 0), quantity=int(o['ready_quantity']),
+                      delivery_date=o.get('delivery_date') or '')
+            for o in orders
+        ]
+
+    def plan(self, orders: Optional[List[Dict]] = None) -> Dict:
+        """Tüm sevke hazır siparişler için plan (worker thread'de çağrılabilir)"""
+        plan = plan_racks(self.build_pieces(orders), self.rack_types)
+        self.last_plan = plan
+        return plan
+
+
+# Global instance
+rack_planner = RackPlanner()
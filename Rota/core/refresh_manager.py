@@ -8,13 +8,20 @@ Event-driven refresh sistemi - Timer polling'i ortadan kaldırır
 - Version tracking (versiyon kontrolü)
 - Debounce (çok sık refresh engelleme)
 - Event-driven (timer yerine signal-based)
+- fetch/apply ayrımı (veri çekme worker pool'da, arayüz GUI thread'inde)
+- Döngü birleştirme (aynı anda kirlenen anahtarlar tek yenileme döngüsünde)
+- Görünürlük takibi (gizli sayfaların timer'ları durur, görününce tek yenileme)
 """
 
 from datetime import datetime, timedelta
-from typing import Dict, Callable, Optional, Set, Any
-from PySide6.QtCore import QObject, Signal, QTimer
+from typing import Dict, Callable, Optional, Set, Any, List
+from PySide6.QtCore import QObject, Signal, QTimer, QEvent
+from PySide6.QtWidgets import QWidget
 from collections import defaultdict
 import threading
+import time
+
+from core.db_async import run_async, TaskPriority
 
 
 class DataVersion:
@@ -41,43 +48,157 @@ class DebounceTimer:
 
     Örnek: 100ms içinde 10 tane refresh isteği gelirse,
     sadece 1 tane execute eder
+
+    Timer tek sefer oluşturulur ve her trigger'da sadece yeniden başlatılır
+    (her istekte yeni QTimer + deleteLater maliyeti yok).
+    Not: trigger/cancel GUI thread'inden çağrılmalıdır.
     """
-    def __init__(self, delay_ms: int = 500):
+    def __init__(self, delay_ms: int = 500, callback: Callable = None):
         self.delay_ms = delay_ms
-        self.timer = None
-        self.callback = None
-        self.lock = threading.Lock()
-
-    def trigger(self, callback: Callable):
+        self.callback = callback
+        self._timer = None
+
+    @property
+    def timer(self) -> QTimer:
+        """Kalıcı single-shot timer (ilk kullanımda oluşturulur)"""
+        if self._timer is None:
+            self._timer = QTimer()
+            self._timer.setSingleShot(True)
+            self._timer.timeout.connect(self._execute)
+        return self._timer
+
+    def trigger(self, callback: Callable = None):
         """
         Debounce'lu trigger
         Eğer delay süresi içinde tekrar çağrılırsa, timer resetlenir
         """
-        with self.lock:
-            if self.timer is not None:
-                self.timer.stop()
-                self.timer.deleteLater()
-
+        if callback is not None:
             self.callback = callback
-            self.timer = QTimer()
-            self.timer.setSingleShot(True)
-            self.timer.timeout.connect(self._execute)
-            self.timer.start(self.delay_ms)
+        # start() çalışan timer'ı baştan başlatır
+        self.timer.start(self.delay_ms)
 
     def _execute(self):
         """Callback'i çalıştır"""
         if self.callback:
             self.callback()
-            self.callback = None
+
+    def is_pending(self) -> bool:
+        """Bekleyen tetikleme var mı?"""
+        return self._timer is not None and self._timer.isActive()
 
     def cancel(self):
-        """İptal et"""
-        with self.lock:
-            if self.timer:
-                self.timer.stop()
-                self.timer.deleteLater()
-                self.timer = None
-            self.callback = None
+        """İptal et (timer silinmez, sadece durdurulur)"""
+        if self._timer is not None:
+            self._timer.stop()
+
+
+class ViewVisibility:
+    """
+    Bir sayfanın (widget) görünürlük durumu
+
+    Gizliyken yenilemeler atlanır ve sayfa 'stale' işaretlenir,
+    kendi timer'ları durdurulur. Tekrar göründüğünde timer'lar devam eder
+    ve gerekiyorsa tek bir telafi yenilemesi yapılır.
+    """
+    def __init__(self, widget: QWidget):
+        self.widget = widget
+        self.visible = widget.isVisible()
+        self.stale = False
+        self.hidden_since = None if self.visible else time.monotonic()
+
+        # Sayfanın kendi periyodik timer'ları
+        self.timers: List[QTimer] = []
+        self.suspended_timers: List[QTimer] = []
+
+        # Bu sayfaya bağlı kayıtlar
+        self.registrations: List['ViewRegistration'] = []
+
+    def add_timer(self, timer: QTimer):
+        if timer in self.timers:
+            return
+        self.timers.append(timer)
+        if not self.visible and timer.isActive():
+            timer.stop()
+            self.suspended_timers.append(timer)
+
+    def hide(self):
+        """Sayfa gizlendi: timer'ları durdur"""
+        if not self.visible:
+            return
+        self.visible = False
+        self.hidden_since = time.monotonic()
+        for timer in self.timers:
+            if timer.isActive():
+                timer.stop()
+                self.suspended_timers.append(timer)
+
+    def show(self) -> bool:
+        """
+        Sayfa göründü: timer'ları devam ettir
+
+        Returns:
+            True ise sayfa bayat, telafi yenilemesi gerekli
+        """
+        if self.visible:
+            return False
+        self.visible = True
+
+        hidden_ms = (time.monotonic() - self.hidden_since) * 1000 if self.hidden_since else 0
+        self.hidden_since = None
+
+        # Gizliyken en az bir timer periyodu dolduysa veri bayattır
+        for timer in self.suspended_timers:
+            if hidden_ms >= timer.interval():
+                self.stale = True
+            timer.start()
+        self.suspended_timers = []
+
+        needs_refresh = self.stale
+        self.stale = False
+        return needs_refresh
+
+
+class ViewRegistration:
+    """
+    RefreshManager'a kayıtlı tek bir view
+
+    İki kullanım şekli var:
+    - callback: Eski usul, GUI thread'inde senkron çalışır
+    - fetch + apply: fetch ortak worker havuzunda (run_async) çalışır (widget'a DOKUNMAZ, sadece
+      veri döndürür), apply dönen veriyle GUI thread'inde arayüzü günceller
+    """
+    def __init__(self, name: str, callback: Callable = None,
+                 fetch: Callable = None, apply: Callable = None):
+        self.name = name
+        self.callback = callback
+        self.fetch = fetch
+        self.apply = apply
+        self.active = True
+        self.visibility: Optional[ViewVisibility] = None
+
+        # Aynı view için üst üste fetch başlatılmaz
+        self.fetch_running = False
+        self.rerun_pending = False
+
+    @property
+    def is_async(self) -> bool:
+        return self.fetch is not None and self.apply is not None
+
+    @property
+    def identity(self) -> Callable:
+        """Aynı view'ı bir döngüde tek kez yenilemek için kimlik"""
+        return self.apply if self.is_async else self.callback
+
+    def matches(self, func: Callable) -> bool:
+        return func is not None and func in (self.callback, self.fetch, self.apply)
+
+
+def _callable_name(func: Callable) -> str:
+    """Bound method için sınıf adı (örn: 'OrdersView'), diğerleri için fonksiyon adı"""
+    owner = getattr(func, '__self__', None)
+    if owner is not None:
+        return type(owner).__name__
+    return getattr(func, '__name__', repr(func))
 
 
 class RefreshManager(QObject):
@@ -89,17 +210,35 @@ class RefreshManager(QObject):
     Kullanım:
         refresh_mgr = RefreshManager()
 
-        # View'ı kaydet
+        # View'ı kaydet (eski usul - GUI thread'inde senkron)
         refresh_mgr.register_view('orders', orders_view.refresh_data)
 
-        # Veri değiştiğinde bildir
+        # View'ı kaydet (önerilen - veri çekme arka planda)
+        refresh_mgr.register_view(
+            'orders',
+            fetch=orders_view.fetch_data,    # worker thread, widget yok
+            apply=orders_view.apply_data     # GUI thread, fetch sonucu ile
+        )
+
+        # Veri değiştiğinde bildir (herhangi bir thread'den)
         refresh_mgr.mark_dirty('orders')
 
-        # RefreshManager otomatik olarak debounce ile refresh eder
+        # Sayfa QWidget ise görünürlüğü otomatik izlenir: gizliyken
+        # yenilenmez, timers=[...] ile verilen timer'ları durdurulur
+        refresh_mgr.register_view('stocks', fetch=..., apply=...,
+                                  timers=[stock_view.timer])
+
+        # RefreshManager otomatik olarak debounce ile refresh eder.
+        # Aynı anda kirlenen anahtarlar tek bir yenileme döngüsünde birleşir,
+        # birden fazla anahtara bağlı bir view döngüde sadece 1 kez yenilenir.
     """
 
     # Signals
     data_changed = Signal(str)  # data_key değişti
+    refresh_cycle_started = Signal(list)  # döngüde yenilenen data_key'ler
+
+    # İç sinyal (thread geçişi için)
+    _dirty_requested = Signal(list)
 
     def __init__(self, debounce_ms: int = 500):
         super().__init__()
@@ -107,10 +246,10 @@ class RefreshManager(QObject):
         # Veri versiyonları
         self._versions: Dict[str, DataVersion] = {}
 
-        # View callbacks
-        self._view_callbacks: Dict[str, Set[Callable]] = defaultdict(set)
+        # Kayıtlı view'lar
+        self._views: Dict[str, List[ViewRegistration]] = defaultdict(list)
 
-        # Debounce timer'lar (her data_key için)
+        # Debounce timer'lar (her data_key için tek, kalıcı)
         self._debouncers: Dict[str, DebounceTimer] = {}
 
         # Debounce delay
@@ -119,20 +258,59 @@ class RefreshManager(QObject):
         # Dependency mapping (bir data değiştiğinde hangileri etkilenir)
         self._dependencies: Dict[str, Set[str]] = defaultdict(set)
 
+        # Debounce'u dolmuş, döngü bekleyen anahtarlar
+        self._ready_keys: List[str] = []
+        self._cycle_timer = None
+
+        # View bazlı süre ölçümleri
+        self._timings: Dict[str, Dict[str, float]] = {}
+
+        # Görünürlük takibi (id(widget) -> durum)
+        self._visibility: Dict[int, ViewVisibility] = {}
+        self._skipped: Dict[str, int] = {}
+
         # Lock
-        self._lock = threading.Lock()
+        self._lock = threading.RLock()
+
+        self._dirty_requested.connect(self._schedule_keys)
 
-    def register_view(self, data_key: str, callback: Callable, dependencies: list = None):
+    def register_view(self, data_key: str, callback: Callable = None,
+                      dependencies: list = None, fetch: Callable = None,
+                      apply: Callable = None, name: str = None,
+                      visibility_widget: QWidget = None, timers: list = None):
         """
         View'ı refresh sistemine kaydet
 
         Args:
             data_key: Veri anahtarı (örn: 'orders', 'production_logs')
-            callback: Refresh fonksiyonu
+            callback: Refresh fonksiyonu (GUI thread'inde senkron çalışır)
             dependencies: Bu view hangi data'lara bağımlı? (örn: ['orders', 'stations'])
+            fetch: Veriyi çeken saf fonksiyon (worker havuzunda çalışır, widget'a dokunmaz)
+            apply: fetch sonucunu arayüze basan fonksiyon (GUI thread'inde çalışır)
+            name: Süre ölçümlerinde görünecek isim
+            visibility_widget: Görünürlüğü izlenecek sayfa (varsayılan: fonksiyonun
+                sahibi QWidget ise kendisi). Gizliyken yenileme atlanır.
+            timers: Sayfa gizliyken durdurulacak periyodik timer'lar
         """
+        if (fetch is None) != (apply is None):
+            raise ValueError("fetch ve apply birlikte verilmelidir")
+        if callback is None and fetch is None:
+            raise ValueError("callback veya fetch/apply verilmelidir")
+
+        registration = ViewRegistration(
+            name=name or _callable_name(apply or callback),
+            callback=callback,
+            fetch=fetch,
+            apply=apply
+        )
+
         with self._lock:
-            self._view_callbacks[data_key].add(callback)
+            # Aynı fonksiyon ikinci kez kaydedilmez
+            for existing in self._views[data_key]:
+                if existing.identity == registration.identity:
+                    return existing
+
+            self._views[data_key].append(registration)
 
             # Versiyonu başlat
             if data_key not in self._versions:
@@ -140,74 +318,346 @@ class RefreshManager(QObject):
 
             # Debouncer oluştur
             if data_key not in self._debouncers:
-                self._debouncers[data_key] = DebounceTimer(self.debounce_ms)
+                self._debouncers[data_key] = DebounceTimer(
+                    self.debounce_ms,
+                    lambda key=data_key: self._enqueue_cycle(key)
+                )
 
             # Dependency mapping
             if dependencies:
                 for dep in dependencies:
                     self._dependencies[dep].add(data_key)
 
+        # Görünürlük takibi
+        if visibility_widget is None:
+            owner = getattr(apply or callback, '__self__', None)
+            if isinstance(owner, QWidget):
+                visibility_widget = owner
+        if visibility_widget is not None:
+            state = self._track_widget(visibility_widget)
+            state.registrations.append(registration)
+            registration.visibility = state
+            for timer in timers or []:
+                state.add_timer(timer)
+
+        return registration
+
     def unregister_view(self, data_key: str, callback: Callable):
-        """View'ı sistemden çıkar"""
+        """View'ı sistemden çıkar (callback, fetch veya apply ile)"""
         with self._lock:
-            if data_key in self._view_callbacks:
-                self._view_callbacks[data_key].discard(callback)
+            remaining = []
+            for registration in self._views.get(data_key, []):
+                if registration.matches(callback):
+                    registration.active = False
+                    if registration.visibility is not None:
+                        registration.visibility.registrations.remove(registration)
+                else:
+                    remaining.append(registration)
+            self._views[data_key] = remaining
 
     def mark_dirty(self, data_key: str, propagate: bool = True):
         """
         Veriyi 'dirty' olarak işaretle ve refresh tetikle
 
+        Worker thread'lerinden de çağrılabilir; timer işlemleri
+        GUI thread'ine aktarılır.
+
         Args:
             data_key: Değişen veri
             propagate: Bağımlı data'ları da dirty yap mı?
         """
         with self._lock:
-            # Versiyon artır
-            if data_key not in self._versions:
-                self._versions[data_key] = DataVersion()
+            keys = [data_key]
+            if propagate:
+                keys.extend(k for k in self._dependencies.get(data_key, ()) if k != data_key)
 
-            self._versions[data_key].increment()
+            for key in keys:
+                # Versiyon artır
+                if key not in self._versions:
+                    self._versions[key] = DataVersion()
+                self._versions[key].increment()
 
+        for key in keys:
             # Signal gönder
-            self.data_changed.emit(data_key)
+            self.data_changed.emit(key)
 
-            # Debounce ile refresh tetikle
-            if data_key in self._debouncers:
-                self._debouncers[data_key].trigger(
-                    lambda: self._refresh_views(data_key)
-                )
+        # Debounce ile refresh tetikle (GUI thread'inde)
+        self._dirty_requested.emit(keys)
+
+    def _schedule_keys(self, keys: list):
+        """Her anahtarın kendi debounce timer'ını yeniden başlat"""
+        for key in keys:
+            debouncer = self._debouncers.get(key)
+            if debouncer is not None:
+                debouncer.trigger()
+
+    def _enqueue_cycle(self, data_key: str):
+        """
+        Debounce süresi dolan anahtarı döngüye ekle
 
-            # Bağımlı data'ları da dirty yap
-            if propagate and data_key in self._dependencies:
-                for dependent in self._dependencies[data_key]:
-                    self.mark_dirty(dependent, propagate=False)
+        Aynı event loop turunda dolan tüm anahtarlar tek döngüde işlenir.
+        """
+        if data_key not in self._ready_keys:
+            self._ready_keys.append(data_key)
+
+        if self._cycle_timer is None:
+            self._cycle_timer = QTimer()
+            self._cycle_timer.setSingleShot(True)
+            self._cycle_timer.timeout.connect(self._run_cycle)
+        if not self._cycle_timer.isActive():
+            self._cycle_timer.start(0)
+
+    def _run_cycle(self):
+        """Bekleyen tüm anahtarları tek yenileme döngüsünde işle"""
+        keys, self._ready_keys = self._ready_keys, []
+        if keys:
+            self._refresh_keys(keys)
+
+    def _refresh_keys(self, keys: list, blocking: bool = False):
+        """
+        Anahtarlara kayıtlı view'ları yenile
+
+        Aynı view birden fazla anahtarda kayıtlıysa sadece bir kez çalışır.
+        """
+        with self._lock:
+            registrations = []
+            seen = set()
+            for key in keys:
+                for registration in self._views.get(key, []):
+                    if registration.identity in seen:
+                        continue
+                    seen.add(registration.identity)
+                    registrations.append(registration)
+
+        self.refresh_cycle_started.emit(list(keys))
+
+        for registration in registrations:
+            state = registration.visibility
+            if state is not None and not state.visible and not blocking:
+                # Gizli sayfa: şimdi yenileme, görününce telafi et
+                state.stale = True
+                self._record_skip(registration.name)
+                continue
+            self._start_refresh(registration, blocking)
+
+        # Dirty flag'i temizle
+        with self._lock:
+            for key in keys:
+                if key in self._versions:
+                    self._versions[key].mark_clean()
 
     def _refresh_views(self, data_key: str):
         """
         İlgili tüm view'ları refresh et
         """
-        callbacks = self._view_callbacks.get(data_key, set())
+        self._refresh_keys([data_key])
 
-        for callback in callbacks:
+    def _start_refresh(self, registration: ViewRegistration, blocking: bool = False):
+        """Tek bir view'ın yenilemesini başlat"""
+        if not registration.is_async:
+            start = time.perf_counter()
             try:
-                callback()
+                registration.callback()
             except Exception as e:
-                print(f"Refresh error for {data_key}: {e}")
+                print(f"Refresh error for {registration.name}: {e}")
+            self._record_timing(registration.name, None, (time.perf_counter() - start) * 1000)
+            return
+
+        if blocking:
+            # Çağıran anında güncel veri istiyor: fetch'i burada çalıştır
+            start = time.perf_counter()
+            result, error = None, None
+            try:
+                result = registration.fetch()
+            except Exception as e:
+                error = e
+            self._apply_result(registration, result, error, (time.perf_counter() - start) * 1000)
+            return
+
+        # Önceki fetch bitmeden yenisi başlatılmaz; bitince bir kez daha çalışır
+        if registration.fetch_running:
+            registration.rerun_pending = True
+            return
+
+        registration.fetch_running = True
+
+        def timed_fetch():
+            start = time.perf_counter()
+            result = registration.fetch()
+            return result, (time.perf_counter() - start) * 1000
+
+        # Sonuç/hata GUI thread'inde döner
+        run_async(
+            timed_fetch,
+            callback=lambda out: self._on_fetch_finished(registration, out[0], None, out[1]),
+            error_callback=lambda msg: self._on_fetch_finished(registration, None, msg, None),
+            priority=TaskPriority.NORMAL
+        )
+
+    # =========================================================================
+    # GÖRÜNÜRLÜK
+    # =========================================================================
+
+    def _track_widget(self, widget: QWidget) -> ViewVisibility:
+        """Widget'ın Show/Hide olaylarını izlemeye başla"""
+        key = id(widget)
+        state = self._visibility.get(key)
+        if state is None:
+            state = ViewVisibility(widget)
+            self._visibility[key] = state
+            widget.installEventFilter(self)
+            widget.destroyed.connect(lambda _=None, k=key: self._untrack_widget(k))
+        return state
+
+    def _untrack_widget(self, key: int):
+        """Silinen widget'ın kayıtlarını pasifleştir"""
+        state = self._visibility.pop(key, None)
+        if state is None:
+            return
+        with self._lock:
+            for registration in state.registrations:
+                registration.active = False
+                for views in self._views.values():
+                    if registration in views:
+                        views.remove(registration)
+
+    def eventFilter(self, obj, event):
+        event_type = event.type()
+        if event_type in (QEvent.Show, QEvent.Hide):
+            state = self._visibility.get(id(obj))
+            if state is not None and state.widget is obj:
+                if event_type == QEvent.Show:
+                    self._on_view_shown(state)
+                else:
+                    state.hide()
+        return False
+
+    def _on_view_shown(self, state: ViewVisibility):
+        """Sayfa göründü: bayatsa tek telafi yenilemesi yap"""
+        if state.show():
+            self._refresh_visibility_state(state)
+
+    def _refresh_visibility_state(self, state: ViewVisibility):
+        """Sayfaya bağlı view'ları birer kez yenile"""
+        seen = set()
+        for registration in list(state.registrations):
+            if registration.active and registration.identity not in seen:
+                seen.add(registration.identity)
+                self._start_refresh(registration)
+
+    def is_view_visible(self, widget: QWidget) -> bool:
+        """İzlenen sayfa şu an görünür mü? (izlenmiyorsa widget'a sorulur)"""
+        state = self._visibility.get(id(widget))
+        if state is not None and state.widget is widget:
+            return state.visible
+        return widget.isVisible()
+
+    def mark_view_stale(self, widget: QWidget):
+        """
+        Sayfayı bayat işaretle
 
-        # Dirty flag'i temizle
-        if data_key in self._versions:
-            self._versions[data_key].mark_clean()
+        Görünürse hemen yenilenir, gizliyse görününce yenilenir.
+        """
+        state = self._visibility.get(id(widget))
+        if state is None or state.widget is not widget:
+            return
+        if state.visible:
+            self._refresh_visibility_state(state)
+        else:
+            state.stale = True
+
+    def _record_skip(self, name: str):
+        with self._lock:
+            self._skipped[name] = self._skipped.get(name, 0) + 1
+
+    def _on_fetch_finished(self, registration: ViewRegistration, result: Any,
+                           error: Optional[str], fetch_ms: Optional[float]):
+        """fetch bitti (GUI thread'i): apply'ı çalıştır"""
+        registration.fetch_running = False
+        self._apply_result(registration, result, error, fetch_ms)
+
+        if registration.rerun_pending and registration.active:
+            registration.rerun_pending = False
+            self._start_refresh(registration)
+
+    def _apply_result(self, registration: ViewRegistration, result: Any,
+                      error: Optional[Any], fetch_ms: Optional[float]):
+        if not registration.active:
+            return
+        if error is not None:
+            print(f"Refresh fetch error for {registration.name}: {error}")
+            self._record_timing(registration.name, fetch_ms, None)
+            return
+
+        start = time.perf_counter()
+        try:
+            registration.apply(result)
+        except Exception as e:
+            print(f"Refresh apply error for {registration.name}: {e}")
+        self._record_timing(registration.name, fetch_ms, (time.perf_counter() - start) * 1000)
+
+    def _record_timing(self, name: str, fetch_ms: Optional[float], apply_ms: Optional[float]):
+        """View bazlı fetch/apply sürelerini kaydet"""
+        with self._lock:
+            stats = self._timings.setdefault(name, {
+                'runs': 0,
+                'last_fetch_ms': 0.0, 'total_fetch_ms': 0.0, 'max_fetch_ms': 0.0,
+                'last_apply_ms': 0.0, 'total_apply_ms': 0.0, 'max_apply_ms': 0.0,
+            })
+            stats['runs'] += 1
+            if fetch_ms is not None:
+                stats['last_fetch_ms'] = fetch_ms
+                stats['total_fetch_ms'] += fetch_ms
+                stats['max_fetch_ms'] = max(stats['max_fetch_ms'], fetch_ms)
+            if apply_ms is not None:
+                stats['last_apply_ms'] = apply_ms
+                stats['total_apply_ms'] += apply_ms
+                stats['max_apply_ms'] = max(stats['max_apply_ms'], apply_ms)
+
+    def get_timings(self) -> Dict[str, Dict[str, float]]:
+        """
+        View bazlı yenileme süreleri (ms)
 
-    def force_refresh(self, data_key: str):
+        Returns:
+            {'OrdersView': {'runs': 3, 'last_fetch_ms': 41.2,
+             'avg_fetch_ms': 38.0, 'last_apply_ms': 12.5, ...}, ...}
+        """
+        with self._lock:
+            result = {}
+            for name, stats in self._timings.items():
+                runs = stats['runs'] or 1
+                entry = {k: round(v, 2) if isinstance(v, float) else v for k, v in stats.items()}
+                entry['avg_fetch_ms'] = round(stats['total_fetch_ms'] / runs, 2)
+                entry['avg_apply_ms'] = round(stats['total_apply_ms'] / runs, 2)
+                entry['skipped_hidden'] = self._skipped.get(name, 0)
+                result[name] = entry
+            # Hiç çalışmamış ama gizli olduğu için atlanmış view'lar
+            for name, skipped in self._skipped.items():
+                if name not in result:
+                    result[name] = {'runs': 0, 'skipped_hidden': skipped}
+            return result
+
+    def reset_timings(self):
+        """Süre ölçümlerini sıfırla"""
+        with self._lock:
+            self._timings.clear()
+            self._skipped.clear()
+
+    def force_refresh(self, data_key: str, blocking: bool = False):
         """
         Debounce'u bypass et, hemen refresh et
+
+        Args:
+            blocking: True ise fetch de bu thread'de çalışır, dönüşte veri günceldir
         """
         # Debouncer'ı iptal et
         if data_key in self._debouncers:
             self._debouncers[data_key].cancel()
+        if data_key in self._ready_keys:
+            self._ready_keys.remove(data_key)
 
         # Hemen refresh
-        self._refresh_views(data_key)
+        self._refresh_keys([data_key], blocking=blocking)
 
     def get_version(self, data_key: str) -> Optional[DataVersion]:
         """Veri versiyonunu al"""
@@ -266,7 +716,7 @@ def requires_refresh(data_key: str):
         def wrapper(*args, **kwargs):
             # Eğer dirty ise refresh et
             if refresh_manager.is_dirty(data_key):
-                refresh_manager.force_refresh(data_key)
+                refresh_manager.force_refresh(data_key, blocking=True)
             return func(*args, **kwargs)
         return wrapper
     return decorator
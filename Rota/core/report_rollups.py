@@ -0,0 +1,218 @@
+# -*- coding: utf-8 -*-
+"""
+EFES ROTA X - Günlük Rapor Özetleri (Rollup)
+
+Raporlar production_logs tablosunu her açılışta baştan toplamak yerine
+üç özet tablodan okur:
+
+- rollup_station_daily         (gün, istasyon)
+- rollup_operator_daily        (gün, operatör)
+- rollup_station_action_daily  (gün, istasyon, işlem)
+
+Her satırda kayıt sayısı, adet, m² ve süre (start_time/end_time, dakika)
+tutulur; istasyon ve operatör tablolarında ayrıca tamamlanan ve fire
+kırılımları vardır.
+
+Özetler her log eklemesinde aynı SQL ile artımlı güncellenir
+(record_log), sipariş silinirken logları düşülür (remove_order_logs);
+sipariş ölçüleri/adedi değişince logları düşülüp yeniden eklenir.
+Tutarsızlık şüphesinde tamamen yeniden hesaplanabilir:
+
+    python -m core.report_rollups            # ROTA_DB_PATH / varsayılan DB
+    python -m core.report_rollups --db x.db  # belirli dosya
+"""
+
+import sqlite3
+
+STATION_TABLE = "rollup_station_daily"
+OPERATOR_TABLE = "rollup_operator_daily"
+ACTION_TABLE = "rollup_station_action_daily"
+
+M2_TOLERANCE = 1e-6  # is_consistent: toplam m² için bağıl tolerans (kayan nokta)
+
+# Dönem anahtarları (rollup 'day' kolonu üzerinden)
+PERIOD_EXPRESSIONS = {
+    'day': "day",
+    'month': "substr(day, 1, 7)",
+    'year': "substr(day, 1, 4)",
+}
+
+_TOTAL_COLUMNS = """
+    log_count INTEGER NOT NULL DEFAULT 0,
+    quantity INTEGER NOT NULL DEFAULT 0,
+    m2 REAL NOT NULL DEFAULT 0,
+    duration_min REAL NOT NULL DEFAULT 0"""
+
+_SPLIT_COLUMNS = """,
+    completed_qty INTEGER NOT NULL DEFAULT 0,
+    completed_m2 REAL NOT NULL DEFAULT 0,
+    fire_qty INTEGER NOT NULL DEFAULT 0,
+    fire_m2 REAL NOT NULL DEFAULT 0"""
+
+SCHEMA = [
+    f"""CREATE TABLE IF NOT EXISTS {STATION_TABLE} (
+        day TEXT NOT NULL,
+        station_name TEXT NOT NULL,{_TOTAL_COLUMNS}{_SPLIT_COLUMNS},
+        PRIMARY KEY (day, station_name)
+    )""",
+    f"""CREATE TABLE IF NOT EXISTS {OPERATOR_TABLE} (
+        day TEXT NOT NULL,
+        operator_name TEXT NOT NULL,{_TOTAL_COLUMNS}{_SPLIT_COLUMNS},
+        PRIMARY KEY (day, operator_name)
+    )""",
+    f"""CREATE TABLE IF NOT EXISTS {ACTION_TABLE} (
+        day TEXT NOT NULL,
+        station_name TEXT NOT NULL,
+        action TEXT NOT NULL,{_TOTAL_COLUMNS},
+        PRIMARY KEY (day, station_name, action)
+    )""",
+]
+
+# Birim m²: ölçü varsa en x boy, yoksa beyan edilen toplam / adet
+_UNIT_M2 = """CASE
+    WHEN o.width > 0 AND o.height > 0 THEN o.width * o.height / 10000.0
+    WHEN o.quantity > 0 THEN COALESCE(o.declared_total_m2, 0) * 1.0 / o.quantity
+    ELSE 0 END"""
+
+
+def _minutes(column):
+    return f"(substr({column}, 1, 2) * 60 + substr({column}, 4, 2))"
+
+
+# "HH:mm" aralığı; bitiş başlangıçtan küçükse gece yarısı geçilmiştir
+_DURATION_MIN = f"""CASE
+    WHEN pl.start_time GLOB '[0-2][0-9]:[0-5][0-9]*'
+     AND pl.end_time GLOB '[0-2][0-9]:[0-5][0-9]*'
+    THEN ({_minutes('pl.end_time')} - {_minutes('pl.start_time')} + 1440) % 1440
+    ELSE 0 END"""
+
+# Fire sınıflandırması get_fire_analysis_data ile aynı
+_IS_FIRE = "(pl.action LIKE '%Fire%' OR pl.action LIKE '%Kırık%')"
+
+_SOURCE = f"""
+    SELECT COALESCE(substr(pl.timestamp, 1, 10), '') AS day,
+           COALESCE(pl.station_name, '') AS station_name,
+           COALESCE(pl.operator_name, '') AS operator_name,
+           COALESCE(pl.action, '') AS action,
+           COALESCE(pl.quantity, 0) AS quantity,
+           COALESCE(pl.quantity, 0) * COALESCE({_UNIT_M2}, 0) AS m2,
+           {_DURATION_MIN} AS duration_min,
+           COALESCE(pl.action = 'Tamamlandi', 0) AS is_completed,
+           COALESCE({_IS_FIRE}, 0) AS is_fire
+    FROM production_logs pl
+    LEFT JOIN orders o ON o.id = pl.order_id
+    WHERE {{where}}
+"""
+
+_TOTAL_SELECT = "{s} * COUNT(*), {s} * SUM(quantity), {s} * SUM(m2), {s} * SUM(duration_min)"
+_SPLIT_SELECT = (", {s} * SUM(quantity * is_completed), {s} * SUM(m2 * is_completed),"
+                 " {s} * SUM(quantity * is_fire), {s} * SUM(m2 * is_fire)")
+
+_TOTAL_NAMES = ["log_count", "quantity", "m2", "duration_min"]
+_SPLIT_NAMES = ["completed_qty", "completed_m2", "fire_qty", "fire_m2"]
+
+
+def _upsert_sql(table, keys, split, sign):
+    names = _TOTAL_NAMES + (_SPLIT_NAMES if split else [])
+    select = _TOTAL_SELECT + (_SPLIT_SELECT if split else "")
+    key_list = ", ".join(keys)
+    updates = ", ".join(f"{n} = {n} + excluded.{n}" for n in names)
+    return f"""
+        INSERT INTO {table} ({key_list}, {", ".join(names)})
+        SELECT {key_list}, {select.format(s=sign)}
+        FROM ({_SOURCE}) src
+        GROUP BY {key_list}
+        ON CONFLICT({key_list}) DO UPDATE SET {updates}
+    """
+
+
+_TARGETS = [
+    (STATION_TABLE, ("day", "station_name"), True),
+    (OPERATOR_TABLE, ("day", "operator_name"), True),
+    (ACTION_TABLE, ("day", "station_name", "action"), False),
+]
+
+
+def create_tables(conn):
+    """Özet tablolarını oluştur (init_database içinden çağrılır)"""
+    for sql in SCHEMA:
+        conn.execute(sql)
+
+
+def apply_logs(conn, where, params=(), sign=1):
+    """
+    WHERE koşuluna uyan logları özetlere ekle (sign=1) veya düş (sign=-1).
+
+    Artımlı güncelleme ve yeniden hesaplama aynı SQL'i kullanır; böylece
+    iki yol aynı sonucu verir. Düşme sonrası boşalan satırlar silinir.
+    """
+    sign = 1 if sign >= 0 else -1
+    for table, keys, split in _TARGETS:
+        conn.execute(_upsert_sql(table, keys, split, sign).replace("{where}", where), params)
+    if sign < 0:
+        for table, _, _ in _TARGETS:
+            conn.execute(f"DELETE FROM {table} WHERE log_count <= 0")
+
+
+def record_log(conn, log_id):
+    """Yeni eklenen tek logu özetlere işle"""
+    apply_logs(conn, "pl.id = ?", (log_id,))
+
+
+def remove_order_logs(conn, order_id):
+    """Siparişin loglarını özetlerden düş (loglar ve sipariş silinmeden önce)"""
+    apply_logs(conn, "pl.order_id = ?", (order_id,), sign=-1)
+
+
+def rebuild(conn):
+    """Özetleri production_logs'tan baştan hesapla, işlenen log sayısını döndür"""
+    for table, _, _ in _TARGETS:
+        conn.execute(f"DELETE FROM {table}")
+    apply_logs(conn, "1")
+    return conn.execute(f"SELECT COALESCE(SUM(log_count), 0) FROM {STATION_TABLE}").fetchone()[0]
+
+
+def is_consistent(conn):
+    """
+    Özetlerdeki kayıt sayısı, adet ve m² production_logs ile eşleşiyor mu.
+    m² siparişin ölçülerinden geldiği için sipariş düzenlemesi de yakalanır.
+    """
+    rolled = conn.execute(f"""
+        SELECT COALESCE(SUM(log_count), 0), COALESCE(SUM(quantity), 0), COALESCE(SUM(m2), 0)
+        FROM {STATION_TABLE}
+    """).fetchone()
+    actual = conn.execute(f"""
+        SELECT COUNT(*), COALESCE(SUM(quantity), 0), COALESCE(SUM(m2), 0)
+        FROM ({_SOURCE.replace("{where}", "1")})
+    """).fetchone()
+    return (rolled[0] == actual[0] and rolled[1] == actual[1]
+            and abs(rolled[2] - actual[2]) <= M2_TOLERANCE * max(1.0, abs(actual[2])))
+
+
+def main(argv=None):
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Rapor özet tablolarını yeniden hesapla")
+    parser.add_argument("--db", help="Veritabanı dosyası (varsayılan: uygulama veritabanı)")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    if args.db:
+        conn = sqlite3.connect(args.db)
+        try:
+            with conn:
+                create_tables(conn)
+                count = rebuild(conn)
+        finally:
+            conn.close()
+    else:
+        from core.db_manager import db
+        count = db.rebuild_report_rollups()
+
+    print(f"Rapor özetleri yeniden hesaplandı: {count} log, {time.perf_counter() - start:.2f} sn")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
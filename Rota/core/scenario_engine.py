@@ -0,0 +1,368 @@
+# -*- coding: utf-8 -*-
+"""
+EFES ROTA X - What-If Senaryo Motoru
+"X'i en üste alırsak", "TEMPER A1 Perşembe arızalı olursa", "800 m²'lik
+şu siparişi alırsak" sorularını gerçek planlayıcı modeliyle ve toplu cevaplar.
+
+- Tüm senaryolar aynı başlangıç durumunu (ScenarioBaseline) paylaşır;
+  veritabanı bir kez okunur
+- Senaryolar süreç havuzunda paralel değerlendirilir (GIL yok); işçiler
+  sadece bu modülü ve schedule_engine'i yükler, veritabanına dokunmaz
+- Her senaryo için mevcut plana göre sipariş bitiş farkları döner
+
+Mutasyonlar (senaryo içinde sırayla uygulanır):
+    {'type': 'reorder',   'order_id': 12, 'position': 0}
+    {'type': 'sequence',  'order_ids': [12, 7, 3, ...]}   # Elle sıra (kalanlar sona)
+    {'type': 'priority',  'order_id': 12, 'priority': 'Kritik'}
+    {'type': 'capacity',  'station': 'TEMPER A1', 'factor': 0.5}   # veya 'capacity': 400
+    {'type': 'holiday',   'day': '2026-10-22', 'station': 'TEMPER A1'}  # station yoksa fabrika
+    {'type': 'new_order', 'order': {...AddOrderDialog verisi...}, 'code': 'TEKLIF-1'}
+
+    Sipariş 'order_id' yerine 'order_code' ile de seçilebilir.
+
+Kullanım:
+    results = planner.evaluate_scenarios([
+        {'name': 'A en üste', 'mutations': [{'type': 'reorder', 'order_id': 5, 'position': 0}]},
+        {'name': 'Temper arıza', 'mutations': [{'type': 'holiday', 'day': 3, 'station': 'TEMPER A1'}]},
+    ])
+"""
+
+import math
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Callable, Dict, List, Optional
+
+from core.schedule_engine import (
+    WorkCalendar, EventScheduler, sequence_orders, order_steps,
+    make_simulated_order, parse_date
+)
+
+
+@dataclass
+class ScenarioBaseline:
+    """Senaryoların ortak başlangıç durumu (pickle edilebilir, DB'siz)"""
+    today: date
+    orders: List[Dict]
+    progress_cache: Dict
+    completed_cache: Dict
+    capacities: Dict[str, float]
+    thickness_factors: Dict[int, float]
+    default_factor: float
+    lookahead_window: int
+    batch_bonus_score: float
+    holidays: List[int] = field(default_factory=list)
+    station_factors: Dict[str, Dict[int, float]] = field(default_factory=dict)  # Fırın doluluk katsayıları
+
+
+class _ScenarioState:
+    """Bir senaryonun mutasyonlar uygulanmış çalışma kopyası"""
+
+    def __init__(self, baseline: ScenarioBaseline):
+        self.baseline = baseline
+        self.orders = list(baseline.orders)
+        self.sequence: Optional[List[Dict]] = None  # None = planlayıcı sıralaması
+        self.capacities = dict(baseline.capacities)
+        self.holidays = set(baseline.holidays)
+        self.station_holidays: Dict[str, set] = {}
+        self.new_codes: List[str] = []
+
+    def resolved_sequence(self) -> List[Dict]:
+        if self.sequence is None:
+            self.sequence = sequence_orders(
+                self.orders, self.baseline.today,
+                self.baseline.lookahead_window, self.baseline.batch_bonus_score
+            )
+        return self.sequence
+
+    def find_index(self, items: List[Dict], mutation: Dict) -> int:
+        key, value = ('id', mutation['order_id']) if 'order_id' in mutation \
+            else ('order_code', mutation.get('order_code'))
+        for i, order in enumerate(items):
+            if order.get(key) == value:
+                return i
+        raise ValueError(f"Sipariş bulunamadı: {value}")
+
+    def day_offset(self, day) -> int:
+        if isinstance(day, int):
+            return day
+        if isinstance(day, str):
+            day = parse_date(day)
+        return (day - self.baseline.today).days
+
+
+def _apply_mutation(state: _ScenarioState, mutation: Dict):
+    kind = mutation.get('type')
+
+    if kind == 'reorder':
+        sequence = list(state.resolved_sequence())
+        order = sequence.pop(state.find_index(sequence, mutation))
+        position = max(0, min(int(mutation.get('position', 0)), len(sequence)))
+        sequence.insert(position, order)
+        state.sequence = sequence
+
+    elif kind == 'sequence':
+        by_id = {o.get('id'): o for o in state.orders}
+        wanted = [by_id[oid] for oid in mutation.get('order_ids', []) if oid in by_id]
+        listed = {o.get('id') for o in wanted}
+        rest = [o for o in state.resolved_sequence() if o.get('id') not in listed]
+        state.sequence = wanted + rest
+
+    elif kind == 'priority':
+        i = state.find_index(state.orders, mutation)
+        state.orders[i] = dict(state.orders[i], priority=mutation['priority'])
+        state.sequence = None  # Planlayıcı yeniden sıralar
+
+    elif kind == 'capacity':
+        station = mutation['station']
+        if station not in state.capacities:
+            raise ValueError(f"İstasyon bulunamadı: {station}")
+        if 'capacity' in mutation:
+            state.capacities[station] = float(mutation['capacity'])
+        else:
+            state.capacities[station] *= float(mutation.get('factor', 1.0))
+
+    elif kind == 'holiday':
+        offset = state.day_offset(mutation['day'])
+        station = mutation.get('station')
+        if station:
+            state.station_holidays.setdefault(station, set()).add(offset)
+        else:
+            state.holidays.add(offset)
+
+    elif kind == 'new_order':
+        code = mutation.get('code') or f">>> YENİ {len(state.new_codes) + 1} <<<"
+        order = make_simulated_order(mutation['order'], order_id=-1 - len(state.new_codes),
+                                     order_code=code)
+        state.orders.append(order)
+        state.new_codes.append(code)
+        state.sequence = None
+
+    else:
+        raise ValueError(f"Bilinmeyen senaryo mutasyonu: {kind}")
+
+
+def simulate_finish_times(state: _ScenarioState) -> Dict[str, float]:
+    """Durumu olay tabanlı motorla çizelgele -> {sipariş_kodu: bitiş günü}"""
+    baseline = state.baseline
+    calendar = WorkCalendar(baseline.today, holidays=state.holidays)
+    station_calendars = {
+        station: WorkCalendar(baseline.today, holidays=state.holidays | extra)
+        for station, extra in state.station_holidays.items()
+    }
+    scheduler = EventScheduler(calendar, state.capacities.keys(), station_calendars)
+
+    finish_times = {}
+    for order in state.resolved_sequence():
+        steps = order_steps(order, state.capacities, baseline.thickness_factors,
+                            baseline.default_factor, baseline.progress_cache,
+                            baseline.completed_cache, baseline.station_factors)
+        if steps is None: continue
+        _, finish = scheduler.schedule_order(order.get('order_code'), steps)
+        finish_times[order.get('order_code')] = finish
+    return finish_times
+
+
+def baseline_finish_times(baseline: ScenarioBaseline) -> Dict[str, float]:
+    """Mutasyonsuz (mevcut plan) bitiş zamanları"""
+    return simulate_finish_times(_ScenarioState(baseline))
+
+
+def evaluate_scenario(baseline: ScenarioBaseline, scenario: Dict,
+                      base_finish: Dict[str, float]) -> Dict:
+    """
+    Tek senaryoyu değerlendir (süreç havuzunda çalışabilir).
+
+    Returns:
+        {
+            'name', 'finish_times': {kod: gün}, 'deltas': {kod: gün farkı},
+            'delayed': [{'code', 'delay', 'old_day', 'new_day'}], 'improved': [...],
+            'total_delay_days', 'late_orders', 'new_orders': {kod: bitiş günü},
+            'elapsed_ms', 'error'
+        }
+    """
+    started = time.perf_counter()
+    name = scenario.get('name', '')
+    try:
+        state = _ScenarioState(baseline)
+        for mutation in scenario.get('mutations', []):
+            _apply_mutation(state, mutation)
+        finish_times = simulate_finish_times(state)
+    except Exception as e:
+        return {'name': name, 'error': str(e),
+                'elapsed_ms': round((time.perf_counter() - started) * 1000, 2)}
+
+    deltas = {}
+    delayed = []
+    improved = []
+    for code, base_time in base_finish.items():
+        if code not in finish_times:
+            continue
+        delta = finish_times[code] - base_time
+        deltas[code] = delta
+        # calculate_impact ile aynı eşik ve gün yuvarlaması
+        entry = {
+            "code": code,
+            "delay": math.ceil(delta) if delta > 0 else -math.ceil(-delta),
+            "old_day": math.ceil(base_time),
+            "new_day": math.ceil(finish_times[code])
+        }
+        if delta > 0.1:
+            delayed.append(entry)
+        elif delta < -0.1:
+            improved.append(entry)
+
+    delayed.sort(key=lambda x: -x['delay'])
+    improved.sort(key=lambda x: x['delay'])
+
+    # Termini aşan sipariş sayısı (bitiş günü > termine kalan gün)
+    late_orders = 0
+    for order in state.orders:
+        code = order.get('order_code')
+        if code not in finish_times:
+            continue
+        due = parse_date(order.get('delivery_date'))
+        if due == date.max:
+            continue
+        if math.ceil(finish_times[code]) > (due - baseline.today).days:
+            late_orders += 1
+
+    return {
+        'name': name,
+        'finish_times': finish_times,
+        'deltas': deltas,
+        'delayed': delayed,
+        'improved': improved,
+        'total_delay_days': round(sum(d for d in deltas.values() if d > 0), 2),
+        'late_orders': late_orders,
+        'new_orders': {code: finish_times.get(code) for code in state.new_codes},
+        'elapsed_ms': round((time.perf_counter() - started) * 1000, 2),
+        'error': None
+    }
+
+
+def evaluate_chunk(baseline: ScenarioBaseline, scenarios: List[Dict],
+                   base_finish: Dict[str, float]) -> List[Dict]:
+    """Süreç havuzu görevi: baseline işçiye bir kez gönderilir, birden çok senaryo döner"""
+    return [evaluate_scenario(baseline, scenario, base_finish) for scenario in scenarios]
+
+
+def _noop():
+    """Havuz ısıtma görevi (işçi sürecin açılıp modülleri yüklemesi için)"""
+    return None
+
+
+class ScenarioRunner:
+    """
+    Senaryo toplu değerlendirici (kalıcı süreç havuzu)
+
+    Havuz ilk kullanımda açılır ve uygulama kapanana kadar tutulur; süreç
+    başlatma maliyeti oturum başına bir kez ödenir. "spawn" bağlamı
+    kullanılır: Qt thread'leri olan bir süreçte fork güvenli değildir.
+    Az sayıda senaryo veya havuz hatasında aynı süreçte sırayla çalışır.
+    """
+
+    PARALLEL_MIN_SCENARIOS = 4  # Bunun altında süreç havuzu maliyetine değmez
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max_workers or max(1, min(4, (os.cpu_count() or 2) - 1))
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._warmup: Optional[List] = None
+        self._lock = threading.Lock()
+
+        # İstatistikler
+        self.batches = 0
+        self.parallel_batches = 0
+        self.fallbacks = 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
+
+    def warm_up(self):
+        """Süreç havuzunu arka planda aç (beklemeden döner)"""
+        if self._warmup is not None:
+            return
+        try:
+            executor = self._get_executor()
+            self._warmup = [executor.submit(_noop) for _ in range(self.max_workers)]
+        except Exception as e:
+            print(f"Senaryo süreç havuzu açılamadı: {e}")
+
+    def is_warm(self) -> bool:
+        """Havuz açık ve işçiler görev almaya hazır mı?"""
+        warmup = self._warmup
+        return self._executor is not None and warmup is not None and all(f.done() for f in warmup)
+
+    def run(self, baseline: ScenarioBaseline, scenarios: List[Dict],
+            max_workers: Optional[int] = None) -> List[Dict]:
+        """Senaryoları değerlendir; sonuçlar girdi sırasıyla döner"""
+        self.batches += 1
+        if not scenarios:
+            return []
+
+        base_finish = baseline_finish_times(baseline)
+        workers = min(max_workers or self.max_workers, self.max_workers, len(scenarios))
+
+        if workers <= 1 or len(scenarios) < self.PARALLEL_MIN_SCENARIOS:
+            return evaluate_chunk(baseline, scenarios, base_finish)
+
+        # Round-robin parçalar: her işçiye baseline bir kez gider
+        chunks = [scenarios[i::workers] for i in range(workers)]
+        chunk_results = self.map(evaluate_chunk, [(baseline, chunk, base_finish) for chunk in chunks])
+
+        results = [None] * len(scenarios)
+        for i, chunk_result in enumerate(chunk_results):
+            for j, result in enumerate(chunk_result):
+                results[i + j * workers] = result
+        return results
+
+    def map(self, func: Callable, payloads: List[tuple]) -> List:
+        """
+        func(*payload) çağrılarını süreç havuzunda çalıştır (sonuçlar sırayla).
+        func modül seviyesinde tanımlı olmalı (pickle). Havuz hatasında aynı
+        süreçte sırayla çalışır.
+        """
+        try:
+            executor = self._get_executor()
+            futures = [executor.submit(func, *payload) for payload in payloads]
+            results = [f.result() for f in futures]
+        except Exception as e:
+            print(f"Senaryo süreç havuzu hatası, sırayla çalıştırılıyor: {e}")
+            self.fallbacks += 1
+            self.shutdown()
+            return [func(*payload) for payload in payloads]
+
+        self.parallel_batches += 1
+        return results
+
+    def shutdown(self):
+        """Süreç havuzunu kapat (uygulama çıkışında)"""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+            self._warmup = None
+
+    def get_stats(self) -> dict:
+        return {
+            "max_workers": self.max_workers,
+            "batches": self.batches,
+            "parallel_batches": self.parallel_batches,
+            "fallbacks": self.fallbacks,
+            "pool_open": self._executor is not None,
+            "pool_warm": self.is_warm()
+        }
+
+
+# Global instance
+scenario_runner = ScenarioRunner()
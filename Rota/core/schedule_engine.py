@@ -0,0 +1,610 @@
+# -*- coding: utf-8 -*-
+"""
+EFES ROTA X - Olay Tabanlı Çizelgeleme Çekirdeği
+SmartPlanner için gün gün ilerlemeyen, aralık aritmetiği ile çalışan motor.
+
+Eski motor her operasyon için zamanı gün gün dilimler (FORECAST_DAYS * 2
+iterasyon sınırı). Bu yüzden ufkun ötesindeki işler sessizce kesilir ve
+maliyet "süre × sipariş" ile büyür.
+
+Bu motor:
+- Her operasyonun başlangıç/bitişini makine boşalma zamanı ve çalışma
+  takviminden DOĞRUDAN hesaplar (hafta/tatil sayımı kapalı formül)
+- Günlük tablolar (doluluk, yük, detay) sonradan kovalama ile üretilir;
+  sadece gösterilen ufuk kadar gün dolaşılır
+- Çizelgeleme maliyeti ufuk uzunluğundan bağımsızdır
+
+Zaman birimi: gün ofseti (0.0 = bugün 00:00, 1.5 = yarın öğlen).
+Bir çalışma günü [d, d+1) aralığının tamamıdır (eski motorla aynı model).
+
+Uzun ufuklar (1 yıla kadar) için sonuç ForecastTimeline olarak saklanır:
+istasyon başına sıralı aralık listesi. Gün tabloları ve gün detayları
+sadece istenen pencere için (ör. ekranda görünen sütunlar) üretilir;
+bellek ufukla değil operasyon sayısıyla büyür.
+
+Kullanım:
+    calendar = WorkCalendar(today)
+    scheduler = EventScheduler(calendar, capacities.keys())
+    ops, finish = scheduler.schedule_order(code, steps)
+    grids = bucket_operations(scheduler.operations, calendar, 30, capacities.keys())
+
+    timeline = ForecastTimeline.from_operations(scheduler.operations, calendar, stations)
+    forecast, loads = timeline.window(first_day=90, days=30)   # 3 ay sonrası
+    orders = timeline.details("TEMPER A1", 120)
+"""
+
+import math
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Kayan nokta artıkları (1e-16 gün) yeni bir güne taşmasın
+EPSILON = 1e-9
+
+
+class WorkCalendar:
+    """
+    Çalışma zamanı takvimi (gün ofsetleri üzerinde)
+
+    Hafta sonları haftalık desenden, tatiller sıralı ofset listesinden
+    okunur; "n. çalışma günü" ve "d'den önceki çalışma günü sayısı"
+    sorguları döngüsüz (tatil sayısı kadar düzeltme ile) cevaplanır.
+    """
+
+    def __init__(self, start_date: date, holidays: Iterable[int] = (),
+                 weekend: Iterable[int] = (5, 6)):
+        self.start_date = start_date
+        weekend = frozenset(weekend)
+        self._weekend = weekend
+
+        # Ofset % 7 -> çalışma günü mü (bugünün haftanın günü referans)
+        start_weekday = start_date.weekday()
+        self._week = [((start_weekday + r) % 7) not in weekend for r in range(7)]
+        self._per_week = sum(self._week)
+        if self._per_week == 0:
+            raise ValueError("Takvimde hiç çalışma günü yok")
+
+        self._prefix = [0]
+        for working in self._week:
+            self._prefix.append(self._prefix[-1] + int(working))
+
+        # Sadece hafta içine denk gelen tatiller sayımı etkiler
+        self._holidays = sorted(
+            h for h in set(int(h) for h in holidays)
+            if h >= 0 and self._week[h % 7]
+        )
+
+    @classmethod
+    def from_dates(cls, start_date: date, holiday_dates: Iterable[date] = (),
+                   weekend: Iterable[int] = (5, 6)) -> "WorkCalendar":
+        """Tatil tarihlerinden takvim oluştur (geçmiş tarihler yok sayılır)"""
+        offsets = [(d - start_date).days for d in holiday_dates]
+        return cls(start_date, holidays=offsets, weekend=weekend)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON'a yazılabilir hali (disk cache için)"""
+        return {
+            'start_date': self.start_date.isoformat(),
+            'holidays': list(self._holidays),
+            'weekend': sorted(self._weekend)
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "WorkCalendar":
+        return cls(date.fromisoformat(data['start_date']),
+                   holidays=data.get('holidays', ()),
+                   weekend=data.get('weekend', (5, 6)))
+
+    def _is_holiday(self, day: int) -> bool:
+        i = bisect_left(self._holidays, day)
+        return i < len(self._holidays) and self._holidays[i] == day
+
+    def is_working_day(self, day: int) -> bool:
+        """Gün ofseti çalışma günü mü?"""
+        return self._week[day % 7] and not self._is_holiday(day)
+
+    def working_days_before(self, day: int) -> int:
+        """[0, day) aralığındaki çalışma günü sayısı"""
+        if day <= 0:
+            return 0
+        weeks, rest = divmod(day, 7)
+        count = weeks * self._per_week + self._prefix[rest]
+        return count - bisect_left(self._holidays, day)
+
+    def nth_working_day(self, n: int) -> int:
+        """n. çalışma gününün ofseti (0 tabanlı: 0 = ilk çalışma günü)"""
+        weeks, rest = divmod(n, self._per_week)
+        day = weeks * 7
+        for r in range(7):
+            if self._week[r]:
+                if rest == 0:
+                    day += r
+                    break
+                rest -= 1
+
+        # Tatiller sayımı kaydırır; her adımda en az bir tatil geçilir
+        while self.working_days_before(day) < n or not self.is_working_day(day):
+            day += 1
+        return day
+
+    def align(self, t: float) -> float:
+        """t çalışma dışındaysa bir sonraki çalışma gününün başına taşı"""
+        day = math.floor(t)
+        if self.is_working_day(day):
+            return t
+        return float(self.nth_working_day(self.working_days_before(day)))
+
+    def add_work(self, start: float, duration: float) -> float:
+        """
+        start anından itibaren duration (çalışma günü) kadar iş yapılınca
+        ulaşılan an. Hafta sonu ve tatiller atlanır.
+        """
+        if duration <= 0:
+            return start
+
+        t = self.align(start)
+        day = math.floor(t)
+        first = (day + 1) - t
+        if duration <= first:
+            return t + duration
+
+        rest = duration - first
+        if rest <= EPSILON:
+            return float(day + 1)
+
+        full_days = int(rest)
+        frac = rest - full_days
+        if frac >= 1.0 - EPSILON:
+            full_days += 1
+            frac = 0.0
+
+        base = self.working_days_before(day + 1)
+        if frac <= EPSILON:
+            # Tam bir günün sonunda biter
+            return float(self.nth_working_day(base + full_days - 1) + 1)
+        return self.nth_working_day(base + full_days) + frac
+
+    def work_segments(self, start: float, end: float, horizon: Optional[int] = None,
+                      from_day: int = 0) -> List[Tuple[int, float]]:
+        """
+        [start, end) aralığının çalışma günlerine düşen parçaları:
+        [(gün, gün içindeki iş miktarı), ...]. Sadece [from_day, horizon)
+        günleri döner.
+        """
+        first_day = max(math.floor(start), from_day, 0)
+        last_day = math.ceil(end)
+        if horizon is not None:
+            last_day = min(last_day, horizon)
+
+        segments = []
+        for day in range(first_day, last_day):
+            if not self.is_working_day(day):
+                continue
+            amount = min(end, day + 1) - max(start, day)
+            if amount > EPSILON:
+                segments.append((day, amount))
+        return segments
+
+
+# =============================================================================
+# SAF PLANLAMA FONKSİYONLARI
+# Veritabanına dokunmaz; SmartPlanner ve senaryo süreç havuzu ortak kullanır.
+# =============================================================================
+PRIORITY_RANK = {"Kritik": 0, "Çok Acil": 1, "Acil": 2, "Normal": 3}
+
+
+def parse_date(date_str) -> date:
+    """'YYYY-MM-DD' -> date (boş/geçersiz ise date.max: en sona)"""
+    if not date_str: return datetime.max.date()
+    try:
+        return datetime.strptime(date_str, '%Y-%m-%d').date()
+    except:
+        return datetime.max.date()
+
+
+def capacity_coefficient(thickness, factors: Dict[int, float], default_factor: float) -> float:
+    """Kalınlığa göre kapasite çarpanını döndürür (referans 4mm = 1.0)"""
+    try:
+        t_int = int(float(thickness))
+        return factors.get(t_int, default_factor)
+    except:
+        return 1.0 # Hata durumunda 4mm gibi davran
+
+
+def sequence_orders(orders: List[Dict], today: date, lookahead_window: int,
+                    batch_bonus_score: float) -> List[Dict]:
+    """
+    Gelişmiş Fabrika Sıralama Algoritması
+
+    1. Kırmızı hat: 2 günden az kalan veya Kritik/Çok Acil (öncelik, termin)
+    2. Yeşil hat: lookahead penceresindeki normal işler, (kalınlık, ürün)
+       batch'leri halinde; batch puanı = adet * bonus - ort. kalan gün * 2
+    3. Gri hat: uzak tarihli işler (termin sırası)
+    """
+    red_orders = []      # Acil / Gecikmiş
+    green_orders = []    # Yakın tarihli Normal
+    grey_orders = []     # Uzak tarihli Normal
+
+    window_limit = today + timedelta(days=lookahead_window)
+
+    # 1. AYRIŞTIRMA
+    for order in orders:
+        due_date = parse_date(order.get('delivery_date'))
+        days_left = (due_date - today).days
+        priority = order.get('priority', 'Normal')
+
+        # Kriter 1: KIRMIZI HAT
+        if (days_left < 2) or (priority in ['Kritik', 'Çok Acil']):
+            red_orders.append(order)
+
+        # Kriter 2: YEŞİL HAT
+        elif due_date <= window_limit:
+            green_orders.append(order)
+
+        # Kriter 3: GRİ HAT
+        else:
+            grey_orders.append(order)
+
+    # --- KIRMIZI HAT SIRALAMASI ---
+    red_orders.sort(key=lambda x: (
+        PRIORITY_RANK.get(x.get('priority', 'Normal'), 3),
+        x.get('delivery_date', '9999-12-31')
+    ))
+
+    # --- YEŞİL HAT GRUPLAMASI (BATCHING) ---
+    batches = defaultdict(list)
+    for order in green_orders:
+        key = (order.get('thickness'), order.get('product_type'))
+        batches[key].append(order)
+
+    scored_batches = []
+    for key, batch_list in batches.items():
+        avg_days = sum([(parse_date(o.get('delivery_date')) - today).days for o in batch_list]) / len(batch_list)
+        batch_score = (len(batch_list) * batch_bonus_score) - (avg_days * 2)
+
+        batch_list.sort(key=lambda x: x.get('delivery_date', '9999-12-31'))
+
+        scored_batches.append({
+            'score': batch_score,
+            'orders': batch_list
+        })
+
+    scored_batches.sort(key=lambda x: x['score'], reverse=True)
+
+    # --- GRİ HAT SIRALAMASI ---
+    grey_orders.sort(key=lambda x: x.get('delivery_date', '9999-12-31'))
+
+    # 4. LİSTELERİ BİRLEŞTİR
+    final_sequence = []
+    final_sequence.extend(red_orders)
+    for batch in scored_batches:
+        final_sequence.extend(batch['orders'])
+    final_sequence.extend(grey_orders)
+
+    return final_sequence
+
+
+def order_steps(order: Dict, capacities: Dict[str, float], factors: Dict[int, float],
+                default_factor: float, progress_cache: Dict, completed_cache: Dict,
+                station_factors: Optional[Dict[str, Dict[int, float]]] = None) -> Optional[List[Dict]]:
+    """
+    Siparişin kalan rota adımları:
+    [{'station', 'duration', 'daily_capacity', 'remaining_m2', 'info'}, ...]
+    m² hesaplanamıyorsa None döner (sipariş simülasyona girmez).
+
+    station_factors: {istasyon: {kalınlık: katsayı}} - verilen istasyonlarda
+    kalınlık katsayısı yerine kullanılır (ör. fırın yatak doluluğu, bkz.
+    core/furnace_loader.py).
+    """
+    m2 = order.get('declared_total_m2', 0)
+    if not m2 or m2 <= 0:
+        w = order.get('width', 0)
+        h = order.get('height', 0)
+        q = order.get('quantity', 0)
+        if w and h and q: m2 = (w * h * q) / 10000.0
+
+    if m2 <= 0: return None
+
+    total_qty = order.get('quantity', 1)
+    route_str = order.get('route', '')
+    route_steps = route_str.split(',')
+    thickness = order.get('thickness', 4)
+
+    # --- KRİTİK NOKTA: KALINLIK KATSAYISINI AL ---
+    capacity_factor = capacity_coefficient(thickness, factors, default_factor)
+
+    completed_stops = []
+    if not order.get('is_new'):
+        # Cache'den oku (DB'ye gitme)
+        completed_stops = completed_cache.get(order.get('id'), [])
+
+    steps = []
+    for station in route_steps:
+        station = station.strip()
+        if station not in capacities: continue
+        if station in completed_stops: continue
+
+        # Teorik Günlük Kapasite (4mm için)
+        base_daily_cap = capacities[station]
+        if base_daily_cap <= 0: base_daily_cap = 1
+
+        # --- GERÇEK KAPASİTE HESABI ---
+        # Örn: 1000 m2 (4mm) * 0.6 (10mm katsayısı) = 600 m2 (Gerçek Kapasite)
+        station_factor = capacity_factor
+        if station_factors and station in station_factors:
+            station_factor = capacity_coefficient(thickness, station_factors[station], capacity_factor)
+        effective_daily_cap = base_daily_cap * station_factor
+
+        done_qty = 0
+        if not order.get('is_new'):
+            # Cache'den oku (DB'ye gitme)
+            oid = order.get('id')
+            if oid in progress_cache and station in progress_cache[oid]:
+                done_qty = progress_cache[oid][station]
+
+        remaining_ratio = 1.0 - (done_qty / total_qty)
+        if remaining_ratio <= 0: continue
+
+        remaining_m2 = m2 * remaining_ratio
+
+        steps.append({
+            'station': station,
+            # Süre Hesabı: m2 / Gerçek Kapasite
+            'duration': remaining_m2 / effective_daily_cap,
+            'daily_capacity': effective_daily_cap,
+            'remaining_m2': remaining_m2,
+            'info': {
+                "code": order['order_code'],
+                "customer": order.get('customer_name', 'Tahmini'),
+                "m2": remaining_m2,
+                "batch": f"{thickness}mm",
+                "notes": order.get('notes', '')
+            }
+        })
+    return steps
+
+
+def make_simulated_order(new_order: Dict, order_id: int = -1,
+                         order_code: str = '>>> HESAPLANAN <<<') -> Dict:
+    """Sipariş formu verisinden (henüz kaydedilmemiş) simülasyon siparişi oluştur"""
+    return {
+        'id': order_id,
+        'order_code': order_code,
+        'customer_name': 'YENİ',
+        'width': new_order.get('width', 0),
+        'height': new_order.get('height', 0),
+        'quantity': new_order.get('quantity', 0),
+        'declared_total_m2': new_order.get('total_m2', 0),
+        'thickness': new_order.get('thickness', 0),
+        'product_type': new_order.get('product', ''),
+        'route': new_order.get('route', ''),
+        'priority': new_order.get('priority', 'Normal'),
+        'delivery_date': new_order.get('date', '9999-12-31'),
+        'is_new': True
+    }
+
+
+@dataclass
+class ScheduledOperation:
+    """Bir siparişin bir istasyondaki planlanmış işlemi"""
+    order_code: str
+    station: str
+    start: float
+    end: float
+    duration: float          # Çalışma günü cinsinden net süre
+    daily_capacity: float    # Gerçek günlük kapasite (m²/gün, kalınlık dahil)
+    info: Dict = field(default_factory=dict)
+
+
+class EventScheduler:
+    """
+    Makine boşalma zamanlarına göre operasyon yerleştirici
+
+    Siparişler verilen sırayla, rotalarındaki istasyonlar sırayla yerleşir:
+    başlangıç = max(siparişin önceki adımı bitişi, makinenin boşalması),
+    bitiş = takvimde başlangıç + süre. Gün döngüsü yoktur.
+    """
+
+    def __init__(self, calendar: WorkCalendar, stations: Iterable[str],
+                 station_calendars: Optional[Dict[str, WorkCalendar]] = None):
+        self.calendar = calendar
+        # İstasyona özel takvim (ör. "TEMPER A1 Perşembe arızalı" senaryosu)
+        self.station_calendars = station_calendars or {}
+        self.machine_free_time = {s: 0.0 for s in stations}
+        self.operations: List[ScheduledOperation] = []
+
+    def schedule_order(self, order_code: str, steps: Iterable[Dict],
+                       ready_time: float = 0.0) -> Tuple[List[ScheduledOperation], float]:
+        """
+        Bir siparişin adımlarını yerleştir.
+
+        steps: {'station', 'duration', 'daily_capacity', 'info'} sözlükleri
+        Returns: (operasyonlar, siparişin bitiş anı)
+        """
+        scheduled = []
+        current = ready_time
+
+        for step in steps:
+            station = step['station']
+            calendar = self.station_calendars.get(station, self.calendar)
+            start = max(current, self.machine_free_time[station])
+            end = calendar.add_work(start, step['duration'])
+
+            op = ScheduledOperation(
+                order_code=order_code,
+                station=station,
+                start=start,
+                end=end,
+                duration=step['duration'],
+                daily_capacity=step['daily_capacity'],
+                info=step.get('info', {})
+            )
+            scheduled.append(op)
+
+            self.machine_free_time[station] = end
+            current = end
+
+        self.operations.extend(scheduled)
+        return scheduled, current
+
+
+def bucket_operations(operations: Iterable[ScheduledOperation], calendar: WorkCalendar,
+                      horizon: int, stations: Iterable[str]):
+    """
+    Operasyonları günlük tablolara dağıt (ufuk dışındaki günler atlanır).
+
+    Returns: (forecast_grid, details_grid, loads_grid)
+        forecast_grid[istasyon][gün]: doluluk yüzdesi (zaman bazlı)
+        loads_grid[istasyon][gün]: yük (m²)
+        details_grid[istasyon][gün]: o gün çalışılan siparişler
+    """
+    stations = list(stations)
+    forecast_grid = {k: [0.0] * horizon for k in stations}
+    loads_grid = {k: [0.0] * horizon for k in stations}
+    details_grid = {k: [[] for _ in range(horizon)] for k in stations}
+    seen = {k: [set() for _ in range(horizon)] for k in stations}
+
+    for op in operations:
+        if op.start >= horizon or op.station not in forecast_grid:
+            continue
+
+        for day, amount in calendar.work_segments(op.start, op.end, horizon):
+            forecast_grid[op.station][day] += amount * 100
+            loads_grid[op.station][day] += amount * op.daily_capacity
+
+            if op.order_code not in seen[op.station][day]:
+                seen[op.station][day].add(op.order_code)
+                details_grid[op.station][day].append(op.info)
+
+    return forecast_grid, details_grid, loads_grid
+
+
+class StationTimeline:
+    """
+    Bir istasyonun seyrek yük zaman çizelgesi
+
+    Operasyon aralıkları başlangıca göre sıralı ve çakışmasızdır (makine
+    aynı anda tek iş yapar), bu yüzden bitişler de sıralıdır. Bir gün
+    penceresiyle kesişen operasyonlar iki bisect ile bulunur.
+    """
+
+    __slots__ = ('starts', 'ends', 'rates', 'infos')
+
+    def __init__(self):
+        self.starts: List[float] = []
+        self.ends: List[float] = []
+        self.rates: List[float] = []
+        self.infos: List[Dict] = []
+
+    def __len__(self):
+        return len(self.starts)
+
+    def add(self, start: float, end: float, rate: float, info: Dict):
+        self.starts.append(start)
+        self.ends.append(end)
+        self.rates.append(rate)
+        self.infos.append(info)
+
+    def overlapping(self, first_day: int, last_day: int) -> range:
+        """[first_day, last_day) ile kesişen operasyonların indeksleri"""
+        lo = bisect_right(self.ends, first_day)
+        hi = bisect_left(self.starts, last_day)
+        return range(lo, max(lo, hi))
+
+
+class ForecastTimeline:
+    """
+    Uzun ufuklu tahmin sonucu (istasyon başına seyrek aralık listeleri)
+
+    Yoğun [0.0] * gün tabloları yerine operasyonları saklar; istenen gün
+    penceresi için doluluk/yük tabloları ve gün detayları talep anında
+    üretilir.
+    """
+
+    def __init__(self, calendar: WorkCalendar, stations: Iterable[str]):
+        self.calendar = calendar
+        self.stations: Dict[str, StationTimeline] = {s: StationTimeline() for s in stations}
+
+    @classmethod
+    def from_operations(cls, operations: Iterable[ScheduledOperation],
+                        calendar: WorkCalendar, stations: Iterable[str]) -> "ForecastTimeline":
+        timeline = cls(calendar, stations)
+        for op in operations:
+            line = timeline.stations.get(op.station)
+            if line is not None and op.end > op.start:
+                line.add(op.start, op.end, op.daily_capacity, op.info)
+        return timeline
+
+    @property
+    def operation_count(self) -> int:
+        return sum(len(line) for line in self.stations.values())
+
+    @property
+    def last_day(self) -> int:
+        """Son operasyonun bittiği gün (yük olan son gün + 1)"""
+        ends = [line.ends[-1] for line in self.stations.values() if line.ends]
+        return math.ceil(max(ends)) if ends else 0
+
+    def window(self, first_day: int, days: int):
+        """
+        [first_day, first_day + days) penceresi için yoğun tablolar.
+
+        Returns: (forecast_grid, loads_grid) - liste indeksi 0 = first_day
+        """
+        last_day = first_day + days
+        forecast_grid = {}
+        loads_grid = {}
+
+        for station, line in self.stations.items():
+            percents = [0.0] * days
+            loads = [0.0] * days
+            for i in line.overlapping(first_day, last_day):
+                segments = self.calendar.work_segments(
+                    line.starts[i], line.ends[i], horizon=last_day, from_day=first_day
+                )
+                for day, amount in segments:
+                    percents[day - first_day] += amount * 100
+                    loads[day - first_day] += amount * line.rates[i]
+            forecast_grid[station] = percents
+            loads_grid[station] = loads
+
+        return forecast_grid, loads_grid
+
+    def details(self, station: str, day: int) -> List[Dict]:
+        """Bir istasyonda o gün çalışılan siparişler (talep anında üretilir)"""
+        line = self.stations.get(station)
+        if line is None or not self.calendar.is_working_day(day):
+            return []
+
+        result = []
+        seen = set()
+        for i in line.overlapping(day, day + 1):
+            if not self.calendar.work_segments(line.starts[i], line.ends[i],
+                                               horizon=day + 1, from_day=day):
+                continue
+            info = line.infos[i]
+            code = info.get('code')
+            if code not in seen:
+                seen.add(code)
+                result.append(info)
+        return result
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON'a yazılabilir hali (disk cache için)"""
+        return {
+            'calendar': self.calendar.to_dict(),
+            'stations': {
+                station: [line.starts, line.ends, line.rates, line.infos]
+                for station, line in self.stations.items()
+            }
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ForecastTimeline":
+        timeline = cls(WorkCalendar.from_dict(data['calendar']), data['stations'].keys())
+        for station, (starts, ends, rates, infos) in data['stations'].items():
+            line = timeline.stations[station]
+            line.starts, line.ends, line.rates, line.infos = starts, ends, rates, infos
+        return timeline
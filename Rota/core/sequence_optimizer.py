@@ -0,0 +1,388 @@
+# -*- coding: utf-8 -*-
+"""
+EFES ROTA X - Süre Bütçeli Sıra Optimizasyonu
+Sezgisel sıralamadan (kırmızı/yeşil/gri hat + batch) başlayıp yerel arama
+ile toplam ağırlıklı gecikmeyi (weighted tardiness) azaltır.
+
+- Amaç: Σ ağırlık(öncelik) × max(0, bitiş günü - termin günü)
+- Hamleler: iki siparişi yer değiştir (swap), siparişi başka sıraya taşı
+  (insert), aynı (kalınlık, ürün) batch'ini önceki eşinin yanına taşı (merge)
+- Aday sıralar artımlı simüle edilir: değişmeyen önek için makine boşalma
+  zamanları önceden hesaplanır, simülasyon sadece ilk değişen sıradan başlar;
+  maliyet mevcut en iyiyi geçince aday erken bırakılır
+- Her turda üretilen adaylar senaryo süreç havuzunda paralel değerlendirilir;
+  problem işçilere bir kez gider ve orada önbellekte tutulur, turlarda
+  sadece mevcut sıra ve hamleler gönderilir
+- Duvar saati bütçesi dolunca en iyi sıra döner
+
+Kullanım:
+    result = planner.optimize_sequence(time_budget=5.0)
+    result['before']['weighted_tardiness'], result['after']['weighted_tardiness']
+    result['order_ids']   # Önerilen üretim sırası
+"""
+
+import math
+import random
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Dict, List, Optional, Tuple
+
+from core.schedule_engine import WorkCalendar, sequence_orders, order_steps, parse_date
+
+# Öncelik ağırlıkları: Kritik siparişin 1 günlük gecikmesi 4 Normal gün sayılır
+PRIORITY_WEIGHTS = {"Kritik": 4.0, "Çok Acil": 3.0, "Acil": 2.0, "Normal": 1.0}
+
+ROUND_MOVES = 48  # İşçi başına turdaki aday sayısı
+
+# İşçi süreç önbelleği: token -> problem (son gönderilen problem tutulur)
+_worker_problems: Dict[str, "SequenceProblem"] = {}
+
+
+@dataclass
+class SequenceProblem:
+    """Optimizasyon girdisi - sadece sayılar (işçilere hızlı pickle edilir)"""
+    calendar: WorkCalendar
+    station_count: int
+    steps: List[Tuple[Tuple[int, float], ...]]  # Sipariş -> ((istasyon no, süre), ...)
+    due: List[float]                             # Termin gün ofseti (yoksa inf)
+    weights: List[float]
+    batch_keys: List[Any]                        # (kalınlık, ürün tipi)
+
+
+def build_problem(baseline, orders: List[Dict]) -> Tuple[SequenceProblem, List[Dict], List[Dict]]:
+    """
+    ScenarioBaseline + siparişlerden optimizasyon problemi kur.
+
+    Returns: (problem, simüle edilen siparişler, rotası kalmamış siparişler)
+        Problemdeki i. indeks simüle edilen listedeki i. siparişe karşılık gelir.
+    """
+    stations = list(baseline.capacities.keys())
+    station_index = {s: i for i, s in enumerate(stations)}
+
+    scheduled, skipped = [], []
+    steps, due, weights, keys = [], [], [], []
+    for order in orders:
+        order_route = order_steps(order, baseline.capacities, baseline.thickness_factors,
+                                  baseline.default_factor, baseline.progress_cache,
+                                  baseline.completed_cache, baseline.station_factors)
+        if not order_route:
+            skipped.append(order)
+            continue
+
+        due_date = parse_date(order.get('delivery_date'))
+        scheduled.append(order)
+        steps.append(tuple((station_index[s['station']], s['duration']) for s in order_route))
+        due.append(math.inf if due_date == date.max else float((due_date - baseline.today).days))
+        weights.append(PRIORITY_WEIGHTS.get(order.get('priority', 'Normal'), 1.0))
+        keys.append((order.get('thickness'), order.get('product_type')))
+
+    problem = SequenceProblem(
+        calendar=WorkCalendar(baseline.today, holidays=baseline.holidays),
+        station_count=len(stations),
+        steps=steps,
+        due=due,
+        weights=weights,
+        batch_keys=keys
+    )
+    return problem, scheduled, skipped
+
+
+# =============================================================================
+# ARTIMLI SİMÜLASYON (işçi süreçlerinde de çalışır)
+# =============================================================================
+def simulate(problem: SequenceProblem, sequence: List[int], start: int = 0,
+             free: Optional[Tuple[float, ...]] = None, cost: float = 0.0,
+             cutoff: float = math.inf) -> float:
+    """
+    sequence[start:] siparişlerini verilen makine durumundan çizelgele,
+    ağırlıklı gecikmeyi döndür. Maliyet cutoff'a ulaşınca erken çıkar.
+    """
+    free = list(free) if free is not None else [0.0] * problem.station_count
+    add_work = problem.calendar.add_work
+    steps, due, weights = problem.steps, problem.due, problem.weights
+
+    for pos in range(start, len(sequence)):
+        i = sequence[pos]
+        current = 0.0
+        for station, duration in steps[i]:
+            begin = free[station]
+            if current > begin:
+                begin = current
+            current = add_work(begin, duration)
+            free[station] = current
+
+        late = current - due[i]
+        if late > 0:
+            cost += weights[i] * late
+            if cost >= cutoff:
+                return cost
+    return cost
+
+
+def prefix_states(problem: SequenceProblem, sequence: List[int]) -> List[Tuple[Tuple[float, ...], float]]:
+    """states[p] = (p. sıradan önceki makine boşalma zamanları, o ana kadarki maliyet)"""
+    free = [0.0] * problem.station_count
+    add_work = problem.calendar.add_work
+    cost = 0.0
+    states = [(tuple(free), cost)]
+
+    for i in sequence:
+        current = 0.0
+        for station, duration in problem.steps[i]:
+            begin = max(current, free[station])
+            current = add_work(begin, duration)
+            free[station] = current
+        late = current - problem.due[i]
+        if late > 0:
+            cost += problem.weights[i] * late
+        states.append((tuple(free), cost))
+    return states
+
+
+def sequence_metrics(problem: SequenceProblem, sequence: List[int]) -> Dict:
+    """Rapor metrikleri: ağırlıklı gecikme, geciken sipariş sayısı, toplam gecikme günü"""
+    free = [0.0] * problem.station_count
+    weighted = 0.0
+    tardy_days = 0.0
+    late_orders = 0
+
+    for i in sequence:
+        current = 0.0
+        for station, duration in problem.steps[i]:
+            current = problem.calendar.add_work(max(current, free[station]), duration)
+            free[station] = current
+        late = current - problem.due[i]
+        if late > 0:
+            weighted += problem.weights[i] * late
+            tardy_days += late
+            late_orders += 1
+
+    return {
+        'weighted_tardiness': round(weighted, 2),
+        'tardy_days': round(tardy_days, 2),
+        'late_orders': late_orders
+    }
+
+
+def tardy_positions(problem: SequenceProblem, sequence: List[int],
+                    states: List[Tuple[Tuple[float, ...], float]]) -> List[int]:
+    """Gecikmeye katkı veren sıralar (maliyetin arttığı pozisyonlar)"""
+    return [pos for pos in range(len(sequence)) if states[pos + 1][1] > states[pos][1]]
+
+
+def apply_move(sequence: List[int], move: tuple) -> Tuple[List[int], int]:
+    """Hamleyi uygula -> (yeni sıra, ilk değişen pozisyon)"""
+    candidate = list(sequence)
+    kind = move[0]
+
+    if kind == 'swap':
+        _, a, b = move
+        candidate[a], candidate[b] = candidate[b], candidate[a]
+        return candidate, min(a, b)
+
+    if kind == 'insert':
+        _, a, b = move
+        candidate.insert(b, candidate.pop(a))
+        return candidate, min(a, b)
+
+    # 'merge': [a, a+length) bloğunu b pozisyonuna taşı (b < a)
+    _, a, length, b = move
+    block = candidate[a:a + length]
+    del candidate[a:a + length]
+    candidate[b:b] = block
+    return candidate, min(a, b)
+
+
+def evaluate_moves(problem: SequenceProblem, sequence: List[int], moves: List[tuple],
+                   cutoff: float, states=None) -> List[float]:
+    """
+    Süreç havuzu görevi: aynı sıraya uygulanan hamlelerin maliyetleri.
+    Önek durumları bir kez hesaplanır, her aday ilk değişen sıradan simüle edilir.
+    """
+    if states is None:
+        states = prefix_states(problem, sequence)
+
+    costs = []
+    for move in moves:
+        candidate, first = apply_move(sequence, move)
+        free, cost = states[first]
+        costs.append(simulate(problem, candidate, first, free, cost, cutoff))
+    return costs
+
+
+def evaluate_moves_cached(token: str, problem: Optional[SequenceProblem], sequence: List[int],
+                          moves: List[tuple], cutoff: float) -> Optional[List[float]]:
+    """
+    Süreç havuzu görevi (önbellekli): problem sadece ilk turda gönderilir,
+    sonraki turlarda işçideki kopya kullanılır. Problem None gelir ve bu
+    işçide yoksa None döner; çağıran problemi ekleyip parçayı tekrar gönderir.
+    """
+    if problem is not None:
+        _worker_problems.clear()
+        _worker_problems[token] = problem
+    else:
+        problem = _worker_problems.get(token)
+        if problem is None:
+            return None
+    return evaluate_moves(problem, sequence, moves, cutoff)
+
+
+# =============================================================================
+# YEREL ARAMA
+# =============================================================================
+def _propose_move(rng: random.Random, problem: SequenceProblem, sequence: List[int],
+                  tardy: List[int]) -> tuple:
+    n = len(sequence)
+    r = rng.random()
+
+    # Geciken bir siparişi öne çek (en verimli hamle)
+    if tardy and r < 0.45:
+        a = rng.choice(tardy)
+        if a > 0:
+            return ('insert', a, rng.randrange(0, a))
+
+    # Batch birleştirme: aynı (kalınlık, ürün) grubunu önceki eşinin arkasına al
+    if r >= 0.85:
+        move = _propose_merge(rng, problem, sequence)
+        if move is not None:
+            return move
+
+    a = rng.randrange(n)
+    # Çoğunlukla yakın komşular, bazen uzak sıçrama
+    span = max(1, n // 10) if rng.random() < 0.8 else n
+    b = min(n - 1, max(0, a + rng.randint(-span, span)))
+    if b == a:
+        b = a + 1 if a + 1 < n else a - 1
+
+    if r < 0.65:
+        return ('swap', a, b)
+    return ('insert', a, b)
+
+
+def _propose_merge(rng: random.Random, problem: SequenceProblem, sequence: List[int]) -> Optional[tuple]:
+    keys = problem.batch_keys
+    a = rng.randrange(len(sequence))
+    key = keys[sequence[a]]
+
+    # Rastgele seçilen siparişin ait olduğu ardışık blok
+    while a > 0 and keys[sequence[a - 1]] == key:
+        a -= 1
+    end = a
+    while end < len(sequence) and keys[sequence[end]] == key:
+        end += 1
+
+    # Daha önceki aynı anahtarlı sipariş (bloğa bitişik olmayan)
+    for p in range(a - 2, -1, -1):
+        if keys[sequence[p]] == key:
+            return ('merge', a, end - a, p + 1)
+    return None
+
+
+def optimize_sequence(baseline, time_budget: float = 5.0, initial_order_ids: Optional[List] = None,
+                      runner=None, max_workers: Optional[int] = None,
+                      seed: Optional[int] = None) -> Dict:
+    """
+    Süre bütçeli yerel arama.
+
+    Args:
+        baseline: ScenarioBaseline (DB'siz başlangıç durumu)
+        time_budget: Saniye cinsinden duvar saati bütçesi
+        initial_order_ids: Başlangıç sırası (None = sezgisel planlayıcı sırası)
+        runner: Paralel değerlendirme için ScenarioRunner (None = aynı süreç)
+        max_workers: Süreç sayısı üst sınırı
+        seed: Tekrarlanabilir arama için rastgele tohum
+
+    Returns:
+        {
+            'order_ids': [...], 'orders': [...],   # Önerilen sıra
+            'before': metrikler, 'after': metrikler, 'heuristic': metrikler,
+            'rounds', 'evaluated', 'improvements', 'workers', 'elapsed_ms'
+        }
+    """
+    started = time.perf_counter()
+    deadline = started + max(0.0, time_budget)
+
+    heuristic_orders = sequence_orders(baseline.orders, baseline.today,
+                                       baseline.lookahead_window, baseline.batch_bonus_score)
+    problem, scheduled, skipped = build_problem(baseline, heuristic_orders)
+    heuristic = list(range(len(scheduled)))
+
+    start_sequence = heuristic
+    if initial_order_ids is not None:
+        position = {o.get('id'): i for i, o in enumerate(scheduled)}
+        listed = [position[oid] for oid in initial_order_ids if oid in position]
+        listed_set = set(listed)
+        start_sequence = listed + [i for i in heuristic if i not in listed_set]
+
+    heuristic_metrics = sequence_metrics(problem, heuristic)
+    before = sequence_metrics(problem, start_sequence)
+
+    # Kullanıcının sırası sezgiselden kötüyse aramaya sezgiselden başla
+    best = start_sequence
+    best_cost = simulate(problem, best)
+    heuristic_cost = simulate(problem, heuristic)
+    if heuristic_cost < best_cost:
+        best, best_cost = heuristic, heuristic_cost
+
+    workers = 1
+    if runner is not None:
+        workers = max(1, min(max_workers or runner.max_workers, runner.max_workers))
+
+    rng = random.Random(seed)
+    rounds = evaluated = improvements = 0
+    states = prefix_states(problem, best)
+    token, shipped = uuid.uuid4().hex, False
+
+    while len(best) > 1 and best_cost > 0 and time.perf_counter() < deadline:
+        tardy = tardy_positions(problem, best, states)
+        moves = [_propose_move(rng, problem, best, tardy) for _ in range(ROUND_MOVES * workers)]
+
+        if workers > 1:
+            chunks = [moves[i::workers] for i in range(workers)]
+            chunk_costs = runner.map(evaluate_moves_cached, [
+                (token, None if shipped else problem, best, chunk, best_cost) for chunk in chunks
+            ])
+            # Problemi henüz almamış işçiye düşen parçalar problemle tekrar gider
+            missing = [i for i, chunk_cost in enumerate(chunk_costs) if chunk_cost is None]
+            if missing:
+                retried = runner.map(evaluate_moves_cached, [
+                    (token, problem, best, chunks[i], best_cost) for i in missing
+                ])
+                for i, chunk_cost in zip(missing, retried):
+                    chunk_costs[i] = chunk_cost
+            shipped = True
+            costs = [None] * len(moves)
+            for i, chunk_cost in enumerate(chunk_costs):
+                for j, cost in enumerate(chunk_cost):
+                    costs[i + j * workers] = cost
+        else:
+            costs = evaluate_moves(problem, best, moves, best_cost, states)
+
+        rounds += 1
+        evaluated += len(moves)
+
+        best_index = min(range(len(moves)), key=costs.__getitem__)
+        if costs[best_index] < best_cost - 1e-9:
+            best, _ = apply_move(best, moves[best_index])
+            best_cost = costs[best_index]
+            states = prefix_states(problem, best)
+            improvements += 1
+
+    # Havuz yerine aynı süreçte çalışıldıysa önbellekte kalmasın
+    _worker_problems.pop(token, None)
+
+    ordered = [scheduled[i] for i in best] + skipped
+    return {
+        'order_ids': [o.get('id') for o in ordered],
+        'orders': ordered,
+        'before': before,
+        'after': sequence_metrics(problem, best),
+        'heuristic': heuristic_metrics,
+        'rounds': rounds,
+        'evaluated': evaluated,
+        'improvements': improvements,
+        'workers': workers,
+        'elapsed_ms': round((time.perf_counter() - started) * 1000, 1)
+    }
@@ -8,13 +8,21 @@ except ImportError:
     from datetime import datetime as _dt
     now_turkey = lambda: _dt.now()
     get_current_date_turkey = lambda: _dt.now().date()
-from collections import defaultdict
 
 try:
     from core.db_manager import db
 except ImportError:
     pass
 
+from core.planner_cache import PlannerDiskCache
+from core.schedule_engine import (
+    WorkCalendar, EventScheduler, ForecastTimeline, bucket_operations,
+    sequence_orders, order_steps, capacity_coefficient, make_simulated_order, parse_date
+)
+from core.scenario_engine import ScenarioBaseline, scenario_runner
+from core.sequence_optimizer import optimize_sequence
+from core.furnace_loader import DEFAULT_BEDS, build_furnace_queue, furnace_factors, plan_station
+
 class SmartPlanner:
     """
     AKILLI PLANLAMA MOTORU v18 (TAKVİM ENTEGRASYONLU) 🧠
@@ -28,10 +36,19 @@ class SmartPlanner:
     """
 
     def __init__(self):
-        self.FORECAST_DAYS = 30 # 2 aylık projeksiyon
+        self.FORECAST_DAYS = 30 # Yoğun günlük tabloların boyu (Haftalık Liste, eski API)
         self.BATCH_BONUS_SCORE = 5
         self.LOOKAHEAD_WINDOW = 30
-        self.SIMULATION_WINDOW = 45  # Simülasyona sadece önümüzdeki 45 günlük siparişler dahil edilir 
+
+        # Uzun ufuk: terminine 1 yıla kadar olan siparişler simülasyona girer.
+        # Sonuç ayrıca seyrek zaman çizelgesi (ForecastTimeline) olarak saklanır;
+        # PlanningView aylar sonrasını bellek/süre patlaması olmadan gösterebilir.
+        self.MAX_HORIZON_DAYS = 365
+        self.SIMULATION_WINDOW = 365
+
+        # Çizelgeleme çekirdeği: "event" = aralık aritmetiği (ufuktan bağımsız),
+        # "daily" = eski gün gün dilimleyen motor (karşılaştırma için)
+        self.SCHEDULER_ENGINE = "event"
         
         # --- KALINLIK KATSAYILARI (REFERANS: 4mm = 1.0) ---
         # Örnek: 10mm cam işlemek, 4mm cama göre %40 daha yavaştır (Katsayı 0.60)
@@ -49,12 +66,27 @@ class SmartPlanner:
         }
         # Listede olmayan çok kalın camlar için varsayılan katsayı
         self.DEFAULT_FACTOR = 0.50
-        
+
+        # --- TEMPER FIRINI YÜKLEME ---
+        # Fırın istasyonlarında kalınlık katsayısı yerine yatak doluluğu ve yük
+        # çevrim süresinden çıkan katsayı kullanılır (bkz. core/furnace_loader.py).
+        # Doluluk, FURNACE_WINDOW_DAYS günlük kapasite kadar kuyruk yüklenerek ölçülür.
+        self.FURNACE_LOADING = True
+        self.FURNACE_WINDOW_DAYS = 1
+
+        # Açılıştaki kapasiteler: hesaplamalar her çağrıda güncelini yerel
+        # olarak okur (_load_capacities); bu sadece DB okunamazsa kullanılır
         try:
             self.capacities = db.get_all_capacities()
             if not self.capacities: raise ValueError
         except:
             self.capacities = {} 
+
+        # 🚀 PERFORMANS: Simülasyon sonucu diskte saklanır (uygulama yeniden başlasa bile)
+        try:
+            self.disk_cache = PlannerDiskCache(db.app_data_dir)
+        except Exception:
+            self.disk_cache = PlannerDiskCache(None)
         
         self.station_order = [
             "INTERMAC", "LIVA KESIM", "LAMINE KESIM",
@@ -67,19 +99,11 @@ class SmartPlanner:
         ]
 
     def _parse_date(self, date_str):
-        if not date_str: return datetime.max.date()
-        try:
-            return datetime.strptime(date_str, '%Y-%m-%d').date()
-        except:
-            return datetime.max.date()
+        return parse_date(date_str)
 
     def _get_capacity_coefficient(self, thickness):
         """Kalınlığa göre kapasite çarpanını döndürür"""
-        try:
-            t_int = int(float(thickness))
-            return self.THICKNESS_FACTORS.get(t_int, self.DEFAULT_FACTOR)
-        except:
-            return 1.0 # Hata durumunda 4mm gibi davran
+        return capacity_coefficient(thickness, self.THICKNESS_FACTORS, self.DEFAULT_FACTOR)
 
     def _is_working_day(self, day_offset):
         """
@@ -96,83 +120,27 @@ class SmartPlanner:
     def optimize_production_sequence(self, orders):
         """
         Gelişmiş Fabrika Sıralama Algoritması
+        (Kırmızı hat / yeşil hat batch / gri hat - bkz. schedule_engine.sequence_orders)
         """
-        red_orders = []      # Acil / Gecikmiş
-        green_orders = []    # Yakın tarihli Normal
-        grey_orders = []     # Uzak tarihli Normal
-        
-        today = now_turkey().date()
-        window_limit = today + timedelta(days=self.LOOKAHEAD_WINDOW)
-        
-        # 1. AYRIŞTIRMA
-        for order in orders:
-            due_date = self._parse_date(order.get('delivery_date'))
-            days_left = (due_date - today).days
-            priority = order.get('priority', 'Normal')
-            
-            # Kriter 1: KIRMIZI HAT
-            if (days_left < 2) or (priority in ['Kritik', 'Çok Acil']):
-                red_orders.append(order)
-            
-            # Kriter 2: YEŞİL HAT
-            elif due_date <= window_limit:
-                green_orders.append(order)
-                
-            # Kriter 3: GRİ HAT
-            else:
-                grey_orders.append(order)
-                
-        # --- KIRMIZI HAT SIRALAMASI ---
-        priority_map = {"Kritik": 0, "Çok Acil": 1, "Acil": 2, "Normal": 3}
-        red_orders.sort(key=lambda x: (
-            priority_map.get(x.get('priority', 'Normal'), 3),
-            x.get('delivery_date', '9999-12-31')
-        ))
-        
-        # --- YEŞİL HAT GRUPLAMASI (BATCHING) ---
-        batches = defaultdict(list)
-        for order in green_orders:
-            key = (order.get('thickness'), order.get('product_type'))
-            batches[key].append(order)
-            
-        scored_batches = []
-        for key, batch_list in batches.items():
-            avg_days = sum([(self._parse_date(o.get('delivery_date')) - today).days for o in batch_list]) / len(batch_list)
-            batch_score = (len(batch_list) * self.BATCH_BONUS_SCORE) - (avg_days * 2)
-            
-            batch_list.sort(key=lambda x: x.get('delivery_date', '9999-12-31'))
-            
-            scored_batches.append({
-                'score': batch_score,
-                'orders': batch_list
-            })
-            
-        scored_batches.sort(key=lambda x: x['score'], reverse=True)
-        
-        # --- GRİ HAT SIRALAMASI ---
-        grey_orders.sort(key=lambda x: x.get('delivery_date', '9999-12-31'))
-        
-        # 4. LİSTELERİ BİRLEŞTİR
-        final_sequence = []
-        final_sequence.extend(red_orders)
-        for batch in scored_batches:
-            final_sequence.extend(batch['orders'])
-        final_sequence.extend(grey_orders)
-            
-        return final_sequence
+        return sequence_orders(orders, now_turkey().date(),
+                               self.LOOKAHEAD_WINDOW, self.BATCH_BONUS_SCORE)
 
-    def _run_simulation(self, new_order=None):
+    def _load_simulation_inputs(self):
+        """
+        Simülasyona girecek aktif siparişler ve ilerleme bilgisi.
+        Returns: (active_orders, progress_cache, completed_cache)
+        """
         # 1. Mevcut İşleri Çek
         active_orders = db.get_orders_by_status(["Beklemede", "Üretimde"])
 
-        # PERFORMANS OPTİMİZASYONU: Sadece önümüzdeki 45 günlük siparişleri simülasyona sok
+        # Sadece önümüzdeki SIMULATION_WINDOW gün içindeki siparişleri simülasyona sok
         today = now_turkey().date()
         simulation_deadline = today + timedelta(days=self.SIMULATION_WINDOW)
 
         filtered_orders = []
         for order in active_orders:
             due_date = self._parse_date(order.get('delivery_date'))
-            # Termin tarihi 45 gün içindeyse veya termin tarihi yoksa/geçersizse simülasyona dahil et
+            # Termin tarihi pencere içindeyse veya termin tarihi yoksa/geçersizse simülasyona dahil et
             if due_date <= simulation_deadline or due_date == datetime.max.date():
                 filtered_orders.append(order)
 
@@ -222,91 +190,155 @@ class SmartPlanner:
                         completed_cache[oid] = completed
             except:
                 pass  # Hata durumunda boş cache ile devam et
-        
+
+        return active_orders, progress_cache, completed_cache
+
+    def _load_capacities(self):
+        """
+        Güncel istasyon kapasiteleri. Çağrı boyunca yerel tutulur ve alt
+        adımlara parametre olarak geçer; paylaşılan planlayıcının durumu
+        değişmez (eşzamanlı hesaplamalar birbirini etkilemez).
+        """
+        try:
+            return db.get_all_capacities()
+        except Exception:
+            return dict(self.capacities)
+
+    def _furnace_beds(self, capacities):
+        """Kapasite tablosunda bulunan fırınların yatakları"""
+        try:
+            beds = db.get_furnace_beds()
+        except Exception:
+            beds = dict(DEFAULT_BEDS)
+        return {station: bed for station, bed in beds.items() if station in capacities}
+
+    def plan_furnace_loads(self, station=None, window_days=None, inputs=None, capacities=None):
+        """
+        Temper fırınlarının sıralı yük listesi (planlayıcı sırasıyla).
+
+        Args:
+            station: Tek fırın (None = hepsi)
+            window_days: Kaç günlük kapasite kadar kuyruk (None = FURNACE_WINDOW_DAYS,
+                0 = tüm kuyruk)
+            inputs: Hazır (active_orders, progress_cache, completed_cache)
+            capacities: Hazır istasyon kapasiteleri (None = DB'den)
+
+        Returns: {istasyon: plan} - plan alanları için bkz. furnace_loader.plan_station
+        """
+        if capacities is None:
+            capacities = self._load_capacities()
+        if inputs is None:
+            inputs = self._load_simulation_inputs()
+        active_orders, progress_cache, completed_cache = inputs
+
+        beds = self._furnace_beds(capacities)
+        if station is not None:
+            beds = {station: beds[station]} if station in beds else {}
+        window_days = self.FURNACE_WINDOW_DAYS if window_days is None else window_days
+        max_m2 = {s: capacities[s] * window_days for s in beds} if window_days else None
+
+        queue = build_furnace_queue(self.optimize_production_sequence(active_orders),
+                                    progress_cache, completed_cache, beds.keys(), max_m2)
+        return {s: plan_station(queue[s], bed) for s, bed in beds.items() if s in queue}
+
+    def _furnace_factors(self, inputs, capacities):
+        """Fırın doluluk katsayılarını güncel kuyruktan hesapla"""
+        if not self.FURNACE_LOADING:
+            return {}
+        try:
+            plans = self.plan_furnace_loads(inputs=inputs, capacities=capacities)
+            thicknesses = {o.get('thickness') for o in inputs[0]}
+            return furnace_factors(plans, self._furnace_beds(capacities), thicknesses)
+        except Exception as e:
+            print(f"Fırın yükleme hatası: {e}")
+            return {}
+
+    def _run_simulation(self, new_order=None, capacities=None):
+        if capacities is None:
+            capacities = self._load_capacities()
+        active_orders, progress_cache, completed_cache = self._load_simulation_inputs()
+        station_factors = self._furnace_factors((active_orders, progress_cache, completed_cache), capacities)
+
         # 2. Yeni Siparişi Ekle
         if new_order:
-            simulated_order = {
-                'id': -1,
-                'order_code': '>>> HESAPLANAN <<<',
-                'customer_name': 'YENİ',
-                'width': new_order.get('width', 0),
-                'height': new_order.get('height', 0),
-                'quantity': new_order.get('quantity', 0),
-                'declared_total_m2': new_order.get('total_m2', 0),
-                'thickness': new_order.get('thickness', 0),
-                'product_type': new_order.get('product', ''),
-                'route': new_order.get('route', ''),
-                'priority': new_order.get('priority', 'Normal'),
-                'delivery_date': new_order.get('date', '9999-12-31'),
-                'is_new': True 
-            }
-            active_orders.append(simulated_order)
+            active_orders.append(make_simulated_order(new_order))
 
         # 3. YENİ OPTİMİZE SIRALAMA
         active_orders = self.optimize_production_sequence(active_orders)
 
-        # 4. SİMÜLASYON DEĞİŞKENLERİ
-        forecast_grid = {k: [0.0]*self.FORECAST_DAYS for k in self.capacities.keys()}
-        loads_grid = {k: [0.0]*self.FORECAST_DAYS for k in self.capacities.keys()}
-        details_grid = {k: [[] for _ in range(self.FORECAST_DAYS)] for k in self.capacities.keys()}
-        machine_free_time = {k: 0.0 for k in self.capacities.keys()}
+        # 4. ÇİZELGELEME
+        if self.SCHEDULER_ENGINE == "daily":
+            return self._simulate_daily(active_orders, progress_cache, completed_cache,
+                                        capacities, station_factors)
+        return self._simulate_events(active_orders, progress_cache, completed_cache,
+                                     capacities, station_factors)
+
+    def _order_steps(self, order, progress_cache, completed_cache, capacities, station_factors):
+        """
+        Siparişin kalan rota adımları (bkz. schedule_engine.order_steps).
+        m² hesaplanamıyorsa None döner (sipariş simülasyona girmez).
+        """
+        return order_steps(order, capacities, self.THICKNESS_FACTORS, self.DEFAULT_FACTOR,
+                           progress_cache, completed_cache, station_factors)
+
+    def _work_calendar(self):
+        """Simülasyon takvimi (eski motorla aynı: Cumartesi/Pazar tatil)"""
+        return WorkCalendar(now_turkey().date())
+
+    def _simulate_events(self, active_orders, progress_cache, completed_cache, capacities, station_factors):
+        """
+        Olay tabanlı çizelgeleme: operasyon başlangıç/bitişleri aralık
+        aritmetiği ile hesaplanır, günlük tablolar sonradan kovalanır.
+        Ufuk dışındaki işler kesilmez; bitiş zamanları gerçek değerdir.
+        """
+        calendar = self._work_calendar()
+        scheduler = EventScheduler(calendar, capacities.keys())
+
+        order_finish_times = {}
+        target_finish_day = 0
+
+        for order in active_orders:
+            steps = self._order_steps(order, progress_cache, completed_cache, capacities, station_factors)
+            if steps is None: continue
+
+            _, finish = scheduler.schedule_order(order.get('order_code'), steps)
+
+            order_finish_times[order.get('order_code')] = finish
+            if order.get('is_new'):
+                target_finish_day = finish
+
+        forecast_grid, details_grid, loads_grid = bucket_operations(
+            scheduler.operations, calendar, self.FORECAST_DAYS, capacities.keys()
+        )
+        timeline = ForecastTimeline.from_operations(
+            scheduler.operations, calendar, capacities.keys()
+        )
+        return (forecast_grid, details_grid, loads_grid, target_finish_day,
+                order_finish_times, timeline.to_dict())
+
+    def _simulate_daily(self, active_orders, progress_cache, completed_cache, capacities, station_factors):
+        """
+        Eski motor: zamanı gün gün dilimler (FORECAST_DAYS sonrası kesilir).
+        Seyrek zaman çizelgesi üretmez (6. eleman None).
+        """
+        forecast_grid = {k: [0.0]*self.FORECAST_DAYS for k in capacities.keys()}
+        loads_grid = {k: [0.0]*self.FORECAST_DAYS for k in capacities.keys()}
+        details_grid = {k: [[] for _ in range(self.FORECAST_DAYS)] for k in capacities.keys()}
+        machine_free_time = {k: 0.0 for k in capacities.keys()}
         
         order_finish_times = {} 
         target_finish_day = 0
 
-        # 5. MOTOR ÇALIŞIYOR
         for order in active_orders:
-            m2 = order.get('declared_total_m2', 0)
-            if not m2 or m2 <= 0:
-                w = order.get('width', 0)
-                h = order.get('height', 0)
-                q = order.get('quantity', 0)
-                if w and h and q: m2 = (w * h * q) / 10000.0
-            
-            if m2 <= 0: continue
-            
-            total_qty = order.get('quantity', 1)
-            route_str = order.get('route', '')
-            route_steps = route_str.split(',')
-            thickness = order.get('thickness', 4)
-            
-            # --- KRİTİK NOKTA: KALINLIK KATSAYISINI AL ---
-            capacity_factor = self._get_capacity_coefficient(thickness)
-            
-            completed_stops = []
-            if not order.get('is_new'):
-                # Cache'den oku (DB'ye gitme)
-                completed_stops = completed_cache.get(order.get('id'), [])
+            steps = self._order_steps(order, progress_cache, completed_cache, capacities, station_factors)
+            if steps is None: continue
             
             current_order_ready_time = 0.0 
             
-            for station in route_steps:
-                station = station.strip()
-                if station not in self.capacities: continue
-                if station in completed_stops: continue 
-
-                # Teorik Günlük Kapasite (4mm için)
-                base_daily_cap = self.capacities[station]
-                if base_daily_cap <= 0: base_daily_cap = 1
-                
-                # --- GERÇEK KAPASİTE HESABI ---
-                # Örn: 1000 m2 (4mm) * 0.6 (10mm katsayısı) = 600 m2 (Gerçek Kapasite)
-                effective_daily_cap = base_daily_cap * capacity_factor
-                
-                done_qty = 0
-                if not order.get('is_new'):
-                    # Cache'den oku (DB'ye gitme)
-                    oid = order.get('id')
-                    if oid in progress_cache and station in progress_cache[oid]:
-                        done_qty = progress_cache[oid][station]
-                
-                remaining_ratio = 1.0 - (done_qty / total_qty)
-                if remaining_ratio <= 0: continue
-
-                remaining_m2 = m2 * remaining_ratio
-                
-                # Süre Hesabı: m2 / Gerçek Kapasite
-                duration_days = remaining_m2 / effective_daily_cap
+            for step in steps:
+                station = step['station']
+                effective_daily_cap = step['daily_capacity']
+                duration_days = step['duration']
 
                 start_day = max(current_order_ready_time, machine_free_time[station])
 
@@ -337,13 +369,7 @@ class SmartPlanner:
                         # Yük Miktarı (m2 bazlı)
                         loads_grid[station][day_idx] += (work_amount * effective_daily_cap)
 
-                        info = {
-                            "code": order['order_code'],
-                            "customer": order.get('customer_name', 'Tahmini'),
-                            "m2": remaining_m2,
-                            "batch": f"{thickness}mm",
-                            "notes": order.get('notes', '')
-                        }
+                        info = dict(step['info'])
                         exists = any(x['code'] == info['code'] for x in details_grid[station][day_idx])
                         if not exists:
                             details_grid[station][day_idx].append(info)
@@ -363,19 +389,110 @@ class SmartPlanner:
             if order.get('is_new'):
                 target_finish_day = current_order_ready_time
 
-        return forecast_grid, details_grid, loads_grid, target_finish_day, order_finish_times
+        return forecast_grid, details_grid, loads_grid, target_finish_day, order_finish_times, None
+
+    def _data_fingerprint(self, capacities):
+        """
+        Simülasyonu etkileyen tüm verilerin özeti (disk cache anahtarı).
+        Siparişler, ilerleme, kapasiteler, takvim ve bugünün tarihi.
+        """
+        with db.get_connection() as conn:
+            orders = conn.execute("""
+                SELECT id, order_code, customer_name, quantity, declared_total_m2,
+                       width, height, thickness, product_type, route, priority,
+                       delivery_date, queue_position, status, notes
+                FROM orders
+                WHERE status IN ('Beklemede', 'Üretimde')
+                ORDER BY id
+            """).fetchall()
+            progress = conn.execute("SELECT COUNT(*), MAX(id) FROM production_logs").fetchone()
+            furnace_beds = conn.execute("SELECT * FROM furnace_beds ORDER BY station_name").fetchall()
+            calendar = conn.execute(
+                "SELECT date, is_holiday FROM factory_calendar ORDER BY date"
+            ).fetchall()
+
+        return PlannerDiskCache.make_fingerprint(
+            now_turkey().date().isoformat(),
+            [tuple(r) for r in orders],
+            tuple(progress),
+            [tuple(r) for r in calendar],
+            capacities,
+            [self.FORECAST_DAYS, self.SIMULATION_WINDOW, self.LOOKAHEAD_WINDOW,
+             self.BATCH_BONUS_SCORE, self.DEFAULT_FACTOR, self.SCHEDULER_ENGINE,
+             self.MAX_HORIZON_DAYS, self.FURNACE_LOADING, self.FURNACE_WINDOW_DAYS],
+            sorted(self.THICKNESS_FACTORS.items()),
+            [tuple(r) for r in furnace_beds]
+        )
+
+    def _run_base_simulation(self, capacities=None):
+        """
+        Yeni sipariş olmadan simülasyon.
+        Veri değişmediyse sonuç disk cache'ten okunur.
+        """
+        if capacities is None:
+            capacities = self._load_capacities()
+        try:
+            fingerprint = self._data_fingerprint(capacities)
+        except Exception as e:
+            print(f"Planlayıcı fingerprint hatası: {e}")
+            return self._run_simulation(new_order=None, capacities=capacities)
+
+        cached = self.disk_cache.get(fingerprint)
+        if cached is not None:
+            return tuple(cached)
+
+        result = self._run_simulation(new_order=None, capacities=capacities)
+        self.disk_cache.set(fingerprint, list(result))
+        return result
+
+    def get_cached_forecast(self):
+        """
+        Sadece cache'ten tahmin döndür (hesaplama yapmaz).
+        PlanningView ilk açılışta bunu kullanır; yoksa None.
+        """
+        try:
+            cached = self.disk_cache.get(self._data_fingerprint(self._load_capacities()))
+        except Exception:
+            return None
+
+        if cached is None:
+            return None
+        grid, details, loads = cached[:3]
+        return grid, details, loads
+
+    def get_cached_timeline(self):
+        """
+        Sadece cache'ten seyrek zaman çizelgesi döndür (hesaplama yapmaz).
+        Yoksa veya eski motor seçiliyse None.
+        """
+        try:
+            cached = self.disk_cache.get(self._data_fingerprint(self._load_capacities()))
+        except Exception:
+            return None
+
+        if cached is None or cached[5] is None:
+            return None
+        return ForecastTimeline.from_dict(cached[5])
 
     def calculate_forecast(self):
-        try: self.capacities = db.get_all_capacities()
-        except: pass
-        grid, details, loads, _, _ = self._run_simulation(new_order=None)
+        grid, details, loads = self._run_base_simulation(self._load_capacities())[:3]
         return grid, details, loads
 
+    def calculate_timeline(self):
+        """
+        Uzun ufuklu tahmin (MAX_HORIZON_DAYS'e kadar).
+        Returns: ForecastTimeline - gün pencereleri talep anında üretilir.
+        Eski ("daily") motor seçiliyse None.
+        """
+        timeline = self._run_base_simulation(self._load_capacities())[5]
+        if timeline is None:
+            return None
+        return ForecastTimeline.from_dict(timeline)
+
     def calculate_impact(self, new_order_data):
-        try: self.capacities = db.get_all_capacities()
-        except: pass
-        _, _, _, _, base_finish_times = self._run_simulation(new_order=None)
-        _, _, _, target_day, new_finish_times = self._run_simulation(new_order=new_order_data)
+        capacities = self._load_capacities()
+        base_finish_times = self._run_base_simulation(capacities)[4]
+        target_day, new_finish_times = self._run_simulation(new_order=new_order_data, capacities=capacities)[3:5]
         
         delayed_orders = []
         for code, base_time in base_finish_times.items():
@@ -393,6 +510,69 @@ class SmartPlanner:
         delivery_date = today + timedelta(days=math.ceil(target_day))
         return delivery_date, math.ceil(target_day), delayed_orders
 
+    def build_scenario_baseline(self):
+        """
+        What-if senaryoları için ortak başlangıç durumu (DB'siz, pickle edilebilir).
+        Süreç havuzundaki işçiler veritabanına hiç dokunmaz.
+        """
+        capacities = self._load_capacities()
+        active_orders, progress_cache, completed_cache = self._load_simulation_inputs()
+        station_factors = self._furnace_factors((active_orders, progress_cache, completed_cache), capacities)
+        return ScenarioBaseline(
+            today=now_turkey().date(),
+            orders=active_orders,
+            progress_cache=progress_cache,
+            completed_cache=completed_cache,
+            capacities=dict(capacities),
+            thickness_factors=dict(self.THICKNESS_FACTORS),
+            default_factor=self.DEFAULT_FACTOR,
+            lookahead_window=self.LOOKAHEAD_WINDOW,
+            batch_bonus_score=self.BATCH_BONUS_SCORE,
+            station_factors=station_factors
+        )
+
+    def evaluate_scenarios(self, scenarios, max_workers=None, baseline=None):
+        """
+        What-if senaryolarını toplu ve paralel değerlendir.
+
+        Args:
+            scenarios: [{'name': str, 'mutations': [...]}, ...]
+                Mutasyon tipleri (bkz. core/scenario_engine.py):
+                reorder, sequence, priority, capacity, holiday, new_order
+            max_workers: Süreç sayısı (None = otomatik)
+            baseline: Hazır ScenarioBaseline (None ise DB'den okunur)
+
+        Returns:
+            Senaryo sırasıyla sonuç listesi: her biri bitiş zamanları,
+            mevcut plana göre farklar (deltas), geciken/iyileşen siparişler.
+        """
+        if baseline is None:
+            baseline = self.build_scenario_baseline()
+        return scenario_runner.run(baseline, scenarios, max_workers=max_workers)
+
+    def optimize_sequence(self, time_budget=5.0, initial_order_ids=None, max_workers=None,
+                          seed=None, baseline=None):
+        """
+        Sezgisel sıralamadan başlayıp süre bütçesi içinde yerel arama ile
+        ağırlıklı gecikmeyi azaltan sıra önerisi (bkz. core/sequence_optimizer.py).
+
+        Args:
+            time_budget: Saniye cinsinden arama bütçesi
+            initial_order_ids: Başlangıç sırası (None = optimize_production_sequence)
+            max_workers: Süreç sayısı (None = otomatik)
+            seed: Tekrarlanabilir sonuç için rastgele tohum
+            baseline: Hazır ScenarioBaseline (None ise DB'den okunur)
+
+        Returns:
+            {'order_ids', 'orders', 'before', 'after', 'heuristic', ...}
+            before/after: {'weighted_tardiness', 'tardy_days', 'late_orders'}
+        """
+        if baseline is None:
+            baseline = self.build_scenario_baseline()
+        return optimize_sequence(baseline, time_budget=time_budget,
+                                 initial_order_ids=initial_order_ids, runner=scenario_runner,
+                                 max_workers=max_workers, seed=seed)
+
     def fix_route_order(self, user_route_str):
         if not user_route_str: return ""
         selected = [s.strip() for s in user_route_str.split(',')]
@@ -411,8 +591,8 @@ class SmartPlanner:
             # Aktif siparişleri çek
             active_orders = db.get_orders_by_status(["Beklemede", "Uretimde"], respect_manual_order=True)
 
-            # Simülasyonu çalıştır
-            forecast_grid, details_grid, loads_grid, _, order_finish_times = self._run_simulation()
+            # Simülasyonu çalıştır (veri değişmediyse disk cache'ten)
+            details_grid = self._run_base_simulation()[1]
 
             # Haftalık plan oluştur (bugünden itibaren 7 gün)
             weekly_plan = {}
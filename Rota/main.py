@@ -1,22 +1,12 @@
 import sys
+import multiprocessing
 from PySide6.QtWidgets import QApplication, QMainWindow, QStackedWidget, QMessageBox
 from PySide6.QtGui import QFont, QIcon
 
-# Kendi modüllerimiz
-try:
-    from ui.theme import Theme
-    from views.login_view import LoginView
-    from views.dashboard_view import DashboardView
-    from views.operator_view import OperatorView
-    from views.daily_summary_dialog import DailySummaryDialog
+# Kendi modüllerimiz __main__ bloğunda yüklenir: senaryo/optimizasyon süreç
+# havuzunun "spawn" işçileri bu dosyayı __mp_main__ olarak yeniden çalıştırır
+# ve veritabanı katmanını (init_database, migrasyonlar) açmamalıdır.
 
-    # === YENİ IMPORT'LAR ===
-    from core.db_manager import db
-    from core.factory_config import factory_config
-    from core.logger import logger
-
-except ImportError as e:
-    print(f"UYARI: Modul yukleme hatasi: {e}")
 
 class EfesRotaApp(QMainWindow):
     def __init__(self):
@@ -28,6 +18,12 @@ class EfesRotaApp(QMainWindow):
             logger.info("Factory config veritabanına bağlandı")
         except Exception as e:
             print(f"Factory config hatası: {e}")
+
+        # === Async DB worker (arka plan sorguları + cache yenileme) ===
+        try:
+            async_db.set_database(db)
+        except Exception as e:
+            print(f"Async DB başlatma hatası: {e}")
         
         # Pencere Ayarları
         self.setWindowTitle("REFLEKS 360 ROTA - Üretim Yönetim Sistemi")
@@ -114,6 +110,28 @@ class EfesRotaApp(QMainWindow):
             self.show_admin_dashboard(user_data)
 
 if __name__ == "__main__":
+    # EXE modunda senaryo süreç havuzunun işçileri uygulamayı yeniden açmasın
+    # (modüller yüklenmeden önce: işçi burada kendi görevine geçer)
+    multiprocessing.freeze_support()
+
+    # Kendi modüllerimiz
+    try:
+        from ui.theme import Theme
+        from views.login_view import LoginView
+        from views.dashboard_view import DashboardView
+        from views.operator_view import OperatorView
+        from views.daily_summary_dialog import DailySummaryDialog
+
+        # === YENİ IMPORT'LAR ===
+        from core.db_manager import db
+        from core.factory_config import factory_config
+        from core.db_async import async_db
+        from core.scenario_engine import scenario_runner
+        from core.logger import logger
+
+    except ImportError as e:
+        print(f"UYARI: Modul yukleme hatasi: {e}")
+
     app = QApplication(sys.argv)
     
     # Temayı Uygula
@@ -124,5 +142,8 @@ if __name__ == "__main__":
     
     window = EfesRotaApp()
     window.show()
-    
-    sys.exit(app.exec())
\ No newline at end of file
+
+    exit_code = app.exec()
+    async_db.shutdown()
+    scenario_runner.shutdown()
+    sys.exit(exit_code)
\ No newline at end of file
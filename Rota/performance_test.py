@@ -1,13 +1,16 @@
 # -*- coding: utf-8 -*-
 """
 EFES ROTA X - PERFORMANS TEST SCRIPT
+Canlı veritabanı üzerinde hızlı ölçüm. Sabit veri boyutlarında tekrarlanabilir
+ölçüm ve regresyon kontrolü için: python -m benchmarks.planner_benchmarks
 """
 
+import os
 import sys
 import time
 from datetime import datetime
 
-sys.path.insert(0, 'c:\\Users\\okand\\Desktop\\Rota')
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from core.db_manager import db
 from core.smart_planner import planner
@@ -19,7 +19,8 @@ class ImpactReportDialog(QDialog):
     """Etki analizi sonuçlarını gösteren popup dialog - Excel tarzı"""
 
     def __init__(self, analysis_result: dict, selected_order: dict,
-                 current_position: int = None, target_position: int = None, parent=None):
+                 current_position: int = None, target_position: int = None, parent=None,
+                 alternatives: list = None):
         """
         Args:
             analysis_result: ImpactAnalyzer.analyze_reorder_impact() sonucu
@@ -27,12 +28,16 @@ class ImpactReportDialog(QDialog):
             current_position: Mevcut pozisyon (0-based, opsiyonel)
             target_position: Hedef pozisyon (0-based, opsiyonel)
             parent: Ana pencere
+            alternatives: ImpactAnalyzer.compare_reorder_options() sonucu (opsiyonel).
+                Verilirse alternatif pozisyonlar karşılaştırma tablosunda gösterilir;
+                satıra tıklamak hedef pozisyonu değiştirir (bkz. target_position).
         """
         super().__init__(parent)
         self.analysis = analysis_result
         self.selected_order = selected_order
         self.current_position = current_position
         self.target_position = target_position
+        self.alternatives = alternatives or []
         self.user_confirmed = False
 
         self.setWindowTitle("Etki Analizi Raporu")
@@ -60,11 +65,17 @@ class ImpactReportDialog(QDialog):
         # Başlık
         self._add_header(layout)
 
-        # Özet bilgi
-        self._add_summary(layout)
+        # Alternatif pozisyon karşılaştırması
+        if self.alternatives:
+            self._add_alternatives(layout)
 
-        # Tablo
-        self._add_table(layout)
+        # Özet bilgi + tablo (alternatif seçilince yeniden çizilir)
+        self.content_widget = QWidget()
+        self.content_layout = QVBoxLayout(self.content_widget)
+        self.content_layout.setSpacing(0)
+        self.content_layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(self.content_widget, 1)
+        self._render_analysis()
 
         # Alt butonlar
         self._add_buttons(layout)
@@ -92,6 +103,13 @@ class ImpactReportDialog(QDialog):
         header_layout.addWidget(title)
 
         # Sipariş bilgisi
+        self.info_label = QLabel(self._info_text())
+        self.info_label.setStyleSheet("color: #666666; font-size: 10pt; background: transparent; border: none;")
+        header_layout.addWidget(self.info_label)
+
+        layout.addWidget(header_widget)
+
+    def _info_text(self) -> str:
         order_code = self.selected_order.get('order_code', 'N/A')
         customer = self.selected_order.get('customer_name', 'N/A')
 
@@ -99,12 +117,92 @@ class ImpactReportDialog(QDialog):
 
         if self.current_position is not None and self.target_position is not None:
             info_text += f" | Değişiklik: {self.current_position + 1}. sıra → {self.target_position + 1}. sıra"
+        return info_text
 
-        info_label = QLabel(info_text)
-        info_label.setStyleSheet("color: #666666; font-size: 10pt; background: transparent; border: none;")
-        header_layout.addWidget(info_label)
+    def _add_alternatives(self, layout):
+        """Alternatif pozisyonların özet karşılaştırması - tıklanınca seçilir"""
+        title = QLabel("Alternatif Pozisyonlar (satıra tıklayarak seçin)")
+        title.setStyleSheet("color: #1A1A1A; font-size: 10pt; font-weight: bold; padding: 10px 20px 4px 20px;")
+        layout.addWidget(title)
 
-        layout.addWidget(header_widget)
+        table = QTableWidget()
+        table.setColumnCount(5)
+        table.setRowCount(len(self.alternatives))
+        table.setHorizontalHeaderLabels(["Sıra", "Etkilenen", "Gecikecek", "Termin Aşan", "İyileşen"])
+        table.verticalHeader().setVisible(False)
+        table.setSelectionBehavior(QTableWidget.SelectRows)
+        table.setSelectionMode(QTableWidget.SingleSelection)
+        table.setEditTriggers(QTableWidget.NoEditTriggers)
+        table.setMaximumHeight(170)
+        table.setStyleSheet("""
+            QTableWidget {
+                background-color: white;
+                border: none;
+                border-bottom: 1px solid #D4D4D4;
+                gridline-color: #E0E0E0;
+                font-size: 9pt;
+            }
+            QTableWidget::item:selected {
+                background-color: #E3F2FD;
+                color: #1A1A1A;
+            }
+            QHeaderView::section {
+                background-color: #F3F3F3;
+                padding: 6px;
+                border: none;
+                border-bottom: 1px solid #D4D4D4;
+                font-weight: bold;
+                font-size: 9pt;
+                color: #1A1A1A;
+            }
+        """)
+
+        selected_row = None
+        for row, alternative in enumerate(self.alternatives):
+            summary = alternative['analysis'].get('summary', {})
+            values = [
+                f"{alternative['position'] + 1}.",
+                summary.get('total_affected', 0),
+                summary.get('delayed_count', 0),
+                summary.get('deadline_exceeded_count', 0),
+                summary.get('improved_count', 0)
+            ]
+            for col, value in enumerate(values):
+                item = QTableWidgetItem(str(value))
+                item.setTextAlignment(Qt.AlignCenter | Qt.AlignVCenter)
+                if col == 3 and value:
+                    item.setForeground(QColor(192, 0, 0))
+                table.setItem(row, col, item)
+
+            if alternative['position'] == self.target_position:
+                selected_row = row
+
+        for col in range(5):
+            table.horizontalHeader().setSectionResizeMode(col, QHeaderView.Stretch)
+
+        if selected_row is not None:
+            table.selectRow(selected_row)
+        table.cellClicked.connect(lambda row, _col: self._select_alternative(row))
+
+        layout.addWidget(table)
+
+    def _select_alternative(self, row):
+        """Karşılaştırma tablosundan bir alternatif seçildi"""
+        alternative = self.alternatives[row]
+        self.target_position = alternative['position']
+        self.analysis = alternative['analysis']
+        self.info_label.setText(self._info_text())
+        self._render_analysis()
+
+    def _render_analysis(self):
+        """Özet ve etkilenen siparişler tablosunu (yeniden) oluştur"""
+        while self.content_layout.count():
+            child = self.content_layout.takeAt(0)
+            if child.widget():
+                child.widget().deleteLater()
+
+        self._add_summary(self.content_layout)
+        self._add_table(self.content_layout)
 
     def _add_summary(self, layout):
         """Özet istatistikler - Minimal"""
@@ -5,12 +5,14 @@ Sipariş öncelik değişikliklerinin diğer siparişlere etkisini analiz eder.
 What-If senaryoları üretir ve karar destek sağlar.
 
 Özellikler:
-- Simülasyon tabanlı etki analizi
+- Simülasyon tabanlı etki analizi (SmartPlanner senaryo motoru; yoksa basit model)
+- Birden çok alternatifin tek toplu (paralel) değerlendirmesi
 - Tahmini teslim tarihi karşılaştırması
 - Gecikme/Erken teslim hesaplama
 - Kritik sipariş tespiti
 """
 
+import math
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional
 from copy import deepcopy
@@ -86,18 +88,57 @@ class ImpactAnalyzer:
         if selected_order is None:
             return {'error': 'Sipariş bulunamadı'}
 
-        # 2. Mevcut durumu analiz et (Before)
-        current_snapshot = self._calculate_completion_dates(all_orders)
-
-        # 3. Yeni sıralamayı oluştur
+        # 2. Yeni sıralamayı oluştur
         new_orders = all_orders.copy()
         new_orders.pop(selected_index)
         new_orders.insert(new_position, selected_order)
 
-        # 4. Yeni durumu analiz et (After)
-        new_snapshot = self._calculate_completion_dates(new_orders)
+        # 3. Önce / sonra durumlarını tek toplu simülasyonda hesapla
+        current_snapshot, new_snapshot = self._completion_snapshots(all_orders, [all_orders, new_orders])
+
+        return self._build_report(all_orders, current_snapshot, new_snapshot)
+
+    def compare_reorder_options(
+        self,
+        all_orders: List[Dict],
+        selected_order_id: int,
+        positions: List[int]
+    ) -> List[Dict]:
+        """
+        Bir siparişi farklı pozisyonlara taşımanın etkilerini karşılaştır.
+        Tüm alternatifler tek toplu (paralel) planlayıcı çağrısında hesaplanır.
 
-        # 5. Farkları hesapla
+        Returns:
+            [{'position': int, 'analysis': analyze_reorder_impact formatı}, ...]
+        """
+        selected_index = None
+        for i, order in enumerate(all_orders):
+            if order.get('id') == selected_order_id:
+                selected_index = i
+                break
+
+        if selected_index is None or not positions:
+            return []
+
+        order_lists = [all_orders]
+        for position in positions:
+            new_orders = all_orders.copy()
+            moved = new_orders.pop(selected_index)
+            new_orders.insert(position, moved)
+            order_lists.append(new_orders)
+
+        snapshots = self._completion_snapshots(all_orders, order_lists)
+        current_snapshot = snapshots[0]
+
+        return [
+            {'position': position,
+             'analysis': self._build_report(all_orders, current_snapshot, snapshot)}
+            for position, snapshot in zip(positions, snapshots[1:])
+        ]
+
+    def _build_report(self, all_orders: List[Dict], current_snapshot: Dict, new_snapshot: Dict) -> Dict:
+        """Önce/sonra tamamlanma tarihlerinden etki raporu oluştur"""
+        # Farkları hesapla
         affected_orders = []
 
         for order_id, current_date in current_snapshot.items():
@@ -139,12 +180,12 @@ class ImpactAnalyzer:
                     'exceeds_deadline': exceeds_deadline
                 })
 
-        # 6. Özet istatistikler
+        # Özet istatistikler
         delayed_count = sum(1 for x in affected_orders if x['diff_days'] > 0)
         improved_count = sum(1 for x in affected_orders if x['diff_days'] < 0)
         deadline_exceeded_count = sum(1 for x in affected_orders if x['exceeds_deadline'])
 
-        # 7. Önem derecesine göre sırala (kritik önce)
+        # Önem derecesine göre sırala (kritik önce)
         severity_order = {'critical': 0, 'warning': 1, 'improved': 2, 'neutral': 3}
         affected_orders.sort(key=lambda x: (severity_order[x['severity']], -abs(x['diff_days'])))
 
@@ -158,9 +199,45 @@ class ImpactAnalyzer:
             }
         }
 
+    def _completion_snapshots(self, all_orders: List[Dict], order_lists: List[List[Dict]]) -> List[Dict[int, datetime]]:
+        """
+        Her sıralama için tamamlanma tarihleri.
+
+        Planlayıcının senaryo motoru varsa gerçek kapasite/rota modeli ile
+        hepsini tek toplu (paralel) çağrıda hesaplar; yoksa veya hata olursa
+        basit birikimli modele düşer.
+        """
+        if self.planner and hasattr(self.planner, 'evaluate_scenarios'):
+            try:
+                scenarios = [
+                    {'name': str(i),
+                     'mutations': [{'type': 'sequence', 'order_ids': [o.get('id') for o in orders]}]}
+                    for i, orders in enumerate(order_lists)
+                ]
+                results = self.planner.evaluate_scenarios(scenarios)
+
+                code_to_id = {o.get('order_code'): o.get('id') for o in all_orders}
+                today = now_turkey()
+                snapshots = []
+                for result in results:
+                    if result.get('error'):
+                        raise RuntimeError(result['error'])
+                    snapshot = {}
+                    for code, finish_day in result['finish_times'].items():
+                        order_id = code_to_id.get(code)
+                        if order_id:
+                            snapshot[order_id] = today + timedelta(days=math.ceil(finish_day))
+                    snapshots.append(snapshot)
+                return snapshots
+            except Exception as e:
+                print(f"Senaryo analizi hatası, basit modele geçiliyor: {e}")
+
+        return [self._calculate_completion_dates(orders) for orders in order_lists]
+
     def _calculate_completion_dates(self, orders: List[Dict]) -> Dict[int, datetime]:
         """
         Tüm siparişler için tahmini tamamlanma tarihlerini hesapla
+        (Basit model - planlayıcı kullanılamazsa)
         ÖNEMLI: Sipariş sırasını dikkate alarak kümülatif hesaplama yapar
 
         Returns:
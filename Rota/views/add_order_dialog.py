@@ -11,7 +11,7 @@ from PySide6.QtWidgets import (
     QGridLayout, QSizePolicy, QCheckBox, QScrollArea,
     QWidget, QGroupBox, QTextEdit, QProgressDialog
 )
-from PySide6.QtCore import Qt, QDate, QThread, Signal
+from PySide6.QtCore import Qt, QDate
 from PySide6.QtGui import QFont, QCursor
 from datetime import datetime, timedelta
 
@@ -19,6 +19,7 @@ try:
     from core.db_manager import db
     from core.smart_planner import planner
     from core.factory_config import factory_config
+    from core.db_async import run_async
 except ImportError:
     db = None
     planner = None
@@ -181,25 +182,16 @@ class FactoryCapacity:
 
 
 # =============================================================================
-# ASYNC WORKER THREAD
+# ASYNC KAYIT (yazıcı worker'da çalışır)
 # =============================================================================
-class OrderSaveWorker(QThread):
-    """Siparis kaydetme islemi icin arka plan thread'i"""
-    finished = Signal(bool, str)  # (success, message)
-
-    def __init__(self, order_data):
-        super().__init__()
-        self.order_data = order_data
-
-    def run(self):
-        """Arka planda siparis kaydet"""
-        try:
-            if db and db.add_new_order(self.order_data):
-                self.finished.emit(True, f"Siparis '{self.order_data['code']}' basariyla kaydedildi.")
-            else:
-                self.finished.emit(False, "Siparis kaydedilemedi!")
-        except Exception as e:
-            self.finished.emit(False, f"Kayit hatasi: {str(e)}")
+def _save_order(order_data):
+    """Siparisi kaydet -> (success, message)"""
+    try:
+        if db and db.add_new_order(order_data):
+            return True, f"Siparis '{order_data['code']}' basariyla kaydedildi."
+        return False, "Siparis kaydedilemedi!"
+    except Exception as e:
+        return False, f"Kayit hatasi: {str(e)}"
 
 
 # =============================================================================
@@ -894,41 +886,54 @@ class AddOrderDialog(QDialog):
             'date': None # Tarihi o verecek
         }
 
-        # Planlayıcı varsa ona sor, yoksa basit hesap yap
+        # Planlayıcı varsa ona sor (arka planda), yoksa basit hesap yap
         if planner:
-            try:
-                # result = (delivery_date, finish_day_index, delayed_orders_list)
-                est_date, days, delayed = planner.calculate_impact(temp_order_data)
-
-                # Sonuçları kontrol et
-                if est_date and days is not None:
-                    # Tarih kutusunu güncelle
-                    self.date_picker.setDate(est_date)
-
-                    # Bilgi metni
-                    station_count = len([s for s in route_str.split(',') if s.strip() != "SEVKIYAT"])
-                    info_text = f"Tahmini: {days} gün ({station_count} istasyon)\nTeslim: {est_date.strftime('%d.%m.%Y')}"
-
-                    # Eğer bu sipariş başkalarını geciktiriyorsa uyar
-                    if delayed:
-                        info_text += f"\n⚠️ Dikkat: Bu sipariş {len(delayed)} diğer işi geciktirebilir."
-                        self.lbl_estimate.setStyleSheet(f"color: {Colors.WARNING}; font-size: 11px; font-weight: bold;")
-                    else:
-                        self.lbl_estimate.setStyleSheet(f"color: {Colors.SUCCESS}; font-size: 11px; font-weight: bold;")
-
-                    self.lbl_estimate.setText(info_text)
-                    return
-                else:
-                    # Geçersiz sonuç, basit hesaba geç
-                    print("SmartPlanner geçersiz sonuç döndü, basit hesap kullanılıyor")
+            self.lbl_estimate.setText("Hesaplanıyor...")
+            run_async(
+                planner.calculate_impact, temp_order_data,
+                callback=lambda result: self._on_estimate_ready(result, route_str, total_m2),
+                error_callback=lambda msg: self._on_estimate_failed(msg, route_str, total_m2),
+                key="order_estimate"
+            )
+            return
 
-            except Exception as e:
-                print(f"Akıllı hesaplama hatası: {e}")
-                import traceback
-                traceback.print_exc()
-                # Hata olursa eski yönteme (basit hesap) düş (Fallback)
-        
-        # --- ESKİ BASİT YÖNTEM (YEDEK) ---
+        self._apply_simple_estimate(route_str, total_m2)
+
+    def _on_estimate_ready(self, result, route_str, total_m2):
+        """SmartPlanner sonucu geldi (GUI thread)"""
+        # result = (delivery_date, finish_day_index, delayed_orders_list)
+        est_date, days, delayed = result
+
+        # Sonuçları kontrol et
+        if est_date and days is not None:
+            # Tarih kutusunu güncelle
+            self.date_picker.setDate(est_date)
+
+            # Bilgi metni
+            station_count = len([s for s in route_str.split(',') if s.strip() != "SEVKIYAT"])
+            info_text = f"Tahmini: {days} gün ({station_count} istasyon)\nTeslim: {est_date.strftime('%d.%m.%Y')}"
+
+            # Eğer bu sipariş başkalarını geciktiriyorsa uyar
+            if delayed:
+                info_text += f"\n⚠️ Dikkat: Bu sipariş {len(delayed)} diğer işi geciktirebilir."
+                self.lbl_estimate.setStyleSheet(f"color: {Colors.WARNING}; font-size: 11px; font-weight: bold;")
+            else:
+                self.lbl_estimate.setStyleSheet(f"color: {Colors.SUCCESS}; font-size: 11px; font-weight: bold;")
+
+            self.lbl_estimate.setText(info_text)
+            return
+
+        # Geçersiz sonuç, basit hesaba geç
+        print("SmartPlanner geçersiz sonuç döndü, basit hesap kullanılıyor")
+        self._apply_simple_estimate(route_str, total_m2)
+
+    def _on_estimate_failed(self, error_msg, route_str, total_m2):
+        """Akıllı hesaplama hatası - eski yönteme (basit hesap) düş (Fallback)"""
+        print(f"Akıllı hesaplama hatası: {error_msg}")
+        self._apply_simple_estimate(route_str, total_m2)
+
+    def _apply_simple_estimate(self, route_str, total_m2):
+        """ESKİ BASİT YÖNTEM (YEDEK)"""
         days = FactoryCapacity.estimate_days(route_str, total_m2)
         priority = self.combo_priority.currentText()
         if priority == "Kritik": days = max(1, days - 2)
@@ -936,6 +941,7 @@ class AddOrderDialog(QDialog):
         estimated_date = QDate.currentDate().addDays(days)
         self.date_picker.setDate(estimated_date)
         self.lbl_estimate.setText(f"Basit Tahmin: {days} gün → {estimated_date.toString('dd.MM.yyyy')}")
+
     def save_order(self):
         """Siparisi kaydet - ASENKRON"""
         code = self.inp_code.text().strip()
@@ -1027,10 +1033,12 @@ class AddOrderDialog(QDialog):
         self.progress.setMinimumDuration(0)
         self.progress.show()
 
-        # Worker thread basla
-        self.worker = OrderSaveWorker(data)
-        self.worker.finished.connect(self._on_save_finished)
-        self.worker.start()
+        # Kayit tek yazici worker'da, sonuc GUI thread'ine doner
+        self.worker = run_async(
+            _save_order, data,
+            callback=lambda result: self._on_save_finished(*result),
+            write=True
+        )
 
     def _on_save_finished(self, success, message):
         """Kayit tamamlandiginda cagrilir"""
@@ -16,7 +16,7 @@ from PySide6.QtWidgets import (
     QPushButton, QFrame, QScrollArea, QLineEdit,
     QGraphicsDropShadowEffect, QSizePolicy
 )
-from PySide6.QtCore import Qt, Signal, QPoint, QSize, QTimer, QEvent, QRect, QThread, QPropertyAnimation, QEasingCurve
+from PySide6.QtCore import Qt, Signal, QPoint, QSize, QTimer, QEvent, QRect, QPropertyAnimation, QEasingCurve
 from PySide6.QtGui import QColor, QCursor, QMouseEvent
 
 try:
@@ -26,6 +26,11 @@ except ImportError:
     now_turkey = lambda: datetime.now()
 
 # Chatbot motorunu import et
+try:
+    from core.db_async import run_async
+except ImportError:
+    run_async = None
+
 try:
     from core.chatbot import bot
 except ImportError:
@@ -38,36 +43,21 @@ except ImportError:
 # =============================================================================
 # THREADING - ANA THREAD'İ DONDURMAMAK İÇİN
 # =============================================================================
-class BotWorker(QThread):
-    """Arka planda bot işlemlerini çalıştıran worker thread"""
-
-    # Sinyal: İşlem tamamlandığında response'u gönder
-    response_ready = Signal(dict)
-
-    def __init__(self, message, parent=None):
-        super().__init__(parent)
-        self.message = message
-
-    def run(self):
-        """Arka planda çalışacak işlem"""
-        try:
-            if bot:
-                response = bot.process_message(self.message)
-            else:
-                response = {
-                    'text': '⚠️ Asistan şu an kullanılamıyor.',
-                    'buttons': []
-                }
-
-            # Sinyal ile ana thread'e gönder
-            self.response_ready.emit(response)
-        except Exception as e:
-            # Hata durumunda kullanıcıya bilgi ver
-            error_response = {
-                'text': f'⚠️ Bir hata oluştu: {str(e)}',
-                'buttons': []
-            }
-            self.response_ready.emit(error_response)
+def _process_bot_message(message):
+    """Bot işlemini çalıştır (worker havuzunda çağrılır, widget'a dokunmaz)"""
+    try:
+        if bot:
+            return bot.process_message(message)
+        return {
+            'text': '⚠️ Asistan şu an kullanılamıyor.',
+            'buttons': []
+        }
+    except Exception as e:
+        # Hata durumunda kullanıcıya bilgi ver
+        return {
+            'text': f'⚠️ Bir hata oluştu: {str(e)}',
+            'buttons': []
+        }
 
 
 # =============================================================================
@@ -286,7 +276,7 @@ class ChatPanel(QFrame):
         # Typing indicator
         self.typing_indicator = None
 
-        # Worker thread (veritabanı işlemleri için)
+        # Arka plan çağrısı (veritabanı işlemleri için)
         self.worker = None
 
         self.setMouseTracking(True)
@@ -670,16 +660,18 @@ class ChatPanel(QFrame):
         QTimer.singleShot(delay, lambda: self._process_and_respond(text))
 
     def _process_and_respond(self, text):
-        """Mesajı işle ve yanıt ver (arka planda thread ile)"""
-        # Önceki worker varsa temizle
-        if self.worker and self.worker.isRunning():
-            self.worker.wait()
+        """Mesajı işle ve yanıt ver (arka planda worker havuzunda)"""
+        self._run_bot(text)
 
-        # Yeni worker thread başlat (ana thread donmayacak!)
-        self.worker = BotWorker(text, self)
-        self.worker.response_ready.connect(self._on_response_ready)
-        self.worker.finished.connect(self._on_worker_finished)
-        self.worker.start()
+    def _run_bot(self, text):
+        """Bot cevabını worker havuzunda hazırla, GUI thread'inde göster"""
+        if run_async is None:
+            self._on_response_ready(_process_bot_message(text))
+            return
+
+        # Ana thread donmayacak; sonuç _on_response_ready'e GUI thread'inde gelir
+        self.worker = run_async(_process_bot_message, text,
+                                callback=self._on_response_ready)
 
     def _on_response_ready(self, response):
         """Worker thread cevabı hazırladığında çağrılır"""
@@ -689,12 +681,6 @@ class ChatPanel(QFrame):
         # Cevabı ekrana bas
         self.add_bot_message(response.get('text', ''), response.get('buttons'))
 
-    def _on_worker_finished(self):
-        """Worker thread bittiğinde temizlik yap"""
-        if self.worker:
-            self.worker.deleteLater()
-            self.worker = None
-
     def _show_typing_indicator(self):
         """Typing indicator göster"""
         if self.typing_indicator is None:
@@ -727,16 +713,8 @@ class ChatPanel(QFrame):
         QTimer.singleShot(delay, lambda: self._process_button_response(clean_text))
 
     def _process_button_response(self, text):
-        """Buton yanıtını işle (arka planda thread ile)"""
-        # Önceki worker varsa temizle
-        if self.worker and self.worker.isRunning():
-            self.worker.wait()
-
-        # Yeni worker thread başlat (ana thread donmayacak!)
-        self.worker = BotWorker(text, self)
-        self.worker.response_ready.connect(self._on_response_ready)
-        self.worker.finished.connect(self._on_worker_finished)
-        self.worker.start()
+        """Buton yanıtını işle (arka planda worker havuzunda)"""
+        self._run_bot(text)
     
     def _scroll_to_bottom(self):
         """Scroll'u en alta getir"""
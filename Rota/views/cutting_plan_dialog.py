@@ -0,0 +1,296 @@
+"""
+EFES ROTA X - Kesim Planı (INTERMAC / LIVA KESIM)
+Bekleyen kesimlerin plakalara yerleşimi, verim/fire özeti ve plaka rezervasyonu.
+"""
+
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QComboBox,
+    QTableWidget, QTableWidgetItem, QHeaderView, QAbstractItemView,
+    QMessageBox, QSplitter, QWidget
+)
+from PySide6.QtCore import Qt, QRectF
+from PySide6.QtGui import QColor, QPainter, QPen, QBrush, QFont
+
+try:
+    from core.cutting_planner import cutting_planner, CUTTING_STATIONS
+    from core.db_async import run_async
+except ImportError:
+    cutting_planner = None
+    CUTTING_STATIONS = ("INTERMAC", "LIVA KESIM")
+    run_async = None
+
+
+class Colors:
+    BG = "#FFFFFF"
+    HEADER_BG = "#F3F3F3"
+    BORDER = "#D4D4D4"
+    TEXT = "#1A1A1A"
+    TEXT_SECONDARY = "#666666"
+    ACCENT = "#217346"
+    SHEET = "#EEF3F8"
+    WASTE = "#F4E3E3"
+    CRITICAL = "#C00000"
+    SUCCESS = "#107C41"
+    WARNING = "#C65911"
+
+
+# Sipariş renkleri (aynı sipariş aynı renk)
+PIECE_COLORS = ["#9DC3E6", "#A9D18E", "#FFD966", "#F4B183", "#C9A0DC",
+                "#8FD3D1", "#F8CBAD", "#B4C7E7", "#C5E0B4", "#FFE699"]
+
+
+class SheetLayoutWidget(QWidget):
+    """Tek plakanın yerleşim çizimi (ölçekli)"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.layout_data = None
+        self.setMinimumSize(360, 260)
+
+    def set_layout(self, layout_data):
+        self.layout_data = layout_data
+        self.update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.fillRect(self.rect(), QColor(Colors.BG))
+
+        sheet = self.layout_data
+        if sheet is None:
+            painter.setPen(QColor(Colors.TEXT_SECONDARY))
+            painter.drawText(self.rect(), Qt.AlignCenter, "Plaka seçiniz")
+            return
+
+        margin = 16
+        scale = min((self.width() - 2 * margin) / sheet.width, (self.height() - 2 * margin - 18) / sheet.height)
+        ox, oy = margin, margin + 18
+
+        painter.setPen(QColor(Colors.TEXT))
+        painter.setFont(QFont("Segoe UI", 9, QFont.Bold))
+        painter.drawText(margin, margin + 8,
+                         f"{sheet.width:g} x {sheet.height:g} cm  ×{sheet.repeat}  "
+                         f"verim %{sheet.yield_ratio * 100:.1f}")
+
+        painter.setPen(QPen(QColor(Colors.BORDER), 1))
+        painter.setBrush(QBrush(QColor(Colors.WASTE)))
+        painter.drawRect(QRectF(ox, oy, sheet.width * scale, sheet.height * scale))
+
+        painter.setFont(QFont("Segoe UI", 7))
+        for p in sheet.placements:
+            color = QColor(PIECE_COLORS[hash(p.order_code) % len(PIECE_COLORS)])
+            rect = QRectF(ox + p.x * scale, oy + p.y * scale, p.width * scale, p.height * scale)
+            painter.setPen(QPen(QColor(Colors.TEXT_SECONDARY), 1))
+            painter.setBrush(QBrush(color))
+            painter.drawRect(rect)
+            if rect.width() > 40 and rect.height() > 18:
+                painter.setPen(QColor(Colors.TEXT))
+                label = f"{p.order_code}\n{p.width:g}x{p.height:g}" + (" ↻" if p.rotated else "")
+                painter.drawText(rect, Qt.AlignCenter, label)
+
+
+class CuttingPlanDialog(QDialog):
+    """Kesim istasyonu nesting planı"""
+
+    def __init__(self, station_name=None, parent=None):
+        super().__init__(parent)
+        self.plan = None
+        self.setWindowTitle("Kesim Planı")
+        self.resize(1100, 680)
+        self.setStyleSheet(f"""
+            QDialog {{ background-color: {Colors.BG}; }}
+            QLabel {{ color: {Colors.TEXT}; font-size: 11px; }}
+            QTableWidget {{ border: 1px solid {Colors.BORDER}; gridline-color: {Colors.BORDER}; font-size: 11px; }}
+            QHeaderView::section {{ background-color: {Colors.HEADER_BG}; padding: 4px; border: none;
+                                    border-bottom: 1px solid {Colors.BORDER}; font-weight: bold; }}
+            QPushButton {{ border: 1px solid {Colors.BORDER}; border-radius: 3px; padding: 5px 12px; font-size: 11px; }}
+        """)
+        self.setup_ui()
+
+        if station_name in CUTTING_STATIONS:
+            self.combo_station.setCurrentText(station_name)
+        self.calculate()
+
+    def setup_ui(self):
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(12, 12, 12, 12)
+        layout.setSpacing(8)
+
+        header = QHBoxLayout()
+        title = QLabel("Kesim Planı")
+        title.setStyleSheet(f"font-size: 14px; font-weight: bold; color: {Colors.ACCENT};")
+        header.addWidget(title)
+        header.addSpacing(12)
+
+        header.addWidget(QLabel("İstasyon:"))
+        self.combo_station = QComboBox()
+        self.combo_station.addItems(list(CUTTING_STATIONS))
+        self.combo_station.currentTextChanged.connect(lambda _: self.calculate())
+        header.addWidget(self.combo_station)
+
+        self.btn_calculate = QPushButton("Hesapla")
+        self.btn_calculate.clicked.connect(self.calculate)
+        header.addWidget(self.btn_calculate)
+
+        header.addStretch()
+        self.lbl_summary = QLabel("")
+        self.lbl_summary.setStyleSheet(f"font-weight: bold; color: {Colors.TEXT};")
+        header.addWidget(self.lbl_summary)
+        layout.addLayout(header)
+
+        splitter = QSplitter(Qt.Horizontal)
+
+        left = QWidget()
+        left_layout = QVBoxLayout(left)
+        left_layout.setContentsMargins(0, 0, 0, 0)
+
+        self.table_groups = QTableWidget(0, 6)
+        self.table_groups.setHorizontalHeaderLabels(["Kalınlık / Tip", "Parça", "Yerleşen", "Plaka", "Verim %", "Fire m²"])
+        self.table_groups.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.table_groups.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table_groups.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.table_groups.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table_groups.verticalHeader().setVisible(False)
+        self.table_groups.itemSelectionChanged.connect(self._on_group_selected)
+        left_layout.addWidget(self.table_groups, 3)
+
+        self.table_sheets = QTableWidget(0, 4)
+        self.table_sheets.setHorizontalHeaderLabels(["Plaka", "Tekrar", "Parça", "Verim %"])
+        self.table_sheets.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.table_sheets.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table_sheets.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.table_sheets.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table_sheets.verticalHeader().setVisible(False)
+        self.table_sheets.itemSelectionChanged.connect(self._on_sheet_selected)
+        left_layout.addWidget(self.table_sheets, 2)
+
+        splitter.addWidget(left)
+
+        self.sheet_view = SheetLayoutWidget()
+        splitter.addWidget(self.sheet_view)
+        splitter.setSizes([520, 580])
+        layout.addWidget(splitter, 1)
+
+        self.lbl_status = QLabel("")
+        self.lbl_status.setStyleSheet(f"color: {Colors.TEXT_SECONDARY};")
+        layout.addWidget(self.lbl_status)
+
+        buttons = QHBoxLayout()
+        buttons.addStretch()
+        self.btn_release = QPushButton("Rezervasyonu Kaldır")
+        self.btn_release.clicked.connect(self.release_reservation)
+        buttons.addWidget(self.btn_release)
+
+        self.btn_reserve = QPushButton("Plakaları Rezerve Et")
+        self.btn_reserve.setStyleSheet(f"background-color: {Colors.ACCENT}; color: white; font-weight: bold;")
+        self.btn_reserve.setEnabled(False)
+        self.btn_reserve.clicked.connect(self.reserve_plates)
+        buttons.addWidget(self.btn_reserve)
+
+        btn_close = QPushButton("Kapat")
+        btn_close.clicked.connect(self.accept)
+        buttons.addWidget(btn_close)
+        layout.addLayout(buttons)
+
+    # ------------------------------------------------------------------
+    def calculate(self):
+        """Planı worker havuzunda hesapla (gruplar süreç havuzunda paralel)"""
+        if cutting_planner is None:
+            return
+        station = self.combo_station.currentText()
+        self.btn_calculate.setEnabled(False)
+        self.btn_reserve.setEnabled(False)
+        self.lbl_status.setText(f"{station} kesim planı hesaplanıyor...")
+        run_async(
+            cutting_planner.plan, station,
+            callback=self._on_plan_ready,
+            error_callback=self._on_plan_failed,
+            key="cutting_plan"
+        )
+
+    def _on_plan_ready(self, plan):
+        self.btn_calculate.setEnabled(True)
+        if plan['station'] != self.combo_station.currentText():
+            return  # İstasyon bu arada değişti; yeni hesap yolda
+        self.plan = plan
+        self.btn_reserve.setEnabled(bool(plan['plates_used']))
+
+        unplaced = plan['pieces'] - plan['placed']
+        self.lbl_summary.setText(
+            f"{plan['placed']}/{plan['pieces']} parça  |  {plan['sheets']} plaka  |  "
+            f"verim %{plan['yield'] * 100:.1f}  |  fire {plan['waste_m2']:.1f} m²"
+        )
+        self.lbl_status.setText(
+            f"Hesap süresi {plan['elapsed_ms'] / 1000:.2f} sn"
+            + (f"  -  {unplaced} parça stok yetersizliğinden yerleşmedi" if unplaced else "")
+        )
+
+        self.table_groups.setRowCount(0)
+        for row, group in enumerate(plan['groups']):
+            thickness, glass_type = group['group']
+            self.table_groups.insertRow(row)
+            values = [f"{thickness}mm {glass_type}", group['pieces'], group['placed'], group['sheets'],
+                      f"{group['yield'] * 100:.1f}", f"{group['waste_m2']:.1f}"]
+            for col, value in enumerate(values):
+                item = QTableWidgetItem(str(value))
+                item.setTextAlignment(Qt.AlignCenter if col else Qt.AlignLeft | Qt.AlignVCenter)
+                if col == 2 and group['placed'] < group['pieces']:
+                    item.setForeground(QColor(Colors.CRITICAL))
+                self.table_groups.setItem(row, col, item)
+
+        self.table_sheets.setRowCount(0)
+        self.sheet_view.set_layout(None)
+        if plan['groups']:
+            self.table_groups.selectRow(0)
+
+    def _on_plan_failed(self, error_msg):
+        self.btn_calculate.setEnabled(True)
+        self.lbl_status.setText(f"Hata: {error_msg}")
+
+    def _on_group_selected(self):
+        rows = self.table_groups.selectionModel().selectedRows()
+        if not self.plan or not rows:
+            return
+        group = self.plan['groups'][rows[0].row()]
+
+        self.table_sheets.setRowCount(0)
+        for row, sheet in enumerate(group['layouts']):
+            self.table_sheets.insertRow(row)
+            values = [f"{sheet.width:g} x {sheet.height:g}", sheet.repeat, len(sheet.placements),
+                      f"{sheet.yield_ratio * 100:.1f}"]
+            for col, value in enumerate(values):
+                item = QTableWidgetItem(str(value))
+                item.setTextAlignment(Qt.AlignCenter)
+                self.table_sheets.setItem(row, col, item)
+
+        if group['layouts']:
+            self.table_sheets.selectRow(0)
+        else:
+            self.sheet_view.set_layout(None)
+
+    def _on_sheet_selected(self):
+        group_rows = self.table_groups.selectionModel().selectedRows()
+        sheet_rows = self.table_sheets.selectionModel().selectedRows()
+        if not self.plan or not group_rows or not sheet_rows:
+            return
+        group = self.plan['groups'][group_rows[0].row()]
+        self.sheet_view.set_layout(group['layouts'][sheet_rows[0].row()])
+
+    def reserve_plates(self):
+        if not self.plan:
+            return
+        try:
+            count = cutting_planner.reserve(self.plan)
+        except Exception as e:
+            QMessageBox.warning(self, "Hata", f"Rezervasyon yapılamadı: {e}")
+            return
+        self.lbl_status.setText(f"{self.plan['station']} için {count} plaka rezerve edildi.")
+
+    def release_reservation(self):
+        station = self.combo_station.currentText()
+        try:
+            cutting_planner.release(station)
+        except Exception as e:
+            QMessageBox.warning(self, "Hata", f"Rezervasyon kaldırılamadı: {e}")
+            return
+        self.lbl_status.setText(f"{station} rezervasyonu kaldırıldı.")
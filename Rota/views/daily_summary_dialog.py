@@ -147,6 +147,22 @@ class DailySummaryDialog(QDialog):
             today = now_turkey().date()
             today_str = today.strftime("%Y-%m-%d")
 
+            # Bugünkü üretim (günlük rapor özetlerinden)
+            try:
+                produced = self.db.get_production_summary(today_str, today_str)
+                yesterday_str = (today - timedelta(days=1)).strftime("%Y-%m-%d")
+                yesterday = self.db.get_production_summary(yesterday_str, yesterday_str)
+
+                card = self.create_info_card(
+                    "Bugünkü Üretim",
+                    f"{produced['m2']:.1f} m²",
+                    "#217346",
+                    f"{produced['adet']} adet, {produced['fire_adedi']} fire | Dün: {yesterday['m2']:.1f} m²"
+                )
+                self.content_layout.addWidget(card)
+            except:
+                pass
+
             due_today = []
             for order in orders:
                 delivery_date = order.get('delivery_date', '')
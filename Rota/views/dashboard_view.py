@@ -95,8 +95,10 @@ from PySide6.QtGui import QFont, QColor
 
 try:
     from core.db_manager import db
+    from core.db_async import run_async
 except ImportError:
     db = None
+    run_async = None
 
 # Chatbot import
 try:
@@ -417,11 +419,21 @@ class DashboardView(QWidget):
             from core.refresh_manager import refresh_manager
             refresh_manager.register_view(
                 data_key='orders',
-                callback=self.update_dashboard,
-                dependencies=['production_logs', 'stocks']
+                fetch=self.fetch_dashboard_data,
+                apply=self.apply_dashboard_data,
+                dependencies=['production_logs', 'stocks'],
+                visibility_widget=self.dashboard_page,
+                timers=[self.timer]
             )
         except:
             pass
+
+        # 🚀 Stale-while-revalidate: arka planda taze veri hazır olunca yeniden çiz
+        try:
+            from core.db_async import async_db
+            async_db.cache_refreshed.connect(self._on_cache_refreshed)
+        except:
+            pass
         
         # ============================================
         # CHATBOT ENTEGRASYONU
@@ -818,86 +830,127 @@ class DashboardView(QWidget):
         """Dashboard verilerini güncelle (Mevcut Arayüzle Uyumlu)"""
         if not db: return
         
+        # 🚀 Veriler worker havuzunda çekilir, kartlar GUI thread'inde çizilir
+        run_async(
+            self.fetch_dashboard_data,
+            callback=self.apply_dashboard_data,
+            error_callback=lambda msg: print(f"Dashboard güncelleme hatası: {msg}"),
+            key="dashboard_refresh"
+        )
+
+    def fetch_dashboard_data(self):
+        """Dashboard verilerini çek (widget'a dokunmaz, worker thread'de çalışabilir)"""
+        if not db:
+            return None
+
+        # PERFORMANS: Tüm sorgular tek bağlantı / tek okuma transaction'ında
+        with db.snapshot() as snap:
+            return self._fetch_dashboard_snapshot(snap)
+
+    def _fetch_dashboard_snapshot(self, snap):
+        """fetch_dashboard_data'nın snapshot içindeki gövdesi"""
+        # 1. İstatistikleri Çek
+        stats = snap.get_dashboard_stats()
+
+        # Aktif Projeler (Hata korumalı)
         try:
-            self.lbl_time.setText(f"Son Güncelleme: {now_turkey().strftime('%H:%M:%S')}")
-            
-            # 1. İstatistikleri Çek
-            stats = db.get_dashboard_stats()
-            
-            # 2. Metrik Kartlarını Güncelle (Sadece arayüzde olanları)
-            # Aktif Projeler (Hata korumalı)
+            if hasattr(db, 'get_active_projects_count'):
+                proj_count = snap.get_active_projects_count()
+            else:
+                proj_count = "0"
+        except:
+            proj_count = "0"
+
+        # Bugün Tamamlanan (Loglardan tarihli çekim)
+        try:
+            today_completed = snap.get_today_completed_count()
+        except AttributeError:
+            today_completed = 0
+
+        # Geciken ve Bugün Teslim Edilecekler (Sadece aktif siparişleri tara)
+        active_orders = snap.get_orders_by_status(['Beklemede', 'Üretimde'])
+        today = now_turkey().date()
+        overdue_list = []
+        today_list = []
+
+        for o in active_orders:
+            if o.get('delivery_date'):
+                try:
+                    # Tarih formatını güvenli çevir
+                    d_str = o.get('delivery_date')
+                    if isinstance(d_str, str):
+                        d_date = datetime.strptime(d_str, '%Y-%m-%d').date()
+                    else:
+                        d_date = d_str
+
+                    if d_date < today:
+                        days = (today - d_date).days
+                        overdue_list.append(f"{o['order_code']} - {o['customer_name']} ({days} gün)")
+                    elif d_date == today:
+                        today_list.append(f"{o['order_code']} - {o['customer_name']}")
+                except: pass
+
+        return {
+            'stats': stats,
+            'projects': proj_count,
+            'today_completed': today_completed,
+            'overdue': overdue_list,
+            'today': today_list,
+            'station_loads': snap.get_station_loads()
+        }
+
+    def apply_dashboard_data(self, data):
+        """fetch_dashboard_data sonucunu kartlara ve grafiklere bas (GUI thread)"""
+        if not data:
+            return
+
+        self.lbl_time.setText(f"Son Güncelleme: {now_turkey().strftime('%H:%M:%S')}")
+
+        # 2. Metrik Kartlarını Güncelle (Sadece arayüzde olanları)
+        stats = data['stats']
+        self.metric_projects.set_value(data['projects'])
+        self.metric_active.set_value(stats.get('active', 0))
+        self.metric_urgent.set_value(stats.get('urgent', 0))
+        self.metric_fire.set_value(stats.get('fire', 0))
+        self.metric_today_done.set_value(data['today_completed'])
+
+        # 3. Geciken ve Bugün Teslim Edilecekler
+        self.alert_overdue.set_items(data['overdue'])
+        self.alert_today.set_items(data['today'])
+
+        # 4. Kapasite Grafikleri (PERFORMANS: Widget'ları yeniden oluşturma yerine güncelle)
+        station_loads = data['station_loads']
+
+        # İlk yüklemede veya istasyon sayısı değiştiyse widget'ları yeniden oluştur
+        if not hasattr(self, '_capacity_bars') or len(self._capacity_bars) != len(station_loads[:12]):
+            # Cache temizle
+            while self.capacity_layout.count():
+                child = self.capacity_layout.takeAt(0)
+                if child.widget(): child.widget().deleteLater()
+
+            # Yeni widget'ları oluştur ve cache'le
+            self._capacity_bars = []
+            for st in station_loads[:12]:
+                bar = CapacityBar(st['name'], st['percent'], st['status'])
+                self.capacity_layout.addWidget(bar)
+                self._capacity_bars.append(bar)
+        else:
+            # Mevcut widget'ları güncelle (çok daha hızlı!)
+            for i, st in enumerate(station_loads[:12]):
+                if i < len(self._capacity_bars):
+                    bar = self._capacity_bars[i]
+                    bar.set_value(st['percent'], st['status'])
+    
+    def _on_cache_refreshed(self, cache_key):
+        """Arka planda yenilenen cache Dashboard'u ilgilendiriyorsa yeniden çiz"""
+        if cache_key in ("dashboard_stats", "station_loads"):
             try:
-                if hasattr(db, 'get_active_projects_count'):
-                    proj_count = db.get_active_projects_count()
-                    self.metric_projects.set_value(proj_count)
-                else:
-                    self.metric_projects.set_value("0")
+                from core.refresh_manager import refresh_manager
+                # Ana sayfa gizliyse şimdi çizme, görününce yenilenir
+                refresh_manager.mark_view_stale(self.dashboard_page)
             except:
-                self.metric_projects.set_value("0")
+                self.update_dashboard()
 
-            self.metric_active.set_value(stats.get('active', 0))
-            self.metric_urgent.set_value(stats.get('urgent', 0))
-            self.metric_fire.set_value(stats.get('fire', 0))
-            
-            # Bugün Tamamlanan (Loglardan tarihli çekim)
-            try:
-                today_completed = db.get_today_completed_count()
-            except AttributeError:
-                today_completed = 0
-            self.metric_today_done.set_value(today_completed)
-            
-            # 3. Geciken ve Bugün Teslim Edilecekler (Sadece aktif siparişleri tara)
-            active_orders = db.get_orders_by_status(['Beklemede', 'Üretimde'])
-            today = now_turkey().date()
-            overdue_list = []
-            today_list = []
-            
-            for o in active_orders:
-                if o.get('delivery_date'):
-                    try:
-                        # Tarih formatını güvenli çevir
-                        d_str = o.get('delivery_date')
-                        if isinstance(d_str, str):
-                            d_date = datetime.strptime(d_str, '%Y-%m-%d').date()
-                        else:
-                            d_date = d_str
-                            
-                        if d_date < today: 
-                            days = (today - d_date).days
-                            overdue_list.append(f"{o['order_code']} - {o['customer_name']} ({days} gün)")
-                        elif d_date == today: 
-                            today_list.append(f"{o['order_code']} - {o['customer_name']}")
-                    except: pass
-            
-            self.alert_overdue.set_items(overdue_list)
-            self.alert_today.set_items(today_list)
-            
-            # 4. Kapasite Grafikleri (PERFORMANS: Widget'ları yeniden oluşturma yerine güncelle)
-            station_loads = db.get_station_loads()
-
-            # İlk yüklemede veya istasyon sayısı değiştiyse widget'ları yeniden oluştur
-            if not hasattr(self, '_capacity_bars') or len(self._capacity_bars) != len(station_loads[:12]):
-                # Cache temizle
-                while self.capacity_layout.count():
-                    child = self.capacity_layout.takeAt(0)
-                    if child.widget(): child.widget().deleteLater()
-
-                # Yeni widget'ları oluştur ve cache'le
-                self._capacity_bars = []
-                for st in station_loads[:12]:
-                    bar = CapacityBar(st['name'], st['percent'], st['status'])
-                    self.capacity_layout.addWidget(bar)
-                    self._capacity_bars.append(bar)
-            else:
-                # Mevcut widget'ları güncelle (çok daha hızlı!)
-                for i, st in enumerate(station_loads[:12]):
-                    if i < len(self._capacity_bars):
-                        bar = self._capacity_bars[i]
-                        bar.set_value(st['percent'], st['status'])
-                
-        except Exception as e: 
-            print(f"Dashboard güncelleme hatası: {e}")
-    
     def resizeEvent(self, event):
         """Pencere boyutu değiştiğinde chatbot konumunu güncelle"""
         super().resizeEvent(event)
@@ -12,6 +12,7 @@ Ozellikler:
 
 import sys
 from datetime import datetime, timedelta
+from functools import partial
 
 try:
     from utils.timezone_helper import now_turkey, get_current_date_turkey
@@ -35,6 +36,7 @@ try:
     from core.db_manager import db
     from core.smart_planner import planner
     from core.factory_config import factory_config
+    from core.db_async import run_async
     from utils.impact_analyzer import ImpactAnalyzer
     from ui.impact_report_dialog import ImpactReportDialog
     from ui.position_selector_dialog import PositionSelectorDialog
@@ -43,6 +45,9 @@ except ImportError:
     planner = None
     factory_config = None
 
+from core.export_service import export_rows
+from views.export_dialog import ask_export_path, run_export
+
 
 # =============================================================================
 # TEMA RENKLERI (Excel Tarzi)
@@ -568,6 +573,12 @@ class SmartRecommendationEngine:
 # =============================================================================
 class DecisionView(QWidget):
     """Karar Destek Sistemi Ana Ekrani"""
+
+    # Etki analizinde hedefle birlikte karşılaştırılacak ilk N pozisyon
+    ALTERNATIVE_POSITIONS = 25
+
+    # "Optimize" aksiyonunun arama süresi (saniye)
+    OPTIMIZE_TIME_BUDGET = 5.0
     
     def __init__(self):
         super().__init__()
@@ -679,6 +690,7 @@ class DecisionView(QWidget):
             ("Termin", self.sort_by_deadline),
             ("Oncelik", self.sort_by_priority),
             ("Kisa Is", self.sort_by_duration),
+            ("Optimize", self.optimize_sequence),
             ("Sifirla", self.reset_order)
         ]:
             btn = QPushButton(text)
@@ -1376,6 +1388,41 @@ class DecisionView(QWidget):
             self.update_side_panel()
         self.status_label.setText("Kisa is once siralandi")
 
+    def optimize_sequence(self):
+        """Gecikmeyi azaltan sıra araması (süre bütçeli, arka planda)"""
+        if not planner or not self.all_orders:
+            self.status_label.setText("Veri yok")
+            return
+
+        self.status_label.setText(
+            f"⏳ Sıra optimize ediliyor ({self.OPTIMIZE_TIME_BUDGET:.0f} sn)..."
+        )
+        run_async(
+            partial(planner.optimize_sequence,
+                    time_budget=self.OPTIMIZE_TIME_BUDGET,
+                    initial_order_ids=[o.get('id') for o in self.all_orders]),
+            callback=self._on_optimize_done,
+            error_callback=lambda msg: self.status_label.setText(f"Optimizasyon hatası: {msg}"),
+            key="decision_optimize"
+        )
+
+    def _on_optimize_done(self, result):
+        """Önerilen sırayı tabloya uygula (kaydetmek için 'Uygula')"""
+        rank = {oid: i for i, oid in enumerate(result['order_ids'])}
+        self.all_orders.sort(key=lambda o: rank.get(o.get('id'), len(rank)))
+
+        self.refresh_table()
+        if self.panel_visible:
+            self.update_side_panel()
+
+        before = result['before']
+        after = result['after']
+        self.status_label.setText(
+            f"Optimize edildi - Ağırlıklı gecikme: {before['weighted_tardiness']:.0f} → "
+            f"{after['weighted_tardiness']:.0f} | Geciken: {before['late_orders']} → "
+            f"{after['late_orders']} ({result['evaluated']} aday). Kaydetmek için 'Uygula'"
+        )
+
     def reset_order(self):
         self.all_orders = self.original_orders.copy()
         self.refresh_table()
@@ -1472,21 +1519,20 @@ class DecisionView(QWidget):
         if not self.all_orders:
             self.status_label.setText("Veri yok")
             return
-        
-        filename, _ = QFileDialog.getSaveFileName(
-            self, "Kaydet",
-            f"Uretim_Plani_{now_turkey().strftime('%Y%m%d_%H%M')}.csv",
-            "CSV Files (*.csv)"
-        )
-        
+
+        filename = ask_export_path(self, f"Uretim_Plani_{now_turkey().strftime('%Y%m%d_%H%M')}", "Kaydet")
         if not filename:
             return
-        
-        try:
+
+        # Arka planda hesaplanir; GUI listesi degisse de kopya sabit kalir
+        orders = list(self.all_orders)
+        engine = self.engine
+
+        def plan_rows():
             # AYNI SİPARİŞ NUMARASI İÇİN EN GEÇ TAHMİNİ TARİHİ HESAPLA
             order_code_max_dates = {}
-            for idx, order in enumerate(self.all_orders):
-                est_date, _ = self.engine.cr_calculator.estimate_completion_date(order, idx, self.all_orders)
+            for idx, order in enumerate(orders):
+                est_date, _ = engine.cr_calculator.estimate_completion_date(order, idx, orders)
                 order_code = order['order_code']
 
                 if order_code not in order_code_max_dates:
@@ -1497,39 +1543,45 @@ class DecisionView(QWidget):
                 elif est_date:
                     order_code_max_dates[order_code] = est_date
 
-            with open(filename, 'w', encoding='utf-8-sig') as f:
-                f.write("SIRA,KOD,MUSTERI,URUN,M2,CR,TERMIN,TAHMINI,FARK,DURUM,ISTASYON\n")
-
-                for idx, order in enumerate(self.all_orders):
-                    cr, _ = self.engine.cr_calculator.calculate_cr(order)
-                    # Aynı order_code için en geç tarihi kullan
-                    order_code = order['order_code']
-                    est_date = order_code_max_dates.get(order_code)
-                    est_str = est_date.strftime('%Y-%m-%d') if est_date else ""
-                    current_st = self.engine.get_order_current_station(order)
-                    
-                    f.write(f"{idx+1},")
-                    f.write(f"{order['order_code']},")
-                    f.write(f"{order['customer_name']},")
-                    f.write(f"{order['product_type']},")
-                    f.write(f"{order.get('declared_total_m2', 0):.1f},")
-                    f.write(f"{cr if cr else ''},")
-                    f.write(f"{order.get('delivery_date', '')},")
-                    f.write(f"{est_str},")
-                    f.write(f",")
-                    f.write(f"{order.get('status', 'Beklemede')},")
-                    f.write(f"{current_st or ''}\n")
-            
-            self.status_label.setText(f"Kaydedildi: {filename}")
-            
+            for idx, order in enumerate(orders):
+                cr, _ = engine.cr_calculator.calculate_cr(order)
+                # Aynı order_code için en geç tarihi kullan
+                est_date = order_code_max_dates.get(order['order_code'])
+                current_st = engine.get_order_current_station(order)
+
+                yield [
+                    idx + 1,
+                    order['order_code'],
+                    order['customer_name'],
+                    order['product_type'],
+                    round(order.get('declared_total_m2', 0) or 0, 1),
+                    cr if cr else '',
+                    order.get('delivery_date', ''),
+                    est_date.strftime('%Y-%m-%d') if est_date else '',
+                    '',
+                    order.get('status', 'Beklemede'),
+                    current_st or '',
+                ]
+
+        def on_done(result):
+            self.status_label.setText(f"Kaydedildi: {result.path}")
             try:
                 import os
-                os.startfile(filename)
+                os.startfile(result.path)
             except:
                 pass
-                
-        except Exception as e:
-            QMessageBox.critical(self, "Hata", f"Kayit hatasi:\n{str(e)}")
+
+        run_export(
+            self,
+            lambda **kw: export_rows(
+                plan_rows(), filename,
+                headers=["SIRA", "KOD", "MUSTERI", "URUN", "M2", "CR", "TERMIN",
+                         "TAHMINI", "FARK", "DURUM", "ISTASYON"],
+                total=len(orders), sheet_title="Uretim Plani", **kw
+            ),
+            label="Uretim plani aktariliyor...",
+            on_done=on_done, notify=False
+        )
     
     def apply_order(self):
         """
@@ -1648,16 +1700,38 @@ class DecisionView(QWidget):
             )
             return
 
-        # 3. Analizi çalıştır
+        # 3. Analizi arka planda çalıştır (hedef + alternatif pozisyonlar tek
+        # toplu simülasyonda; ilk çağrı DB okuması ve süreç havuzu açılışı içerir)
+        candidate_positions = sorted(
+            (set(range(min(len(self.all_orders), self.ALTERNATIVE_POSITIONS))) | {target_position})
+            - {selected_row}
+        )
+
+        self.status_label.setText("⏳ Etki analizi hesaplanıyor...")
+        run_async(
+            partial(self.impact_analyzer.compare_reorder_options,
+                    all_orders=list(self.all_orders),
+                    selected_order_id=order_id,
+                    positions=candidate_positions),
+            callback=lambda alternatives: self._on_impact_ready(
+                alternatives, selected_order, selected_row, target_position),
+            error_callback=lambda msg: QMessageBox.critical(
+                self, "Hata", f"Etki analizi sırasında hata oluştu:\n\n{msg}"),
+            key="decision_impact"
+        )
+
+    def _on_impact_ready(self, alternatives, selected_order, selected_row, target_position):
+        """Etki analizi sonucu geldi: rapor dialog'unu göster (GUI thread)"""
         try:
-            result = self.impact_analyzer.analyze_reorder_impact(
-                all_orders=self.all_orders,
-                selected_order_id=order_id,
-                new_position=target_position
-            )
+            # Hesaplama sürerken tablo yeniden sıralanmış olabilir
+            if selected_row >= len(self.all_orders) or self.all_orders[selected_row] is not selected_order:
+                self.status_label.setText("Sıralama değişti - etki analizini tekrar çalıştırın.")
+                return
 
-            if 'error' in result:
-                QMessageBox.warning(self, "Hata", result['error'])
+            result = next((a['analysis'] for a in alternatives if a['position'] == target_position), None)
+            if result is None:
+                self.status_label.setText("")
+                QMessageBox.warning(self, "Hata", "Sipariş bulunamadı")
                 return
 
             # 4. Rapor dialog'unu göster
@@ -1666,11 +1740,16 @@ class DecisionView(QWidget):
                 selected_order=selected_order,
                 current_position=selected_row,
                 target_position=target_position,
-                parent=self
+                parent=self,
+                alternatives=alternatives
             )
 
             # 5. Dialog sonucunu bekle
             if dialog.exec() == QDialog.Accepted and dialog.is_confirmed():
+                # Kullanıcı karşılaştırmadan başka bir pozisyon seçmiş olabilir
+                target_position = dialog.target_position
+                result = dialog.analysis
+
                 # Kullanıcı değişikliği onayladı - Gerçek değişikliği uygula!
 
                 # Seçili siparişi mevcut pozisyondan çıkar
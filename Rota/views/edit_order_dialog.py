@@ -19,6 +19,7 @@ try:
     from core.db_manager import db
     from core.smart_planner import planner
     from core.factory_config import factory_config
+    from core.db_async import run_async
 except ImportError:
     db = None
     planner = None
@@ -649,41 +650,50 @@ class EditOrderDialog(QDialog):
             except:
                 pass
 
-        # Planlayıcı varsa ona sor
+        # Planlayıcı varsa ona sor (arka planda, sonuç GUI thread'inde)
         if planner:
-            try:
-                est_date, days, delayed = planner.calculate_impact(temp_order_data)
-
-                # Tarih kutusunu güncelle
-                self.date_picker.setDate(est_date)
-
-                # Tarih farkını hesapla
-                date_diff_text = ""
-                if old_date:
-                    date_diff = (est_date - old_date).days
-                    if date_diff > 0:
-                        date_diff_text = f"\n⚠️ {date_diff} gün gecikme"
-                    elif date_diff < 0:
-                        date_diff_text = f"\n✓ {abs(date_diff)} gün erken"
-                    else:
-                        date_diff_text = "\n✓ Aynı tarih"
-
-                # Bilgi metni
-                station_count = len([s for s in route_str.split(',') if s.strip() != "SEVKIYAT"])
-                info_text = f"Tahmini: {days} gün ({station_count} istasyon)\nTeslim: {est_date.strftime('%d.%m.%Y')}{date_diff_text}"
-
-                # Eğer bu sipariş başkalarını geciktiriyorsa uyar
-                if delayed:
-                    info_text += f"\n⚠️ Dikkat: Bu değişiklik {len(delayed)} diğer işi geciktirebilir."
-                    self.lbl_estimate.setStyleSheet(f"color: {Colors.WARNING}; font-size: 11px; font-weight: bold;")
+            self.lbl_estimate.setText("Hesaplanıyor...")
+            run_async(
+                planner.calculate_impact, temp_order_data,
+                callback=lambda result: self._on_estimate_ready(result, route_str, old_date),
+                error_callback=lambda msg: print(f"Akıllı hesaplama hatası: {msg}"),
+                key="order_estimate"
+            )
+
+    def _on_estimate_ready(self, result, route_str, old_date):
+        """SmartPlanner sonucunu eski tarih ile karşılaştırıp göster"""
+        try:
+            est_date, days, delayed = result
+
+            # Tarih kutusunu güncelle
+            self.date_picker.setDate(est_date)
+
+            # Tarih farkını hesapla
+            date_diff_text = ""
+            if old_date:
+                date_diff = (est_date - old_date).days
+                if date_diff > 0:
+                    date_diff_text = f"\n⚠️ {date_diff} gün gecikme"
+                elif date_diff < 0:
+                    date_diff_text = f"\n✓ {abs(date_diff)} gün erken"
                 else:
-                    self.lbl_estimate.setStyleSheet(f"color: {Colors.SUCCESS}; font-size: 11px; font-weight: bold;")
+                    date_diff_text = "\n✓ Aynı tarih"
 
-                self.lbl_estimate.setText(info_text)
-                return
+            # Bilgi metni
+            station_count = len([s for s in route_str.split(',') if s.strip() != "SEVKIYAT"])
+            info_text = f"Tahmini: {days} gün ({station_count} istasyon)\nTeslim: {est_date.strftime('%d.%m.%Y')}{date_diff_text}"
 
-            except Exception as e:
-                print(f"Akıllı hesaplama hatası: {e}")
+            # Eğer bu sipariş başkalarını geciktiriyorsa uyar
+            if delayed:
+                info_text += f"\n⚠️ Dikkat: Bu değişiklik {len(delayed)} diğer işi geciktirebilir."
+                self.lbl_estimate.setStyleSheet(f"color: {Colors.WARNING}; font-size: 11px; font-weight: bold;")
+            else:
+                self.lbl_estimate.setStyleSheet(f"color: {Colors.SUCCESS}; font-size: 11px; font-weight: bold;")
+
+            self.lbl_estimate.setText(info_text)
+
+        except Exception as e:
+            print(f"Akıllı hesaplama hatası: {e}")
 
     def save_order(self):
         """Değişiklikleri kaydet"""
@@ -1,20 +1,23 @@
 """
 EFES ROTA X - Excel Sipariş Aktarma Dialogu
-Excel dosyasından toplu sipariş yükleme
+Excel (.xlsx) veya CSV/TSV dosyasından toplu sipariş yükleme
 """
 
 from PySide6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QLabel,
-    QPushButton, QTableWidget, QTableWidgetItem,
+    QPushButton, QTableView, QAbstractItemView,
     QFrame, QMessageBox, QFileDialog, QProgressBar,
-    QHeaderView, QCheckBox, QGroupBox, QWidget
+    QHeaderView, QGroupBox
 )
-from PySide6.QtCore import Qt, QDate, QThread, Signal
+from PySide6.QtCore import Qt, QThread, Signal, QAbstractTableModel, QModelIndex
 from PySide6.QtGui import QFont, QColor
 from datetime import datetime
+import queue
 import openpyxl
 from openpyxl import Workbook
 
+from core.order_import import EXPECTED_COLUMNS, iter_order_chunks, mark_duplicates, prepare_order
+
 try:
     from utils.timezone_helper import now_turkey, get_current_date_turkey
 except ImportError:
@@ -51,105 +54,58 @@ class Colors:
 # IMPORT WORKER THREAD (Performans için arka plan işlemi)
 # =============================================================================
 class ImportWorkerThread(QThread):
-    """Sipariş import işlemini arka planda yapar"""
+    """
+    Sipariş import işlemini arka planda yapar
+
+    orders_data liste olabilir ya da okuma sürerken parça parça gelen
+    siparişler için bir kuyruk (queue.Queue; None = bitti). Her parça
+    db.bulk_add_orders ile kendi transaction'ında yazılır; kuyruk
+    beklenirken yazma kilidi tutulmaz.
+    """
 
-    progress_updated = Signal(int, int)  # (current, total)
+    progress_updated = Signal(int, int)  # (current, total; bilinmiyorsa 0)
     import_completed = Signal(int, int, list)  # (success_count, error_count, error_messages)
 
-    def __init__(self, orders_data):
+    def __init__(self, orders_data, total=None):
         super().__init__()
         self.orders_data = orders_data
+        # Kuyrukta toplam, okuma bitince GUI thread'i tarafından güncellenir
+        self.total = total if total is not None else (
+            len(orders_data) if isinstance(orders_data, list) else 0)
+
+    def _batches(self):
+        """Yazılacak sipariş parçaları"""
+        if isinstance(self.orders_data, list):
+            yield self.orders_data
+            return
+        while True:
+            batch = self.orders_data.get()
+            if batch is None:
+                return
+            if batch:
+                yield batch
 
     def run(self):
-        """Thread'de çalışacak kod - Thread-safe veritabanı işlemi"""
-        import sqlite3
-        import os
-        import sys
-        from datetime import datetime as _dt
-
-        try:
-            from utils.timezone_helper import now_turkey
-        except ImportError:
-            now_turkey = lambda: _dt.now()
-
-        try:
-            from core.refresh_manager import refresh_manager
-            from core.cache_manager import query_cache, order_cache, station_cache
-        except ImportError:
-            # Fallback
-            class DummyCache:
-                def invalidate_table(self, table): pass
-                def clear(self): pass
-            class DummyRefresh:
-                def mark_dirty(self, key): pass
-            refresh_manager = DummyRefresh()
-            query_cache = DummyCache()
-            order_cache = DummyCache()
-            station_cache = DummyCache()
-
+        """Parçaları db.bulk_add_orders ile yaz (executemany, toplu stok düşümü)"""
         success_count = 0
         error_count = 0
         error_messages = []
+        done = 0
 
         try:
-            # Thread içinde kendi veritabanı bağlantısını oluştur
-            if getattr(sys, 'frozen', False):
-                app_data = os.path.join(os.environ['LOCALAPPDATA'], 'REFLEKS360ROTA')
-            else:
-                app_data = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-
-            db_path = os.path.join(app_data, "efes_factory.db")
-
-            # Thread-safe connection oluştur
-            conn = sqlite3.connect(db_path, check_same_thread=False)
-            conn.row_factory = sqlite3.Row
-
-            created_time = now_turkey().strftime('%Y-%m-%d %H:%M:%S')
-
-            # Transaction başlat (performans için)
-            conn.execute("BEGIN TRANSACTION")
-
-            for idx, data in enumerate(self.orders_data):
-                try:
-                    total_m2 = data.get('total_m2') or 0
-
-                    # Sipariş ekle
-                    conn.execute("""
-                        INSERT INTO orders (order_code, customer_name, product_type, thickness, quantity,
-                                           delivery_date, priority, status, route, declared_total_m2, width, height,
-                                           sale_price, total_price, notes, project_id, created_at)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, 'Beklemede', ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """, (data['code'], data['customer'], data['product'], data['thickness'], data['quantity'],
-                          data['date'], data['priority'], data.get('route', ''), total_m2,
-                          data.get('width', 0), data.get('height', 0), 0, 0,
-                          data.get('notes', ''), data.get('project_id'), created_time))
-
-                    # Stok düş
-                    p_name = f"{data['thickness']}mm {data['product']}"
-                    conn.execute("UPDATE stocks SET quantity_m2 = quantity_m2 - ? WHERE product_name = ?",
-                               (total_m2, p_name))
-
-                    success_count += 1
-
-                except Exception as e:
-                    error_count += 1
-                    error_messages.append(f"{data.get('code', 'Bilinmeyen')}: {str(e)}")
-
-                # Progress güncelle
-                self.update_progress(idx + 1, len(self.orders_data))
-
-            # Transaction'ı commit et
-            conn.commit()
-            conn.close()
-
-            # Cache'i temizle (ana thread'de yapılmalı ama signal ile bildir)
-            if success_count > 0:
-                refresh_manager.mark_dirty('orders')
-                refresh_manager.mark_dirty('stocks')
-                query_cache.invalidate_table('orders')
-                query_cache.invalidate_table('stocks')
-                order_cache.clear()
-                station_cache.clear()
+            if db is None:
+                raise RuntimeError("Veritabanı bağlantısı yok")
+
+            for batch in self._batches():
+                # Parça başına tek transaction; ilerleme parça içinde de bildirilir
+                ok, failed, messages = db.bulk_add_orders(
+                    batch,
+                    progress_callback=lambda current, _total, base=done: self.update_progress(base + current, self.total)
+                )
+                success_count += ok
+                error_count += failed
+                error_messages.extend(messages)
+                done += len(batch)
 
             # Sonucu bildir
             self.import_completed.emit(success_count, error_count, error_messages)
@@ -158,41 +114,195 @@ class ImportWorkerThread(QThread):
             # Hata durumunda
             import traceback
             error_detail = f"{str(e)}\n{traceback.format_exc()}"
-            self.import_completed.emit(0, len(self.orders_data), [error_detail])
+            self.import_completed.emit(success_count, max(error_count, self.total - success_count, 1), [error_detail])
 
     def update_progress(self, current, total):
         """Progress callback - UI'ye bildirim gönder"""
         self.progress_updated.emit(current, total)
 
 
+# =============================================================================
+# EXCEL OKUMA WORKER'I (read_only, parça parça)
+# =============================================================================
+class ExcelParseWorker(QThread):
+    """
+    Excel / CSV dosyasını arka planda okur, doğrulanmış satırları parça parça gönderir
+
+    Sistemde zaten kayıtlı sipariş kodları (idx_orders_code) parça başına
+    tek sorguyla işaretlenir. Her kod dosyada ilk görüldüğü anda bir kez
+    sorgulanır: aktarım okuma bitmeden başlasa bile, parça sınırına denk
+    gelen çok satırlı siparişin sonraki satırları bu dosyanın kendi
+    aktardığı satırlar yüzünden tekrar sayılmaz.
+    """
+
+    total_estimated = Signal(int)       # sayfa / dosya boyutundan tahmini satır
+    chunk_ready = Signal(list)          # parse_row çıktıları
+    parse_finished = Signal(int)        # okunan sipariş sayısı
+    parse_failed = Signal(str)
+
+    def __init__(self, file_path):
+        super().__init__()
+        self.file_path = file_path
+        self._cancel_requested = False
+
+    def cancel(self):
+        """Okumayı durdur (bir sonraki parçada)"""
+        self._cancel_requested = True
+
+    def run(self):
+        count = 0
+        seen_codes = set()      # Bu dosyada görülen kodlar
+        existing_codes = set()  # Bunlardan ilk görüldüğünde sistemde olanlar
+        try:
+            for chunk in iter_order_chunks(self.file_path, on_total=self.total_estimated.emit):
+                if self._cancel_requested:
+                    return
+                count += len(chunk)
+                if db is not None:
+                    new_codes = {o.get("Sipariş Kodu") for o in chunk} - seen_codes
+                    existing_codes |= db.get_existing_order_codes(new_codes)
+                    seen_codes |= new_codes
+                    mark_duplicates(chunk, existing_codes)
+                self.chunk_ready.emit(chunk)
+            self.parse_finished.emit(count)
+        except Exception as e:
+            self.parse_failed.emit(str(e))
+
+
+# =============================================================================
+# ÖNİZLEME MODELİ
+# =============================================================================
+class OrderPreviewModel(QAbstractTableModel):
+    """
+    Önizleme tablosu modeli - satırlar parça parça eklenir
+
+    Satır başına widget (QCheckBox) yerine model üzerinde CheckStateRole
+    kullanılır; on binlerce satırda da önizleme akıcı kalır.
+    """
+
+    HEADERS = ["✓", "Sipariş Kodu", "Müşteri", "Ürün", "Kalınlık",
+               "Adet", "m²", "Öncelik", "Teslim Tarihi", "Rota", "Not"]
+    FIELDS = [None, "Sipariş Kodu", "Müşteri", "Ürün Tipi", "Kalınlık (mm)",
+              "Adet", "Toplam m²", "Öncelik", "Teslim Tarihi", "Rota", "Not"]
+
+    ERROR_BG = QColor("#FFE6E6")
+    ERROR_FG = QColor(Colors.CRITICAL)
+    DUPLICATE_BG = QColor("#FFF4E5")
+    DUPLICATE_FG = QColor(Colors.WARNING)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.orders = []
+        self.selected_count = 0
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.orders)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def flags(self, index):
+        if index.column() == 0:
+            return Qt.ItemIsEnabled | Qt.ItemIsUserCheckable | Qt.ItemIsSelectable
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        order = self.orders[index.row()]
+        col = index.column()
+
+        if role == Qt.CheckStateRole and col == 0:
+            return Qt.Checked if order['_selected'] else Qt.Unchecked
+        if role == Qt.DisplayRole and col > 0:
+            value = order.get(self.FIELDS[col])
+            return str(value) if value else ""
+        if not order['_valid']:
+            # Hatalı satırları kırmızı yap
+            if role == Qt.BackgroundRole:
+                return self.ERROR_BG
+            if role == Qt.ForegroundRole:
+                return self.ERROR_FG
+            if role == Qt.ToolTipRole and col == 1:
+                return "\n".join(order['_errors'])
+        elif order.get('_duplicate'):
+            # Sistemde kayıtlı kodlar turuncu (varsayılan seçili değil)
+            if role == Qt.BackgroundRole:
+                return self.DUPLICATE_BG
+            if role == Qt.ForegroundRole:
+                return self.DUPLICATE_FG
+            if role == Qt.ToolTipRole and col == 1:
+                return "Sistemde zaten var"
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if role != Qt.CheckStateRole or index.column() != 0:
+            return False
+        order = self.orders[index.row()]
+        checked = Qt.CheckState(value) == Qt.Checked
+        if order['_selected'] != checked:
+            order['_selected'] = checked
+            self.selected_count += 1 if checked else -1
+            self.dataChanged.emit(index, index, [Qt.CheckStateRole])
+        return True
+
+    def clear(self):
+        self.beginResetModel()
+        self.orders = []
+        self.selected_count = 0
+        self.endResetModel()
+
+    def append_rows(self, rows):
+        """Yeni okunan parçayı sona ekle"""
+        if not rows:
+            return
+        start = len(self.orders)
+        self.beginInsertRows(QModelIndex(), start, start + len(rows) - 1)
+        self.orders.extend(rows)
+        self.selected_count += sum(1 for o in rows if o['_selected'])
+        self.endInsertRows()
+
+    def set_all_selected(self, checked):
+        """Tüm satırları seç / seçimi kaldır"""
+        for order in self.orders:
+            order['_selected'] = checked
+        self.selected_count = len(self.orders) if checked else 0
+        if self.orders:
+            self.dataChanged.emit(self.index(0, 0), self.index(len(self.orders) - 1, 0),
+                                  [Qt.CheckStateRole])
+
+    def selected_orders(self):
+        return [o for o in self.orders if o['_selected']]
+
+
 # =============================================================================
 # EXCEL IMPORT DIALOG
 # =============================================================================
 class ExcelImportDialog(QDialog):
-    """Excel'den Sipariş Aktarma Dialogu"""
-
-    # Beklenen Excel sütun başlıkları (Türkçe)
-    EXPECTED_COLUMNS = [
-        "Sipariş Kodu",
-        "Müşteri",
-        "Ürün Tipi",
-        "Kalınlık (mm)",
-        "Adet",
-        "Toplam m²",
-        "Öncelik",
-        "Teslim Tarihi",
-        "Rota",
-        "Not"
-    ]
+    """Excel / CSV'den Sipariş Aktarma Dialogu"""
+
+    # Beklenen Excel sütun başlıkları (Türkçe) - core.order_import ile ortak
+    EXPECTED_COLUMNS = EXPECTED_COLUMNS
 
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.setWindowTitle("Excel'den Sipariş Aktar")
+        self.setWindowTitle("Excel / CSV'den Sipariş Aktar")
         self.setMinimumSize(1000, 650)
         self.resize(1100, 700)
 
         self.excel_file_path = None
-        self.orders_data = []
+        self.model = OrderPreviewModel(self)
+        self.parse_worker = None
+        self.worker = None
+        self._parsing = False
+        self._parse_total = 0
+        # Okuma bitmeden aktarım başladıysa yeni parçalar bu kuyruğa gider
+        self._import_queue = None
 
         self.setup_ui()
 
@@ -205,13 +315,13 @@ class ExcelImportDialog(QDialog):
                 color: {Colors.TEXT};
                 font-size: 11px;
             }}
-            QTableWidget {{
+            QTableView {{
                 background-color: {Colors.BG};
                 border: 1px solid {Colors.BORDER};
                 gridline-color: {Colors.GRID};
                 font-size: 10px;
             }}
-            QTableWidget::item {{
+            QTableView::item {{
                 padding: 4px;
             }}
             QHeaderView::section {{
@@ -239,7 +349,7 @@ class ExcelImportDialog(QDialog):
         header_layout = QHBoxLayout(header)
         header_layout.setContentsMargins(20, 0, 20, 0)
 
-        title = QLabel("Excel'den Sipariş Aktar")
+        title = QLabel("Excel / CSV'den Sipariş Aktar")
         title.setStyleSheet(f"font-size: 14px; font-weight: bold; color: {Colors.TEXT};")
         header_layout.addWidget(title)
         header_layout.addStretch()
@@ -273,7 +383,7 @@ class ExcelImportDialog(QDialog):
         content_layout.setSpacing(16)
 
         # Dosya seçimi bölümü
-        file_group = QGroupBox("1. Excel Dosyası Seç")
+        file_group = QGroupBox("1. Excel / CSV Dosyası Seç")
         file_group.setStyleSheet(f"""
             QGroupBox {{
                 font-size: 11px;
@@ -296,7 +406,7 @@ class ExcelImportDialog(QDialog):
         self.lbl_file_path.setStyleSheet(f"color: {Colors.TEXT_SECONDARY}; font-weight: normal;")
         file_layout.addWidget(self.lbl_file_path, 1)
 
-        btn_select_file = QPushButton("📂 Excel Dosyası Seç")
+        btn_select_file = QPushButton("📂 Dosya Seç")
         btn_select_file.setFixedSize(150, 36)
         btn_select_file.setCursor(Qt.PointingHandCursor)
         btn_select_file.setStyleSheet(f"""
@@ -332,18 +442,21 @@ class ExcelImportDialog(QDialog):
         """)
         preview_layout = QVBoxLayout(preview_group)
 
-        self.table = QTableWidget()
-        self.table.setColumnCount(11)
-        self.table.setHorizontalHeaderLabels([
-            "✓", "Sipariş Kodu", "Müşteri", "Ürün", "Kalınlık",
-            "Adet", "m²", "Öncelik", "Teslim Tarihi", "Rota", "Not"
-        ])
-        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.verticalHeader().setDefaultSectionSize(24)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Interactive)
         self.table.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)
         self.table.horizontalHeader().setSectionResizeMode(2, QHeaderView.Stretch)
+        self.table.setColumnWidth(0, 32)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
         self.table.setAlternatingRowColors(True)
         preview_layout.addWidget(self.table)
 
+        self.model.dataChanged.connect(self.update_selected_count)
+        self.model.rowsInserted.connect(self.update_selected_count)
+        self.model.modelReset.connect(self.update_selected_count)
+
         # Seçim butonları
         selection_layout = QHBoxLayout()
 
@@ -550,12 +663,12 @@ class ExcelImportDialog(QDialog):
             QMessageBox.critical(self, "Hata", f"Şablon oluşturulamadı:\n{str(e)}")
 
     def select_excel_file(self):
-        """Excel dosyası seç ve oku"""
+        """Excel / CSV dosyası seç ve oku"""
         file_path, _ = QFileDialog.getOpenFileName(
             self,
-            "Excel Dosyası Seç",
+            "Sipariş Dosyası Seç",
             "",
-            "Excel Files (*.xlsx *.xls)"
+            "Sipariş Dosyaları (*.xlsx *.csv *.tsv *.txt);;Excel Files (*.xlsx *.xls);;CSV / TSV (*.csv *.tsv *.txt)"
         )
 
         if not file_path:
@@ -564,220 +677,130 @@ class ExcelImportDialog(QDialog):
         self.excel_file_path = file_path
         self.lbl_file_path.setText(file_path)
 
-        # Excel dosyasını oku ve tabloya yükle
+        # Dosyayı oku ve tabloya yükle
         self.load_excel_data()
 
-    def _get_cell_value(self, cell, column_name):
-        """Hücre değerini tipine göre oku ve dönüştür"""
-        from datetime import datetime
-        import openpyxl.cell.cell
-
-        if cell.value is None or str(cell.value).strip() == "":
-            return None
-
-        # Tarih sütunu
-        if column_name == "Teslim Tarihi":
-            if isinstance(cell.value, datetime):
-                return cell.value.strftime("%d.%m.%Y")
-            else:
-                return str(cell.value).strip()
-
-        # Sayı sütunları
-        elif column_name in ["Adet", "Kalınlık (mm)"]:
-            try:
-                # Eğer Excel tarihe çevirdiyse, sayıya geri dön
-                if isinstance(cell.value, datetime):
-                    # Excel serial date'i sayıya çevir
-                    return int(cell.value.day) if column_name == "Adet" else int(cell.value.month)
-                return int(float(cell.value))
-            except:
-                return None
-
-        # Ondalık sayı sütunları
-        elif column_name == "Toplam m²":
-            try:
-                if isinstance(cell.value, datetime):
-                    return 0.0
-                return float(cell.value)
-            except:
-                return None
-
-        # Metin sütunları
-        else:
-            return str(cell.value).strip()
-
     def load_excel_data(self):
-        """Excel dosyasından verileri oku ve tabloya yükle"""
+        """Dosyayı arka planda oku (Excel veya CSV/TSV); parçalar geldikçe önizlemeye ekle"""
         if not self.excel_file_path:
             return
 
-        try:
-            wb = openpyxl.load_workbook(self.excel_file_path, data_only=True)
-
-            # "Siparişler" sayfasını ara, yoksa ilk sayfayı al
-            if "Siparişler" in wb.sheetnames:
-                ws = wb["Siparişler"]
-            else:
-                ws = wb.active
-
-            # Başlıkları oku ve eşleştir
-            excel_headers = [str(cell.value).strip() if cell.value else "" for cell in ws[1]]
-
-            # Kolon eşleştirme map'i oluştur
-            column_map = {}
-            for expected_col in self.EXPECTED_COLUMNS:
-                # Tam eşleşme ara
-                if expected_col in excel_headers:
-                    column_map[expected_col] = excel_headers.index(expected_col)
-                else:
-                    # Büyük/küçük harf duyarsız eşleşme
-                    expected_lower = expected_col.lower()
-                    for idx, header in enumerate(excel_headers):
-                        if header.lower() == expected_lower:
-                            column_map[expected_col] = idx
-                            break
-
-            # Verileri oku
-            self.orders_data = []
-            for row_idx, row in enumerate(ws.iter_rows(min_row=2, values_only=False), start=2):
-                # Boş satırları atla
-                if not any(cell.value for cell in row):
-                    continue
-
-                order_dict = {}
-
-                # Her beklenen sütun için veriyi al
-                for expected_col in self.EXPECTED_COLUMNS:
-                    if expected_col in column_map:
-                        col_idx = column_map[expected_col]
-                        if col_idx < len(row):
-                            cell = row[col_idx]
-                            # Hücre tipine göre değer al
-                            value = self._get_cell_value(cell, expected_col)
-                            order_dict[expected_col] = value
-                        else:
-                            order_dict[expected_col] = None
-                    else:
-                        order_dict[expected_col] = None
-
-                order_dict['_row_number'] = row_idx
-                order_dict['_valid'] = True
-                order_dict['_errors'] = []
-
-                # Basit validasyon
-                if not order_dict.get("Sipariş Kodu"):
-                    order_dict['_valid'] = False
-                    order_dict['_errors'].append("Sipariş kodu eksik")
-
-                if not order_dict.get("Müşteri"):
-                    order_dict['_valid'] = False
-                    order_dict['_errors'].append("Müşteri adı eksik")
-
-                try:
-                    adet = int(order_dict.get("Adet", 0))
-                    if adet <= 0:
-                        order_dict['_valid'] = False
-                        order_dict['_errors'].append("Adet 0'dan büyük olmalı")
-                except:
-                    order_dict['_valid'] = False
-                    order_dict['_errors'].append("Adet sayı olmalı")
-
-                self.orders_data.append(order_dict)
-
-            # Tabloya yükle
-            self.populate_table()
-
-            if self.orders_data:
-                self.btn_import.setEnabled(True)
-                QMessageBox.information(
-                    self,
-                    "Başarılı",
-                    f"{len(self.orders_data)} sipariş okundu.\n"
-                    f"Geçerli: {sum(1 for o in self.orders_data if o['_valid'])}\n"
-                    f"Hatalı: {sum(1 for o in self.orders_data if not o['_valid'])}"
-                )
-            else:
-                QMessageBox.warning(self, "Uyarı", "Excel dosyasında sipariş bulunamadı!")
+        # Önceki okuma sürüyorsa durdur (kuyruktaki sinyalleri _is_current eler)
+        self._stop_parsing()
 
-        except Exception as e:
-            QMessageBox.critical(self, "Hata", f"Excel dosyası okunamadı:\n{str(e)}")
-            import traceback
-            traceback.print_exc()
-
-    def populate_table(self):
-        """Verileri tabloya yükle"""
-        self.table.setRowCount(len(self.orders_data))
-
-        for row_idx, order in enumerate(self.orders_data):
-            # Checkbox
-            chk = QCheckBox()
-            chk.setChecked(order['_valid'])  # Geçerli olanları otomatik seç
-            chk.stateChanged.connect(self.update_selected_count)
-            chk_widget = QWidget()
-            chk_layout = QHBoxLayout(chk_widget)
-            chk_layout.addWidget(chk)
-            chk_layout.setAlignment(Qt.AlignCenter)
-            chk_layout.setContentsMargins(0, 0, 0, 0)
-            self.table.setCellWidget(row_idx, 0, chk_widget)
-
-            # Veriler (sadeleştirilmiş sütunlar)
-            columns_data = [
-                order.get("Sipariş Kodu", ""),
-                order.get("Müşteri", ""),
-                order.get("Ürün Tipi", ""),
-                str(order.get("Kalınlık (mm)", "")) if order.get("Kalınlık (mm)") else "",
-                str(order.get("Adet", "")) if order.get("Adet") else "",
-                str(order.get("Toplam m²", "")) if order.get("Toplam m²") else "",
-                order.get("Öncelik", ""),
-                str(order.get("Teslim Tarihi", "")) if order.get("Teslim Tarihi") else "",
-                order.get("Rota", ""),
-                order.get("Not", ""),
-            ]
+        self.model.clear()
+        self.btn_import.setEnabled(False)
+        self._parsing = True
+        self._parse_total = 0
 
-            for col_idx, data in enumerate(columns_data, start=1):
-                item = QTableWidgetItem(str(data) if data else "")
+        self.progress_bar.setVisible(True)
+        self.progress_bar.setRange(0, 0)
+        self.progress_bar.setFormat("Okunuyor...")
+
+        self.parse_worker = ExcelParseWorker(self.excel_file_path)
+        self.parse_worker.total_estimated.connect(self.on_total_estimated)
+        self.parse_worker.chunk_ready.connect(self.on_chunk_ready)
+        self.parse_worker.parse_finished.connect(self.on_parse_finished)
+        self.parse_worker.parse_failed.connect(self.on_parse_failed)
+        self.parse_worker.start()
+
+    def _stop_parsing(self):
+        if self.parse_worker is not None:
+            self.parse_worker.cancel()
+            self.parse_worker.wait()
+            self.parse_worker = None
+        self._parsing = False
+        if self._import_queue is not None:
+            # Okuma yarıda kaldı; aktarım worker'ı kuyrukta beklemesin
+            self._import_queue.put(None)
+
+    def _is_current(self):
+        """Sinyal güncel okuma worker'ından mı geldi?"""
+        return self.parse_worker is not None and self.sender() is self.parse_worker
+
+    def reject(self):
+        """Kapatılırken okuma thread'ini durdur"""
+        self._stop_parsing()
+        super().reject()
+
+    def on_total_estimated(self, total):
+        """Tahmini satır sayısı biliniyorsa okuma ilerlemesi yüzde olarak gösterilir"""
+        if not self._is_current():
+            return
+        self._parse_total = total
+        if self._import_queue is None:
+            self.progress_bar.setRange(0, total)
+            self.progress_bar.setFormat("Okunuyor: %v / %m")
+
+    def on_chunk_ready(self, chunk):
+        """Okunan parça: önizlemeye ekle, aktarım sürüyorsa kuyruğa da ver"""
+        if not self._is_current():
+            return
+        first = self.model.rowCount() == 0
+        self.model.append_rows(chunk)
+        if first:
+            self.table.resizeColumnToContents(3)
+            self.btn_import.setEnabled(True)
+
+        if self._import_queue is not None:
+            selected = [prepare_order(o) for o in chunk if o['_selected']]
+            self.worker.total += len(selected)
+            self._import_queue.put(selected)
+        elif self._parse_total:
+            self.progress_bar.setValue(min(self.model.rowCount(), self._parse_total))
+
+    def on_parse_finished(self, count):
+        """Okuma bitti"""
+        if not self._is_current():
+            return
+        self._parsing = False
+        self.parse_worker = None
 
-                # Hatalı satırları kırmızı yap
-                if not order['_valid']:
-                    item.setBackground(QColor("#FFE6E6"))
-                    item.setForeground(QColor(Colors.CRITICAL))
-                    if col_idx == 1:  # Sipariş kodu sütununa hata mesajı ekle
-                        item.setToolTip("\n".join(order['_errors']))
+        if self._import_queue is not None:
+            # Aktarım sürüyor: kuyruğu kapat, sonucu import_completed bildirir
+            self._import_queue.put(None)
+            return
 
-                item.setFlags(item.flags() & ~Qt.ItemIsEditable)
-                self.table.setItem(row_idx, col_idx, item)
+        self.progress_bar.setVisible(False)
+        self.progress_bar.setFormat("%p%")
+
+        if count:
+            valid = sum(1 for o in self.model.orders if o['_valid'])
+            duplicate = sum(1 for o in self.model.orders if o.get('_duplicate'))
+            message = (f"{count} sipariş okundu.\n"
+                       f"Geçerli: {valid}\n"
+                       f"Hatalı: {count - valid}")
+            if duplicate:
+                message += f"\nSistemde kayıtlı (seçilmedi): {duplicate}"
+            QMessageBox.information(self, "Başarılı", message)
+        else:
+            QMessageBox.warning(self, "Uyarı", "Dosyada sipariş bulunamadı!")
 
-        self.update_selected_count()
+    def on_parse_failed(self, message):
+        if not self._is_current():
+            return
+        self._parsing = False
+        self.parse_worker = None
+        if self._import_queue is not None:
+            self._import_queue.put(None)
+        else:
+            self.progress_bar.setVisible(False)
+        QMessageBox.critical(self, "Hata", f"Dosya okunamadı:\n{message}")
 
     def select_all_rows(self):
         """Tüm satırları seç"""
-        for row in range(self.table.rowCount()):
-            chk_widget = self.table.cellWidget(row, 0)
-            if chk_widget:
-                chk = chk_widget.findChild(QCheckBox)
-                if chk:
-                    chk.setChecked(True)
+        self.model.set_all_selected(True)
 
     def deselect_all_rows(self):
         """Tüm seçimleri kaldır"""
-        for row in range(self.table.rowCount()):
-            chk_widget = self.table.cellWidget(row, 0)
-            if chk_widget:
-                chk = chk_widget.findChild(QCheckBox)
-                if chk:
-                    chk.setChecked(False)
-
-    def update_selected_count(self):
-        """Seçili sipariş sayısını güncelle"""
-        count = 0
-        for row in range(self.table.rowCount()):
-            chk_widget = self.table.cellWidget(row, 0)
-            if chk_widget:
-                chk = chk_widget.findChild(QCheckBox)
-                if chk and chk.isChecked():
-                    count += 1
+        self.model.set_all_selected(False)
 
-        self.lbl_selected_count.setText(f"Seçili: {count} sipariş")
+    def update_selected_count(self, *args):
+        """Seçili sipariş sayısını güncelle"""
+        text = f"Seçili: {self.model.selected_count} sipariş"
+        if self._parsing:
+            text += f" (okunan: {self.model.rowCount()})"
+        self.lbl_selected_count.setText(text)
 
     def import_orders(self):
         """Seçili siparişleri veritabanına aktar (Thread kullanarak)"""
@@ -786,118 +809,63 @@ class ExcelImportDialog(QDialog):
             return
 
         # Seçili siparişleri topla
-        selected_orders = []
-        for row in range(self.table.rowCount()):
-            chk_widget = self.table.cellWidget(row, 0)
-            if chk_widget:
-                chk = chk_widget.findChild(QCheckBox)
-                if chk and chk.isChecked():
-                    selected_orders.append(self.orders_data[row])
-
-        if not selected_orders:
+        selected_orders = self.model.selected_orders()
+
+        if not selected_orders and not self._parsing:
             QMessageBox.warning(self, "Uyarı", "Lütfen en az bir sipariş seçin!")
             return
 
         # Onay al
+        message = f"{len(selected_orders)} sipariş sisteme aktarılacak."
+        if self._parsing:
+            message += "\nDosya okunmaya devam ediyor; kalan geçerli siparişler okundukça aktarılacak."
         reply = QMessageBox.question(
             self,
             "Onay",
-            f"{len(selected_orders)} sipariş sisteme aktarılacak.\n\nDevam edilsin mi?",
+            f"{message}\n\nDevam edilsin mi?",
             QMessageBox.Yes | QMessageBox.No
         )
 
         if reply != QMessageBox.Yes:
             return
 
-        # Boş değerleri güvenli şekilde handle et
-        def safe_int(value, default=0):
-            if value is None or value == "" or str(value).strip() == "":
-                return default
-            try:
-                return int(float(value))
-            except:
-                return default
-
-        def safe_float(value, default=0.0):
-            if value is None or value == "" or str(value).strip() == "":
-                return default
-            try:
-                return float(value)
-            except:
-                return default
-
-        def safe_str(value, default=""):
-            if value is None or str(value).strip() == "":
-                return default
-            return str(value).strip()
-
         # Siparişleri hazırla
-        prepared_orders = []
-        for order in selected_orders:
-            # Tarihi formatla
-            delivery_date = order.get("Teslim Tarihi", "")
-            if delivery_date:
-                try:
-                    if isinstance(delivery_date, datetime):
-                        delivery_date = delivery_date.strftime("%Y-%m-%d")
-                    elif isinstance(delivery_date, str):
-                        parts = delivery_date.split('.')
-                        if len(parts) == 3:
-                            delivery_date = f"{parts[2]}-{parts[1]}-{parts[0]}"
-                except:
-                    delivery_date = QDate.currentDate().addDays(7).toString("yyyy-MM-dd")
-            else:
-                delivery_date = QDate.currentDate().addDays(7).toString("yyyy-MM-dd")
-
-            # Rotayı düzenle
-            route = order.get("Rota", "").strip()
-            if route and "SEVKIYAT" not in route:
-                route = route + ",SEVKIYAT"
-            elif not route:
-                route = "SEVKIYAT"
-
-            # Sipariş verisini hazırla
-            order_data = {
-                "code": safe_str(order.get("Sipariş Kodu"), ""),
-                "customer": safe_str(order.get("Müşteri"), ""),
-                "product": safe_str(order.get("Ürün Tipi"), "Düz Cam"),
-                "thickness": safe_int(order.get("Kalınlık (mm)"), 6),
-                "width": safe_float(order.get("Genişlik (mm)"), 0),
-                "height": safe_float(order.get("Yükseklik (mm)"), 0),
-                "quantity": safe_int(order.get("Adet"), 1),
-                "total_m2": safe_float(order.get("Toplam m²"), 0),
-                "priority": safe_str(order.get("Öncelik"), "Normal"),
-                "date": delivery_date,
-                "route": route,
-                "sale_price": safe_float(order.get("Satış Fiyatı"), 0),
-                "notes": safe_str(order.get("Not"), ""),
-                "project_id": None
-            }
-            prepared_orders.append(order_data)
+        prepared_orders = [prepare_order(order) for order in selected_orders]
 
         # Progress bar göster
         self.progress_bar.setVisible(True)
-        self.progress_bar.setMaximum(len(prepared_orders))
+        self.progress_bar.setFormat("Aktarılıyor: %v / %m")
+        self.progress_bar.setRange(0, max(len(prepared_orders), 1))
         self.progress_bar.setValue(0)
 
         # Butonları devre dışı bırak
         self.btn_import.setEnabled(False)
+        self.table.setEnabled(False)
 
         # Worker thread'i başlat
-        self.worker = ImportWorkerThread(prepared_orders)
+        if self._parsing:
+            self._import_queue = queue.Queue()
+            self._import_queue.put(prepared_orders)
+            self.worker = ImportWorkerThread(self._import_queue, total=len(prepared_orders))
+        else:
+            self.worker = ImportWorkerThread(prepared_orders)
         self.worker.progress_updated.connect(self.on_progress_updated)
         self.worker.import_completed.connect(self.on_import_completed)
         self.worker.start()
 
     def on_progress_updated(self, current, total):
         """Progress bar güncelleme"""
+        if total and total != self.progress_bar.maximum():
+            self.progress_bar.setMaximum(total)
         self.progress_bar.setValue(current)
 
     def on_import_completed(self, success_count, error_count, error_messages):
         """Import tamamlandığında çağrılır"""
         # Progress bar gizle
+        self._import_queue = None
         self.progress_bar.setVisible(False)
         self.btn_import.setEnabled(True)
+        self.table.setEnabled(True)
 
         # Sonucu göster
         result_msg = f"Aktarım tamamlandı!\n\n"
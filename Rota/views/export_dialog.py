@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+"""
+EFES ROTA X - Arka Plan Dışa Aktarma
+
+core/export_service işlerini GUI thread'ini dondurmadan çalıştırır:
+ilerleme penceresi (yüzde veya satır sayısı) ve İptal düğmesi ile.
+
+Kullanım:
+    path = ask_export_path(self, "uretim_raporu_20240101")
+    if path:
+        sql, params = db.build_production_report_query(d1, d2)
+        run_export(self, lambda **kw: export_query(sql, params, path, headers, **kw))
+"""
+
+import os
+
+from PySide6.QtCore import Qt, QThread, Signal
+from PySide6.QtWidgets import QFileDialog, QMessageBox, QProgressDialog
+
+from core.export_service import FILE_FILTER, FORMAT_CSV, ExportCancelled
+
+
+class ExportWorker(QThread):
+    """Dışa aktarma işini arka planda çalıştırır"""
+    progress_updated = Signal(int, int)  # (yazilan, toplam; bilinmiyorsa -1)
+    finished = Signal(bool, str)         # (success, message)
+
+    def __init__(self, job):
+        """job(progress=..., is_cancelled=...) -> ExportResult"""
+        super().__init__()
+        self.job = job
+        self.result = None
+        self.was_cancelled = False
+        self._cancel_requested = False
+
+    def cancel(self):
+        """İptal iste (bir sonraki parçada durur, yarım dosya silinir)"""
+        self._cancel_requested = True
+
+    def run(self):
+        try:
+            self.result = self.job(
+                progress=lambda done, total: self.progress_updated.emit(done, -1 if total is None else total),
+                is_cancelled=lambda: self._cancel_requested,
+            )
+            self.finished.emit(True, f"{self.result.rows} satır {self.result.seconds:.1f} sn'de kaydedildi:\n{self.result.path}")
+        except ExportCancelled:
+            self.was_cancelled = True
+            self.finished.emit(False, "Dışa aktarma iptal edildi.")
+        except ImportError:
+            self.finished.emit(False, "openpyxl kütüphanesi yüklü değil.\npip install openpyxl\n(CSV olarak kaydedebilirsiniz)")
+        except Exception as e:
+            self.finished.emit(False, f"Kayıt hatası: {e}")
+
+
+def ask_export_path(parent, default_name, title="Dışa Aktar"):
+    """Kayıt yolu sor; seçilen filtreye göre uzantıyı tamamla (iptal -> None)"""
+    path, selected = QFileDialog.getSaveFileName(parent, title, f"{default_name}.xlsx", FILE_FILTER)
+    if not path:
+        return None
+
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in (".xlsx", ".csv"):
+        path += ".csv" if FORMAT_CSV in (selected or "").lower() else ".xlsx"
+    elif ext == ".xlsx" and FORMAT_CSV in (selected or "").lower():
+        path = path[:-5] + ".csv"
+    return path
+
+
+def run_export(parent, job, label="Dışa aktarılıyor...", on_done=None, notify=True):
+    """
+    job'u ExportWorker ile çalıştır, ilerleme penceresi göster.
+
+    Args:
+        job: job(progress=..., is_cancelled=...) -> ExportResult
+        on_done: on_done(result) - başarıyla bitince (GUI thread)
+        notify: Başarı mesaj kutusu gösterilsin mi (hatalar her zaman gösterilir)
+
+    Returns:
+        ExportWorker (parent üzerinde de referansı tutulur)
+    """
+    progress = QProgressDialog(label, "İptal", 0, 0, parent)
+    progress.setWindowTitle("Dışa Aktar")
+    progress.setWindowModality(Qt.WindowModal)
+    progress.setMinimumDuration(300)
+    progress.setAutoClose(False)
+    progress.setAutoReset(False)
+
+    worker = ExportWorker(job)
+
+    def on_progress(done, total):
+        if total > 0:
+            progress.setMaximum(100)
+            progress.setValue(min(100, int(done * 100 / total)))
+            progress.setLabelText(f"{label}\n{done:,} / {total:,} satır")
+        else:
+            progress.setLabelText(f"{label}\n{done:,} satır")
+
+    def on_finished(success, message):
+        progress.close()
+        if success:
+            if on_done:
+                on_done(worker.result)
+            if notify:
+                QMessageBox.information(parent, "Başarılı", message)
+        elif not worker.was_cancelled:
+            QMessageBox.critical(parent, "Hata", message)
+        if getattr(parent, '_export_worker', None) is worker:
+            parent._export_worker = None
+
+    worker.progress_updated.connect(on_progress)
+    worker.finished.connect(on_finished)
+    progress.canceled.connect(worker.cancel)
+
+    parent._export_worker = worker
+    worker.start()
+    return worker
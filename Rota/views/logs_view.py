@@ -12,6 +12,11 @@ try:
 except ImportError:
     pass
 
+try:
+    from core.db_async import async_db
+except ImportError:
+    async_db = None
+
 class LogsView(QWidget):
     def __init__(self):
         super().__init__()
@@ -99,18 +104,50 @@ class LogsView(QWidget):
         """Arama yap"""
         keyword = self.inp_search.text().strip()
         if not keyword:
+            if async_db is not None:
+                async_db.cancel_key("logs_search")
             self.refresh_data()
             return
+
+        # 🚀 PERFORMANS: Her tuşta yeni arama eskisini iptal eder,
+        # sonuçlar parça parça gelir (ilk sayfa hemen görünür)
+        if async_db is not None and async_db.is_running():
+            sql, params = db.build_logs_query(keyword=keyword)
+            async_db.fetch_stream(
+                sql, params,
+                on_chunk=self._on_search_chunk,
+                callback=self._on_search_done,
+                error_callback=lambda msg: print(f"Log arama hatası: {msg}"),
+                chunk_size=200,
+                key="logs_search"
+            )
+            return
             
         data = db.search_logs(keyword)
         self.fill_table(data)
 
+    def _on_search_chunk(self, rows, chunk_index):
+        """Arama sonucunun bir parçası geldi"""
+        if chunk_index == 0:
+            self.table.setRowCount(0)
+        self.append_rows(rows)
+
+    def _on_search_done(self, total):
+        """Arama bitti; sonuç yoksa tabloyu boşalt"""
+        if total == 0:
+            self.table.setRowCount(0)
+
     def fill_table(self, data):
         """Tabloyu doldurur"""
         self.table.setRowCount(0)
-        self.table.setRowCount(len(data))
+        self.append_rows(data)
+
+    def append_rows(self, data):
+        """Tablonun sonuna satır ekler"""
+        start = self.table.rowCount()
+        self.table.setRowCount(start + len(data))
         
-        for row_idx, item in enumerate(data):
+        for row_idx, item in enumerate(data, start=start):
             # Tarih Formatı (YYYY-MM-DD HH:MM:SS -> DD.MM HH:MM)
             raw_date = item['timestamp']
             try:
@@ -4,6 +4,12 @@ Excel temali, Anlik Konum sutunu ile
 """
 
 import sys
+
+try:
+    from utils.timezone_helper import now_turkey
+except ImportError:
+    from datetime import datetime as _dt
+    now_turkey = lambda: _dt.now()
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel,
     QPushButton, QTableWidget, QTableWidgetItem,
@@ -16,8 +22,10 @@ from PySide6.QtGui import QColor, QFont, QBrush
 
 try:
     from core.db_manager import db
+    from core.db_async import run_async
 except ImportError:
     db = None
+    run_async = None
 
 try:
     from views.add_order_dialog import AddOrderDialog
@@ -44,6 +52,12 @@ try:
 except ImportError:
     ExcelImportDialog = None
 
+try:
+    from core.export_service import export_query
+    from views.export_dialog import ask_export_path, run_export
+except ImportError:
+    export_query = None
+
 
 # =============================================================================
 # EXCEL TEMASI
@@ -122,13 +136,16 @@ class OrdersView(QWidget):
             from core.refresh_manager import refresh_manager
             refresh_manager.register_view(
                 data_key='orders',
-                callback=self.refresh_data,
-                dependencies=['production_logs']
+                fetch=self.fetch_data,
+                apply=self.apply_data,
+                dependencies=['production_logs'],
+                timers=[self.timer]
             )
         except:
             pass  # RefreshManager yoksa timer kullan
 
         self.selected_code = ""  # Secili siparis kodu
+        self._restore_selection = False  # Sessiz yenileme sonrasi secimi geri yukle
         self.refresh_data()
 
     def setup_ui(self):
@@ -254,6 +271,26 @@ class OrdersView(QWidget):
         btn_excel.clicked.connect(self.open_excel_import)
         header_layout.addWidget(btn_excel)
 
+        # Excel'e Aktar butonu (akisli, arka planda)
+        btn_export = QPushButton("📤 Excel'e Aktar")
+        btn_export.setFixedHeight(30)
+        btn_export.setCursor(Qt.PointingHandCursor)
+        btn_export.setStyleSheet(f"""
+            QPushButton {{
+                background-color: {Colors.BG};
+                border: 1px solid {Colors.BORDER};
+                border-radius: 3px;
+                padding: 0 12px;
+                font-size: 11px;
+                color: {Colors.TEXT};
+            }}
+            QPushButton:hover {{
+                background-color: {Colors.HEADER_BG};
+            }}
+        """)
+        btn_export.clicked.connect(self.export_orders)
+        header_layout.addWidget(btn_export)
+
         # Toplu Sil butonu
         btn_delete_bulk = QPushButton("🗑️ Seçilileri Sil")
         btn_delete_bulk.setFixedHeight(30)
@@ -554,46 +591,73 @@ class OrdersView(QWidget):
         if not db:
             return
 
-        v_scroll = self.table.verticalScrollBar().value()
+        # 🚀 Siparisler ve konumlar worker havuzunda hesaplanir
+        run_async(
+            self.fetch_data,
+            callback=self.apply_data,
+            error_callback=lambda msg: print(f"Veri cekme hatasi: {msg}"),
+            key="orders_view_refresh"
+        )
+
+    def fetch_data(self):
+        """Siparisleri ve konumlarini cek (widget'a dokunmaz, worker thread'de calisabilir)"""
+        if not db:
+            return [], {}
 
         try:
             # Her seferinde taze veri cek
-            self.all_orders = db.get_all_orders()
+            all_orders = db.get_all_orders()
 
             # BATCH LOCATION HESAPLAMA - N+1 COZUMU
             # Tüm siparişlerin location bilgisini tek seferde hesapla
-            self.location_cache = self.get_all_locations_batch(self.all_orders)
+            location_cache = self.get_all_locations_batch(all_orders)
 
             # Siparis durumlarini guncelle (uretim girisi yapilmissa)
-            for order in self.all_orders:
+            status_changes = {'Tamamlandı': [], 'Üretimde': []}
+            for order in all_orders:
                 order_id = order.get('id')
                 if order_id and order.get('status') not in ['Sevk Edildi', 'Hatalı/Fire']:
                     # Cache'den location bilgisini al
-                    location = self.location_cache.get(order_id, {})
+                    location = location_cache.get(order_id, {})
                     # Eger tum istasyonlar bitmisse ve durum "Tamamlandı" degilse guncelle
                     if location.get('progress') == 100 and location.get('text') == 'Tamamlandı':
                         if order.get('status') != 'Tamamlandı':
-                            try:
-                                db.update_order_status(order_id, 'Tamamlandı')
-                                order['status'] = 'Tamamlandı'
-                            except:
-                                pass
+                            status_changes['Tamamlandı'].append(order)
                     # Eger uretim baslamissa ve durum "Beklemede" ise "Uretimde" yap
                     elif location.get('progress', 0) > 0 or '(' in location.get('text', ''):
                         if order.get('status') == 'Beklemede':
-                            try:
-                                db.update_order_status(order_id, 'Üretimde')
-                                order['status'] = 'Üretimde'
-                            except:
-                                pass
+                            status_changes['Üretimde'].append(order)
+
+            # Durum basina tek toplu guncelleme
+            for status, orders in status_changes.items():
+                if not orders:
+                    continue
+                try:
+                    db.set_status([o['id'] for o in orders], status)
+                    for order in orders:
+                        order['status'] = status
+                except:
+                    pass
         except Exception as e:
             print(f"Veri cekme hatasi: {e}")
-            self.all_orders = []
-            self.location_cache = {}
+            all_orders = []
+            location_cache = {}
+
+        return all_orders, location_cache
+
+    def apply_data(self, data):
+        """fetch_data sonucunu tabloya bas (GUI thread)"""
+        v_scroll = self.table.verticalScrollBar().value()
+
+        self.all_orders, self.location_cache = data
 
         self.populate_table(self.all_orders)
         self.update_summary()
 
+        if self._restore_selection:
+            self._restore_selection = False
+            self._restore_filter_and_selection()
+
         self.table.verticalScrollBar().setValue(v_scroll)
 
     def refresh_data_silent(self):
@@ -608,9 +672,12 @@ class OrdersView(QWidget):
             if code_item:
                 self.selected_code = code_item.text().replace("⚠ ", "").replace("⚡ ", "").strip()
         
-        # Veriyi yenile
+        # Veriyi yenile (veri gelince apply_data secimi geri yukler)
+        self._restore_selection = True
         self.refresh_data()
-        
+
+    def _restore_filter_and_selection(self):
+        """Yenileme sonrasi arama filtresini ve secimi geri yukle"""
         # Eger arama aktifse filtreyi tekrar uygula
         if self.search_input.text():
             self.filter_table(self.search_input.text())
@@ -810,6 +877,30 @@ class OrdersView(QWidget):
         except Exception as e:
             QMessageBox.critical(self, "Hata", f"Excel import hatasi:\n{str(e)}")
 
+    def export_orders(self):
+        """Tum siparisleri dosyaya akit (xlsx veya csv, arka planda)"""
+        if export_query is None or not db:
+            QMessageBox.warning(self, "Hata", "Disa aktarma modulu yuklenemedi.")
+            return
+
+        file_path = ask_export_path(self, f"siparisler_{now_turkey().strftime('%Y%m%d')}")
+        if not file_path:
+            return
+
+        sql, params = db.build_orders_export_query()
+        run_export(
+            self,
+            lambda **kw: export_query(
+                sql, params, file_path,
+                headers=["Siparis Kodu", "Musteri", "Urun", "Kalinlik", "En", "Boy", "Adet",
+                         "m2", "Rota", "Oncelik", "Durum", "Teslim", "Olusturma", "Not"],
+                sheet_title="Siparisler",
+                column_widths=[16, 28, 16, 9, 8, 8, 8, 10, 40, 10, 12, 12, 20, 30],
+                **kw
+            ),
+            label="Siparisler aktariliyor..."
+        )
+
     def open_label_printer(self):
         """Etiket basma dialogu"""
         selected = self.table.selectedItems()
@@ -1038,6 +1129,12 @@ class OrdersView(QWidget):
         action_note = menu.addAction("📝 Not Düzenle")
         action_note.triggered.connect(self.edit_order_note)
 
+        # Durum Değiştir (çoklu seçimde de çalışır)
+        status_menu = menu.addMenu("🔄 Durumu Değiştir")
+        for status in ("Beklemede", "Üretimde", "Tamamlandı"):
+            action_status = status_menu.addAction(status)
+            action_status.triggered.connect(lambda checked=False, st=status: self.set_selected_status(st))
+
         menu.addSeparator()
 
         # Siparişi Sil
@@ -1047,6 +1144,7 @@ class OrdersView(QWidget):
         # Seçili sipariş sayısına göre menü metnini güncelle
         if len(selected_rows) > 1:
             action_delete.setText(f"🗑️ {len(selected_rows)} Siparişi Sil")
+            status_menu.setTitle(f"🔄 {len(selected_rows)} Siparişin Durumunu Değiştir")
             action_detail.setEnabled(False)  # Detay sadece tek seçimde
             action_edit.setEnabled(False)    # Güncelleme sadece tek seçimde
             action_note.setEnabled(False)    # Not sadece tek seçimde
@@ -1054,6 +1152,39 @@ class OrdersView(QWidget):
         # Menüyü göster
         menu.exec(self.table.viewport().mapToGlobal(position))
 
+    def _selected_orders(self):
+        """Seçili satırların (id, kod) listeleri"""
+        order_ids = []
+        order_codes = []
+        for row in self.table.selectionModel().selectedRows():
+            item = self.table.item(row.row(), 0)
+            order_id = item.data(Qt.UserRole) if item else None
+            if order_id:
+                order_ids.append(order_id)
+                order_codes.append(item.text())
+        return order_ids, order_codes
+
+    def set_selected_status(self, status):
+        """Seçili siparişlerin durumunu tek seferde değiştir"""
+        if not db:
+            QMessageBox.warning(self, "Hata", "Veritabanı bağlantısı yok!")
+            return
+
+        order_ids, _ = self._selected_orders()
+        if not order_ids:
+            QMessageBox.warning(self, "Uyarı", "Lütfen sipariş seçin!")
+            return
+
+        try:
+            changed = db.set_status(order_ids, status)
+        except Exception as e:
+            QMessageBox.critical(self, "Hata", f"Durum değiştirilemedi:\n{str(e)}")
+            return
+
+        self.refresh_data_silent()
+        if len(order_ids) > 1:
+            QMessageBox.information(self, "Başarılı", f"{changed} siparişin durumu '{status}' yapıldı.")
+
     def delete_selected_orders(self):
         """Seçili siparişleri sil"""
         if not db:
@@ -1067,14 +1198,7 @@ class OrdersView(QWidget):
             return
 
         # Sipariş ID'lerini topla
-        order_ids = []
-        order_codes = []
-        for row in selected_rows:
-            order_id = self.table.item(row.row(), 0).data(Qt.UserRole)
-            order_code = self.table.item(row.row(), 0).text()
-            if order_id:
-                order_ids.append(order_id)
-                order_codes.append(order_code)
+        order_ids, order_codes = self._selected_orders()
 
         if not order_ids:
             QMessageBox.warning(self, "Uyarı", "Silinecek sipariş bulunamadı!")
@@ -1097,7 +1221,7 @@ class OrdersView(QWidget):
 
         # Siparişleri sil
         try:
-            deleted_count = db.delete_orders_bulk(order_ids)
+            deleted_count = db.delete_orders(order_ids)
             QMessageBox.information(
                 self,
                 "Başarılı",
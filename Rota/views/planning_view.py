@@ -19,7 +19,7 @@ from PySide6.QtWidgets import (
     QTableWidget, QTableWidgetItem, QHeaderView, 
     QPushButton, QAbstractItemView, QStyledItemDelegate, 
     QDialog, QListWidget, QMessageBox, QApplication, QStyle, QFrame,
-    QGraphicsDropShadowEffect
+    QGraphicsDropShadowEffect, QComboBox
 )
 from PySide6.QtCore import Qt, QTimer, QRect
 from PySide6.QtGui import QColor, QFont, QPainter, QPen, QBrush
@@ -33,6 +33,7 @@ try:
     from ui.theme import Theme
     from core.smart_planner import planner
     from core.factory_config import factory_config
+    from core.db_async import run_async
     try:
         from views.weekly_schedule_dialog import WeeklyScheduleDialog
     except ImportError:
@@ -232,6 +233,12 @@ class PlanningView(QWidget):
         self.DAYS_RANGE = 30
         self.cached_details = {}
 
+        # Uzun ufuk: seyrek zaman çizelgesi + sadece görünen sütunları doldur
+        self.timeline = None
+        self._filled_columns = set()
+        self.HORIZON_OPTIONS = [("30 Gün", 30), ("3 Ay", 90), ("6 Ay", 180), ("1 Yıl", 365)]
+        self.LAZY_COLUMN_MARGIN = 14  # Kaydırmada boşluk görünmesin diye ön-doldurma
+
         # --- MAKİNE LİSTESİNİ YÜKLETablo başlatma yap
         self.load_machines()
 
@@ -244,20 +251,16 @@ class PlanningView(QWidget):
         # self.timer.timeout.connect(self.refresh_plan)
         # self.timer.start(10000)
 
-        # İlk yüklemeyi threading ile yap (UI donmasını önle)
-        from PySide6.QtCore import QThread, Signal
-
-        class RefreshThread(QThread):
-            finished = Signal(object)
-
-            def run(self):
-                if planner:
-                    result = planner.calculate_forecast()
-                    self.finished.emit(result)
+        # 🚀 PERFORMANS: Veri değişmediyse ilk çizim disk cache'ten (sadece dosya okuma)
+        cached = None
+        if planner:
+            cached = planner.get_cached_timeline() or planner.get_cached_forecast()
+        if cached:
+            self.on_refresh_complete(cached)
+            return
 
-        self.refresh_thread = RefreshThread()
-        self.refresh_thread.finished.connect(self.on_refresh_complete)
-        self.refresh_thread.start()
+        # İlk yüklemeyi arka planda yap (UI donmasını önle)
+        self.manual_refresh()
 
     def load_machines(self):
         """Makina listesini factory_config'den yükle"""
@@ -324,6 +327,24 @@ class PlanningView(QWidget):
         tb_layout.addLayout(legend_layout)
         tb_layout.addSpacing(20)
 
+        # Ufuk seçimi (zaman çizelgesi tüm ufku kapsar, yeniden hesap gerekmez)
+        self.combo_horizon = QComboBox()
+        for label, days in self.HORIZON_OPTIONS:
+            self.combo_horizon.addItem(label, days)
+        self.combo_horizon.currentIndexChanged.connect(self.on_horizon_changed)
+        self.combo_horizon.setStyleSheet(f"""
+            QComboBox {{
+                background-color: {Colors.BG};
+                border: 1px solid {Colors.BORDER};
+                border-radius: 4px;
+                padding: 5px 10px;
+                color: {Colors.TEXT};
+                font-size: 11px;
+            }}
+        """)
+        tb_layout.addWidget(self.combo_horizon)
+        tb_layout.addSpacing(8)
+
         if WeeklyScheduleDialog:
             btn_list = QPushButton("Haftalık Liste")
             btn_list.setCursor(Qt.PointingHandCursor)
@@ -363,6 +384,7 @@ class PlanningView(QWidget):
         # Tablo
         self.table = QTableWidget()
         self.table.cellClicked.connect(self.on_cell_clicked)
+        self.table.horizontalScrollBar().valueChanged.connect(self._fill_visible_columns)
         layout.addWidget(self.table)
 
     def init_table_structure(self):
@@ -426,32 +448,124 @@ class PlanningView(QWidget):
             self.table.setItem(row_idx, 0, item)
 
     def manual_refresh(self):
-        """Manuel yenileme butonu - Threading ile"""
-        from PySide6.QtCore import QThread, Signal
-
-        class RefreshThread(QThread):
-            finished = Signal(object)
-
-            def run(self):
-                if planner:
-                    result = planner.calculate_forecast()
-                    self.finished.emit(result)
+        """Manuel yenileme butonu - hesaplama worker havuzunda"""
+        if not planner:
+            return
 
-        self.refresh_thread = RefreshThread()
-        self.refresh_thread.finished.connect(self.on_refresh_complete)
-        self.refresh_thread.start()
+        # Üst üste basılırsa sadece son istek sonuç üretir
+        run_async(
+            planner.calculate_timeline if planner.SCHEDULER_ENGINE == "event" else planner.calculate_forecast,
+            callback=self.on_refresh_complete,
+            error_callback=lambda msg: print(f"Planlama yenileme hatası: {msg}"),
+            key="planning_forecast"
+        )
 
     def on_refresh_complete(self, result):
         """Threading ile yükleme tamamlandığında UI'ı güncelle"""
-        if not result or not isinstance(result, tuple) or len(result) < 3:
+        if result is None:
             return
 
+        if not isinstance(result, tuple):
+            # Seyrek zaman çizelgesi: sütunlar görünür oldukça doldurulur
+            self.timeline = result
+            self._filled_columns.clear()
+            self._fill_visible_columns()
+            return
+
+        if len(result) < 3:
+            return
+
+        # Eski motor: yoğun 30 günlük tablolar
+        self.timeline = None
         forecast, details, loads = result
         self.cached_details = details
         self.update_table_data(forecast, loads)
 
+    def on_horizon_changed(self, index):
+        """Ufuk değişti: sütunları yeniden kur, görünenleri doldur"""
+        days = self.combo_horizon.itemData(index)
+        if not days or days == self.DAYS_RANGE:
+            return
+
+        # Eski motorun tabloları sadece FORECAST_DAYS kadar
+        if self.timeline is None and planner and days > planner.FORECAST_DAYS:
+            days = planner.FORECAST_DAYS
+
+        self.DAYS_RANGE = days
+        self.init_table_structure()
+        self._filled_columns.clear()
+        if self.timeline is not None:
+            self._fill_visible_columns()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._fill_visible_columns()
+
+    def _visible_day_range(self):
+        """Ekranda görünen gün sütunları (+ kenar payı): (ilk_gün, son_gün_hariç)"""
+        viewport = self.table.viewport()
+        first_col = self.table.columnAt(0)
+        last_col = self.table.columnAt(viewport.width() - 1)
+        if first_col < 1:
+            first_col = 1
+        if last_col < 0:
+            last_col = self.table.columnCount() - 1
+
+        first_day = max(first_col - 1 - self.LAZY_COLUMN_MARGIN, 0)
+        last_day = min(last_col + self.LAZY_COLUMN_MARGIN, self.DAYS_RANGE)
+        return first_day, last_day
+
+    def _fill_visible_columns(self, *_):
+        """Görünen ve henüz doldurulmamış gün sütunlarını zaman çizelgesinden doldur"""
+        if self.timeline is None:
+            return
+
+        first_day, last_day = self._visible_day_range()
+        missing = [d for d in range(first_day, last_day) if d not in self._filled_columns]
+        if not missing:
+            return
+
+        start = missing[0]
+        days = missing[-1] - start + 1
+        forecast, loads = self.timeline.window(start, days)
+        calendar = self.timeline.calendar
+
+        for row_idx, machine_name in enumerate(self.machines):
+            machine_key = machine_name.upper()
+            daily_percents = forecast.get(machine_key)
+            daily_loads = loads.get(machine_key)
+
+            for day_idx in missing:
+                offset = day_idx - start
+                percent = daily_percents[offset] if daily_percents else 0
+                load = daily_loads[offset] if daily_loads else 0
+                self._set_day_cell(row_idx, day_idx, percent, load,
+                                   not calendar.is_working_day(day_idx))
+
+        self._filled_columns.update(missing)
+
+    def _set_day_cell(self, row_idx, day_idx, percent, load, is_holiday):
+        """Tek bir gün hücresini yaz (delegate percent/metin ile boyar)"""
+        text = ""
+        if is_holiday:
+            # Hafta sonu / tatil - işaret göster
+            text = "TATIL"
+            percent = -1  # Özel işaret (delegate'de gri renk için)
+        elif percent > 0:
+            text = f"{int(load)} m²"
+
+        item = self.table.item(row_idx, day_idx + 1)
+        if not item:
+            item = QTableWidgetItem()
+            self.table.setItem(row_idx, day_idx + 1, item)
+
+        item.setData(Qt.DisplayRole, text)
+        item.setData(Qt.UserRole, percent)
+        item.setFlags(Qt.ItemIsEnabled | Qt.ItemIsSelectable)
+
     def update_table_data(self, forecast, loads):
-        """Tablo verilerini güncelle (threading-safe)"""
+        """Tablo verilerini güncelle (eski motorun yoğun tabloları)"""
+        today = now_turkey()
         for row_idx, machine_name in enumerate(self.machines):
             machine_key = machine_name.upper()
 
@@ -459,31 +573,14 @@ class PlanningView(QWidget):
             daily_loads = loads.get(machine_key, [0]*self.DAYS_RANGE)
 
             for day_idx in range(self.DAYS_RANGE):
-                col_idx = day_idx + 1
-
                 # Hafta sonu kontrolü
-                day_date = now_turkey() + timedelta(days=day_idx)
+                day_date = today + timedelta(days=day_idx)
                 is_weekend = day_date.weekday() in [5, 6]
 
                 percent = daily_percents[day_idx] if day_idx < len(daily_percents) else 0
                 load = daily_loads[day_idx] if day_idx < len(daily_loads) else 0
 
-                text = ""
-                if is_weekend:
-                    # Hafta sonu - işaret göster
-                    text = "TATIL"
-                    percent = -1  # Özel işaret (delegate'de gri renk için)
-                elif percent > 0:
-                    text = f"{int(load)} m²"
-
-                item = self.table.item(row_idx, col_idx)
-                if not item:
-                    item = QTableWidgetItem()
-                    self.table.setItem(row_idx, col_idx, item)
-
-                item.setData(Qt.DisplayRole, text)
-                item.setData(Qt.UserRole, percent)
-                item.setFlags(Qt.ItemIsEnabled | Qt.ItemIsSelectable) 
+                self._set_day_cell(row_idx, day_idx, percent, load, is_weekend)
 
     def on_cell_clicked(self, row, col):
         if col == 0: return
@@ -492,6 +589,16 @@ class PlanningView(QWidget):
         machine_name = self.machines[row]
         machine_key = machine_name.upper()
         
+        if self.timeline is not None:
+            # Gün detayı talep anında zaman çizelgesinden üretilir
+            orders = self.timeline.details(machine_key, day_idx)
+            if not orders: return
+
+            target_date = now_turkey() + timedelta(days=day_idx)
+            dialog = DayDetailDialog(machine_name, target_date.strftime("%d.%m.%Y"), orders, self)
+            dialog.exec()
+            return
+
         if machine_key in self.cached_details:
             try:
                 orders = self.cached_details[machine_key][day_idx]
@@ -25,8 +25,15 @@ from PySide6.QtGui import QColor, QFont, QCursor
 
 try:
     from core.db_manager import db
+    from core.db_async import run_async
 except ImportError:
     db = None
+    run_async = None
+
+try:
+    from views.cutting_plan_dialog import CuttingPlanDialog
+except ImportError:
+    CuttingPlanDialog = None
 
 
 # =============================================================================
@@ -264,6 +271,11 @@ class ProductionEntryDialog(QDialog):
                 plates = db.get_plates_by_thickness_type(thickness, product_type)
                 self.combo_plate.addItem("-- Plaka Seçiniz --", None)
 
+                # Kesim planında bu istasyona ayrılan plakalar
+                reserved = {}
+                for r in db.get_plate_reservations(self.station):
+                    reserved[r['plate_id']] = reserved.get(r['plate_id'], 0) + r['quantity']
+
                 for plate in plates:
                     if plate.get('quantity', 0) > 0:
                         display_text = (
@@ -271,6 +283,8 @@ class ProductionEntryDialog(QDialog):
                             f"{plate['quantity']} adet - "
                             f"{plate.get('location', 'Konum yok')}"
                         )
+                        if reserved.get(plate['id']):
+                            display_text += f" - {reserved[plate['id']]} rezerve"
                         self.combo_plate.addItem(display_text, plate['id'])
 
                 if self.combo_plate.count() == 1:
@@ -688,8 +702,10 @@ class ProductionView(QWidget):
             from core.refresh_manager import refresh_manager
             refresh_manager.register_view(
                 data_key='production_logs',
-                callback=self.refresh_data,
-                dependencies=['orders']
+                fetch=self.fetch_data,
+                apply=self.apply_data,
+                dependencies=['orders'],
+                timers=[self.timer]
             )
         except:
             pass
@@ -815,8 +831,19 @@ class ProductionView(QWidget):
         btn_refresh.clicked.connect(self.refresh_data)
         layout.addWidget(btn_refresh)
         
+        if CuttingPlanDialog:
+            btn_cutting = QPushButton("Kesim Plani")
+            btn_cutting.setStyleSheet(btn_refresh.styleSheet())
+            btn_cutting.clicked.connect(self.open_cutting_plan)
+            layout.addWidget(btn_cutting)
+        
         return toolbar
     
+    def open_cutting_plan(self):
+        """INTERMAC / LIVA KESIM nesting plani ve plaka rezervasyonu"""
+        dialog = CuttingPlanDialog("INTERMAC", self)
+        dialog.exec()
+    
     def _create_list_panel(self):
         panel = QFrame()
         panel.setStyleSheet(f"background-color: {Colors.BG};")
@@ -918,73 +945,84 @@ class ProductionView(QWidget):
                 item.widget().deleteLater()
     
     def refresh_data(self):
-        try:
-            if db:
-                matrix_data = db.get_production_matrix_advanced()
+        if not db:
+            self.apply_data([])
+            return
 
-                orders_info = {}
-                try:
-                    with db.get_connection() as conn:
-                        try:
-                            conn.execute("ALTER TABLE orders ADD COLUMN queue_position INTEGER DEFAULT 9999")
-                        except:
-                            pass
-
-                        rows = conn.execute("""
-                            SELECT id, priority, delivery_date,
-                                   COALESCE(queue_position, 9999) as queue_position,
-                                   COALESCE(notes, '') as notes
-                            FROM orders
-                            WHERE status NOT IN ('Sevk Edildi', 'Tamamlandı')
-                            ORDER BY queue_position ASC, delivery_date ASC
-                        """).fetchall()
-
-                        for row in rows:
-                            orders_info[row['id']] = {
-                                'priority': row['priority'],
-                                'delivery_date': row['delivery_date'],
-                                'queue_position': row['queue_position'],
-                                'notes': row['notes']
-                            }
-                except Exception as e:
-                    print(f"Orders info error: {e}")
-
-                for order in matrix_data:
-                    order_id = order.get('id')
-                    if order_id in orders_info:
-                        order['priority'] = orders_info[order_id]['priority']
-                        order['delivery_date'] = orders_info[order_id]['delivery_date']
-                        order['queue_position'] = orders_info[order_id]['queue_position']
-                        order['notes'] = orders_info[order_id]['notes']
-                    else:
-                        order['priority'] = 'Normal'
-                        order['queue_position'] = 9999
-                        order['notes'] = ''
-
-                # PERFORMANS OPTİMİZASYONU: Karar Destek sıralamasına göre ilk siparişleri göster
-                # Sıralama: queue_position'a göre
-                matrix_data.sort(key=lambda x: (x.get('queue_position', 9999), x.get('delivery_date', '9999-12-31')))
-
-                # Sadece Karar Destek'te sıralanmış ilk 100 siparişi al
-                # (queue_position < 9999 olanlar zaten Karar Destek'te sıralanmış demektir)
-                filtered_orders = []
-                for idx, order in enumerate(matrix_data):
-                    queue_pos = order.get('queue_position', 9999)
-                    # İlk 100 siparişi al VEYA sıralanmamış ama üretimde olanları al
-                    if idx < 100 or queue_pos < 100:
-                        filtered_orders.append(order)
-                    else:
-                        break  # İlk 100'den sonra zaten gerek yok
-
-                self.all_orders = filtered_orders
+        # 🚀 Matris worker havuzunda hazırlanır (yeni istek eskisinin yerine geçer)
+        run_async(
+            self.fetch_data,
+            callback=self.apply_data,
+            error_callback=lambda msg: self.status_label.setText(f"Hata: {msg}"),
+            key="production_view_refresh"
+        )
+
+    def fetch_data(self):
+        """Listelenecek siparişleri hazırla (widget'a dokunmaz, worker thread'de çalışabilir)"""
+        if not db:
+            return []
+
+        # PERFORMANS: Matris ve ek bilgiler tek okuma snapshot'ından (tutarlı veri,
+        # tek bağlantı). queue_position kolonu _migrate_tables ile garanti altında.
+        orders_info = {}
+        with db.snapshot() as snap:
+            matrix_data = snap.get_production_matrix_advanced()
+
+            try:
+                rows = snap.execute("""
+                    SELECT id, priority, delivery_date,
+                           COALESCE(queue_position, 9999) as queue_position,
+                           COALESCE(notes, '') as notes
+                    FROM orders
+                    WHERE status NOT IN ('Sevk Edildi', 'Tamamlandı')
+                    ORDER BY queue_position ASC, delivery_date ASC
+                """).fetchall()
+
+                for row in rows:
+                    orders_info[row['id']] = {
+                        'priority': row['priority'],
+                        'delivery_date': row['delivery_date'],
+                        'queue_position': row['queue_position'],
+                        'notes': row['notes']
+                    }
+            except Exception as e:
+                print(f"Orders info error: {e}")
+
+        for order in matrix_data:
+            order_id = order.get('id')
+            if order_id in orders_info:
+                order['priority'] = orders_info[order_id]['priority']
+                order['delivery_date'] = orders_info[order_id]['delivery_date']
+                order['queue_position'] = orders_info[order_id]['queue_position']
+                order['notes'] = orders_info[order_id]['notes']
             else:
-                self.all_orders = []
+                order['priority'] = 'Normal'
+                order['queue_position'] = 9999
+                order['notes'] = ''
+
+        # PERFORMANS OPTİMİZASYONU: Karar Destek sıralamasına göre ilk siparişleri göster
+        # Sıralama: queue_position'a göre
+        matrix_data.sort(key=lambda x: (x.get('queue_position', 9999), x.get('delivery_date', '9999-12-31')))
+
+        # Sadece Karar Destek'te sıralanmış ilk 100 siparişi al
+        # (queue_position < 9999 olanlar zaten Karar Destek'te sıralanmış demektir)
+        filtered_orders = []
+        for idx, order in enumerate(matrix_data):
+            queue_pos = order.get('queue_position', 9999)
+            # İlk 100 siparişi al VEYA sıralanmamış ama üretimde olanları al
+            if idx < 100 or queue_pos < 100:
+                filtered_orders.append(order)
+            else:
+                break  # İlk 100'den sonra zaten gerek yok
 
-            self.update_list()
-            self.update_stats()
-            self.status_label.setText(f"{len(self.all_orders)} siparis (Ilk 100) | {now_turkey().strftime('%H:%M:%S')}")
-        except Exception as e:
-            self.status_label.setText(f"Hata: {str(e)}")
+        return filtered_orders
+
+    def apply_data(self, orders):
+        """fetch_data sonucunu arayüze bas (GUI thread)"""
+        self.all_orders = orders
+        self.update_list()
+        self.update_stats()
+        self.status_label.setText(f"{len(self.all_orders)} siparis (Ilk 100) | {now_turkey().strftime('%H:%M:%S')}")
     
     def update_list(self):
         while self.list_layout.count() > 1:
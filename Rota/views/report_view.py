@@ -28,6 +28,9 @@ try:
 except ImportError:
     db = None
 
+from core.export_service import export_query
+from views.export_dialog import ask_export_path, run_export
+
 
 # =============================================================================
 # EXCEL TEMASI
@@ -60,6 +63,7 @@ class Colors:
 class ReportView(QWidget):
     def __init__(self):
         super().__init__()
+        self._logs_range = None
         self.setup_ui()
         
     def setup_ui(self):
@@ -130,6 +134,11 @@ class ReportView(QWidget):
         self.setup_fire_tab()
         self.tabs.addTab(self.tab_fire, "Fire Analizi")
 
+        # Sekme 4: Donem Karsilastirma
+        self.tab_compare = QWidget()
+        self.setup_compare_tab()
+        self.tabs.addTab(self.tab_compare, "Donem Karsilastirma")
+
         layout.addWidget(self.tabs)
 
     # =========================================================================
@@ -266,9 +275,17 @@ class ReportView(QWidget):
         d1 = self.date_start.date().toString("yyyy-MM-dd")
         d2 = self.date_end.date().toString("yyyy-MM-dd")
         data = db.get_production_report_data(d1, d2)
+        self._logs_range = (d1, d2)
         
         self.table_logs.setRowCount(len(data))
-        self.lbl_result_count.setText(f"{len(data)} kayit bulundu")
+        summary_text = f"{len(data)} kayit bulundu"
+        try:
+            summary = db.get_production_summary(d1, d2)
+            summary_text += (f"  |  Uretim: {summary['adet']} adet, {summary['m2']:.1f} m2"
+                             f"  |  Fire: {summary['fire_adedi']} adet")
+        except Exception:
+            pass
+        self.lbl_result_count.setText(summary_text)
         
         for r, item in enumerate(data):
             # Tarih
@@ -302,42 +319,27 @@ class ReportView(QWidget):
             self.table_logs.setItem(r, 5, QTableWidgetItem(str(item.get('operator', ''))))
 
     def export_logs(self):
-        """Loglari Excel'e aktar"""
-        if self.table_logs.rowCount() == 0:
+        """Sorgulanan tarih araligindaki loglari dosyaya akit (arka planda)"""
+        if not self._logs_range or self.table_logs.rowCount() == 0:
             QMessageBox.warning(self, "Uyari", "Aktarilacak veri yok. Once sorgulama yapin.")
             return
-        
-        file_path, _ = QFileDialog.getSaveFileName(
-            self, "Excel Dosyasi Kaydet", 
-            f"uretim_raporu_{now_turkey().strftime('%Y%m%d')}.xlsx",
-            "Excel Files (*.xlsx)"
+
+        file_path = ask_export_path(self, f"uretim_raporu_{now_turkey().strftime('%Y%m%d')}")
+        if not file_path:
+            return
+
+        sql, params = db.build_production_report_query(*self._logs_range)
+        run_export(
+            self,
+            lambda **kw: export_query(
+                sql, params, file_path,
+                headers=["Tarih", "Siparis", "Musteri", "Istasyon", "Islem", "Operator", "Adet"],
+                sheet_title="Uretim Hareketleri",
+                column_widths=[20, 16, 28, 16, 14, 16, 8],
+                **kw
+            ),
+            label="Uretim hareketleri aktariliyor..."
         )
-        
-        if file_path:
-            try:
-                import openpyxl
-                wb = openpyxl.Workbook()
-                ws = wb.active
-                ws.title = "Uretim Hareketleri"
-                
-                # Basliklar
-                headers = ["Tarih", "Siparis", "Musteri", "Istasyon", "Islem", "Operator"]
-                ws.append(headers)
-                
-                # Veriler
-                for row in range(self.table_logs.rowCount()):
-                    row_data = []
-                    for col in range(self.table_logs.columnCount()):
-                        item = self.table_logs.item(row, col)
-                        row_data.append(item.text() if item else "")
-                    ws.append(row_data)
-                
-                wb.save(file_path)
-                QMessageBox.information(self, "Basarili", f"Rapor kaydedildi:\n{file_path}")
-            except ImportError:
-                QMessageBox.critical(self, "Hata", "openpyxl kutuphanesi yuklu degil.\npip install openpyxl")
-            except Exception as e:
-                QMessageBox.critical(self, "Hata", f"Kayit hatasi: {e}")
 
     # =========================================================================
     # SEKME 2: PERSONEL PERFORMANSI
@@ -600,6 +602,127 @@ class ReportView(QWidget):
             self.table_fire.setCellWidget(r, 2, bar)
             self.table_fire.setRowHeight(r, 36)
 
+    # =========================================================================
+    # SEKME 4: DONEM KARSILASTIRMA
+    # =========================================================================
+    def setup_compare_tab(self):
+        layout = QVBoxLayout(self.tab_compare)
+        layout.setContentsMargins(20, 20, 20, 20)
+        layout.setSpacing(16)
+
+        # Ust bar
+        top_bar = QHBoxLayout()
+
+        lbl_period = QLabel("Donem:")
+        lbl_period.setStyleSheet(f"font-size: 11px; color: {Colors.TEXT_SECONDARY};")
+        top_bar.addWidget(lbl_period)
+
+        self.combo_period = QComboBox()
+        self.combo_period.addItem("Aylik", "month")
+        self.combo_period.addItem("Yillik", "year")
+        self.combo_period.setStyleSheet(f"""
+            QComboBox {{
+                border: 1px solid {Colors.BORDER};
+                border-radius: 3px;
+                padding: 6px 10px;
+                font-size: 11px;
+                background-color: {Colors.BG};
+                min-width: 100px;
+            }}
+        """)
+        self.combo_period.currentIndexChanged.connect(self.refresh_compare)
+        top_bar.addWidget(self.combo_period)
+
+        self.lbl_compare_info = QLabel("")
+        self.lbl_compare_info.setStyleSheet(f"font-size: 11px; color: {Colors.TEXT_SECONDARY};")
+        top_bar.addWidget(self.lbl_compare_info)
+
+        top_bar.addStretch()
+
+        btn_refresh = QPushButton("Yenile")
+        btn_refresh.setFixedHeight(32)
+        btn_refresh.setCursor(Qt.PointingHandCursor)
+        btn_refresh.setStyleSheet(f"""
+            QPushButton {{
+                background-color: {Colors.ACCENT};
+                border: none;
+                border-radius: 4px;
+                padding: 0 20px;
+                color: white;
+                font-size: 11px;
+                font-weight: bold;
+            }}
+            QPushButton:hover {{
+                background-color: #1D6640;
+            }}
+        """)
+        btn_refresh.clicked.connect(self.refresh_compare)
+        top_bar.addWidget(btn_refresh)
+
+        layout.addLayout(top_bar)
+
+        # Tablo
+        self.table_compare = QTableWidget()
+        self.table_compare.setColumnCount(6)
+        self.table_compare.setHorizontalHeaderLabels(
+            ["Istasyon", "Bu Donem (m2)", "Onceki Donem (m2)", "Degisim", "Gecen Yil (m2)", "Degisim"]
+        )
+        self.table_compare.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.table_compare.verticalHeader().setVisible(False)
+        self.table_compare.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table_compare.setAlternatingRowColors(True)
+        self.table_compare.setStyleSheet(self._get_table_style())
+        layout.addWidget(self.table_compare)
+
+    def _change_item(self, current, previous):
+        """Yuzde degisim hucresi (onceki donem yoksa '-')"""
+        if not previous:
+            item = QTableWidgetItem("-")
+            item.setForeground(QColor(Colors.TEXT_MUTED))
+        else:
+            change = (current - previous) / previous * 100
+            item = QTableWidgetItem(f"{change:+.1f}%")
+            item.setForeground(QColor(Colors.SUCCESS if change >= 0 else Colors.CRITICAL))
+            item.setFont(QFont("Segoe UI", 9, QFont.Bold))
+        item.setTextAlignment(Qt.AlignCenter)
+        return item
+
+    def refresh_compare(self):
+        if not db:
+            return
+
+        try:
+            result = db.get_period_comparison(self.combo_period.currentData())
+        except Exception:
+            QMessageBox.warning(self, "Uyari", "Karsilastirma verisi alinamadi.")
+            return
+
+        ranges = result['ranges']
+        self.lbl_compare_info.setText(
+            f"Bu donem: {ranges['current'][0]} - {ranges['current'][1]}  |  "
+            f"Onceki: {ranges['previous'][0]} - {ranges['previous'][1]}"
+        )
+
+        rows = result['rows']
+        self.table_compare.setRowCount(len(rows))
+
+        for r, item in enumerate(rows):
+            station_item = QTableWidgetItem(str(item.get('station_name', '')))
+            station_item.setFont(QFont("Segoe UI", 9, QFont.Bold))
+            self.table_compare.setItem(r, 0, station_item)
+
+            current = item.get('current_m2') or 0
+            previous = item.get('previous_m2') or 0
+            last_year = item.get('last_year_m2') or 0
+
+            for col, value in ((1, current), (2, previous), (4, last_year)):
+                value_item = QTableWidgetItem(f"{value:,.1f}")
+                value_item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                self.table_compare.setItem(r, col, value_item)
+
+            self.table_compare.setItem(r, 3, self._change_item(current, previous))
+            self.table_compare.setItem(r, 5, self._change_item(current, last_year))
+
     # =========================================================================
     # ORTAK STIL
     # =========================================================================
@@ -34,8 +34,15 @@ from PySide6.QtGui import QColor, QFont
 
 try:
     from core.db_manager import db
+    from core.db_async import run_async
 except ImportError:
     db = None
+    run_async = None
+
+try:
+    from core.rack_planner import rack_planner
+except ImportError:
+    rack_planner = None
 
 
 # =============================================================================
@@ -90,8 +97,10 @@ class ShippingView(QWidget):
             from core.refresh_manager import refresh_manager
             refresh_manager.register_view(
                 data_key='shipments',
-                callback=self.refresh_data,
-                dependencies=['orders']
+                fetch=self.fetch_data,
+                apply=self.apply_data,
+                dependencies=['orders'],
+                timers=[self.timer]
             )
         except:
             pass
@@ -205,6 +214,13 @@ class ShippingView(QWidget):
         btn_history.clicked.connect(self.show_history)
         layout.addWidget(btn_history)
 
+        # Sehpa yükleme planı
+        if rack_planner:
+            btn_rack_plan = QPushButton("Sehpa Planı")
+            btn_rack_plan.setStyleSheet(btn_history.styleSheet())
+            btn_rack_plan.clicked.connect(self.show_rack_plan)
+            layout.addWidget(btn_rack_plan)
+
         # Yenile
         btn_refresh = QPushButton("Yenile")
         btn_refresh.setStyleSheet(f"""
@@ -729,25 +745,50 @@ class ShippingView(QWidget):
     # =========================================================================
     
     def refresh_data(self):
-        """Tum verileri yenile"""
+        """Tum verileri yenile (veri cekme arka planda)"""
+        if not db:
+            self.apply_data(self.fetch_data())
+            return
+
+        run_async(
+            self.fetch_data,
+            callback=self.apply_data,
+            error_callback=lambda msg: self.status_label.setText(f"Hata: {msg}"),
+            key="shipping_view_refresh"
+        )
+
+    def fetch_data(self):
+        """Tum verileri cek (widget'a dokunmaz, worker thread'de calisabilir)"""
+        if not db:
+            return {'ready': ([], [], []), 'pallets': [], 'completed': []}
+
+        # PERFORMANS: Matris, siparis bilgileri, hazir adetler ve sehpalar tek
+        # okuma snapshot'indan (tek baglanti, birbiriyle tutarli sayilar)
+        with db.snapshot():
+            return {
+                'ready': self._fetch_ready_orders(),
+                'pallets': self._fetch_pallets(),
+                'completed': self._fetch_completed_shipments()
+            }
+
+    def apply_data(self, data):
+        """fetch_data sonucunu arayuze bas (GUI thread)"""
         try:
-            self._load_ready_orders()
-            self._load_pallets()
-            self._load_completed_shipments()
+            self._load_ready_orders(data['ready'])
+            self._load_pallets(data['pallets'])
+            self._load_completed_shipments(data['completed'])
             self._update_summary()
             self.status_label.setText(f"Guncellendi: {now_turkey().strftime('%H:%M:%S')}")
         except Exception as e:
             self.status_label.setText(f"Hata: {str(e)}")
     
-    def _load_ready_orders(self):
-        """Sevke hazir siparisleri yukle"""
-        self.table_orders.setRowCount(0)
-        self.ready_orders = []
-        self.delayed_orders = []
-        self.today_orders = []
+    def _fetch_ready_orders(self):
+        """Sevke hazir siparisleri hazirla -> (hazir, geciken, bugun)"""
+        delayed_orders = []
+        today_orders = []
         
         if not db:
-            return
+            return [], [], []
         
         try:
             all_orders = db.get_production_matrix_advanced()
@@ -811,10 +852,10 @@ class ShippingView(QWidget):
                         
                         if days_diff < 0:
                             order['status_type'] = 'delayed'
-                            self.delayed_orders.append(order)
+                            delayed_orders.append(order)
                         elif days_diff == 0:
                             order['status_type'] = 'today'
-                            self.today_orders.append(order)
+                            today_orders.append(order)
                         else:
                             order['status_type'] = 'normal'
                     except:
@@ -832,23 +873,29 @@ class ShippingView(QWidget):
                 x.get('days_diff', 999)
             ))
             
-            self.ready_orders = ready_list
-            self.all_ready_orders = ready_list.copy()  # Filtreleme için kaydet
-
-            # Tabloyu doldur
-            self._populate_orders_table()
+            return ready_list, delayed_orders, today_orders
 
         except Exception as e:
             print(f"Siparis yukleme hatasi: {e}")
+            return [], [], []
     
-    def _load_pallets(self):
-        """3 SABİT SEHPAYI YÜKLE"""
-        if not db:
-            return
+    def _load_ready_orders(self, data):
+        """Sevke hazir siparisleri tabloya yukle"""
+        self.table_orders.setRowCount(0)
+        ready_list, self.delayed_orders, self.today_orders = data
+        
+        self.ready_orders = ready_list
+        self.all_ready_orders = ready_list.copy()  # Filtreleme için kaydet
 
-        current_name = self.combo_pallets.currentText()
-        self.combo_pallets.clear()
+        # Tabloyu doldur
+        self._populate_orders_table()
+    
+    def _fetch_pallets(self):
+        """3 SABİT SEHPAYI OKU -> [(gorunen_ad, sehpa_id), ...]"""
+        if not db:
+            return []
 
+        pallets = []
         try:
             # 3 sabit sehpayı direkt ekle
             standard_pallets = ["Büyük L", "Küçük L", "Büyük A"]
@@ -868,8 +915,24 @@ class ShippingView(QWidget):
                             (sehpa['id'],)
                         ).fetchone()[0]
 
-                        display_text = f"{sehpa_name} ({order_count} sipariş)"
-                        self.combo_pallets.addItem(display_text, sehpa['id'])
+                        pallets.append((f"{sehpa_name} ({order_count} sipariş)", sehpa['id']))
+
+        except Exception as e:
+            print(f"Sehpa yukleme hatasi: {e}")
+
+        return pallets
+    
+    def _load_pallets(self, pallets):
+        """3 SABİT SEHPAYI YÜKLE"""
+        if not db:
+            return
+
+        current_name = self.combo_pallets.currentText()
+        self.combo_pallets.clear()
+
+        try:
+            for display_text, pallet_id in pallets:
+                self.combo_pallets.addItem(display_text, pallet_id)
 
             # Önceki seçimi geri yükle
             if current_name:
@@ -883,32 +946,34 @@ class ShippingView(QWidget):
         except Exception as e:
             print(f"Sehpa yukleme hatasi: {e}")
     
-    def _load_completed_shipments(self):
-        """Son sevkiyatlari yukle"""
-        self.list_completed.clear()
-        
+    def _fetch_completed_shipments(self):
+        """Son sevkiyatlari oku"""
         if not db:
-            return
+            return []
         
         try:
-            completed = db.get_shipped_pallets()
-            
-            for p in completed[:10]:  # Son 10 sevkiyat
-                date_str = p.get('shipped_at', p.get('created_at', ''))
-                if date_str:
-                    try:
-                        dt = datetime.strptime(date_str, '%Y-%m-%d %H:%M:%S')
-                        date_str = dt.strftime('%d.%m %H:%M')
-                    except:
-                        pass
-                
-                item = QListWidgetItem(
-                    f"{p.get('pallet_name', '-')} - {p.get('customer_name', '-')} ({date_str})"
-                )
-                self.list_completed.addItem(item)
-                
+            return db.get_shipped_pallets()[:10]  # Son 10 sevkiyat
         except Exception as e:
             print(f"Tamamlanan sevkiyat yukleme hatasi: {e}")
+            return []
+    
+    def _load_completed_shipments(self, completed):
+        """Son sevkiyatlari yukle"""
+        self.list_completed.clear()
+        
+        for p in completed:
+            date_str = p.get('shipped_at', p.get('created_at', ''))
+            if date_str:
+                try:
+                    dt = datetime.strptime(date_str, '%Y-%m-%d %H:%M:%S')
+                    date_str = dt.strftime('%d.%m %H:%M')
+                except:
+                    pass
+            
+            item = QListWidgetItem(
+                f"{p.get('pallet_name', '-')} - {p.get('customer_name', '-')} ({date_str})"
+            )
+            self.list_completed.addItem(item)
     
     def _update_summary(self):
         """Ozet istatistiklerini guncelle"""
@@ -1334,6 +1399,11 @@ class ShippingView(QWidget):
         dialog = ShippingHistoryDialog(self)
         dialog.exec()
 
+    def show_rack_plan(self):
+        """Tum sevke hazir siparisler icin sehpa yukleme plani"""
+        dialog = RackPlanDialog(self)
+        dialog.exec()
+
 
 # =============================================================================
 # GEÇMİŞ SEVKİYATLAR DIALOG
@@ -1533,6 +1603,182 @@ class ShippingHistoryDialog(QDialog):
             print(f"Gecmis sevkiyat yukleme hatasi: {e}")
 
 
+# =============================================================================
+# SEHPA YÜKLEME PLANI DIALOG
+# =============================================================================
+class RackPlanDialog(QDialog):
+    """Sevke hazir siparislerin sehpalara dagilimi ve yukleme sirasi"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Sehpa Yükleme Planı")
+        self.resize(1100, 620)
+        self.setup_ui()
+        self.calculate()
+
+    def setup_ui(self):
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(0)
+
+        # Baslik
+        header = QFrame()
+        header.setFixedHeight(50)
+        header.setStyleSheet(f"""
+            QFrame {{
+                background-color: {Colors.HEADER_BG};
+                border-bottom: 1px solid {Colors.BORDER};
+            }}
+        """)
+        header_layout = QHBoxLayout(header)
+        header_layout.setContentsMargins(16, 0, 16, 0)
+
+        lbl_title = QLabel("Sehpa Yükleme Planı")
+        lbl_title.setStyleSheet(f"font-size: 14px; font-weight: bold; color: {Colors.TEXT};")
+        header_layout.addWidget(lbl_title)
+
+        header_layout.addSpacing(16)
+        self.lbl_summary = QLabel("")
+        self.lbl_summary.setStyleSheet(f"font-size: 11px; font-weight: bold; color: {Colors.ACCENT};")
+        header_layout.addWidget(self.lbl_summary)
+
+        header_layout.addStretch()
+
+        button_style = f"""
+            QPushButton {{
+                background-color: {Colors.BG};
+                border: 1px solid {Colors.BORDER};
+                border-radius: 4px;
+                color: {Colors.TEXT};
+                font-size: 11px;
+            }}
+            QPushButton:hover {{
+                background-color: {Colors.HEADER_BG};
+            }}
+        """
+        self.btn_calculate = QPushButton("Yeniden Hesapla")
+        self.btn_calculate.setFixedSize(120, 32)
+        self.btn_calculate.setStyleSheet(button_style)
+        self.btn_calculate.clicked.connect(self.calculate)
+        header_layout.addWidget(self.btn_calculate)
+
+        btn_close = QPushButton("Kapat")
+        btn_close.setFixedSize(80, 32)
+        btn_close.setStyleSheet(button_style)
+        btn_close.clicked.connect(self.close)
+        header_layout.addWidget(btn_close)
+
+        layout.addWidget(header)
+
+        # Tablo (yukleme sirasiyla)
+        self.table = QTableWidget()
+        self.table.setColumnCount(8)
+        self.table.setHorizontalHeaderLabels([
+            "Sıra", "Sehpa", "Müşteri", "Termin", "Adet", "Ağırlık (kg)", "Doluluk %", "Siparişler"
+        ])
+        self.table.verticalHeader().setVisible(False)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.setAlternatingRowColors(True)
+        self.table.setStyleSheet(f"""
+            QTableWidget {{
+                background-color: {Colors.BG};
+                alternate-background-color: {Colors.ROW_ALT};
+                gridline-color: {Colors.GRID};
+                border: none;
+                font-size: 11px;
+            }}
+            QTableWidget::item:selected {{
+                background-color: {Colors.SELECTION};
+                color: {Colors.TEXT};
+            }}
+            QHeaderView::section {{
+                background-color: {Colors.HEADER_BG};
+                color: {Colors.TEXT};
+                padding: 8px;
+                border: none;
+                border-right: 1px solid {Colors.GRID};
+                border-bottom: 1px solid {Colors.BORDER};
+                font-size: 11px;
+                font-weight: 600;
+            }}
+        """)
+        header = self.table.horizontalHeader()
+        header.setSectionResizeMode(QHeaderView.Interactive)
+        for col, width in enumerate([50, 90, 180, 90, 60, 90, 80]):
+            self.table.setColumnWidth(col, width)
+        header.setStretchLastSection(True)
+        self.table.verticalHeader().setDefaultSectionSize(26)
+        layout.addWidget(self.table, 1)
+
+        # Alt bilgi
+        footer = QFrame()
+        footer.setFixedHeight(40)
+        footer.setStyleSheet(f"""
+            QFrame {{
+                background-color: {Colors.HEADER_BG};
+                border-top: 1px solid {Colors.BORDER};
+            }}
+        """)
+        footer_layout = QHBoxLayout(footer)
+        footer_layout.setContentsMargins(16, 0, 16, 0)
+
+        self.lbl_info = QLabel("Hesaplanıyor...")
+        self.lbl_info.setStyleSheet(f"font-size: 11px; color: {Colors.TEXT_SECONDARY};")
+        footer_layout.addWidget(self.lbl_info)
+        footer_layout.addStretch()
+
+        layout.addWidget(footer)
+
+    def calculate(self):
+        """Plani arka planda hesapla"""
+        if not rack_planner or not db:
+            self.lbl_info.setText("Veritabanı bağlantısı yok")
+            return
+        self.btn_calculate.setEnabled(False)
+        self.lbl_info.setText("Hesaplanıyor...")
+        run_async(
+            rack_planner.plan,
+            callback=self._apply_plan,
+            error_callback=self._on_error,
+            key="rack_plan"
+        )
+
+    def _on_error(self, msg):
+        self.btn_calculate.setEnabled(True)
+        self.lbl_info.setText(f"Hata: {msg}")
+
+    def _apply_plan(self, plan):
+        self.btn_calculate.setEnabled(True)
+        by_type = ", ".join(f"{count} {name}" for name, count in plan['by_type'].items())
+        self.lbl_summary.setText(
+            f"{plan['rack_count']} sehpa ({by_type})  |  {len(plan['customers'])} müşteri  |  "
+            f"{plan['weight_kg'] / 1000:.1f} ton"
+        )
+
+        racks = plan['racks']
+        self.table.setRowCount(len(racks))
+        for row, load in enumerate(racks):
+            orders = ", ".join(f"{i.order_code} ×{i.quantity}" for i in load.items)
+            values = [
+                str(load.sequence), load.rack.name, load.customer, load.delivery_date or '-',
+                str(load.pieces), f"{load.weight_kg:.0f}", f"{load.fill * 100:.0f}", orders
+            ]
+            for col, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                if col in (0, 4, 5, 6):
+                    item.setTextAlignment(Qt.AlignCenter)
+                if col == 6 and load.fill < 0.5:
+                    item.setForeground(QColor(Colors.WARNING))
+                self.table.setItem(row, col, item)
+
+        unplaced = sum(plan['unplaced'].values())
+        info = f"{plan['placed']}/{plan['pieces']} adet yerleşti - yükleme sırası: 1 kasaya ilk giren"
+        if unplaced:
+            info += f"  |  {unplaced} adet hiçbir sehpaya sığmıyor"
+        self.lbl_info.setText(info + f"  |  {plan['elapsed_ms']:.0f} ms")
+
+
 if __name__ == "__main__":
     app = QApplication(sys.argv)
     app.setStyle("Fusion")
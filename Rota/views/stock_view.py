@@ -27,8 +27,10 @@ from PySide6.QtGui import QColor, QFont, QIcon
 
 try:
     from core.db_manager import db
+    from core.db_async import run_async
 except ImportError:
     db = None
+    run_async = None
 
 
 # =============================================================================
@@ -441,7 +443,9 @@ class StockView(QWidget):
             from core.refresh_manager import refresh_manager
             refresh_manager.register_view(
                 data_key='stocks',
-                callback=self.refresh_data
+                fetch=self.fetch_data,
+                apply=self.apply_data,
+                timers=[self.timer]
             )
         except:
             pass
@@ -744,19 +748,30 @@ class StockView(QWidget):
     def refresh_data(self):
         if not db: return
 
-        try:
-            # Genel stok verisi
-            self.all_stocks = db.get_all_stocks()
-            self.filter_table()
-            self.update_stats()
-
-            # Plaka stok verisi
-            self.all_plates = db.get_all_plates()
-            self.populate_plate_table()
-
-            self.lbl_status.setText(f"Veriler güncellendi: {now_turkey().strftime('%H:%M:%S')}")
-        except Exception as e:
-            self.lbl_status.setText(f"Hata: {e}")
+        run_async(
+            self.fetch_data,
+            callback=self.apply_data,
+            error_callback=lambda msg: self.lbl_status.setText(f"Hata: {msg}"),
+            key="stock_view_refresh"
+        )
+
+    def fetch_data(self):
+        """Genel stok ve plaka verisini çek (widget'a dokunmaz)"""
+        if not db:
+            return [], []
+        return db.get_all_stocks(), db.get_all_plates()
+
+    def apply_data(self, data):
+        """fetch_data sonucunu tablolara bas (GUI thread)"""
+        # Genel stok verisi
+        self.all_stocks, self.all_plates = data
+        self.filter_table()
+        self.update_stats()
+
+        # Plaka stok verisi
+        self.populate_plate_table()
+
+        self.lbl_status.setText(f"Veriler güncellendi: {now_turkey().strftime('%H:%M:%S')}")
 
     def update_stats(self):
         total_items = len(self.all_stocks)
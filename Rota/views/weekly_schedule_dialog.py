@@ -25,6 +25,7 @@ from PySide6.QtGui import QColor, QFont, QIcon
 try:
     from ui.theme import Theme
     from core.smart_planner import planner
+    from core.db_async import run_async
     from core.pdf_engine import PDFEngine
     from core.db_manager import db
 except ImportError:
@@ -74,14 +75,31 @@ class WeeklyScheduleDialog(QDialog):
             }}
         """)
         
-        # Veriyi Çek
-        try:
-            self.schedule_data = planner.get_weekly_plan()
-        except:
-            self.schedule_data = {}
+        # Veri arka planda çekilir, gelince tablolar dolar
+        self.schedule_data = {}
 
         self.init_ui()
         self.load_data()
+        self._request_plan(notify=False)
+
+    def _request_plan(self, notify):
+        """Haftalık planı worker havuzunda hesapla"""
+        run_async(
+            planner.get_weekly_plan,
+            callback=lambda data: self._on_plan_loaded(data, notify),
+            error_callback=self._on_plan_failed,
+            key="weekly_plan"
+        )
+
+    def _on_plan_loaded(self, data, notify):
+        """Plan hazır (GUI thread)"""
+        self.schedule_data = data or {}
+        self.load_data()
+        if notify:
+            QMessageBox.information(self, "Bilgi", "Veriler güncellendi.")
+
+    def _on_plan_failed(self, error_msg):
+        QMessageBox.warning(self, "Hata", f"Yenileme hatası: {error_msg}")
 
     def init_ui(self):
         layout = QVBoxLayout(self)
@@ -245,12 +263,7 @@ class WeeklyScheduleDialog(QDialog):
                 child.setText(3, f"{job['m2']:.1f}")
 
     def refresh_data(self):
-        try:
-            self.schedule_data = planner.get_weekly_plan()
-            self.load_data()
-            QMessageBox.information(self, "Bilgi", "Veriler güncellendi.")
-        except Exception as e:
-            QMessageBox.warning(self, "Hata", f"Yenileme hatası: {str(e)}")
+        self._request_plan(notify=True)
 
     def export_to_pdf(self):
         """PDF Çıktısı - Aktif sekmeye göre"""